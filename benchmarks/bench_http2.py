@@ -0,0 +1,92 @@
+"""
+HTTP/1.1 连接池与 HTTP/2 多路复用对比基准测试
+
+使用本地 hypercorn 服务器(同时支持 HTTP/1.1 和 h2c), 以相同并发度发送请求,
+比较延迟、吞吐量和建立的连接数。需要安装 httpx[http2] 和 hypercorn, 未安装时跳过。
+"""
+import json
+import time
+import asyncio
+
+from benchmarks.common import SMALL_JSON, AsgiServer, HYPERCORN_MISSING, hypercorn_serve, summarize, log
+from src.utils.http_client import HttpClient
+from src.utils.network import NetworkSettings
+from src.utils.transports.httpx_transport import HTTP2_AVAILABLE, HTTP2_MISSING
+
+SCENARIOS = [
+    # 名称, 路径: /json 立即返回, /delay 模拟 20ms 的服务端处理时间
+    ("small_json", "/json"),
+    ("delay_20ms", "/delay"),
+]
+PROTOCOLS = [("http1_pool", None), ("http2_multiplex", "httpx")]
+
+
+async def app(scope, receive, send):
+    """最小的 ASGI 应用"""
+    if scope['type'] != 'http':
+        return
+    if scope['path'] == '/delay':
+        await asyncio.sleep(0.02)
+    body = json.dumps(SMALL_JSON).encode()
+    await send({'type': 'http.response.start', 'status': 200,
+                'headers': [(b'content-type', b'application/json')]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def measure(client, url, total, concurrency):
+    """以固定并发度发送请求, 统计延迟、吞吐量、新建连接数和协议"""
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+    new_connections = 0
+    versions = set()
+
+    async def one():
+        nonlocal new_connections
+        async with semaphore:
+            response = await client.send_request("GET", url, {}, None)
+            if response.status != 200:
+                raise RuntimeError(f"Unexpected response: {response.status or response.error_kind}")
+            samples.append(response.elapsed_ms / 1000)
+            new_connections += sum(1 for hop in response.hops if hop['connection'] == 'new')
+            versions.add(response.http_version)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    return {
+        "latency": summarize(samples),
+        "requests_per_s": total / elapsed if elapsed else 0.0,
+        "new_connections": new_connections,
+        "http_version": sorted(versions),
+    }
+
+
+async def run_async(iterations, concurrency):
+    server = await AsgiServer(app).start()
+    results = {}
+    try:
+        for scenario, path in SCENARIOS:
+            url = f"{server.base_url}{path}"
+            for name, transport in PROTOCOLS:
+                # 每个场景使用新的客户端, 连接数从零开始统计
+                network = NetworkSettings(transports={"127.0.0.1": transport} if transport else None)
+                client = HttpClient(network=network)
+                try:
+                    entry = await measure(client, url, iterations, concurrency)
+                finally:
+                    await client.close()
+                results.setdefault(scenario, {})[name] = entry
+                log(f"[http2] {scenario} {name}: p50={entry['latency']['p50_ms']:.2f}ms "
+                    f"rps={entry['requests_per_s']:.1f} connections={entry['new_connections']}")
+    finally:
+        await server.stop()
+    return results
+
+
+def run(iterations=200, concurrency=20):
+    """运行 HTTP/1.1 与 HTTP/2 对比基准测试"""
+    if not HTTP2_AVAILABLE:
+        return {"skipped": HTTP2_MISSING}
+    if hypercorn_serve is None:
+        return {"skipped": HYPERCORN_MISSING}
+    return asyncio.run(run_async(iterations, concurrency))
@@ -0,0 +1,81 @@
+"""
+HttpClient.send_request 吞吐量与延迟基准测试
+"""
+import time
+import asyncio
+
+from benchmarks.common import BenchServer, measure_async, log, LARGE_BODY_SIZE
+from src.utils.http_client import HttpClient
+
+SCENARIOS = [
+    # 名称, 方法, 路径, 请求体
+    ("small_json", "GET", "/json", None),
+    ("large_10mb", "GET", "/large", None),
+    ("chunked", "GET", "/chunked", None),
+    ("gzip", "GET", "/gzip", None),
+    ("post_echo", "POST", "/echo", '{"key": "value"}'),
+]
+
+
+async def measure_throughput(client, url, method, body, total, concurrency):
+    """以固定并发度发送 total 个请求, 返回每秒请求数"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await client.send_request(method, url, {}, body)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "requests_per_s": total / elapsed if elapsed else 0.0,
+    }
+
+
+async def run_async(iterations, concurrency):
+    server = await BenchServer().start()
+    client = HttpClient()
+    results = {}
+    try:
+        for name, method, path, body in SCENARIOS:
+            url = server.base_url + path
+            # 10 MB 响应体开销较大, 减少迭代次数
+            count = max(3, iterations // 10) if name == "large_10mb" else iterations
+
+            response = await client.send_request(method, url, {}, body)
+            if response.status != 200:
+                raise RuntimeError(f"Unexpected response for {name}: {response.status or response.error_kind}")
+
+            latency = await measure_async(
+                lambda: client.send_request(method, url, {}, body), count
+            )
+            throughput = await measure_throughput(
+                client, url, method, body, count, concurrency
+            )
+            # 共享会话应复用已建立的连接
+            probe = await client.send_request(method, url, {}, body)
+            entry = {
+                "latency": latency,
+                "throughput": throughput,
+                "connection": probe.hops[-1]['connection'] if probe.hops else None,
+            }
+            if name == "large_10mb":
+                entry["throughput"]["megabytes_per_s"] = (
+                    throughput["requests_per_s"] * LARGE_BODY_SIZE / (1024 * 1024)
+                )
+            results[name] = entry
+            log(f"[http_client] {name}: p50={latency['p50_ms']:.2f}ms "
+                  f"rps={throughput['requests_per_s']:.1f}")
+    finally:
+        await client.close()
+        await server.stop()
+    return results
+
+
+def run(iterations=50, concurrency=10):
+    """运行 HttpClient 基准测试"""
+    return asyncio.run(run_async(iterations, concurrency))
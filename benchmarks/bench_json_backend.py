@@ -0,0 +1,46 @@
+"""
+JSON 编解码后端基准测试: 标准库 json 与 json_utils(安装 orjson 时使用 orjson)的 loads/dumps 耗时
+
+负载覆盖应用中常见的调用: 请求头和小响应体、约 1 MB 的响应体、历史记录行的存储格式。
+"""
+import json
+
+from benchmarks.common import SMALL_JSON, measure, log
+from benchmarks.bench_json_format import generate_payload
+from src.utils import json_utils
+
+HISTORY_ROW = {
+    "headers": {"Content-Type": "application/json", "Accept": "*/*", "User-Agent": "free-http"},
+    "body": {"query": "示例", "page": 1, "size": 20, "filters": {"active": True, "tags": ["a", "b"]}}
+}
+
+
+def payloads():
+    return {
+        "small": SMALL_JSON,
+        "history_row": HISTORY_ROW,
+        "1mb": json.loads(generate_payload(5000)),
+    }
+
+
+def run(iterations=200):
+    results = {"backend": json_utils.BACKEND}
+    for name, obj in payloads().items():
+        # 大负载减少迭代次数
+        loops = max(1, iterations // 50) if name == "1mb" else iterations
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+        data = text.encode("utf-8")
+        cases = {
+            "stdlib_loads": lambda: json.loads(data),
+            "json_utils_loads": lambda: json_utils.loads(data),
+            "stdlib_dumps_compact": lambda: json.dumps(obj, ensure_ascii=False, separators=(",", ":")),
+            "json_utils_dumps_compact": lambda: json_utils.dumps(obj, compact=True),
+            "stdlib_dumps_indent": lambda: json.dumps(obj, ensure_ascii=False, indent=2),
+            "json_utils_dumps_indent": lambda: json_utils.dumps(obj, indent=2),
+        }
+        results[name] = {"input_bytes": len(data)}
+        for case, func in cases.items():
+            stats = measure(func, loops)
+            results[name][case] = stats
+            log(f"[json_backend] {name} {case}: mean={stats['mean_ms']:.3f}ms")
+    return results
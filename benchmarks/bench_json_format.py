@@ -0,0 +1,84 @@
+"""
+JSON 格式化基准测试: 流式重新缩进 与 json.loads + json.dumps(indent=2) 的耗时和峰值内存
+
+峰值内存用 tracemalloc 单独测量一次(只统计 Python 分配, 不含临时文件), 耗时测量不开启 tracemalloc。
+"""
+import json
+import tracemalloc
+
+from benchmarks.common import measure, log
+
+# 生成的 JSON 数组元素个数, 对应大约 1 MB / 100 MB
+SIZES = {
+    "1mb": 5000,
+    "100mb": 500000,
+}
+
+
+def generate_payload(count):
+    """逐个元素生成紧凑 JSON 字节, 不构建完整的对象列表"""
+    parts = [b'{"total":%d,"items":[' % count]
+    for i in range(count):
+        item = {
+            "id": i,
+            "name": f"item-{i}",
+            "description": "示例数据 sample payload for formatting",
+            "price": i * 1.25,
+            "tags": ["alpha", "beta", "gamma"],
+            "active": i % 2 == 0,
+            "meta": {"created": "2024-01-01T00:00:00Z", "owner": None}
+        }
+        if i:
+            parts.append(b",")
+        parts.append(json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    parts.append(b"]}")
+    return b"".join(parts)
+
+
+def format_with_json(content):
+    """原来的方式: 解析为对象树后再序列化"""
+    return json.dumps(json.loads(content), indent=2, ensure_ascii=False)
+
+
+def format_streaming(content):
+    """响应面板大响应的方式: 流式重新缩进并写入 ResponseBody(超过阈值写入临时文件)"""
+    from src.utils.line_index import format_json_body
+    body = format_json_body(content)
+    body.close()
+
+
+def format_streaming_text(content):
+    """响应面板小响应的方式: 流式重新缩进为字符串"""
+    from src.utils.json_reindent import format_json
+    return format_json(content)
+
+
+def peak_memory(func, content):
+    tracemalloc.start()
+    try:
+        func(content)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(iterations=3, sizes=None):
+    results = {}
+    methods = {
+        "json_loads_dumps": format_with_json,
+        "streaming_to_body": format_streaming,
+        "streaming_to_str": format_streaming_text,
+    }
+    for name in sizes or SIZES:
+        count = SIZES[name]
+        content = generate_payload(count)
+        # 大数据量时只测一次
+        loops = 1 if name == "100mb" else iterations
+        results[name] = {"input_bytes": len(content)}
+        for method, func in methods.items():
+            stats = measure(lambda: func(content), loops, warmup=0 if name == "100mb" else 1)
+            stats["peak_python_bytes"] = peak_memory(func, content)
+            results[name][method] = stats
+            log(f"[json_format] {name} {method}: mean={stats['mean_ms']:.1f}ms "
+                f"peak={stats['peak_python_bytes'] / 1024 / 1024:.1f}MB")
+    return results
@@ -0,0 +1,65 @@
+"""
+ApiModel / HistoryModel 增删改查延迟基准测试
+"""
+import itertools
+
+from benchmarks.common import measure, log
+
+HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "User-Agent": "FreeHttp/1.0"
+}
+BODY = {"key": "value", "array": [1, 2, 3], "nested": {"field": "value"}}
+
+
+def bench_api_model(iterations):
+    from src.models.api_model import ApiModel
+
+    model = ApiModel()
+    counter = itertools.count()
+    results = {}
+
+    def insert():
+        model.save_api(f"bench-{next(counter)}", "POST", "http://127.0.0.1/api", HEADERS, BODY, 30)
+
+    results["insert"] = measure(insert, iterations, warmup=0)
+    results["update"] = measure(
+        lambda: model.save_api("bench-0", "PUT", "http://127.0.0.1/api", HEADERS, BODY, 30),
+        iterations
+    )
+    results["get_all"] = measure(model.get_all_apis, iterations)
+    api_id = model.get_all_apis()[-1]["id"]
+    results["get_by_id"] = measure(lambda: model.get_api_by_id(api_id), iterations)
+    results["update_last_selected"] = measure(lambda: model.update_last_selected(api_id), iterations)
+    results["get_last_selected"] = measure(model.get_last_selected_api, iterations)
+
+    ids = iter([api["id"] for api in model.get_all_apis()])
+    results["delete"] = measure(lambda: model.delete_api(next(ids)), iterations, warmup=0)
+    return results
+
+
+def bench_history_model(iterations):
+    from src.models.history_model import HistoryModel
+
+    model = HistoryModel()
+    results = {}
+    results["add"] = measure(
+        lambda: model.add_history("GET", "http://127.0.0.1/api", HEADERS, BODY, 30),
+        iterations
+    )
+    results["get"] = measure(model.get_history, iterations)
+    results["clear"] = measure(model.clear_history, iterations)
+    return results
+
+
+def run(iterations=200):
+    """运行模型层基准测试, 数据库位于隔离的临时应用数据目录"""
+    results = {
+        "api_model": bench_api_model(iterations),
+        "history_model": bench_history_model(iterations),
+    }
+    for model_name, ops in results.items():
+        for op, stats in ops.items():
+            log(f"[models] {model_name}.{op}: mean={stats['mean_ms']:.3f}ms")
+    return results
@@ -0,0 +1,74 @@
+"""
+ResponsePanel.update_response 格式化耗时基准测试
+"""
+import os
+import sys
+import json
+
+from benchmarks.common import measure, log
+
+# 生成的 JSON 数组元素个数, 对应大约 10 KB / 1 MB / 10 MB
+SIZES = {
+    "10kb": 50,
+    "1mb": 5000,
+    "10mb": 50000,
+}
+
+
+def generate_payload(count):
+    """生成接近真实接口返回的 JSON 文本"""
+    items = [{
+        "id": i,
+        "name": f"item-{i}",
+        "description": "示例数据 sample payload for formatting",
+        "price": i * 1.25,
+        "tags": ["alpha", "beta", "gamma"],
+        "active": i % 2 == 0,
+        "meta": {"created": "2024-01-01T00:00:00Z", "owner": None}
+    } for i in range(count)]
+    return json.dumps({"total": count, "items": items}, separators=(",", ":"))
+
+
+def run(iterations=5):
+    """运行响应面板格式化基准测试(需要 PyQt6, 使用 offscreen 平台)"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from src.views.components.response_panel import ResponsePanel
+    from src.utils.http_result import HttpResult
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    panel = ResponsePanel()
+
+    def wait_for_workers():
+        # 超过 PAGED_THRESHOLD 的响应在后台格式化 JSON 并建立行索引, 等到可以显示后才停止计时
+        for worker in (panel.format_worker, panel.paged_view.worker):
+            if worker is not None:
+                worker.wait()
+                app.processEvents()  # 投递 result 信号, 格式化完成后才会启动行索引
+
+    def update(content):
+        panel.update_response(HttpResult(status=200, reason="OK", content=content, encoding="utf-8"))
+        if panel.paged:
+            wait_for_workers()
+
+    results = {}
+    for name, count in SIZES.items():
+        text = generate_payload(count)
+        content = text.encode("utf-8")
+        # 大数据量时减少迭代次数
+        loops = max(1, iterations // 5) if name == "10mb" else iterations
+        # 每次创建新的结果对象, 计入解码耗时
+        stats = measure(lambda: update(content), loops)
+        stats["input_bytes"] = len(content)
+        stats["paged"] = panel.paged
+        results[name] = stats
+        log(f"[response_panel] {name}: mean={stats['mean_ms']:.2f}ms")
+    # 结束后台任务, 避免影响之后的基准测试
+    panel.reset_paged_view()
+    for worker in (panel.format_worker, panel.paged_view.worker):
+        if worker is not None:
+            worker.cancel()
+            worker.wait()
+    panel.deleteLater()
+    app.processEvents()
+    return results
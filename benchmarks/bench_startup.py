@@ -0,0 +1,55 @@
+"""
+应用冷启动耗时基准测试
+
+每次在独立子进程中导入并创建 MainWindow, 测量从进程启动到窗口显示的时间。
+"""
+import os
+import sys
+import json
+import time
+import subprocess
+
+from benchmarks.common import ROOT_DIR, summarize, log
+
+STARTUP_SCRIPT = r"""
+import os, sys, time, json
+start = time.perf_counter()
+sys.path.insert(0, os.getcwd())
+from PyQt6.QtWidgets import QApplication
+import qasync, asyncio
+imported = time.perf_counter()
+app = QApplication(sys.argv)
+loop = qasync.QEventLoop(app)
+asyncio.set_event_loop(loop)
+from src.views.main_window import MainWindow
+window = MainWindow()
+window.show()
+app.processEvents()
+shown = time.perf_counter()
+print(json.dumps({"import_s": imported - start, "window_s": shown - imported}))
+"""
+
+
+def run(iterations=5):
+    """运行冷启动基准测试"""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    total, imports, windows = [], [], []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT],
+            cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        total.append(time.perf_counter() - start)
+        phases = json.loads(output.strip().splitlines()[-1])
+        imports.append(phases["import_s"])
+        windows.append(phases["window_s"])
+
+    results = {
+        "process_total": summarize(total),
+        "qt_import": summarize(imports),
+        "main_window": summarize(windows),
+    }
+    log(f"[startup] mean={results['process_total']['mean_ms']:.1f}ms")
+    return results
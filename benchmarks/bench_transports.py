@@ -0,0 +1,238 @@
+"""
+传输引擎一致性与性能测试
+
+对每个可用的引擎运行同一组一致性用例(JSON、POST、重定向、Cookie、多值响应头、连接复用、
+错误分类), 再以相同负载测量顺序延迟和并发吞吐量, 用于为不同负载选择最快的引擎。
+所有引擎使用同一个 hypercorn 服务器(同时支持 HTTP/1.1 和 h2c, unix 引擎连接同一服务器的套接字),
+未安装 hypercorn 时跳过。
+"""
+import os
+import json
+import time
+import shutil
+import asyncio
+import tempfile
+from urllib.parse import parse_qs
+
+from benchmarks.common import (SMALL_JSON, AsgiServer, HYPERCORN_MISSING, hypercorn_serve, free_port,
+                               summarize, log)
+from src.utils.http_client import HttpClient
+from src.utils.http_result import ErrorKind
+from src.utils.network import is_unix_url
+from src.utils.transports.registry import TRANSPORTS
+
+
+async def _read_body(receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get('body', b"")
+        if not message.get('more_body'):
+            return body
+
+
+async def _respond(send, status, body=b"", headers=()):
+    await send({'type': 'http.response.start', 'status': status, 'headers': list(headers)})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def app(scope, receive, send):
+    """一致性测试使用的 ASGI 应用"""
+    if scope['type'] != 'http':
+        return
+    path = scope['path']
+    request_headers = {name.decode(): value.decode() for name, value in scope['headers']}
+    json_type = (b'content-type', b'application/json')
+    if path == '/json':
+        await _respond(send, 200, json.dumps(SMALL_JSON).encode(), [json_type])
+    elif path == '/echo':
+        content_type = request_headers.get('content-type', 'application/octet-stream').encode()
+        await _respond(send, 200, await _read_body(receive), [(b'content-type', content_type)])
+    elif path == '/redirect':
+        await _respond(send, 302, headers=[(b'location', b'/json')])
+    elif path == '/cookies/set':
+        await _respond(send, 200, b"{}", [json_type,
+                                          (b'set-cookie', b'engine=1; Path=/'),
+                                          (b'set-cookie', b'session=abc; Path=/')])
+    elif path == '/cookies/echo':
+        body = json.dumps({'cookie': request_headers.get('cookie', '')}).encode()
+        await _respond(send, 200, body, [json_type])
+    elif path == '/headers':
+        await _respond(send, 200, b"{}", [json_type, (b'x-multi', b'a'), (b'x-multi', b'b')])
+    elif path == '/delay':
+        query = parse_qs(scope['query_string'].decode())
+        await asyncio.sleep(int(query.get('ms', ['20'])[0]) / 1000)
+        await _respond(send, 200, json.dumps(SMALL_JSON).encode(), [json_type])
+    else:
+        await _respond(send, 404)
+
+
+def _expect(condition, message):
+    if not condition:
+        raise AssertionError(message)
+
+
+async def check_json(client, base_url, engine):
+    response = await client.send_request("GET", f"{base_url}/json", transport=engine.name)
+    _expect(response.status == 200, f"status {response.status or response.error_kind}")
+    _expect(json.loads(response.text) == SMALL_JSON, "unexpected body")
+    _expect(response.http_version, "missing http_version")
+    _expect(response.transport == engine.name, f"sent via {response.transport}")
+
+
+async def check_post_echo(client, base_url, engine):
+    body = json.dumps({"engine": engine.name, "data": "x" * 4096})
+    response = await client.send_request("POST", f"{base_url}/echo", {"Content-Type": "application/json"},
+                                         body, transport=engine.name)
+    _expect(response.status == 200, f"status {response.status or response.error_kind}")
+    _expect(response.text == body, "echoed body differs")
+
+
+async def check_redirect(client, base_url, engine):
+    response = await client.send_request("GET", f"{base_url}/redirect", transport=engine.name)
+    _expect(response.status == 200, f"status {response.status or response.error_kind}")
+    _expect(response.url.endswith("/json"), f"final url {response.url}")
+    _expect([hop['status'] for hop in response.hops] == [302, 200],
+            f"hops {[hop['status'] for hop in response.hops]}")
+
+
+async def check_cookies(client, base_url, engine):
+    await client.send_request("GET", f"{base_url}/cookies/set", transport=engine.name)
+    response = await client.send_request("GET", f"{base_url}/cookies/echo", transport=engine.name)
+    cookie = json.loads(response.text)['cookie']
+    _expect("engine=1" in cookie and "session=abc" in cookie, f"cookie header {cookie!r}")
+
+
+async def check_multi_headers(client, base_url, engine):
+    response = await client.send_request("GET", f"{base_url}/headers", transport=engine.name)
+    _expect(response.headers.getall('X-Multi', []) == ['a', 'b'],
+            f"X-Multi {response.headers.getall('X-Multi', [])}")
+
+
+async def check_connection_reuse(client, base_url, engine):
+    await client.send_request("GET", f"{base_url}/json", transport=engine.name)
+    response = await client.send_request("GET", f"{base_url}/json", transport=engine.name)
+    _expect(response.hops and response.hops[-1]['connection'] == 'reused',
+            f"connection {response.hops[-1]['connection'] if response.hops else None}")
+
+
+async def check_connect_error(client, base_url, engine):
+    if is_unix_url(base_url):
+        url = f"{os.path.dirname(base_url)}/missing.sock/json"
+    else:
+        url = f"http://127.0.0.1:{free_port()}/json"
+    response = await client.send_request("GET", url, transport=engine.name)
+    _expect(response.error_kind == ErrorKind.CONNECT, f"error kind {response.error_kind}")
+
+
+async def check_timeout(client, base_url, engine):
+    response = await client.send_request("GET", f"{base_url}/delay?ms=300", timeout=0.1, transport=engine.name)
+    _expect(response.error_kind == ErrorKind.TIMEOUT, f"error kind {response.error_kind}")
+
+
+# 名称, 用例, 需要的能力
+CONFORMANCE = [
+    ("json", check_json, None),
+    ("post_echo", check_post_echo, None),
+    ("redirect", check_redirect, None),
+    ("cookies", check_cookies, None),
+    ("multi_headers", check_multi_headers, None),
+    ("connection_reuse", check_connection_reuse, 'trace_hooks'),
+    ("connect_error", check_connect_error, None),
+    ("timeout", check_timeout, None),
+]
+
+
+async def run_conformance(base_url, engine):
+    """运行一致性用例, 每个用例使用新的客户端; 引擎缺少所需能力时跳过"""
+    results = {}
+    for name, check, capability in CONFORMANCE:
+        if capability and not getattr(engine.capabilities, capability):
+            results[name] = "skipped"
+            continue
+        client = HttpClient()
+        try:
+            await check(client, base_url, engine)
+            results[name] = "passed"
+        except Exception as e:
+            results[name] = f"failed: {e}"
+        finally:
+            await client.close()
+    return results
+
+
+async def measure_engine(base_url, engine, iterations, concurrency):
+    """顺序请求的延迟分布和固定并发度下的吞吐量"""
+    url = f"{base_url}/json"
+    client = HttpClient()
+    try:
+        await client.send_request("GET", url, transport=engine.name)
+        samples = []
+        for _ in range(iterations):
+            response = await client.send_request("GET", url, transport=engine.name)
+            samples.append(response.elapsed_ms / 1000)
+    finally:
+        await client.close()
+
+    client = HttpClient()
+    semaphore = asyncio.Semaphore(concurrency)
+    new_connections = 0
+
+    async def one():
+        nonlocal new_connections
+        async with semaphore:
+            response = await client.send_request("GET", url, transport=engine.name)
+            if response.status != 200:
+                raise RuntimeError(f"Unexpected response: {response.status or response.error_kind}")
+            new_connections += sum(1 for hop in response.hops if hop['connection'] == 'new')
+
+    total = iterations * 2
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.close()
+    return {
+        "sequential_latency": summarize(samples),
+        "concurrent_requests_per_s": total / elapsed if elapsed else 0.0,
+        "concurrent_new_connections": new_connections,
+    }
+
+
+async def run_async(iterations, concurrency):
+    directory = tempfile.mkdtemp(prefix="free-http-bench-")
+    server = await AsgiServer(app, os.path.join(directory, "conformance.sock")).start()
+    results = {}
+    try:
+        for name, transport_class in TRANSPORTS.items():
+            if not transport_class.available():
+                results[name] = {"skipped": transport_class.missing_message}
+                continue
+            base_url = server.unix_base_url if transport_class.capabilities.unix_sockets else server.base_url
+            conformance = await run_conformance(base_url, transport_class)
+            failed = [case for case, outcome in conformance.items() if outcome.startswith("failed")]
+            entry = {
+                "label": transport_class.label,
+                "capabilities": transport_class.capabilities.to_dict(),
+                "conformance": conformance,
+                "conformance_failed": len(failed),
+            }
+            entry.update(await measure_engine(base_url, transport_class, iterations, concurrency))
+            results[name] = entry
+            log(f"[transports] {name}: conformance {len(conformance) - len(failed)}/{len(conformance)} "
+                f"p50={entry['sequential_latency']['p50_ms']:.2f}ms "
+                f"rps={entry['concurrent_requests_per_s']:.1f} connections={entry['concurrent_new_connections']}")
+            for case in failed:
+                log(f"[transports] {name}: {case} {conformance[case]}")
+    finally:
+        await server.stop()
+        shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def run(iterations=200, concurrency=20):
+    """对所有可用的传输引擎运行一致性和性能测试"""
+    if hypercorn_serve is None:
+        return {"skipped": HYPERCORN_MISSING}
+    return asyncio.run(run_async(iterations, concurrency))
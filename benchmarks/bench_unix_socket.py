@@ -0,0 +1,64 @@
+"""
+unix 域套接字与 TCP 回环延迟对比基准测试
+
+同一个本地服务器同时监听 127.0.0.1 和 unix 套接字, 通过 HttpClient 以相同负载分别请求,
+比较顺序请求延迟和并发吞吐量。Windows 不支持 unix 域套接字, 此时跳过。
+"""
+import os
+import shutil
+import asyncio
+import tempfile
+
+from benchmarks.common import BenchServer, measure_async, log
+from benchmarks.bench_http_client import measure_throughput
+from src.utils.http_client import HttpClient
+from src.utils.transports.unix_transport import UnixTransport
+
+SCENARIOS = [
+    # 名称, 方法, 路径, 请求体
+    ("small_json", "GET", "/json", None),
+    ("gzip", "GET", "/gzip", None),
+    ("post_echo", "POST", "/echo", '{"key": "value"}'),
+]
+
+
+async def run_async(iterations, concurrency):
+    directory = tempfile.mkdtemp(prefix="free-http-bench-")
+    server = await BenchServer().start(unix_path=os.path.join(directory, "bench.sock"))
+    client = HttpClient()
+    results = {}
+    try:
+        for name, method, path, body in SCENARIOS:
+            for target, base_url in (("tcp_loopback", server.base_url), ("unix_socket", server.unix_base_url)):
+                url = base_url + path
+                response = await client.send_request(method, url, {}, body)
+                if response.status != 200:
+                    raise RuntimeError(f"Unexpected response for {name} via {target}: "
+                                       f"{response.status or response.error_kind}")
+
+                latency = await measure_async(lambda: client.send_request(method, url, {}, body), iterations)
+                throughput = await measure_throughput(client, url, method, body, iterations, concurrency)
+                probe = await client.send_request(method, url, {}, body)
+                results.setdefault(name, {})[target] = {
+                    "latency": latency,
+                    "throughput": throughput,
+                    "transport": probe.transport,
+                    "connection": probe.hops[-1]['connection'] if probe.hops else None,
+                }
+                log(f"[unix_socket] {name} {target}: p50={latency['p50_ms']:.3f}ms "
+                    f"rps={throughput['requests_per_s']:.1f}")
+            tcp = results[name]["tcp_loopback"]["latency"]["p50_ms"]
+            unix = results[name]["unix_socket"]["latency"]["p50_ms"]
+            results[name]["p50_speedup"] = tcp / unix if unix else None
+    finally:
+        await client.close()
+        await server.stop()
+        shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def run(iterations=200, concurrency=10):
+    """运行 unix 套接字与 TCP 回环对比基准测试"""
+    if not UnixTransport.available():
+        return {"skipped": UnixTransport.missing_message}
+    return asyncio.run(run_async(iterations, concurrency))
@@ -0,0 +1,255 @@
+"""
+基准测试公共工具: 本地测试服务器、计时统计与结果输出
+"""
+import os
+import sys
+import gzip
+import json
+import time
+import socket
+import asyncio
+import platform
+import tempfile
+import statistics
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+# 添加项目根目录到 Python 路径
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.version import VERSION
+
+try:
+    from hypercorn.config import Config as HypercornConfig
+    from hypercorn.asyncio import serve as hypercorn_serve
+except ImportError:
+    hypercorn_serve = None
+
+HYPERCORN_MISSING = "The HTTP/2 test server requires hypercorn (pip install hypercorn)"
+
+SMALL_JSON = {
+    "id": 1,
+    "name": "free-http",
+    "tags": ["api", "http", "benchmark"],
+    "nested": {"enabled": True, "count": 42}
+}
+LARGE_BODY_SIZE = 10 * 1024 * 1024  # 10 MB
+
+
+def isolate_app_home():
+    """将配置文件和应用数据目录隔离到临时目录, 避免污染用户数据
+
+    ConfigModel 使用 Path.home() 定位配置文件, 因此需要在导入模型之前调用。
+    """
+    home = tempfile.mkdtemp(prefix="free-http-bench-")
+    os.environ["HOME"] = home
+    os.environ["USERPROFILE"] = home
+    return home
+
+
+def log(message):
+    """输出进度信息到标准错误, 避免与 JSON 结果混在一起"""
+    print(message, file=sys.stderr)
+
+
+def summarize(samples):
+    """计算耗时样本(秒)的统计信息, 结果单位为毫秒"""
+    ordered = sorted(samples)
+    count = len(ordered)
+
+    def percentile(p):
+        if not ordered:
+            return 0.0
+        index = min(count - 1, max(0, int(round(p / 100.0 * (count - 1)))))
+        return ordered[index] * 1000
+
+    return {
+        "count": count,
+        "min_ms": ordered[0] * 1000 if ordered else 0.0,
+        "mean_ms": statistics.fmean(ordered) * 1000 if ordered else 0.0,
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+        "stdev_ms": statistics.stdev(ordered) * 1000 if count > 1 else 0.0,
+    }
+
+
+def measure(func, iterations, warmup=1):
+    """同步执行 func 多次并返回耗时统计"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+async def measure_async(coro_factory, iterations, warmup=1):
+    """异步执行 coro_factory() 多次并返回耗时统计"""
+    for _ in range(warmup):
+        await coro_factory()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await coro_factory()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+class BenchServer:
+    """基于 aiohttp.web 的本地测试服务器, 监听 127.0.0.1 的随机端口, 可同时监听 unix 域套接字"""
+
+    def __init__(self):
+        self.runner = None
+        self.port = None
+        self.unix_path = None
+        self.small_json = json.dumps(SMALL_JSON).encode("utf-8")
+        self.large_body = b"x" * LARGE_BODY_SIZE
+        self.gzip_body = gzip.compress(json.dumps([SMALL_JSON] * 2000).encode("utf-8"))
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def unix_base_url(self):
+        return f"unix://{self.unix_path}"
+
+    async def handle_json(self, request):
+        return web.Response(body=self.small_json, content_type="application/json")
+
+    async def handle_large(self, request):
+        return web.Response(body=self.large_body, content_type="application/octet-stream")
+
+    async def handle_chunked(self, request):
+        response = web.StreamResponse()
+        response.content_type = "application/json"
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        for _ in range(64):
+            await response.write(self.small_json + b"\n")
+        await response.write_eof()
+        return response
+
+    async def handle_gzip(self, request):
+        return web.Response(
+            body=self.gzip_body,
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"}
+        )
+
+    async def handle_echo(self, request):
+        body = await request.read()
+        return web.Response(body=body, content_type=request.content_type)
+
+    async def start(self, unix_path=None):
+        app = web.Application(client_max_size=LARGE_BODY_SIZE * 2)
+        app.router.add_get("/json", self.handle_json)
+        app.router.add_get("/large", self.handle_large)
+        app.router.add_get("/chunked", self.handle_chunked)
+        app.router.add_get("/gzip", self.handle_gzip)
+        app.router.add_post("/echo", self.handle_echo)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        if unix_path:
+            await web.UnixSite(self.runner, unix_path).start()
+            self.unix_path = unix_path
+        return self
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+
+def free_port():
+    """获取一个当前未被占用的本地端口"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class AsgiServer:
+    """用 hypercorn 运行 ASGI 应用的本地测试服务器, 同时支持 HTTP/1.1 和 h2c, 可同时监听 unix 域套接字"""
+
+    def __init__(self, app, unix_path=None):
+        self.app = app
+        self.unix_path = unix_path
+        self.port = None
+        self._shutdown = None
+        self._task = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def unix_base_url(self):
+        return f"unix://{self.unix_path}"
+
+    async def start(self):
+        if hypercorn_serve is None:
+            raise RuntimeError(HYPERCORN_MISSING)
+        self.port = free_port()
+        config = HypercornConfig()
+        config.bind = [f"127.0.0.1:{self.port}"]
+        if self.unix_path:
+            config.bind.append(f"unix:{self.unix_path}")
+        config.accesslog = None
+        config.errorlog = None
+        self._shutdown = asyncio.Event()
+        self._task = asyncio.ensure_future(
+            hypercorn_serve(self.app, config, shutdown_trigger=self._shutdown.wait)
+        )
+        # 等待端口开始监听
+        for _ in range(250):
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", self.port)
+            except OSError:
+                if self._task.done():
+                    self._task.result()
+                await asyncio.sleep(0.02)
+                continue
+            writer.close()
+            await writer.wait_closed()
+            return self
+        raise RuntimeError(f"Test server did not start on port {self.port}")
+
+    async def stop(self):
+        if self._task is not None:
+            self._shutdown.set()
+            await self._task
+            self._task = None
+
+
+def environment_info():
+    """收集运行环境信息, 便于跨版本比较结果"""
+    return {
+        "version": VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def write_results(results, output_path=None):
+    """输出机器可读的 JSON 结果, output_path 为空时输出到标准输出"""
+    payload = {"environment": environment_info(), "results": results}
+    text = json.dumps(payload, indent=2, ensure_ascii=False)
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return payload
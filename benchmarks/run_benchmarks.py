@@ -0,0 +1,61 @@
+"""
+基准测试入口
+
+用法:
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --only http_client models --quick
+"""
+import sys
+import argparse
+import importlib
+import traceback
+
+from benchmarks.common import isolate_app_home, write_results
+
+# 名称: (模块, 默认参数, 快速模式参数)
+SUITES = {
+    "http_client": ("benchmarks.bench_http_client", {"iterations": 50}, {"iterations": 10}),
+    "http2": ("benchmarks.bench_http2", {"iterations": 200}, {"iterations": 40}),
+    "transports": ("benchmarks.bench_transports", {"iterations": 200}, {"iterations": 40}),
+    "unix_socket": ("benchmarks.bench_unix_socket", {"iterations": 200}, {"iterations": 40}),
+    "response_panel": ("benchmarks.bench_response_panel", {"iterations": 5}, {"iterations": 1}),
+    "json_format": ("benchmarks.bench_json_format", {"iterations": 5}, {"iterations": 1, "sizes": ["1mb"]}),
+    "json_backend": ("benchmarks.bench_json_backend", {"iterations": 500}, {"iterations": 50}),
+    "models": ("benchmarks.bench_models", {"iterations": 200}, {"iterations": 20}),
+    "startup": ("benchmarks.bench_startup", {"iterations": 5}, {"iterations": 1}),
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Free Http benchmark suite")
+    parser.add_argument("--output", "-o", help="结果 JSON 文件路径, 默认输出到标准输出")
+    parser.add_argument("--only", nargs="+", choices=list(SUITES), help="只运行指定的测试集")
+    parser.add_argument("--quick", action="store_true", help="减少迭代次数, 用于快速验证")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # 必须在导入任何模型之前隔离应用数据目录
+    isolate_app_home()
+
+    results = {}
+    failed = False
+    for name in args.only or list(SUITES):
+        module_name, default_kwargs, quick_kwargs = SUITES[name]
+        kwargs = quick_kwargs if args.quick else default_kwargs
+        print(f"Running benchmark suite: {name}", file=sys.stderr)
+        try:
+            module = importlib.import_module(module_name)
+            results[name] = module.run(**kwargs)
+        except Exception as e:
+            failed = True
+            traceback.print_exc()
+            results[name] = {"error": str(e)}
+
+    write_results(results, args.output)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
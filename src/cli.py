@@ -0,0 +1,92 @@
+import os
+import sys
+import argparse
+import asyncio
+from loguru import logger
+
+# 添加项目根目录到 Python 路径
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.models.api_model import ApiModel
+from src.models.config_model import ConfigModel
+from src.models.metrics_model import MetricsModel
+from src.controllers.request_controller import RequestController
+from src.controllers.collection_runner import CollectionRunner
+from src.utils import json_utils
+from src.utils.log_utils import setup_logger
+from src.utils.request_metrics import request_metrics
+from src.utils.transports.registry import TRANSPORTS
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run saved APIs and check their assertions")
+    parser.add_argument("names", nargs="*", help="API names to run (default: all saved APIs)")
+    parser.add_argument("--base-url", help="Prefix for relative API URLs")
+    parser.add_argument("--concurrency", type=int, default=1, help="Maximum concurrent requests")
+    parser.add_argument("--transport", choices=list(TRANSPORTS),
+                        help="Transport engine for all requests (default: per-domain setting)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--metrics-export", metavar="PATH",
+                        help="Write request metrics to PATH (.prom for Prometheus text, otherwise JSON)")
+    return parser.parse_args(argv)
+
+
+def print_report(summary):
+    for result in summary['results']:
+        api = result['api']
+        response = result['response']
+        mark = "PASS" if result['passed'] else "FAIL"
+        elapsed = response.elapsed_ms
+        timing = f" {elapsed:.0f} ms" if elapsed is not None else ""
+        print(f"[{mark}] {api['method']} {api['name']} -> {response.status or response.error_kind.value}{timing}")
+        for assertion in result['assertions']:
+            if not assertion['passed']:
+                print(f"       - {assertion['name']}: {assertion['message']}")
+    print(f"{summary['total']} APIs, {summary['failed']} failed, {summary['elapsed']:.2f}s")
+
+
+async def run_collection(runner, apis, concurrency):
+    try:
+        return await runner.run(apis, concurrency=concurrency)
+    finally:
+        await runner.controller.close()
+        request_metrics.flush()
+
+
+def main(argv=None):
+    """命令行入口: 运行已保存的API并检查断言, 有失败时返回非零退出码"""
+    args = parse_args(argv)
+    setup_logger(ConfigModel())
+
+    api_model = ApiModel()
+    apis = api_model.get_all_apis()
+    if args.names:
+        by_name = {api['name']: api for api in apis}
+        missing = [name for name in args.names if name not in by_name]
+        if missing:
+            logger.error(f"Unknown APIs: {', '.join(missing)}")
+            return 2
+        apis = [by_name[name] for name in args.names]
+
+    request_metrics.configure(MetricsModel(), args.metrics_export)
+    runner = CollectionRunner(RequestController(), args.base_url, args.transport)
+    summary = asyncio.run(run_collection(runner, apis, args.concurrency))
+
+    if args.json:
+        print(json_utils.dumps([{
+            'name': result['api']['name'],
+            'status': result['response'].status,
+            'error_kind': result['response'].summary()['error_kind'],
+            'elapsed_ms': result['response'].elapsed_ms,
+            'passed': result['passed'],
+            'assertions': result['assertions'],
+        } for result in summary['results']], indent=2))
+    else:
+        print_report(summary)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
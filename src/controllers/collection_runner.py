@@ -0,0 +1,87 @@
+import asyncio
+import time
+from loguru import logger
+from src.utils import json_utils
+from src.utils.assertions import get_pipeline, summarize_results
+from src.utils.network import is_unix_url
+
+class CollectionRunner:
+    """按顺序(或有限并发)运行一组已保存的API, 并对每个响应执行断言"""
+
+    def __init__(self, request_controller, base_url=None, transport=None):
+        self.controller = request_controller
+        self.base_url = base_url.rstrip('/') if base_url else None
+        self.transport = transport  # 引擎名称, 为空时按域名配置选择
+
+    def build_request(self, api):
+        """将已保存的API数据转换为请求参数, 与请求面板发送时的处理一致"""
+        url = api['url']
+        if self.base_url and not url.startswith(('http://', 'https://')) and not is_unix_url(url):
+            url = f"{self.base_url}/{url.lstrip('/')}"
+        headers = api.get('headers') or {}
+        body = api.get('body') or {}
+        if isinstance(body, dict) and 'content' in body and len(body) == 1:
+            body_text = body['content']
+        elif body:
+            body_text = json_utils.dumps(body, compact=True)
+        else:
+            body_text = ''
+        return api['method'], url, headers, body_text, api.get('timeout', 30)
+
+    async def run_one(self, api):
+        """发送单个API并执行断言
+
+        Returns:
+            dict: api, response, assertions, passed
+        """
+        method, url, headers, body, timeout = self.build_request(api)
+        response = await self.controller.send_request(
+            method, url, headers, body, timeout, api.get('retry_policy'), self.transport, api['name']
+        )
+        try:
+            results = get_pipeline(api).evaluate(response)
+        except ValueError as e:
+            results = [{'name': 'assertions', 'passed': False, 'message': str(e)}]
+        passed, total = summarize_results(results)
+        logger.info("Collection run: {} {} -> {} ({}/{} assertions passed)",
+                    method, url, response.status or response.error_kind.value, passed, total)
+        return {
+            'api': api,
+            'response': response,
+            'assertions': results,
+            'passed': passed == total,
+        }
+
+    async def run(self, apis, concurrency=1, on_result=None):
+        """运行一组API
+
+        Args:
+            apis: 已保存的API数据列表
+            concurrency: 同时发送的最大请求数
+            on_result: 每个API完成后的回调, 参数为 (index, result)
+
+        Returns:
+            dict: results 列表以及汇总统计
+        """
+        start = time.perf_counter()
+        results = [None] * len(apis)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def worker(index, api):
+            async with semaphore:
+                result = await self.run_one(api)
+            results[index] = result
+            if on_result:
+                on_result(index, result)
+
+        await asyncio.gather(*(worker(index, api) for index, api in enumerate(apis)))
+        failed = sum(1 for result in results if not result['passed'])
+        summary = {
+            'results': results,
+            'total': len(results),
+            'failed': failed,
+            'elapsed': time.perf_counter() - start,
+        }
+        logger.info("Collection run finished: {} APIs, {} failed, {:.2f}s",
+                    summary['total'], failed, summary['elapsed'])
+        return summary
@@ -0,0 +1,119 @@
+from loguru import logger
+from src.utils.har_utils import (HarEntryReader, har_entry_to_request, request_to_history_record,
+                                 request_to_api_record, history_record_to_har_entry, write_har)
+from src.utils.import_utils import parse_curl_commands, load_openapi_spec, parse_openapi
+
+class ImportController:
+    """批量导入导出: HAR、cURL、OpenAPI 与历史记录/已保存API之间的转换"""
+
+    BATCH_SIZE = 500  # 每个事务写入的记录数
+
+    TARGET_HISTORY = 'history'
+    TARGET_APIS = 'apis'
+
+    def __init__(self, api_model, history_model):
+        self.api_model = api_model
+        self.history_model = history_model
+
+    def import_har(self, path, target, worker=None):
+        """流式导入 HAR 文件
+
+        Args:
+            path: HAR 文件路径
+            target: TARGET_HISTORY 或 TARGET_APIS
+            worker: 可选的 BackgroundWorker, 用于报告进度、发送增量结果和取消
+
+        Returns:
+            dict: 导入结果统计
+        """
+        logger.info(f"Importing HAR: {path} -> {target}")
+        imported = 0
+        skipped = 0
+        dropped = 0  # 历史记录超出保留条数被删除的最旧记录数
+        cancelled = False
+        batch = []
+
+        def flush():
+            nonlocal imported, dropped
+            if not batch:
+                return
+            if target == self.TARGET_APIS:
+                saved = self.api_model.save_apis_batch(batch)
+                imported += len(saved)
+                if worker:
+                    worker.emit_partial(saved)
+            else:
+                inserted, trimmed = self.history_model.add_history_batch(batch)
+                imported += inserted
+                dropped += trimmed
+            batch.clear()
+
+        with HarEntryReader(path) as reader:
+            for entry in reader:
+                if worker and worker.is_cancelled():
+                    cancelled = True
+                    break
+                request = har_entry_to_request(entry)
+                if not request['url']:
+                    skipped += 1
+                    continue
+                if target == self.TARGET_APIS:
+                    batch.append(request_to_api_record(request))
+                else:
+                    batch.append(request_to_history_record(request))
+                if len(batch) >= self.BATCH_SIZE:
+                    flush()
+                    if worker:
+                        worker.report_progress(reader.bytes_read, reader.total_bytes)
+            flush()
+            if worker:
+                worker.report_progress(reader.total_bytes, reader.total_bytes)
+
+        logger.info(f"HAR import finished: {imported} imported, {skipped} skipped, {dropped} dropped, "
+                    f"cancelled={cancelled}")
+        return {'target': target, 'imported': imported, 'skipped': skipped, 'dropped': dropped,
+                'cancelled': cancelled}
+
+    def import_curl(self, text):
+        """导入粘贴的一条或多条 curl 命令为已保存的API
+
+        Returns:
+            list: 已保存的API数据
+        """
+        apis = parse_curl_commands(text)
+        saved = self.api_model.save_apis_batch(apis)
+        logger.info(f"Imported {len(saved)} APIs from curl")
+        return saved
+
+    def import_openapi(self, path, worker=None):
+        """导入 OpenAPI 3 规范中的所有操作为已保存的API
+
+        所有操作在一个事务中写入, 然后分批通过 worker 发送给界面增量显示。
+
+        Returns:
+            dict: 导入结果统计
+        """
+        logger.info(f"Importing OpenAPI spec: {path}")
+        apis = parse_openapi(load_openapi_spec(path))
+        if worker:
+            worker.report_progress(1, 2)
+        saved = self.api_model.save_apis_batch(apis)
+        if worker:
+            for start in range(0, len(saved), self.BATCH_SIZE):
+                worker.emit_partial(saved[start:start + self.BATCH_SIZE])
+            worker.report_progress(2, 2)
+        logger.info(f"OpenAPI import finished: {len(saved)} operations")
+        return {'target': self.TARGET_APIS, 'imported': len(saved), 'skipped': len(apis) - len(saved), 'cancelled': False}
+
+    def export_har(self, path):
+        """导出历史记录为 HAR 1.2 文件
+
+        Returns:
+            int: 导出的记录数
+        """
+        logger.info(f"Exporting history to HAR: {path}")
+        history = self.history_model.get_history()
+        with open(path, 'w', encoding='utf-8') as f:
+            count = write_har((history_record_to_har_entry(record) for record in history), f)
+        logger.info(f"Exported {count} history records to HAR")
+        return count
@@ -0,0 +1,349 @@
+"""
+多进程压测: 每个工作进程运行自己的事件循环(可选 uvloop), 以固定并发反复发送同一个请求
+
+单个 Python 进程受 GIL 限制, 一个事件循环每秒只能发出几千个请求; 工作进程各占一个核心,
+每隔 SAMPLE_INTERVAL 秒通过管道发回这段时间的增量(请求数、错误数、字节数和耗时直方图的桶计数),
+界面进程只负责合并直方图, 不参与发送。
+域名配置了限速时, 每个工作进程分到 1/N 的速率和并发数, 耗时从获取到名额后开始计算。
+工作进程使用 spawn 方式启动(不复制界面进程的 Qt 状态), 只导入发送请求所需的模块。
+"""
+import os
+import sys
+import time
+import asyncio
+import multiprocessing
+from multiprocessing.connection import wait
+import aiohttp
+from loguru import logger
+from src.utils.instrumentation import Histogram
+from src.utils.http_result import classify_error
+from src.utils.rate_limiter import RateLimiter
+from src.utils.network import (CachingResolver, create_connector, is_socks_proxy, is_unix_url,
+                               split_unix_url)
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+SAMPLE_INTERVAL = 0.25  # 工作进程发回增量的间隔(秒)
+POLL_INTERVAL = 0.1  # 界面进程读取管道的间隔(秒)
+START_TIMEOUT = 30  # 等待所有工作进程就绪的最长时间(秒)
+
+
+class LoadTestSettings:
+    """压测参数"""
+
+    DEFAULTS = {
+        'workers': max(1, (os.cpu_count() or 2) - 1),  # 留一个核心给界面进程
+        'concurrency': 50,  # 每个工作进程的并发请求数
+        'duration_s': 10,
+        'max_requests': 0,  # 0 表示只按时长结束
+        'timeout': 30,
+        'uvloop': False,
+    }
+
+    def __init__(self, **options):
+        for key, default in self.DEFAULTS.items():
+            setattr(self, key, options.get(key, default))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**(data or {}))
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.DEFAULTS}
+
+    def quota(self, index):
+        """第 index 个工作进程的请求数上限, 不限制时为 None"""
+        if not self.max_requests:
+            return None
+        share, remainder = divmod(self.max_requests, self.workers)
+        return share + (1 if index < remainder else 0)
+
+
+def uvloop_available():
+    return uvloop is not None and sys.platform != 'win32'
+
+
+# ---------- 工作进程 ----------
+
+def _worker_main(index, conn, start_event, stop_event, request, settings, network):
+    """工作进程入口"""
+    if settings.uvloop and uvloop_available():
+        uvloop.install()
+    try:
+        asyncio.run(_worker(index, conn, start_event, stop_event, request, settings, network))
+        conn.send(('done', index))
+    except Exception as e:
+        conn.send(('error', index, f"{type(e).__name__}: {str(e)}"))
+    finally:
+        conn.close()
+
+
+def _create_session(url, settings, network):
+    """工作进程使用的会话: 不保存 Cookie, 不记录跟踪信息; 返回 (会话, 请求地址, HTTP 代理)"""
+    limit = settings.concurrency
+    if is_unix_url(url):
+        socket_path, url = split_unix_url(url)
+        connector = aiohttp.UnixConnector(path=socket_path, limit=limit)
+        proxy = None
+    else:
+        proxy = network.proxy_for(url)
+        resolver = CachingResolver(network.dns_cache_ttl, network.host_overrides)
+        connector = create_connector(network, resolver, proxy, limit=limit)
+        if proxy and is_socks_proxy(proxy):
+            proxy = None
+    session = aiohttp.ClientSession(
+        connector=connector,
+        cookie_jar=aiohttp.DummyCookieJar(),
+        timeout=aiohttp.ClientTimeout(total=settings.timeout),
+    )
+    return session, url, proxy
+
+
+async def _worker(index, conn, start_event, stop_event, request, settings, network):
+    method, url, headers, body, _ = request
+    data = body.encode('utf-8') if isinstance(body, str) and body else (body or None)
+    limiter = RateLimiter(network.rate_limits, share=1 / settings.workers).limiter_for(url)
+    session, url, proxy = _create_session(url, settings, network)
+    sample = {'requests': 0, 'errors': {}, 'bytes': 0, 'latency': Histogram()}
+    remaining = settings.quota(index)
+    running = True
+    queued = set()  # 正在等待限速名额的发送循环, 结束时直接取消, 不再发送
+
+    async def send_loop():
+        nonlocal remaining
+        perf_counter = time.perf_counter
+        while running:
+            if remaining is not None:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+            if limiter is not None:
+                task = asyncio.current_task()
+                queued.add(task)
+                try:
+                    await limiter.acquire()
+                except asyncio.CancelledError:
+                    return
+                finally:
+                    queued.discard(task)
+            start = perf_counter()
+            error = None
+            try:
+                async with session.request(method, url, headers=headers, data=data, proxy=proxy) as response:
+                    content = await response.read()
+                    sample['bytes'] += len(content)
+                    if response.status >= 500:
+                        error = '5xx'
+                    elif response.status >= 400:
+                        error = '4xx'
+            except Exception as e:
+                error = classify_error(e).value
+                # 连接立即失败(如套接字文件不存在)时不会让出事件循环, 主动让出以免饿死发送增量的循环
+                await asyncio.sleep(0)
+            finally:
+                if limiter is not None:
+                    limiter.release()
+            sample['requests'] += 1
+            if error is not None:
+                sample['errors'][error] = sample['errors'].get(error, 0) + 1
+            sample['latency'].observe((perf_counter() - start) * 1000)
+
+    def send_sample():
+        nonlocal sample
+        current, sample = sample, {'requests': 0, 'errors': {}, 'bytes': 0, 'latency': Histogram()}
+        histogram = current['latency']
+        conn.send(('sample', index, current['requests'], current['errors'], current['bytes'],
+                   histogram.counts, histogram.total, histogram.max))
+
+    try:
+        # 所有工作进程就绪后同时开始
+        conn.send(('ready', index))
+        while not start_event.wait(0.1):
+            if stop_event.is_set():
+                return
+        deadline = time.perf_counter() + settings.duration_s
+        tasks = [asyncio.ensure_future(send_loop()) for _ in range(settings.concurrency)]
+        while not all(task.done() for task in tasks):
+            await asyncio.wait(tasks, timeout=SAMPLE_INTERVAL)
+            if sample['requests']:
+                send_sample()
+            if stop_event.is_set() or time.perf_counter() >= deadline:
+                running = False  # 正在进行的请求完成后退出
+                for task in list(queued):
+                    task.cancel()
+        for task in tasks:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+        if sample['requests']:
+            send_sample()
+    finally:
+        await session.close()
+
+
+# ---------- 界面进程 ----------
+
+class LoadTestStats:
+    """合并后的压测结果"""
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.requests = 0
+        self.errors = {}
+        self.response_bytes = 0
+        self.latency = Histogram()
+        self.started = None  # perf_counter, 所有工作进程开始发送的时间
+        self.finished = None
+        self.worker_errors = []
+        self._rate_window = []  # (时间, 累计请求数), 用于计算最近一秒的速率
+
+    def add_sample(self, requests, errors, response_bytes, counts, total, maximum):
+        self.requests += requests
+        for error, count in errors.items():
+            self.errors[error] = self.errors.get(error, 0) + count
+        self.response_bytes += response_bytes
+        self.latency.merge(Histogram.from_counts(counts, total, maximum))
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def failed(self):
+        return sum(self.errors.values())
+
+    @property
+    def average_rps(self):
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def current_rps(self):
+        """最近约一秒的请求速率"""
+        now = time.perf_counter()
+        self._rate_window.append((now, self.requests))
+        while len(self._rate_window) > 2 and now - self._rate_window[1][0] >= 1.0:
+            self._rate_window.pop(0)
+        first_time, first_requests = self._rate_window[0]
+        return (self.requests - first_requests) / (now - first_time) if now > first_time else 0.0
+
+    def summary(self):
+        return {
+            'workers': self.workers,
+            'requests': self.requests,
+            'failed': self.failed,
+            'errors': dict(self.errors),
+            'response_bytes': self.response_bytes,
+            'elapsed': self.elapsed,
+            'requests_per_s': self.average_rps,
+            'latency': self.latency.snapshot(),
+            'worker_errors': list(self.worker_errors),
+        }
+
+
+class LoadGenerator:
+    """启动工作进程并合并它们发回的结果; run() 在界面进程的事件循环(qasync)上等待完成"""
+
+    def __init__(self, request, settings, network):
+        """
+        Args:
+            request: (method, url, headers, body, timeout), 与 CollectionRunner.build_request 相同
+            settings: LoadTestSettings
+            network: NetworkSettings, 代理和主机映射与普通请求一致
+        """
+        self.request = request
+        self.settings = settings
+        self.network = network
+        self.stats = LoadTestStats(settings.workers)
+        self.context = multiprocessing.get_context('spawn')
+        self.start_event = self.context.Event()
+        self.stop_event = self.context.Event()
+        self.processes = []
+
+    def stop(self):
+        """通知工作进程在当前请求完成后退出"""
+        self.stop_event.set()
+
+    async def run(self, on_progress=None):
+        """运行压测, on_progress(stats) 在每次读取到新数据后调用
+
+        Returns:
+            LoadTestStats
+        """
+        method, url = self.request[:2]
+        logger.info(f"Load test: {method} {url}, {self.settings.workers} workers x "
+                    f"{self.settings.concurrency} concurrent, {self.settings.duration_s}s")
+        connections = {}
+        for index in range(self.settings.workers):
+            parent_conn, child_conn = self.context.Pipe(duplex=False)
+            process = self.context.Process(
+                target=_worker_main,
+                args=(index, child_conn, self.start_event, self.stop_event, self.request, self.settings, self.network),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            connections[parent_conn] = index
+            self.processes.append(process)
+
+        ready = set()
+        finished = set()  # 已发回 done 或 error 的工作进程
+        launch_time = time.perf_counter()
+        try:
+            while connections:
+                changed = False
+                for conn in wait(list(connections), timeout=0):
+                    try:
+                        while conn.poll():
+                            changed = self._handle(conn.recv(), ready, finished) or changed
+                    except (EOFError, OSError):
+                        index = connections.pop(conn)
+                        if index not in finished:
+                            process = self.processes[index]
+                            process.join(1)
+                            message = f"Worker {index} exited unexpectedly (exit code {process.exitcode})"
+                            logger.error(f"Load test: {message}")
+                            self.stats.worker_errors.append(message)
+                        changed = True
+                # 仍在运行的工作进程都已就绪(启动失败的进程已关闭管道)后开始
+                if not self.start_event.is_set() and (
+                        ready.issuperset(connections.values())
+                        or time.perf_counter() - launch_time > START_TIMEOUT):
+                    self.stats.started = time.perf_counter()
+                    self.start_event.set()
+                    logger.info(f"Load test started with {len(ready)} workers")
+                if changed and on_progress:
+                    on_progress(self.stats)
+                await asyncio.sleep(POLL_INTERVAL)
+        finally:
+            self.stop_event.set()
+            for process in self.processes:
+                process.join(1)
+                if process.is_alive():
+                    process.terminate()
+        if self.stats.started is not None:
+            self.stats.finished = time.perf_counter()
+        summary = self.stats.summary()
+        logger.info("Load test finished: {} requests, {} failed, {:.0f} req/s, p99 {} ms",
+                    summary['requests'], summary['failed'], summary['requests_per_s'], summary['latency']['p99'])
+        if on_progress:
+            on_progress(self.stats)
+        return self.stats
+
+    def _handle(self, message, ready, finished):
+        kind, index = message[:2]
+        if kind == 'sample':
+            self.stats.add_sample(*message[2:])
+            return True
+        if kind == 'ready':
+            ready.add(index)
+        elif kind == 'done':
+            finished.add(index)
+        elif kind == 'error':
+            finished.add(index)
+            logger.error(f"Load test worker {index} failed: {message[2]}")
+            self.stats.worker_errors.append(message[2])
+            return True
+        return False
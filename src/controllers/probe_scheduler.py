@@ -0,0 +1,242 @@
+"""
+定时探测: 按间隔在后台运行标记为探测的已保存API, 结果写入历史记录, 断言失败或超过延迟阈值时发出提醒
+
+所有探测共用一个按到期时间排序的堆和一个 asyncio 任务: 任务睡眠到最早的到期时间, 唤醒后发出所有到期的探测,
+探测数量增加时调度开销只按 log(n) 增长, 不需要为每个探测创建定时器。
+"""
+import heapq
+import random
+import asyncio
+import itertools
+from loguru import logger
+from src.controllers.collection_runner import CollectionRunner
+from src.models.history_model import HistoryModel
+
+DEFAULT_CONCURRENCY = 4
+
+
+class ProbeSettings:
+    """单个API的探测配置"""
+
+    DEFAULTS = {
+        'enabled': False,
+        'interval_s': 60,
+        'jitter': 0.1,  # 每次间隔在 ±jitter 比例内随机, 避免多个探测同时发出
+        'latency_threshold_ms': 0,  # 0 表示不检查延迟
+    }
+
+    def __init__(self, **options):
+        for key, default in self.DEFAULTS.items():
+            setattr(self, key, options.get(key, default))
+
+    @classmethod
+    def from_dict(cls, data):
+        """从 ApiModel 保存的配置创建, 为空时返回未启用的默认配置"""
+        return cls(**(data or {}))
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.DEFAULTS}
+
+    def next_interval(self):
+        """下一次探测前的等待时间(秒)"""
+        interval = max(1, self.interval_s)
+        if self.jitter:
+            interval *= 1 + random.uniform(-self.jitter, self.jitter)
+        return interval
+
+
+class ProbeState:
+    """调度器中的一个探测"""
+    __slots__ = ('api', 'settings', 'version', 'next_due', 'running', 'failing', 'last_result')
+
+    def __init__(self, api, settings, version):
+        self.api = api
+        self.settings = settings
+        # 堆中条目的版本与之不同时被忽略; 由调度器分配且不重复使用, 禁用后重新启用的探测不会匹配旧条目
+        self.version = version
+        self.next_due = None
+        self.running = False
+        self.failing = False
+        self.last_result = None
+
+
+class ProbeScheduler:
+    """在当前事件循环(qasync)上运行所有探测
+
+    on_result(api, result) 在每次探测完成后调用(result 与 CollectionRunner.run_one 相同, 另有 problems);
+    on_alert(api, failing, message) 在探测开始失败或恢复时调用, 同一探测连续失败只提醒一次。
+    """
+
+    def __init__(self, request_controller, api_model, history_model=None,
+                 concurrency=DEFAULT_CONCURRENCY, base_url=None):
+        self.runner = CollectionRunner(request_controller, base_url)
+        self.api_model = api_model
+        self.history_model = history_model
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.probes = {}  # API ID -> ProbeState
+        self.heap = []  # (到期时间, 序号, API ID, 版本)
+        self.paused = False
+        self.on_result = None
+        self.on_alert = None
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._running_tasks = set()
+
+    def set_base_url(self, base_url):
+        """相对地址的前缀(活动域名)"""
+        self.runner.base_url = base_url.rstrip('/') if base_url else None
+
+    # ---------- 探测列表 ----------
+
+    def reload(self):
+        """重新读取标记为探测的API; API 或设置变化后调用"""
+        apis = {api['id']: api for api in self.api_model.get_probe_apis()}
+        for api_id in list(self.probes):
+            api = apis.get(api_id)
+            if api is None or not ProbeSettings.from_dict(api['probe']).enabled:
+                del self.probes[api_id]
+        for api_id, api in apis.items():
+            settings = ProbeSettings.from_dict(api['probe'])
+            if not settings.enabled:
+                continue
+            state = self.probes.get(api_id)
+            if state is None:
+                state = self.probes[api_id] = ProbeState(api, settings, next(self._sequence))
+                # 第一次探测在一个间隔内随机分布, 避免启动时同时发出
+                self._schedule(state, self._now() + random.uniform(0, settings.interval_s))
+                continue
+            interval_changed = state.settings.interval_s != settings.interval_s
+            state.api, state.settings = api, settings
+            if interval_changed:
+                state.version = next(self._sequence)
+                self._schedule(state, self._now() + settings.next_interval())
+        logger.info(f"Probe scheduler: {len(self.probes)} active probes")
+
+    def _schedule(self, state, due):
+        state.next_due = due
+        heapq.heappush(self.heap, (due, next(self._sequence), state.api['id'], state.version))
+        self._wakeup.set()
+
+    @staticmethod
+    def _now():
+        return asyncio.get_event_loop().time()
+
+    # ---------- 调度循环 ----------
+
+    def start(self):
+        """读取探测列表并启动调度任务"""
+        if self._task and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            logger.warning("No event loop available for probe scheduler")
+            return
+        self.reload()
+        self._task = loop.create_task(self._run())
+
+    async def stop(self):
+        """停止调度并取消正在运行的探测"""
+        tasks = list(self._running_tasks)
+        if self._task:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self):
+        # Python 3.11 的 wait_for 在内部等待恰好完成时会吞掉取消, 因此同时检查 stop() 是否已清除任务
+        while self._task is asyncio.current_task():
+            self._wakeup.clear()
+            now = self._now()
+            while self.heap and self.heap[0][0] <= now:
+                due, _, api_id, version = heapq.heappop(self.heap)
+                state = self.probes.get(api_id)
+                if state is None or state.version != version:
+                    continue
+                self._fire(state, due, now)
+            timeout = self.heap[0][0] - now if self.heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _fire(self, state, due, now):
+        """发出一次探测并安排下一次; 上一次还未完成或已暂停时跳过本次"""
+        next_due = due + state.settings.next_interval()
+        if next_due <= now:
+            # 落后超过一个间隔(如系统休眠)时不补发错过的探测
+            next_due = now + state.settings.next_interval()
+        self._schedule(state, next_due)
+        if self.paused:
+            return
+        if state.running:
+            logger.debug(f"Probe {state.api['name']} is still running, skipped")
+            return
+        state.running = True
+        task = asyncio.ensure_future(self._probe(state))
+        self._running_tasks.add(task)
+        task.add_done_callback(self._running_tasks.discard)
+
+    # ---------- 单次探测 ----------
+
+    async def _probe(self, state):
+        # 请求面板会自动保存修改, 每次探测前重新读取API
+        api = self.api_model.get_api_by_id(state.api['id'])
+        if api is None:
+            state.running = False
+            self.probes.pop(state.api['id'], None)
+            return
+        state.api = api
+        try:
+            async with self.semaphore:
+                result = await self.runner.run_one(api)
+        except Exception as e:
+            logger.error(f"Probe {api['name']} failed to run: {str(e)}")
+            return
+        finally:
+            state.running = False
+
+        response = result['response']
+        self.record_history(api, response)
+        problems = self.find_problems(state.settings, result)
+        result['problems'] = problems
+        state.last_result = result
+        failing = bool(problems)
+        if failing != state.failing:
+            state.failing = failing
+            message = "; ".join(problems) if failing else "Recovered"
+            logger.info(f"Probe {api['name']} {'failing' if failing else 'recovered'}: {message}")
+            if self.on_alert:
+                self.on_alert(api, failing, message)
+        if self.on_result:
+            self.on_result(api, result)
+
+    def record_history(self, api, response):
+        if self.history_model is None:
+            return
+        method, url, headers, _, timeout = self.runner.build_request(api)
+        self.history_model.add_history(
+            method=method,
+            url=url,
+            headers=headers,
+            body=api.get('body'),
+            timeout=timeout,
+            source=HistoryModel.PROBE_SOURCE,
+            **response.summary()
+        )
+
+    @staticmethod
+    def find_problems(settings, result):
+        """需要提醒的问题: 传输错误、断言失败、超过延迟阈值"""
+        response = result['response']
+        if response.is_error:
+            return [f"{response.error_kind.label}: {response.error_message}"]
+        problems = [f"{item['name']}: {item['message']}" for item in result['assertions'] if not item['passed']]
+        threshold = settings.latency_threshold_ms
+        if threshold and response.elapsed_ms is not None and response.elapsed_ms > threshold:
+            problems.append(f"Latency {response.elapsed_ms:.0f} ms exceeds {threshold} ms")
+        return problems
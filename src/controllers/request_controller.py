@@ -1,15 +1,44 @@
 import asyncio
 from src.utils.http_client import HttpClient
+from src.utils.instrumentation import instrumentation
+from src.utils.retry_policy import RetryPolicy
+from src.utils.http_result import HttpResult
+from src.utils.request_metrics import request_metrics, body_size
+from src.models.cookie_model import CookieModel
+from src.models.domain_model import DomainModel
+from src.models.config_model import ConfigModel
+from src.utils.network import NetworkSettings
+from loguru import logger
 
 class RequestController:
     def __init__(self):
-        self.http_client = HttpClient()
+        # 长期存在的客户端: 复用连接, 并共享持久化的 Cookie
+        self.http_client = HttpClient(cookie_model=CookieModel(), network=self.load_network_settings())
+
+    @staticmethod
+    def load_network_settings():
+        return NetworkSettings.load(DomainModel(), ConfigModel())
+
+    def reload_network_settings(self):
+        """域名的代理、主机映射或活动域名变化后重新加载网络设置"""
+        self.http_client.configure_network(self.load_network_settings())
     
-    async def send_request(self, method, url, headers, body, timeout=30):
+    async def send_request(self, method, url, headers, body, timeout=30, retry_policy=None, transport=None,
+                           api_name=None):
+        """发送请求并记录请求指标; api_name 为已保存的 API 名称, 用于按 API 统计"""
+        instrumentation.request_started()
         try:
-            # 创建带有指定超时时间的新客户端
-            client = HttpClient(timeout=timeout)
-            return await client.send_request(method, url, headers, body)
+            policy = RetryPolicy.from_dict(retry_policy) if isinstance(retry_policy, dict) else retry_policy
+            with instrumentation.span('send'):
+                result = await self.http_client.send_request(method, url, headers, body, policy, timeout, transport)
         except Exception as e:
-            print(f"Error sending request: {e}")
-            return None
\ No newline at end of file
+            logger.error(f"Error sending request: {e}")
+            result = HttpResult.from_error(e)
+        finally:
+            instrumentation.request_finished()
+        request_metrics.observe(result, url, api_name, body_size(body))
+        return result
+
+    async def close(self):
+        """关闭共享会话"""
+        await self.http_client.close()
@@ -9,23 +9,16 @@ if ROOT_DIR not in sys.path:
 
 from PyQt6.QtWidgets import QApplication
 from src.views.main_window import MainWindow
+from src.models.config_model import ConfigModel
+from src.utils.log_utils import setup_logger
 import qasync
 import asyncio
-
-def setup_logger():
-    """配置loguru日志格式"""
-    # 移除默认的处理器
-    logger.remove()
-    # 添加新的处理器，使用自定义格式
-    if sys.stderr is not None:
-        logger.add(sys.stderr, format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}.py:{line} - {message}", level="DEBUG")
-    # 替换模块名中的点号为斜杠
-    logger.configure(patcher=lambda record: record.update(name=record["name"].replace(".", "/")))
+import multiprocessing
 
 def main():
     """应用程序入口"""
-    # 配置日志
-    setup_logger()
+    # 配置日志(级别、文件输出等来自配置文件)
+    setup_logger(ConfigModel())
     
     # 创建应用程序实例
     app = QApplication(sys.argv)
@@ -47,4 +40,6 @@ def main():
         sys.exit(1)
 
 if __name__ == '__main__':
+    # 打包后的程序启动压测工作进程时需要
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
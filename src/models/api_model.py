@@ -1,7 +1,8 @@
 import sqlite3
-import json
 from pathlib import Path
 from src.models.config_model import ConfigModel
+from src.utils import json_utils
+from src.utils.instrumentation import timed
 
 class ApiModel:
     def __init__(self):
@@ -40,21 +41,33 @@ class ApiModel:
                             body TEXT,
                             timeout INTEGER DEFAULT 30,
                             last_selected DATETIME,
+                            assertions TEXT,
+                            retry_policy TEXT,
+                            probe TEXT,
                             created_at DATETIME DEFAULT CURRENT_TIMESTAMP
                         )
                     ''')
                     
-                    # 迁移数据
-                    cursor.execute('''
-                        INSERT INTO apis (id, name, method, url, headers, body, timeout, created_at)
-                        SELECT id, name, method, url, headers, body, 
-                               COALESCE(timeout, 30),
-                               created_at
+                    # 迁移数据: 旧表中存在的可选列一并复制, timeout 缺失时使用默认值
+                    column_names = {col[1] for col in columns}
+                    optional = [column for column in ('last_selected', 'assertions', 'retry_policy', 'probe')
+                                if column in column_names]
+                    copied = ''.join(f', {column}' for column in optional)
+                    timeout = 'COALESCE(timeout, 30)' if has_timeout else '30'
+                    cursor.execute(f'''
+                        INSERT INTO apis (id, name, method, url, headers, body, timeout, created_at{copied})
+                        SELECT id, name, method, url, headers, body, {timeout}, created_at{copied}
                         FROM apis_backup
                     ''')
                     
                     # 删除旧表
                     cursor.execute("DROP TABLE apis_backup")
+                else:
+                    # 新增列直接添加, 不需要迁移数据
+                    column_names = {col[1] for col in columns}
+                    for column in ('assertions', 'retry_policy', 'probe'):
+                        if column not in column_names:
+                            cursor.execute(f"ALTER TABLE apis ADD COLUMN {column} TEXT")
             else:
                 # 创建新表
                 cursor.execute('''
@@ -67,12 +80,32 @@ class ApiModel:
                         body TEXT,
                         timeout INTEGER DEFAULT 30,
                         last_selected DATETIME,
+                        assertions TEXT,
+                        retry_policy TEXT,
+                        probe TEXT,
                         created_at DATETIME DEFAULT CURRENT_TIMESTAMP
                     )
                 ''')
             
             conn.commit()
 
+    @staticmethod
+    def _row_to_api(row):
+        """将查询结果行转换为API数据字典"""
+        return {
+            'id': row[0],
+            'name': row[1],
+            'method': row[2],
+            'url': row[3],
+            'headers': json_utils.loads(row[4]) if row[4] else {},
+            'body': json_utils.loads(row[5]) if row[5] else {},
+            'timeout': int(row[6]) if row[6] is not None else 30,
+            'assertions': json_utils.loads(row[7]) if row[7] else [],
+            'retry_policy': json_utils.loads(row[8]) if row[8] else {},
+            'probe': json_utils.loads(row[9]) if row[9] else {}
+        }
+
+    @timed('db.apis.save_api')
     def save_api(self, name, method, url, headers=None, body=None, timeout=30):
         with sqlite3.connect(str(self.db_path)) as conn:
             cursor = conn.cursor()
@@ -85,8 +118,8 @@ class ApiModel:
                     SET method = ?, url = ?, headers = ?, body = ?, timeout = ?
                     WHERE name = ?
                 ''', (method, url, 
-                      json.dumps(headers) if headers else None,
-                      json.dumps(body) if body else None,
+                      json_utils.dumps(headers, compact=True) if headers else None,
+                      json_utils.dumps(body, compact=True) if body else None,
                       timeout,
                       name))
                 api_id = existing[0]
@@ -95,54 +128,176 @@ class ApiModel:
                     INSERT INTO apis (name, method, url, headers, body, timeout)
                     VALUES (?, ?, ?, ?, ?, ?)
                 ''', (name, method, url, 
-                      json.dumps(headers) if headers else None,
-                      json.dumps(body) if body else None,
+                      json_utils.dumps(headers, compact=True) if headers else None,
+                      json_utils.dumps(body, compact=True) if body else None,
                       timeout))
                 api_id = cursor.lastrowid
             
             conn.commit()
             return api_id
 
+    @timed('db.apis.save_apis_batch')
+    def save_apis_batch(self, apis):
+        """在一个事务中批量保存API, 名称已存在时更新(依赖 apis.name 的唯一约束)
+
+        Args:
+            apis: 字典列表, 包含 name, method, url, headers, body, timeout
+
+        Returns:
+            list: 已保存的API数据(包含 id), 顺序与输入一致, 同名只保留最后一条
+        """
+        latest = {}
+        for api in apis:
+            latest[api['name']] = api
+        if not latest:
+            return []
+
+        rows = [(
+            api['name'], api['method'], api['url'],
+            json_utils.dumps(api.get('headers'), compact=True) if api.get('headers') else None,
+            json_utils.dumps(api.get('body'), compact=True) if api.get('body') else None,
+            api.get('timeout', 30)
+        ) for api in latest.values()]
+
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO apis (name, method, url, headers, body, timeout)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    method = excluded.method,
+                    url = excluded.url,
+                    headers = excluded.headers,
+                    body = excluded.body,
+                    timeout = excluded.timeout
+            ''', rows)
+
+            # 查询保存后的ID, 分批避免超过 SQLite 参数数量限制
+            ids = {}
+            names = list(latest)
+            for start in range(0, len(names), 500):
+                batch = names[start:start + 500]
+                placeholders = ','.join('?' * len(batch))
+                cursor.execute(f'SELECT id, name FROM apis WHERE name IN ({placeholders})', batch)
+                ids.update({name: api_id for api_id, name in cursor.fetchall()})
+            conn.commit()
+
+        return [{
+            'id': ids.get(api['name']),
+            'name': api['name'],
+            'method': api['method'],
+            'url': api['url'],
+            'headers': api.get('headers') or {},
+            'body': api.get('body') or {},
+            'timeout': api.get('timeout', 30)
+        } for api in latest.values()]
+
+    @timed('db.apis.get_all_apis')
     def get_all_apis(self):
         with sqlite3.connect(str(self.db_path)) as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                SELECT id, name, method, url, headers, body, timeout 
+                SELECT id, name, method, url, headers, body, timeout, assertions, retry_policy, probe
                 FROM apis 
                 ORDER BY created_at DESC
             ''')
             rows = cursor.fetchall()
-            return [{
-                'id': row[0],
-                'name': row[1],
-                'method': row[2],
-                'url': row[3],
-                'headers': json.loads(row[4]) if row[4] else {},
-                'body': json.loads(row[5]) if row[5] else {},
-                'timeout': int(row[6]) if row[6] is not None else 30
-            } for row in rows]
+            return [self._row_to_api(row) for row in rows]
 
+    @timed('db.apis.get_api_by_id')
     def get_api_by_id(self, api_id):
         with sqlite3.connect(str(self.db_path)) as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                SELECT id, name, method, url, headers, body, timeout 
+                SELECT id, name, method, url, headers, body, timeout, assertions, retry_policy, probe
                 FROM apis 
                 WHERE id = ?
             ''', (api_id,))
             row = cursor.fetchone()
             if row:
-                return {
-                    'id': row[0],
-                    'name': row[1],
-                    'method': row[2],
-                    'url': row[3],
-                    'headers': json.loads(row[4]) if row[4] else {},
-                    'body': json.loads(row[5]) if row[5] else {},
-                    'timeout': int(row[6]) if row[6] is not None else 30
-                }
+                return self._row_to_api(row)
             return None
 
+    @timed('db.apis.get_api_by_name')
+    def get_api_by_name(self, name):
+        """按名称获取API"""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, name, method, url, headers, body, timeout, assertions, retry_policy, probe
+                FROM apis 
+                WHERE name = ?
+            ''', (name,))
+            row = cursor.fetchone()
+            return self._row_to_api(row) if row else None
+
+    @timed('db.apis.update_assertions')
+    def update_assertions(self, api_id, assertions):
+        """更新API的断言规则
+
+        Args:
+            api_id: API的ID
+            assertions: 断言规则列表, 为空时清除
+
+        Returns:
+            bool: 是否更新成功
+        """
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.execute('UPDATE apis SET assertions = ? WHERE id = ?',
+                           (json_utils.dumps(assertions, compact=True) if assertions else None, api_id))
+            conn.commit()
+            return cursor.rowcount > 0
+
+    @timed('db.apis.update_retry_policy')
+    def update_retry_policy(self, api_id, retry_policy):
+        """更新API的重试与对冲策略
+
+        Args:
+            api_id: API的ID
+            retry_policy: 策略字典(RetryPolicy.to_dict()), 为空时清除
+
+        Returns:
+            bool: 是否更新成功
+        """
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.execute('UPDATE apis SET retry_policy = ? WHERE id = ?',
+                           (json_utils.dumps(retry_policy, compact=True) if retry_policy else None, api_id))
+            conn.commit()
+            return cursor.rowcount > 0
+
+    @timed('db.apis.update_probe')
+    def update_probe(self, api_id, probe):
+        """更新API的定时探测设置
+
+        Args:
+            api_id: API的ID
+            probe: 设置字典(ProbeSettings.to_dict()), 为空时取消探测
+
+        Returns:
+            bool: 是否更新成功
+        """
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.execute('UPDATE apis SET probe = ? WHERE id = ?',
+                           (json_utils.dumps(probe, compact=True) if probe else None, api_id))
+            conn.commit()
+            return cursor.rowcount > 0
+
+    @timed('db.apis.get_probe_apis')
+    def get_probe_apis(self):
+        """获取设置了定时探测的API"""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, name, method, url, headers, body, timeout, assertions, retry_policy, probe
+                FROM apis
+                WHERE probe IS NOT NULL
+            ''')
+            return [self._row_to_api(row) for row in cursor.fetchall()]
+
+    @timed('db.apis.delete_api')
     def delete_api(self, api_id):
         """删除指定ID的API"""
         with sqlite3.connect(str(self.db_path)) as conn:
@@ -151,6 +306,7 @@ class ApiModel:
             conn.commit()
             return cursor.rowcount > 0  # 返回是否删除成功
 
+    @timed('db.apis.rename_api')
     def rename_api(self, api_id, new_name):
         """重命名API
         
@@ -171,6 +327,7 @@ class ApiModel:
             # 如果名称已存在，会触发唯一约束错误
             return False
 
+    @timed('db.apis.update_last_selected')
     def update_last_selected(self, api_id):
         """更新最后选择的API"""
         with sqlite3.connect(str(self.db_path)) as conn:
@@ -185,12 +342,13 @@ class ApiModel:
             ''', (api_id,))
             conn.commit()
 
+    @timed('db.apis.get_last_selected_api')
     def get_last_selected_api(self):
         """获取最后选择的API"""
         with sqlite3.connect(str(self.db_path)) as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                SELECT id, name, method, url, headers, body, timeout 
+                SELECT id, name, method, url, headers, body, timeout, assertions, retry_policy, probe
                 FROM apis 
                 WHERE last_selected IS NOT NULL
                 ORDER BY last_selected DESC 
@@ -198,13 +356,5 @@ class ApiModel:
             ''')
             row = cursor.fetchone()
             if row:
-                return {
-                    'id': row[0],
-                    'name': row[1],
-                    'method': row[2],
-                    'url': row[3],
-                    'headers': json.loads(row[4]) if row[4] else {},
-                    'body': json.loads(row[5]) if row[5] else {},
-                    'timeout': int(row[6]) if row[6] is not None else 30
-                }
+                return self._row_to_api(row)
             return None
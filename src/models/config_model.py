@@ -31,7 +31,8 @@ class ConfigModel:
                 "app_data_path": str(Path.home() / ".free-http"),
                 "theme": "light",
                 "language": "en",
-                "request_timeout": 30
+                "request_timeout": 30,
+                "log_level": "INFO"
             }
             self.save_config(default_config)
             return default_config
@@ -93,3 +94,22 @@ class ConfigModel:
         """
         self.config["app_data_path"] = path
         self.save_config(self.config)
+
+    def get(self, key, default=None):
+        """获取配置项
+
+        Args:
+            key: 配置项名称
+            default: 配置项不存在时的默认值
+        """
+        return self.config.get(key, default)
+
+    def set(self, key, value):
+        """设置配置项并保存
+
+        Args:
+            key: 配置项名称
+            value: 配置项的值
+        """
+        self.config[key] = value
+        self.save_config(self.config)
@@ -0,0 +1,100 @@
+import sqlite3
+from pathlib import Path
+from src.models.config_model import ConfigModel
+from src.utils.instrumentation import timed
+
+class CookieModel:
+    """持久化的 Cookie 存储, 供长连接会话的 Cookie Jar 加载和保存"""
+
+    def __init__(self):
+        config = ConfigModel()
+        self.db_path = Path(config.get_app_data_path()) / 'cookies.db'
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.init_db()
+
+    def init_db(self):
+        """初始化数据库表"""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS cookies (
+                    domain TEXT NOT NULL,
+                    path TEXT NOT NULL DEFAULT '/',
+                    name TEXT NOT NULL,
+                    value TEXT,
+                    expires REAL,
+                    secure INTEGER DEFAULT 0,
+                    http_only INTEGER DEFAULT 0,
+                    host_only INTEGER DEFAULT 1,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (domain, path, name)
+                )
+            ''')
+            conn.commit()
+
+    @timed('db.cookies.get_all_cookies')
+    def get_all_cookies(self):
+        """获取所有 Cookie, 按域名排序
+
+        Returns:
+            list: 字典列表, 包含 domain, path, name, value, expires(时间戳或 None),
+                  secure, http_only, host_only
+        """
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT domain, path, name, value, expires, secure, http_only, host_only
+                FROM cookies
+                ORDER BY domain, path, name
+            ''')
+            return [{
+                'domain': row[0],
+                'path': row[1],
+                'name': row[2],
+                'value': row[3] or '',
+                'expires': row[4],
+                'secure': bool(row[5]),
+                'http_only': bool(row[6]),
+                'host_only': bool(row[7])
+            } for row in cursor.fetchall()]
+
+    @timed('db.cookies.replace_all')
+    def replace_all(self, cookies):
+        """在一个事务中用 Cookie Jar 的当前内容替换所有记录"""
+        rows = [(
+            cookie['domain'], cookie['path'] or '/', cookie['name'], cookie['value'],
+            cookie.get('expires'), int(cookie.get('secure', False)),
+            int(cookie.get('http_only', False)), int(cookie.get('host_only', True))
+        ) for cookie in cookies]
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM cookies')
+            cursor.executemany('''
+                INSERT OR REPLACE INTO cookies
+                    (domain, path, name, value, expires, secure, http_only, host_only)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            conn.commit()
+        return len(rows)
+
+    @timed('db.cookies.delete_cookie')
+    def delete_cookie(self, domain, path, name):
+        """删除单个 Cookie"""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM cookies WHERE domain = ? AND path = ? AND name = ?',
+                           (domain, path, name))
+            conn.commit()
+            return cursor.rowcount > 0
+
+    @timed('db.cookies.clear_cookies')
+    def clear_cookies(self, domain=None):
+        """清除指定域名(为空时清除全部)的 Cookie"""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            if domain:
+                cursor.execute('DELETE FROM cookies WHERE domain = ?', (domain,))
+            else:
+                cursor.execute('DELETE FROM cookies')
+            conn.commit()
+            return cursor.rowcount
@@ -1,9 +1,12 @@
 import sqlite3
-import json
 from pathlib import Path
 from src.models.config_model import ConfigModel
+from src.utils import json_utils
+from src.utils.instrumentation import timed
 
 class DomainModel:
+    NETWORK_COLUMNS = ('proxy', 'host_overrides', 'protocol', 'transport', 'rate_limit')
+
     def __init__(self):
         config = ConfigModel()
         self.db_path = Path(config.get_app_data_path()) / 'domains.db'
@@ -20,11 +23,39 @@ class DomainModel:
                     name TEXT NOT NULL,
                     domain TEXT NOT NULL,
                     is_active INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    proxy TEXT,
+                    host_overrides TEXT,
+                    protocol TEXT,
+                    transport TEXT,
+                    rate_limit TEXT
                 )
             ''')
+            # 旧数据库补充网络设置列
+            cursor.execute("PRAGMA table_info(domains)")
+            column_names = {col[1] for col in cursor.fetchall()}
+            for column in self.NETWORK_COLUMNS:
+                if column not in column_names:
+                    cursor.execute(f"ALTER TABLE domains ADD COLUMN {column} TEXT")
+            # 旧版本用 protocol='h2' 表示 HTTP/2, 迁移为 httpx 引擎(只迁移一次)
+            cursor.execute("UPDATE domains SET transport = 'httpx', protocol = NULL WHERE protocol = 'h2'")
             conn.commit()
+
+    @staticmethod
+    def _row_to_domain(row):
+        """将 (id, name, domain, is_active, proxy, host_overrides, transport, rate_limit) 行转换为字典"""
+        return {
+            'id': row[0],
+            'name': row[1],
+            'domain': row[2],
+            'is_active': bool(row[3]),
+            'proxy': row[4] or '',
+            'host_overrides': json_utils.loads(row[5]) if row[5] else {},
+            'transport': row[6] or '',
+            'rate_limit': json_utils.loads(row[7]) if row[7] else {}
+        }
             
+    @timed('db.domains.add_domain')
     def add_domain(self, name, domain):
         """添加新域名"""
         # 移除域名末尾的斜杠
@@ -37,6 +68,7 @@ class DomainModel:
             conn.commit()
             return cursor.lastrowid
             
+    @timed('db.domains.update_domain')
     def update_domain(self, id, name, domain):
         """更新域名"""
         # 移除域名末尾的斜杠
@@ -48,6 +80,7 @@ class DomainModel:
                          (name, domain, id))
             conn.commit()
             
+    @timed('db.domains.delete_domain')
     def delete_domain(self, id):
         """删除域名"""
         with sqlite3.connect(str(self.db_path)) as conn:
@@ -55,14 +88,15 @@ class DomainModel:
             cursor.execute('DELETE FROM domains WHERE id = ?', (id,))
             conn.commit()
             
+    @timed('db.domains.get_all_domains')
     def get_all_domains(self):
         """获取所有域名"""
         with sqlite3.connect(str(self.db_path)) as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT id, name, domain, is_active FROM domains')
-            return [{'id': row[0], 'name': row[1], 'domain': row[2], 'is_active': bool(row[3])} 
-                    for row in cursor.fetchall()]
+            cursor.execute('SELECT id, name, domain, is_active, proxy, host_overrides, transport, rate_limit FROM domains')
+            return [self._row_to_domain(row) for row in cursor.fetchall()]
             
+    @timed('db.domains.set_active_domain')
     def set_active_domain(self, id):
         """设置活动域名"""
         with sqlite3.connect(str(self.db_path)) as conn:
@@ -73,12 +107,34 @@ class DomainModel:
             cursor.execute('UPDATE domains SET is_active = 1 WHERE id = ?', (id,))
             conn.commit()
             
+    @timed('db.domains.get_active_domain')
     def get_active_domain(self):
         """获取当前活动域名"""
         with sqlite3.connect(str(self.db_path)) as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT id, name, domain FROM domains WHERE is_active = 1')
+            cursor.execute('''
+                SELECT id, name, domain, is_active, proxy, host_overrides, transport, rate_limit
+                FROM domains WHERE is_active = 1
+            ''')
             row = cursor.fetchone()
             if row:
-                return {'id': row[0], 'name': row[1], 'domain': row[2]}
+                return self._row_to_domain(row)
             return None
+
+    @timed('db.domains.update_network_settings')
+    def update_network_settings(self, id, proxy, host_overrides, transport='', rate_limit=None):
+        """更新域名的代理、静态主机映射、传输引擎和限速
+
+        Args:
+            proxy: 代理地址(http://, https://, socks5://), 为空表示直连
+            host_overrides: 主机名 -> IP 地址的字典
+            transport: 引擎名称(如 'httpx' 使用 HTTP/2), 为空使用默认引擎
+            rate_limit: RateLimit.to_dict(), 为空表示不限速
+        """
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE domains SET proxy = ?, host_overrides = ?, transport = ?, rate_limit = ? WHERE id = ?
+            ''', (proxy or None, json_utils.dumps(host_overrides, compact=True) if host_overrides else None,
+                  transport or None, json_utils.dumps(rate_limit, compact=True) if rate_limit else None, id))
+            conn.commit()
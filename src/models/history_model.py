@@ -1,15 +1,31 @@
-import json
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 import sqlite3
 from pathlib import Path
 from src.models.config_model import ConfigModel
+from src.utils import json_utils
+from src.utils.instrumentation import timed
 
 class HistoryModel:
+    DEFAULT_LIMIT = 100  # 默认保留的历史记录条数
+    DEFAULT_PROBE_LIMIT = 100  # 默认保留的定时探测记录条数, 与手动请求分开计算
+    PROBE_SOURCE = 'probe'
+    # 请求结果相关的列, 旧数据库中缺少时自动添加
+    RESULT_COLUMNS = (
+        ('status', 'INTEGER'),
+        ('reason', 'TEXT'),
+        ('error_kind', 'TEXT'),
+        ('elapsed_ms', 'REAL'),
+        ('response_size', 'INTEGER'),
+        ('source', 'TEXT'),  # 为空表示手动发送, 'probe' 表示定时探测
+    )
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         config = ConfigModel()
         self.db_path = Path(config.get_app_data_path()) / 'history.db'
+        self.limit = int(config.get('history_limit', self.DEFAULT_LIMIT))
+        self.probe_limit = int(config.get('probe_history_limit', self.DEFAULT_PROBE_LIMIT))
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.init_db()
         
@@ -30,49 +46,125 @@ class HistoryModel:
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
+            
+            # 添加请求结果列
+            cursor.execute("PRAGMA table_info(history)")
+            existing = {col[1] for col in cursor.fetchall()}
+            for column, column_type in self.RESULT_COLUMNS:
+                if column not in existing:
+                    cursor.execute(f"ALTER TABLE history ADD COLUMN {column} {column_type}")
             conn.commit()
     
-    def add_history(self, method, url, headers, body, timeout):
-        """添加一条历史记录"""
+    @timed('db.history.add_history')
+    def add_history(self, method, url, headers, body, timeout, status=None, reason=None,
+                    error_kind=None, elapsed_ms=None, response_size=None, source=None):
+        """添加一条历史记录
+
+        status 为服务器返回的状态码; 传输失败时 status 为空, error_kind 记录失败类型;
+        source 为 'probe' 时是定时探测的结果, 单独按 probe_history_limit 保留
+        """
         try:
             with sqlite3.connect(str(self.db_path)) as conn:
                 cursor = conn.cursor()
                 
                 # 插入新记录
                 cursor.execute('''
-                    INSERT INTO history (method, url, headers, body, timeout)
-                    VALUES (?, ?, ?, ?, ?)
+                    INSERT INTO history (method, url, headers, body, timeout,
+                                         status, reason, error_kind, elapsed_ms, response_size, source)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ''', (
                     method, 
                     url,
-                    json.dumps(headers) if headers else None,
-                    json.dumps(body) if body else None,
-                    timeout
+                    json_utils.dumps(headers, compact=True) if headers else None,
+                    json_utils.dumps(body, compact=True) if body else None,
+                    timeout,
+                    status,
+                    reason,
+                    error_kind,
+                    elapsed_ms,
+                    response_size,
+                    source
                 ))
                 
-                # 只保留最近100条记录
-                cursor.execute('''
-                    DELETE FROM history 
-                    WHERE id NOT IN (
-                        SELECT id FROM history 
-                        ORDER BY created_at DESC 
-                        LIMIT 100
-                    )
-                ''')
+                # 只保留最近的记录
+                self._trim(cursor)
                 
                 conn.commit()
                 self.logger.info(f"Added history record: {method} {url}")
                 
         except Exception as e:
             self.logger.error(f"Failed to add history: {str(e)}")
+
+    def _trim(self, cursor):
+        """手动请求只保留最近 limit 条记录, 定时探测只保留最近 probe_limit 条; 返回删除的记录数"""
+        cursor.execute('''
+            DELETE FROM history 
+            WHERE source IS NULL AND id NOT IN (
+                SELECT id FROM history 
+                WHERE source IS NULL
+                ORDER BY created_at DESC 
+                LIMIT ?
+            )
+        ''', (self.limit,))
+        trimmed = cursor.rowcount
+        cursor.execute('''
+            DELETE FROM history
+            WHERE source = ? AND id NOT IN (
+                SELECT id FROM history
+                WHERE source = ?
+                ORDER BY created_at DESC
+                LIMIT ?
+            )
+        ''', (self.PROBE_SOURCE, self.PROBE_SOURCE, self.probe_limit))
+        return trimmed + cursor.rowcount
+
+    @timed('db.history.add_history_batch')
+    def add_history_batch(self, records):
+        """在一个事务中批量添加历史记录
+
+        Args:
+            records: 字典列表, 包含 method, url, headers, body, timeout,
+                     可选 created_at 以及 status, reason, error_kind, elapsed_ms, response_size
+
+        Returns:
+            (int, int): 插入的记录数, 以及超出 history_limit 被删除的最旧记录数(可能包括刚插入的记录)
+        """
+        rows = [(
+            record['method'],
+            record['url'],
+            json_utils.dumps(record.get('headers'), compact=True) if record.get('headers') else None,
+            json_utils.dumps(record.get('body'), compact=True) if record.get('body') else None,
+            record.get('timeout', 30),
+            record.get('created_at') or datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+            record.get('status'),
+            record.get('reason'),
+            record.get('error_kind'),
+            record.get('elapsed_ms'),
+            record.get('response_size')
+        ) for record in records]
+        if not rows:
+            return 0, 0
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO history (method, url, headers, body, timeout, created_at,
+                                     status, reason, error_kind, elapsed_ms, response_size)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            trimmed = self._trim(cursor)
+            conn.commit()
+        self.logger.info(f"Added {len(rows)} history records in batch, trimmed {trimmed} old records")
+        return len(rows), trimmed
     
+    @timed('db.history.get_history')
     def get_history(self):
         """获取所有历史记录"""
         try:
             with sqlite3.connect(str(self.db_path)) as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    SELECT method, url, headers, body, timeout, created_at
+                    SELECT method, url, headers, body, timeout, created_at,
+                           status, reason, error_kind, elapsed_ms, response_size, source
                     FROM history
                     ORDER BY created_at DESC
                 ''')
@@ -82,10 +174,16 @@ class HistoryModel:
                     history.append({
                         "method": row[0],
                         "url": row[1],
-                        "headers": json.loads(row[2]) if row[2] else {},
-                        "body": json.loads(row[3]) if row[3] else {},
+                        "headers": json_utils.loads(row[2]) if row[2] else {},
+                        "body": json_utils.loads(row[3]) if row[3] else {},
                         "timeout": row[4],
-                        "timestamp": row[5]
+                        "timestamp": row[5],
+                        "status": row[6],
+                        "reason": row[7],
+                        "error_kind": row[8],
+                        "elapsed_ms": row[9],
+                        "response_size": row[10],
+                        "source": row[11]
                     })
                     
                 return history
@@ -94,6 +192,7 @@ class HistoryModel:
             self.logger.error(f"Failed to get history: {str(e)}")
             return []
     
+    @timed('db.history.clear_history')
     def clear_history(self):
         """清空历史记录"""
         try:
@@ -105,6 +204,7 @@ class HistoryModel:
         except Exception as e:
             self.logger.error(f"Failed to clear history: {str(e)}")
             
+    @timed('db.history.delete_history')
     def delete_history(self, timestamp):
         """删除指定时间戳的历史记录"""
         self.logger.info(f"Deleting history record: {timestamp}")
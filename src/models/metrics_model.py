@@ -0,0 +1,201 @@
+import sqlite3
+from pathlib import Path
+from src.models.config_model import ConfigModel
+from src.utils import json_utils
+from src.utils.instrumentation import timed
+
+
+class MetricsModel:
+    """请求指标的时间序列: 每次刷新为有变化的 API/域名写入一行该时间段内的增量"""
+    DEFAULT_RETENTION_DAYS = 30  # 默认保留的天数
+
+    def __init__(self):
+        config = ConfigModel()
+        self.db_path = Path(config.get_app_data_path()) / 'metrics.db'
+        self.retention_days = int(config.get('metrics_retention_days', self.DEFAULT_RETENTION_DAYS))
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.init_db()
+
+    def init_db(self):
+        """初始化数据库"""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS metric_samples (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    scope TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    period_start REAL NOT NULL,
+                    period_end REAL NOT NULL,
+                    requests INTEGER NOT NULL,
+                    errors TEXT,
+                    request_bytes INTEGER NOT NULL,
+                    response_bytes INTEGER NOT NULL,
+                    latency_sum_ms REAL NOT NULL,
+                    latency_max_ms REAL NOT NULL,
+                    latency_buckets TEXT NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_metric_samples_series
+                ON metric_samples (scope, name, period_end)
+            ''')
+            conn.commit()
+
+    @timed('db.metrics.add_samples')
+    def add_samples(self, samples):
+        """在一个事务中写入一批样本, 并删除超过保留天数的样本
+
+        Args:
+            samples: 字典列表, 包含 scope, name, period_start, period_end, requests, errors,
+                     request_bytes, response_bytes, latency_sum_ms, latency_max_ms, latency_buckets
+
+        Returns:
+            int: 写入的样本数
+        """
+        rows = [(
+            sample['scope'],
+            sample['name'],
+            sample['period_start'],
+            sample['period_end'],
+            sample['requests'],
+            json_utils.dumps(sample['errors'], compact=True) if sample['errors'] else None,
+            sample['request_bytes'],
+            sample['response_bytes'],
+            sample['latency_sum_ms'],
+            sample['latency_max_ms'],
+            json_utils.dumps(sample['latency_buckets'], compact=True)
+        ) for sample in samples]
+        if not rows:
+            return 0
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO metric_samples (scope, name, period_start, period_end, requests, errors,
+                                            request_bytes, response_bytes, latency_sum_ms,
+                                            latency_max_ms, latency_buckets)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            cursor.execute('''
+                DELETE FROM metric_samples
+                WHERE period_end < strftime('%s', 'now') - ? * 86400
+            ''', (self.retention_days,))
+            conn.commit()
+        return len(rows)
+
+    @timed('db.metrics.get_samples')
+    def get_samples(self, scope=None, name=None, since=None):
+        """按时间顺序返回样本
+
+        Args:
+            scope: 'api' 或 'domain', 为空时返回全部
+            name: API 名称或域名
+            since: 只返回 period_end 不早于该时间戳(秒)的样本
+        """
+        conditions, params = [], []
+        if scope:
+            conditions.append('scope = ?')
+            params.append(scope)
+        if name:
+            conditions.append('name = ?')
+            params.append(name)
+        if since is not None:
+            conditions.append('period_end >= ?')
+            params.append(since)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT scope, name, period_start, period_end, requests, errors, request_bytes,
+                       response_bytes, latency_sum_ms, latency_max_ms, latency_buckets
+                FROM metric_samples
+                {where}
+                ORDER BY period_end, id
+            ''', params)
+            return [{
+                'scope': row[0],
+                'name': row[1],
+                'period_start': row[2],
+                'period_end': row[3],
+                'requests': row[4],
+                'errors': json_utils.loads(row[5]) if row[5] else {},
+                'request_bytes': row[6],
+                'response_bytes': row[7],
+                'latency_sum_ms': row[8],
+                'latency_max_ms': row[9],
+                'latency_buckets': json_utils.loads(row[10]),
+            } for row in cursor.fetchall()]
+
+    @timed('db.metrics.get_rollup')
+    def get_rollup(self, scope, name, bucket_seconds, since=None, utc_offset=0):
+        """按时间段汇总一个 API 或域名的样本, 汇总在 SQL 中完成(不逐行读取样本)
+
+        Args:
+            bucket_seconds: 时间段长度(秒), 如 3600 按小时、86400 按天
+            since: 只汇总 period_end 不早于该时间戳(秒)的样本
+            utc_offset: 本地时区与 UTC 的偏移(秒), 按天汇总时以本地零点划分
+
+        Returns:
+            list: 按时间排序的字典, 包含 bucket_start, requests, latency_sum_ms, latency_max_ms,
+                  latency_buckets(各桶计数之和)和 errors(错误类型 -> 次数)
+        """
+        where = 'scope = :scope AND name = :name AND period_end >= :since'
+        params = {'scope': scope, 'name': name, 'since': since or 0, 'size': bucket_seconds, 'offset': utc_offset}
+        bucket = 'CAST((period_end + :offset) / :size AS INTEGER) * :size - :offset'
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {bucket} AS bucket, SUM(requests), SUM(request_bytes), SUM(response_bytes),
+                       SUM(latency_sum_ms), MAX(latency_max_ms)
+                FROM metric_samples
+                WHERE {where}
+                GROUP BY bucket
+                ORDER BY bucket
+            ''', params)
+            rows = {row[0]: {
+                'bucket_start': row[0],
+                'requests': row[1],
+                'request_bytes': row[2],
+                'response_bytes': row[3],
+                'latency_sum_ms': row[4],
+                'latency_max_ms': row[5],
+                'latency_buckets': [],
+                'errors': {},
+            } for row in cursor.fetchall()}
+
+            # 直方图桶和错误类型以 JSON 保存, 用 json_each 展开后按时间段求和
+            cursor.execute(f'''
+                SELECT {bucket} AS bucket, CAST(counts.key AS INTEGER) AS position, SUM(counts.value)
+                FROM metric_samples, json_each(metric_samples.latency_buckets) AS counts
+                WHERE {where}
+                GROUP BY bucket, position
+            ''', params)
+            for bucket_start, position, count in cursor.fetchall():
+                buckets = rows[bucket_start]['latency_buckets']
+                buckets.extend([0] * (position + 1 - len(buckets)))
+                buckets[position] = count
+
+            cursor.execute(f'''
+                SELECT {bucket} AS bucket, error_counts.key, SUM(error_counts.value)
+                FROM metric_samples, json_each(metric_samples.errors) AS error_counts
+                WHERE {where} AND metric_samples.errors IS NOT NULL
+                GROUP BY bucket, error_counts.key
+            ''', params)
+            for bucket_start, error, count in cursor.fetchall():
+                rows[bucket_start]['errors'][error] = count
+        return list(rows.values())
+
+    @timed('db.metrics.rename_series')
+    def rename_series(self, scope, old_name, new_name):
+        """API 重命名后保留它的历史样本"""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            conn.execute('UPDATE metric_samples SET name = ? WHERE scope = ? AND name = ?',
+                         (new_name, scope, old_name))
+            conn.commit()
+
+    @timed('db.metrics.clear_samples')
+    def clear_samples(self):
+        """清空所有样本"""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            conn.execute('DELETE FROM metric_samples')
+            conn.commit()
@@ -0,0 +1,310 @@
+"""
+响应断言: 将 API 上保存的断言规则编译为检查流水线, 对每个响应只解析一次 JSON
+
+断言规则为 JSON 列表, 支持的类型:
+    {"type": "status", "in": [200, 201]}
+    {"type": "header", "name": "Content-Type", "equals": "...", "matches": "regex"}
+    {"type": "jsonpath", "path": "$.data.id", "equals": 1}
+    {"type": "jsonpath", "path": "$.items[*].name", "matches": "^item-", "exists": true}
+    {"type": "latency", "max_ms": 500}
+    {"type": "body_size", "min_bytes": 1, "max_bytes": 1048576}
+
+每条规则都可以带 label 字段作为显示名称。
+"""
+import re
+from collections import OrderedDict
+from src.utils import json_utils
+
+_MISSING = object()
+_PIPELINE_CACHE_SIZE = 256
+_pipeline_cache = OrderedDict()
+
+
+class AssertionSpecError(ValueError):
+    """断言规则格式错误"""
+
+
+# ---------- JSONPath 子集 ----------
+
+_TOKEN_RE = re.compile(r"""
+    \.\.(?P<deep>[A-Za-z0-9_\-$]+|\*)      # ..key 递归查找
+  | \.(?P<key>[A-Za-z0-9_\-$]+|\*)         # .key 或 .*
+  | \[\s*(?P<index>-?\d+)\s*\]             # [0]
+  | \[\s*\*\s*\]                            # [*]
+  | \[\s*(?P<quote>['"])(?P<qkey>.*?)(?P=quote)\s*\]   # ['key']
+""", re.VERBOSE)
+
+
+def compile_jsonpath(path):
+    """将 JSONPath 编译为步骤列表, 支持 $ . .. * [n] ['key']"""
+    path = path.strip()
+    if not path.startswith('$'):
+        raise AssertionSpecError(f"JSONPath must start with $: {path}")
+    steps = []
+    pos = 1
+    while pos < len(path):
+        match = _TOKEN_RE.match(path, pos)
+        if not match:
+            raise AssertionSpecError(f"Unsupported JSONPath syntax at {pos}: {path}")
+        if match.group('deep') is not None:
+            steps.append(('deep', match.group('deep')))
+        elif match.group('key') is not None:
+            key = match.group('key')
+            steps.append(('wildcard', None) if key == '*' else ('key', key))
+        elif match.group('index') is not None:
+            steps.append(('index', int(match.group('index'))))
+        elif match.group('qkey') is not None:
+            steps.append(('key', match.group('qkey')))
+        else:
+            steps.append(('wildcard', None))
+        pos = match.end()
+    return steps
+
+
+def _children(value):
+    if isinstance(value, dict):
+        return list(value.values())
+    if isinstance(value, list):
+        return value
+    return []
+
+
+def _descendants(value):
+    """深度优先返回 value 及其所有子孙节点"""
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(_children(node)))
+
+
+def evaluate_jsonpath(steps, document):
+    """执行编译后的 JSONPath, 返回匹配到的值列表"""
+    current = [document]
+    for kind, arg in steps:
+        matched = []
+        for value in current:
+            if kind == 'key':
+                if isinstance(value, dict) and arg in value:
+                    matched.append(value[arg])
+            elif kind == 'index':
+                if isinstance(value, list) and -len(value) <= arg < len(value):
+                    matched.append(value[arg])
+            elif kind == 'wildcard':
+                matched.extend(_children(value))
+            else:
+                for node in _descendants(value):
+                    if arg == '*':
+                        matched.extend(_children(node))
+                    elif isinstance(node, dict) and arg in node:
+                        matched.append(node[arg])
+        current = matched
+    return current
+
+
+# ---------- 断言编译 ----------
+
+class _ParsedResponse:
+    """一次评估中共享的响应数据, JSON 只在需要时解析一次"""
+    __slots__ = ('response', '_json')
+
+    def __init__(self, response):
+        self.response = response
+        self._json = _MISSING
+
+    @property
+    def json(self):
+        if self._json is _MISSING:
+            if self.response.is_binary:
+                # 二进制响应不解码为文本
+                self._json = None
+                return None
+            try:
+                self._json = json_utils.loads(self.response.text or '')
+            except (ValueError, TypeError):
+                self._json = None
+        return self._json
+
+
+def _describe(spec):
+    """断言的显示名称, 可以通过 label 字段自定义"""
+    if spec.get('label'):
+        return spec['label']
+    subject = spec.get('path') or spec.get('name') or ''
+    return f"{spec.get('type')} {subject}".strip()
+
+
+def _compile_status(spec):
+    expected = spec.get('in', spec.get('equals'))
+    if expected is None:
+        raise AssertionSpecError("status assertion requires 'in' or 'equals'")
+    allowed = set(expected) if isinstance(expected, list) else {expected}
+
+    def check(parsed):
+        if parsed.response.is_error:
+            return False, f"no response ({parsed.response.error_kind.value}), expected {sorted(allowed)}"
+        status = parsed.response.status
+        return status in allowed, f"status {status}, expected {sorted(allowed)}"
+    return check
+
+
+def _compile_header(spec):
+    name = spec.get('name')
+    if not name:
+        raise AssertionSpecError("header assertion requires 'name'")
+    equals = spec.get('equals', _MISSING)
+    pattern = re.compile(spec['matches']) if 'matches' in spec else None
+
+    def check(parsed):
+        # 多值响应头(如 Set-Cookie)只要有一个值满足即可
+        values = parsed.response.headers.getall(name, [])
+        if not values:
+            return False, f"header {name} missing"
+        if equals is not _MISSING and equals not in values:
+            return False, f"header {name} is {values[0]!r}, expected {equals!r}"
+        if pattern:
+            matched = next((value for value in values if pattern.search(value)), None)
+            if matched is None:
+                return False, f"header {name} {values[0]!r} does not match {pattern.pattern!r}"
+            return True, f"header {name}: {matched}"
+        return True, f"header {name}: {values[0]}"
+    return check
+
+
+def _compile_jsonpath(spec):
+    path = spec.get('path')
+    if not path:
+        raise AssertionSpecError("jsonpath assertion requires 'path'")
+    steps = compile_jsonpath(path)
+    equals = spec.get('equals', _MISSING)
+    pattern = re.compile(spec['matches']) if 'matches' in spec else None
+    exists = spec.get('exists', True)
+
+    def check(parsed):
+        document = parsed.json
+        if document is None:
+            return False, "response body is not JSON"
+        values = evaluate_jsonpath(steps, document)
+        if not exists:
+            return not values, f"{path} {'exists' if values else 'does not exist'}"
+        if not values:
+            return False, f"{path} not found"
+        if equals is not _MISSING:
+            if any(value == equals for value in values):
+                return True, f"{path} == {equals!r}"
+            return False, f"{path} is {values[0]!r}, expected {equals!r}"
+        if pattern:
+            for value in values:
+                text = value if isinstance(value, str) else json_utils.dumps(value)
+                if pattern.search(text):
+                    return True, f"{path} matches {pattern.pattern!r}"
+            return False, f"{path} does not match {pattern.pattern!r}"
+        return True, f"{path} exists"
+    return check
+
+
+def _compile_latency(spec):
+    max_ms = spec.get('max_ms')
+    if max_ms is None:
+        raise AssertionSpecError("latency assertion requires 'max_ms'")
+
+    def check(parsed):
+        elapsed = parsed.response.elapsed_ms
+        if elapsed is None:
+            return False, "latency not available"
+        return elapsed <= max_ms, f"latency {elapsed:.0f} ms, limit {max_ms} ms"
+    return check
+
+
+def _compile_body_size(spec):
+    min_bytes = spec.get('min_bytes')
+    max_bytes = spec.get('max_bytes')
+    if min_bytes is None and max_bytes is None:
+        raise AssertionSpecError("body_size assertion requires 'min_bytes' or 'max_bytes'")
+
+    def check(parsed):
+        size = parsed.response.size
+        if min_bytes is not None and size < min_bytes:
+            return False, f"body {size} bytes, minimum {min_bytes}"
+        if max_bytes is not None and size > max_bytes:
+            return False, f"body {size} bytes, maximum {max_bytes}"
+        return True, f"body {size} bytes"
+    return check
+
+
+_COMPILERS = {
+    'status': _compile_status,
+    'header': _compile_header,
+    'jsonpath': _compile_jsonpath,
+    'latency': _compile_latency,
+    'body_size': _compile_body_size,
+}
+
+
+class AssertionPipeline:
+    """编译后的断言检查流水线"""
+
+    def __init__(self, checks):
+        self.checks = checks  # [(描述, 检查函数), ...]
+
+    def __len__(self):
+        return len(self.checks)
+
+    def evaluate(self, response):
+        """对响应执行所有断言
+
+        Args:
+            response: HttpResult
+
+        Returns:
+            list: [{'name', 'passed', 'message'}, ...]
+        """
+        parsed = _ParsedResponse(response)
+        results = []
+        for name, check in self.checks:
+            try:
+                passed, message = check(parsed)
+            except Exception as e:
+                passed, message = False, f"error: {e}"
+            results.append({'name': name, 'passed': bool(passed), 'message': message})
+        return results
+
+
+def compile_assertions(specs):
+    """编译断言规则列表, 规则有误时抛出 AssertionSpecError"""
+    if not specs:
+        return AssertionPipeline([])
+    if not isinstance(specs, list):
+        raise AssertionSpecError("Assertions must be a JSON array")
+    checks = []
+    for spec in specs:
+        if not isinstance(spec, dict):
+            raise AssertionSpecError(f"Assertion must be an object: {spec!r}")
+        compiler = _COMPILERS.get(spec.get('type'))
+        if compiler is None:
+            raise AssertionSpecError(f"Unknown assertion type: {spec.get('type')!r}")
+        try:
+            checks.append((_describe(spec), compiler(spec)))
+        except re.error as e:
+            raise AssertionSpecError(f"Invalid regex in {_describe(spec)}: {e}")
+    return AssertionPipeline(checks)
+
+
+def get_pipeline(api):
+    """获取 API 的断言流水线, 按断言内容缓存, 同一 API 只编译一次"""
+    specs = api.get('assertions') or []
+    key = (api.get('id'), json_utils.dumps(specs, sort_keys=True, compact=True))
+    pipeline = _pipeline_cache.get(key)
+    if pipeline is None:
+        pipeline = compile_assertions(specs)
+        _pipeline_cache[key] = pipeline
+        if len(_pipeline_cache) > _PIPELINE_CACHE_SIZE:
+            _pipeline_cache.popitem(last=False)
+    else:
+        _pipeline_cache.move_to_end(key)
+    return pipeline
+
+
+def summarize_results(results):
+    """返回 (通过数, 总数)"""
+    return sum(1 for result in results if result['passed']), len(results)
@@ -0,0 +1,48 @@
+"""
+在后台线程中执行耗时任务, 通过信号向界面报告进度和结果
+"""
+from PyQt6.QtCore import QThread, pyqtSignal
+from loguru import logger
+
+
+class BackgroundWorker(QThread):
+    """通用后台任务线程
+
+    task 为可调用对象, 接收 worker 作为唯一参数, 可以调用:
+      - worker.report_progress(done, total) 报告进度
+      - worker.emit_partial(data) 发送增量结果
+      - worker.is_cancelled() 检查是否已取消
+    task 的返回值通过 result 信号发送, 异常通过 error 信号发送。
+    """
+    progress = pyqtSignal(object, object)  # done, total (可能超过32位整数范围)
+    partial = pyqtSignal(object)  # 增量结果
+    result = pyqtSignal(object)  # 最终结果
+    error = pyqtSignal(str)  # 错误信息
+
+    def __init__(self, task, name="task", parent=None):
+        super().__init__(parent)
+        self.task = task
+        self.name = name
+
+    def run(self):
+        logger.debug(f"Background task started: {self.name}")
+        try:
+            result = self.task(self)
+        except Exception as e:
+            logger.exception(f"Background task failed: {self.name}")
+            self.error.emit(str(e))
+            return
+        logger.debug(f"Background task finished: {self.name}")
+        self.result.emit(result)
+
+    def report_progress(self, done, total):
+        self.progress.emit(int(done), int(total))
+
+    def emit_partial(self, data):
+        self.partial.emit(data)
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def is_cancelled(self):
+        return self.isInterruptionRequested()
@@ -0,0 +1,303 @@
+"""
+二进制响应体解码: MessagePack、CBOR、Protocol Buffers 和 gRPC-Web
+
+解码结果是普通的 dict/list/标量, 由懒加载树视图显示。msgpack、cbor2 和 protobuf 为可选依赖;
+没有 .proto 描述文件时, Protocol Buffers 按线格式解码为字段编号和值。
+"""
+import zlib
+import struct
+from loguru import logger
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+try:
+    from google.protobuf import descriptor_pb2, descriptor_pool, json_format, message_factory
+except ImportError:
+    descriptor_pb2 = None
+
+DECODABLE_KINDS = ('msgpack', 'cbor', 'protobuf', 'grpc-web')
+MISSING_MESSAGES = {
+    'msgpack': "MessagePack decoding requires msgpack (pip install msgpack)",
+    'cbor': "CBOR decoding requires cbor2 (pip install cbor2)",
+    'protobuf_schema': "Decoding with a descriptor requires protobuf (pip install protobuf)",
+}
+GRPC_TRAILER_FLAG = 0x80
+GRPC_COMPRESSED_FLAG = 0x01
+_MAX_NESTING = 64
+
+WIRE_VARINT, WIRE_I64, WIRE_LEN, WIRE_SGROUP, WIRE_EGROUP, WIRE_I32 = range(6)
+WIRE_TYPE_NAMES = {
+    WIRE_VARINT: 'varint',
+    WIRE_I64: 'i64',
+    WIRE_LEN: 'len',
+    WIRE_SGROUP: 'group',
+    WIRE_I32: 'i32',
+}
+
+
+class DecodeError(ValueError):
+    """响应体不是所选格式"""
+    pass
+
+
+def decoder_missing(kind):
+    """所需的可选依赖未安装时返回提示, 否则返回 None"""
+    if kind == 'msgpack' and msgpack is None:
+        return MISSING_MESSAGES['msgpack']
+    if kind == 'cbor' and cbor2 is None:
+        return MISSING_MESSAGES['cbor']
+    return None
+
+
+def decode_msgpack(buffer):
+    if msgpack is None:
+        raise DecodeError(MISSING_MESSAGES['msgpack'])
+    try:
+        # unpackb 接受任意 buffer(包括 mmap), 不复制响应体
+        return msgpack.unpackb(buffer, raw=False, strict_map_key=False, unicode_errors='replace')
+    except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as e:
+        raise DecodeError(f"Invalid MessagePack: {e or type(e).__name__}") from e
+
+
+def decode_cbor(buffer):
+    if cbor2 is None:
+        raise DecodeError(MISSING_MESSAGES['cbor'])
+    try:
+        return cbor2.loads(buffer)
+    except (ValueError, cbor2.CBORDecodeError) as e:
+        raise DecodeError(f"Invalid CBOR: {e}") from e
+
+
+# ---------- Protocol Buffers 线格式 ----------
+
+class WireMessage(list):
+    """没有描述文件时的 Protocol Buffers 消息: 按出现顺序保存的 (字段编号, 线类型, 值) 列表
+
+    items() 返回 (标签, 值), 树视图按字典的方式显示。
+    """
+
+    def items(self):
+        return [(f"#{number} {WIRE_TYPE_NAMES[wire_type]}", value) for number, wire_type, value in self]
+
+
+def _read_varint(data, offset):
+    result = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise DecodeError("Truncated varint")
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, offset
+        shift += 7
+        if shift >= 64:
+            raise DecodeError("Varint is too long")
+
+
+def _wire_value(data, depth):
+    """长度前缀字段可能是嵌套消息、字符串或原始字节, 依次尝试"""
+    if data and depth < _MAX_NESTING:
+        try:
+            return _decode_wire(data, depth + 1)
+        except DecodeError:
+            pass
+    try:
+        return data.tobytes().decode('utf-8')
+    except UnicodeDecodeError:
+        return data.tobytes()
+
+
+def _decode_wire(data, depth=0):
+    message = WireMessage()
+    offset = 0
+    while offset < len(data):
+        key, offset = _read_varint(data, offset)
+        number, wire_type = key >> 3, key & 0x7
+        if number == 0:
+            raise DecodeError("Invalid field number 0")
+        if wire_type == WIRE_VARINT:
+            value, offset = _read_varint(data, offset)
+        elif wire_type == WIRE_I64:
+            if offset + 8 > len(data):
+                raise DecodeError("Truncated 64-bit field")
+            value = struct.unpack_from('<q', data, offset)[0]
+            offset += 8
+        elif wire_type == WIRE_I32:
+            if offset + 4 > len(data):
+                raise DecodeError("Truncated 32-bit field")
+            value = struct.unpack_from('<i', data, offset)[0]
+            offset += 4
+        elif wire_type == WIRE_LEN:
+            length, offset = _read_varint(data, offset)
+            if offset + length > len(data):
+                raise DecodeError("Truncated length-delimited field")
+            value = _wire_value(data[offset:offset + length], depth)
+            offset += length
+        elif wire_type == WIRE_SGROUP:
+            # 已废弃的 group 编码, 只能找到对应的结束标记后当作嵌套消息
+            end = _find_group_end(data, offset, number)
+            value = _decode_wire(data[offset:end], depth + 1) if depth < _MAX_NESTING else data[offset:end].tobytes()
+            offset = end + len(_encode_varint(number << 3 | WIRE_EGROUP))
+        else:
+            raise DecodeError(f"Unsupported wire type {wire_type}")
+        message.append((number, wire_type, value))
+    return message
+
+
+def _encode_varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        out.append(byte | (0x80 if value else 0))
+        if not value:
+            return bytes(out)
+
+
+def _find_group_end(data, offset, number):
+    marker = _encode_varint(number << 3 | WIRE_EGROUP)
+    end = data[offset:].tobytes().find(marker)
+    if end < 0:
+        raise DecodeError("Unterminated group")
+    return offset + end
+
+
+def decode_protobuf_wire(buffer):
+    """不依赖描述文件, 按线格式解码 Protocol Buffers 消息"""
+    return _decode_wire(memoryview(buffer))
+
+
+class ProtobufSchema:
+    """从 FileDescriptorSet 文件加载的消息类型
+
+    描述文件由 protoc --include_imports --descriptor_set_out=api.desc api.proto 生成。
+    """
+
+    def __init__(self, path):
+        if descriptor_pb2 is None:
+            raise DecodeError(MISSING_MESSAGES['protobuf_schema'])
+        descriptor_set = descriptor_pb2.FileDescriptorSet()
+        with open(path, 'rb') as f:
+            try:
+                descriptor_set.ParseFromString(f.read())
+            except Exception as e:
+                raise DecodeError(f"Invalid descriptor set: {e}") from e
+        self.path = path
+        self.pool = descriptor_pool.DescriptorPool()
+        self.message_names = []
+        for file_proto in descriptor_set.file:
+            self.pool.Add(file_proto)
+            prefix = f"{file_proto.package}." if file_proto.package else ""
+            self.message_names.extend(self._message_names(prefix, file_proto.message_type))
+        logger.info(f"Loaded protobuf descriptor set {path}: {len(self.message_names)} message types")
+
+    @classmethod
+    def _message_names(cls, prefix, message_types):
+        names = []
+        for message_type in message_types:
+            name = prefix + message_type.name
+            names.append(name)
+            names.extend(cls._message_names(f"{name}.", message_type.nested_type))
+        return names
+
+    def decode(self, buffer, message_name):
+        try:
+            descriptor = self.pool.FindMessageTypeByName(message_name)
+        except KeyError as e:
+            raise DecodeError(f"Unknown message type {message_name}") from e
+        message = message_factory.GetMessageClass(descriptor)()
+        try:
+            message.ParseFromString(bytes(buffer))
+        except Exception as e:
+            raise DecodeError(f"Invalid {message_name} message: {e}") from e
+        return json_format.MessageToDict(message, preserving_proto_field_name=True)
+
+
+def decode_protobuf(buffer, schema=None, message_name=None):
+    """有描述文件和消息类型时按类型解码, 否则按线格式解码"""
+    if schema is not None and message_name:
+        return schema.decode(buffer, message_name)
+    return decode_protobuf_wire(buffer)
+
+
+# ---------- gRPC-Web ----------
+
+def split_grpc_frames(buffer):
+    """拆分 gRPC(-Web) 帧: 1 字节标志 + 4 字节大端长度 + 数据
+
+    Returns:
+        list: (标志, memoryview) 列表
+    """
+    data = memoryview(buffer)
+    frames = []
+    offset = 0
+    while offset < len(data):
+        if offset + 5 > len(data):
+            raise DecodeError("Truncated gRPC frame header")
+        flag = data[offset]
+        length = struct.unpack_from('>I', data, offset + 1)[0]
+        offset += 5
+        if offset + length > len(data):
+            raise DecodeError("Truncated gRPC frame")
+        frames.append((flag, data[offset:offset + length]))
+        offset += length
+    return frames
+
+
+def _parse_trailers(payload):
+    trailers = {}
+    for line in payload.tobytes().decode('utf-8', errors='replace').split('\r\n'):
+        name, sep, value = line.partition(':')
+        if sep:
+            trailers[name.strip().lower()] = value.strip()
+    return trailers
+
+
+def decode_grpc_web(buffer, schema=None, message_name=None):
+    """解码 gRPC-Web 响应: 数据帧按 Protocol Buffers 解码, 尾部帧解析为 grpc-status 等字段"""
+    messages = []
+    trailers = {}
+    for flag, payload in split_grpc_frames(buffer):
+        if flag & GRPC_TRAILER_FLAG:
+            trailers.update(_parse_trailers(payload))
+            continue
+        if flag & GRPC_COMPRESSED_FLAG:
+            try:
+                payload = memoryview(zlib.decompress(payload, zlib.MAX_WBITS | 32))
+            except zlib.error as e:
+                raise DecodeError(f"Unsupported gRPC message compression: {e}") from e
+        messages.append(decode_protobuf(payload, schema, message_name))
+    result = {'messages': messages}
+    if trailers:
+        result['trailers'] = trailers
+    return result
+
+
+def decode_body(kind, buffer, schema=None, message_name=None):
+    """按类型解码响应体
+
+    Args:
+        kind: DECODABLE_KINDS 中的一项
+        buffer: bytes 或 mmap
+        schema: 可选的 ProtobufSchema
+        message_name: schema 中的消息类型全名
+    """
+    if kind == 'msgpack':
+        return decode_msgpack(buffer)
+    if kind == 'cbor':
+        return decode_cbor(buffer)
+    if kind == 'protobuf':
+        return decode_protobuf(buffer, schema, message_name)
+    if kind == 'grpc-web':
+        return decode_grpc_web(buffer, schema, message_name)
+    raise DecodeError(f"Cannot decode {kind} bodies")
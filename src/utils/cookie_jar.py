@@ -0,0 +1,116 @@
+"""
+持久化 Cookie Jar: 在 aiohttp.CookieJar 基础上从 CookieModel 加载并在变化后写回
+"""
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.cookies import Morsel
+import aiohttp
+from loguru import logger
+from yarl import URL
+
+
+def _morsel_expires(morsel, received_at=None):
+    """计算 Cookie 的过期时间戳, 会话 Cookie 返回 None"""
+    max_age = morsel.get('max-age')
+    if max_age:
+        try:
+            return (received_at or time.time()) + int(max_age)
+        except ValueError:
+            pass
+    expires = morsel.get('expires')
+    if expires:
+        try:
+            return parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+class PersistentCookieJar(aiohttp.CookieJar):
+    """由 SQLite 持久化的 Cookie Jar, 长连接会话共享, 重启应用后登录状态仍然保留
+
+    unsafe=True 允许保存 IP 地址主机(如 127.0.0.1)的 Cookie, 方便本地调试。
+    """
+
+    def __init__(self, cookie_model):
+        super().__init__(unsafe=True)
+        self.cookie_model = cookie_model
+        self.dirty = False
+        self.received_at = {}  # 名称 -> 最近收到时间, 用于把 max-age 换算为过期时间
+        self.load()
+
+    def load(self):
+        """从数据库加载未过期的 Cookie"""
+        now = time.time()
+        loaded = 0
+        for cookie in self.cookie_model.get_all_cookies():
+            if cookie['expires'] is not None and cookie['expires'] <= now:
+                continue
+            morsel = Morsel()
+            morsel.set(cookie['name'], cookie['value'], cookie['value'])
+            morsel['path'] = cookie['path']
+            if not cookie['host_only']:
+                morsel['domain'] = cookie['domain']
+            if cookie['expires'] is not None:
+                morsel['expires'] = formatdate(cookie['expires'], usegmt=True)
+            if cookie['secure']:
+                morsel['secure'] = True
+            if cookie['http_only']:
+                morsel['httponly'] = True
+            super().update_cookies({cookie['name']: morsel}, URL(f"http://{cookie['domain']}{cookie['path']}"))
+            loaded += 1
+        self.dirty = False
+        logger.info(f"Loaded {loaded} persisted cookies")
+
+    def _mark_received(self, names):
+        now = time.time()
+        for name in names:
+            self.received_at[name] = now
+        self.dirty = True
+
+    def update_cookies(self, cookies, response_url=URL()):
+        if not hasattr(cookies, 'items'):
+            cookies = list(cookies)
+        super().update_cookies(cookies, response_url)
+        self._mark_received(name for name, _ in (cookies.items() if hasattr(cookies, 'items') else cookies))
+
+    def update_cookies_from_headers(self, headers, response_url):
+        # aiohttp 3.12 起响应中的 Set-Cookie 通过此方法写入, 不再经过 update_cookies
+        super().update_cookies_from_headers(headers, response_url)
+        self._mark_received(header.split('=', 1)[0].strip() for header in headers)
+
+    def clear(self, predicate=None):
+        super().clear(predicate)
+        self.dirty = True
+
+    def clear_domain(self, domain):
+        super().clear_domain(domain)
+        self.dirty = True
+
+    def delete_cookie(self, domain, path, name):
+        """删除单个 Cookie"""
+        self.clear(lambda morsel: (
+            morsel.key == name and morsel['domain'] == domain and (morsel['path'] or '/') == path
+        ))
+
+    def to_records(self):
+        """导出当前所有 Cookie 为 CookieModel 的记录格式"""
+        host_only = getattr(self, '_host_only_cookies', set())
+        return [{
+            'domain': morsel['domain'],
+            'path': morsel['path'] or '/',
+            'name': morsel.key,
+            'value': morsel.value,
+            'expires': _morsel_expires(morsel, self.received_at.get(morsel.key)),
+            'secure': bool(morsel['secure']),
+            'http_only': bool(morsel['httponly']),
+            'host_only': (morsel['domain'], morsel.key) in host_only,
+        } for morsel in self]
+
+    def save(self, force=False):
+        """Cookie 有变化时写回数据库"""
+        if not (self.dirty or force):
+            return
+        count = self.cookie_model.replace_all(self.to_records())
+        self.dirty = False
+        logger.debug(f"Persisted {count} cookies")
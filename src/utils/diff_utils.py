@@ -0,0 +1,223 @@
+"""
+响应差异比较: 文本行级差异(Myers O(ND) 线性空间算法)与 JSON 结构化差异
+"""
+import re
+from fnmatch import translate
+
+# 单个子问题允许的最大编辑距离, 超过后整体视为替换, 避免完全不同的大文本耗时过长
+DEFAULT_MAX_EDIT_DISTANCE = 5000
+
+DEFAULT_IGNORE_PATHS = ('*timestamp', '*.updated_at', '*.updatedAt', '*.request_id', '*.requestId')
+DEFAULT_ARRAY_KEYS = ('id', 'key', 'name')
+
+
+class DiffCancelled(Exception):
+    """差异计算被取消"""
+
+
+def _middle_snake(a, a_lo, n, b, b_lo, m, max_d):
+    """查找中间蛇形路径, 返回局部坐标 (x0, y0, x1, y1), 超过 max_d 时返回 None"""
+    delta = n - m
+    odd = delta & 1
+    vf = {1: 0}
+    vb = {1: 0}
+    for d in range(min((n + m + 1) // 2, max_d) + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and vf[k - 1] < vf[k + 1]):
+                x = vf[k + 1]
+            else:
+                x = vf[k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_lo + x] == b[b_lo + y]:
+                x += 1
+                y += 1
+            vf[k] = x
+            if odd and delta - (d - 1) <= k <= delta + (d - 1) and x + vb[delta - k] >= n:
+                return x0, y0, x, y
+
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and vb[k - 1] < vb[k + 1]):
+                x = vb[k + 1]
+            else:
+                x = vb[k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_lo + n - x - 1] == b[b_lo + m - y - 1]:
+                x += 1
+                y += 1
+            vb[k] = x
+            if not odd and -d <= delta - k <= d and x + vf[delta - k] >= n:
+                return n - x, m - y, n - x0, m - y0
+    return None
+
+
+def _matching_pairs(a, b, max_d, cancelled):
+    """返回按顺序排列的匹配行区间 [(i, j, length), ...]"""
+    matches = []
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        if cancelled and cancelled():
+            raise DiffCancelled()
+        a_lo, a_hi, b_lo, b_hi = stack.pop()
+
+        # 去除公共前缀和后缀
+        start = 0
+        while a_lo + start < a_hi and b_lo + start < b_hi and a[a_lo + start] == b[b_lo + start]:
+            start += 1
+        if start:
+            matches.append((a_lo, b_lo, start))
+            a_lo += start
+            b_lo += start
+        end = 0
+        while a_hi - end > a_lo and b_hi - end > b_lo and a[a_hi - end - 1] == b[b_hi - end - 1]:
+            end += 1
+        if end:
+            matches.append((a_hi - end, b_hi - end, end))
+            a_hi -= end
+            b_hi -= end
+        if a_lo == a_hi or b_lo == b_hi:
+            continue
+
+        snake = _middle_snake(a, a_lo, a_hi - a_lo, b, b_lo, b_hi - b_lo, max_d)
+        if snake is None:
+            # 差异过大, 整段视为替换
+            continue
+        x0, y0, x1, y1 = snake
+        if (x1, y1) == (0, 0) or (x0, y0) == (a_hi - a_lo, b_hi - b_lo):
+            # 无法继续拆分, 整段视为替换
+            continue
+        if x1 > x0:
+            matches.append((a_lo + x0, b_lo + y0, x1 - x0))
+        stack.append((a_lo + x1, a_hi, b_lo + y1, b_hi))
+        stack.append((a_lo, a_lo + x0, b_lo, b_lo + y0))
+    matches.sort()
+    return matches
+
+
+def line_diff(a_lines, b_lines, max_edit_distance=DEFAULT_MAX_EDIT_DISTANCE, cancelled=None):
+    """计算两组文本行的差异
+
+    Returns:
+        list: 与 difflib 相同格式的操作码 [(tag, i1, i2, j1, j2), ...],
+              tag 为 'equal'/'replace'/'delete'/'insert'
+    """
+    # 将行映射为整数, 加快比较速度
+    ids = {}
+    a = [ids.setdefault(line, len(ids)) for line in a_lines]
+    b = [ids.setdefault(line, len(ids)) for line in b_lines]
+
+    opcodes = []
+    i = j = 0
+    for mi, mj, length in _matching_pairs(a, b, max_edit_distance, cancelled) + [(len(a), len(b), 0)]:
+        if i < mi and j < mj:
+            opcodes.append(('replace', i, mi, j, mj))
+        elif i < mi:
+            opcodes.append(('delete', i, mi, j, j))
+        elif j < mj:
+            opcodes.append(('insert', i, i, j, mj))
+        if length:
+            opcodes.append(('equal', mi, mi + length, mj, mj + length))
+        i, j = mi + length, mj + length
+    return opcodes
+
+
+# ---------- JSON 结构化差异 ----------
+
+def _compile_ignore_paths(ignore_paths):
+    """将多个路径通配符编译为一个正则表达式"""
+    if not ignore_paths:
+        return None
+    return re.compile('|'.join(f'(?:{translate(pattern)})' for pattern in ignore_paths))
+
+
+def _is_ignored(path, ignore_pattern):
+    return ignore_pattern is not None and ignore_pattern.match(path) is not None
+
+
+def _array_key(old, new, array_keys):
+    """如果两个数组的元素都是包含同一唯一键的对象, 返回该键名"""
+    for key in array_keys:
+        for items in (old, new):
+            if not all(isinstance(item, dict) and key in item for item in items):
+                break
+            values = [repr(item[key]) for item in items]
+            if len(set(values)) != len(values):
+                break
+        else:
+            return key
+    return None
+
+
+def json_diff(old, new, ignore_paths=DEFAULT_IGNORE_PATHS, array_keys=DEFAULT_ARRAY_KEYS, cancelled=None):
+    """比较两个 JSON 值的结构差异
+
+    数组元素如果都带有 array_keys 中的唯一键, 则按键匹配而不是按下标匹配;
+    ignore_paths 为路径通配符(如 "*.timestamp"), 匹配的路径不参与比较。
+
+    Returns:
+        list: [{'path', 'kind', 'old', 'new'}, ...], kind 为 'added'/'removed'/'changed'
+    """
+    ignore_pattern = _compile_ignore_paths(ignore_paths)
+    changes = []
+    stack = [('$', old, new)]
+    steps = 0
+    while stack:
+        steps += 1
+        if cancelled and steps % 1000 == 0 and cancelled():
+            raise DiffCancelled()
+        path, left, right = stack.pop()
+        # 相同的子树直接跳过(在 C 层面比较, 比逐节点遍历快得多)
+        if left == right and type(left) is type(right):
+            continue
+        if _is_ignored(path, ignore_pattern):
+            continue
+
+        if isinstance(left, dict) and isinstance(right, dict):
+            children = []
+            for key in left:
+                child = f"{path}.{key}"
+                if key in right:
+                    children.append((child, left[key], right[key]))
+                elif not _is_ignored(child, ignore_pattern):
+                    changes.append({'path': child, 'kind': 'removed', 'old': left[key], 'new': None})
+            for key in right:
+                if key not in left:
+                    child = f"{path}.{key}"
+                    if not _is_ignored(child, ignore_pattern):
+                        changes.append({'path': child, 'kind': 'added', 'old': None, 'new': right[key]})
+            stack.extend(reversed(children))
+        elif isinstance(left, list) and isinstance(right, list):
+            key = _array_key(left, right, array_keys)
+            children = []
+            if key:
+                right_index = {repr(item[key]): item for item in right}
+                left_keys = set()
+                for item in left:
+                    item_key = repr(item[key])
+                    left_keys.add(item_key)
+                    child = f"{path}[{key}={item[key]}]"
+                    if item_key in right_index:
+                        children.append((child, item, right_index[item_key]))
+                    elif not _is_ignored(child, ignore_pattern):
+                        changes.append({'path': child, 'kind': 'removed', 'old': item, 'new': None})
+                for item in right:
+                    if repr(item[key]) not in left_keys:
+                        child = f"{path}[{key}={item[key]}]"
+                        if not _is_ignored(child, ignore_pattern):
+                            changes.append({'path': child, 'kind': 'added', 'old': None, 'new': item})
+            else:
+                for index in range(max(len(left), len(right))):
+                    child = f"{path}[{index}]"
+                    if index < len(left) and index < len(right):
+                        children.append((child, left[index], right[index]))
+                    elif _is_ignored(child, ignore_pattern):
+                        continue
+                    elif index >= len(right):
+                        changes.append({'path': child, 'kind': 'removed', 'old': left[index], 'new': None})
+                    else:
+                        changes.append({'path': child, 'kind': 'added', 'old': None, 'new': right[index]})
+            stack.extend(reversed(children))
+        elif left != right or type(left) is not type(right):
+            changes.append({'path': path, 'kind': 'changed', 'old': left, 'new': right})
+    return changes
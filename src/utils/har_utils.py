@@ -0,0 +1,315 @@
+"""
+HAR 1.2 导入导出工具
+
+导入使用流式解析: 只定位 log.entries 数组, 然后逐个解码 entry,
+内存占用只与单个 entry 的大小相关, 与文件大小无关。
+"""
+import io
+import os
+import json
+from datetime import datetime, timezone
+from urllib.parse import urlparse, parse_qsl, urlencode
+from src.utils import json_utils
+from src.version import VERSION
+
+READ_CHUNK_SIZE = 1024 * 1024  # 每次读取 1 MB
+MAX_ENTRY_SIZE = 512 * 1024 * 1024  # 单个 entry 的最大字符数, 防止异常文件耗尽内存
+_WHITESPACE = ' \t\r\n'
+
+
+class HarFormatError(ValueError):
+    """HAR 文件格式错误"""
+
+
+class HarEntryReader:
+    """从 HAR 文件中流式读取 log.entries 的每一项"""
+
+    def __init__(self, path, chunk_size=READ_CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.total_bytes = os.path.getsize(path)
+        self._raw = None
+        self._text = None
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    @property
+    def bytes_read(self):
+        """已从磁盘读取的字节数, 用于显示进度"""
+        return self._raw.tell() if self._raw else 0
+
+    def __enter__(self):
+        self._raw = open(self.path, 'rb')
+        # utf-8-sig 兼容部分浏览器导出的 BOM
+        self._text = io.TextIOWrapper(self._raw, encoding='utf-8-sig', errors='replace')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._text.close()
+        self._raw = None
+        self._text = None
+        return False
+
+    def _fill(self, size=None):
+        """读取更多数据(默认 chunk_size 个字符)到缓冲区, 同时丢弃已消费的部分"""
+        if self._eof:
+            return False
+        chunk = self._text.read(size or self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        """跳过空白并返回下一个字符, 文件结束时返回空字符串"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def _seek_entries(self):
+        """扫描到 log.entries 数组的 '[' 之后, 跳过 pages 等其他字段"""
+        depth = 0
+        in_string = False
+        string_start = 0
+        last_string = None
+        while True:
+            if self._pos >= len(self._buffer):
+                # 保留未结束字符串的内容, 以便识别跨块的键名
+                keep_from = string_start if in_string else self._pos
+                offset = self._pos - keep_from
+                self._pos = keep_from
+                if not self._fill():
+                    raise HarFormatError("log.entries not found in HAR file")
+                string_start = 0
+                self._pos = offset
+                continue
+
+            char = self._buffer[self._pos]
+            if in_string:
+                if char == '\\':
+                    self._pos += 2
+                    continue
+                if char == '"':
+                    in_string = False
+                    last_string = self._buffer[string_start + 1:self._pos]
+                self._pos += 1
+                continue
+
+            if char == '"':
+                in_string = True
+                string_start = self._pos
+            elif char in '{[':
+                depth += 1
+            elif char in '}]':
+                depth -= 1
+            elif char == ':' and depth == 2 and last_string == 'entries':
+                self._pos += 1
+                if self._peek() != '[':
+                    raise HarFormatError("log.entries is not an array")
+                self._pos += 1
+                return
+            elif char not in _WHITESPACE:
+                last_string = None
+            self._pos += 1
+
+    def __iter__(self):
+        self._seek_entries()
+        while True:
+            char = self._peek()
+            if char == ',':
+                self._pos += 1
+                continue
+            if char == ']':
+                return
+            if char == '':
+                raise HarFormatError("Unexpected end of file in log.entries")
+
+            while True:
+                try:
+                    entry, end = self._decoder.raw_decode(self._buffer, self._pos)
+                    break
+                except json.JSONDecodeError as e:
+                    # 数据不完整时继续读取, 直到能解码出完整的 entry; 每次读取与已缓冲的部分一样多,
+                    # 缓冲区按倍数增长, 大 entry(如 base64 响应体)重新解码的总量与其大小成线性关系
+                    pending = len(self._buffer) - self._pos
+                    if pending > MAX_ENTRY_SIZE:
+                        raise HarFormatError(f"HAR entry too large or malformed: {e}")
+                    if not self._fill(max(self.chunk_size, pending)):
+                        raise HarFormatError(f"Malformed HAR entry: {e}")
+            self._pos = end
+            yield entry
+
+
+def _headers_to_dict(headers):
+    """HAR 请求头列表转换为字典, 忽略 HTTP/2 伪首部"""
+    result = {}
+    for header in headers or []:
+        name = header.get('name', '')
+        if not name or name.startswith(':'):
+            continue
+        result[name] = header.get('value', '')
+    return result
+
+
+def _parse_har_datetime(value):
+    """HAR 的 ISO 8601 时间转换为 SQLite CURRENT_TIMESTAMP 格式(UTC)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def har_entry_to_request(entry, timeout=30):
+    """HAR entry 转换为请求数据
+
+    Returns:
+        dict: method, url, headers, body_text, timeout, created_at
+    """
+    request = entry.get('request') or {}
+    post_data = request.get('postData') or {}
+    body_text = post_data.get('text')
+    if body_text is None and post_data.get('params'):
+        body_text = urlencode([(p.get('name', ''), p.get('value', '')) for p in post_data['params']])
+    return {
+        'method': (request.get('method') or 'GET').upper(),
+        'url': request.get('url', ''),
+        'headers': _headers_to_dict(request.get('headers')),
+        'body_text': body_text or '',
+        'timeout': timeout,
+        'created_at': _parse_har_datetime(entry.get('startedDateTime')),
+    }
+
+
+def request_to_history_record(request):
+    """请求数据转换为历史记录格式(与发送请求时记录的格式一致)"""
+    body_text = request['body_text']
+    try:
+        body = json_utils.loads(body_text) if body_text else {}
+    except ValueError:
+        body = body_text
+    return {
+        'method': request['method'],
+        'url': request['url'],
+        'headers': request['headers'],
+        'body': body,
+        'timeout': request['timeout'],
+        'created_at': request['created_at'],
+    }
+
+
+def request_to_api_record(request):
+    """请求数据转换为已保存 API 的格式, 名称为 "方法 路径" """
+    parsed = urlparse(request['url'])
+    name = f"{request['method']} {parsed.netloc}{parsed.path or '/'}"
+    body_text = request['body_text']
+    content_type = next((v for k, v in request['headers'].items() if k.lower() == 'content-type'), '')
+    body = {}
+    if body_text:
+        body = {'content': body_text}
+        if 'application/json' in content_type.lower():
+            try:
+                parsed_body = json_utils.loads(body_text)
+                if isinstance(parsed_body, dict):
+                    body = parsed_body
+            except ValueError:
+                pass
+    return {
+        'name': name,
+        'method': request['method'],
+        'url': request['url'],
+        'headers': request['headers'],
+        'body': body,
+        'timeout': request['timeout'],
+    }
+
+
+def history_record_to_har_entry(record):
+    """历史记录转换为 HAR entry"""
+    headers = record.get('headers') or {}
+    if not isinstance(headers, dict):
+        headers = {}
+    body = record.get('body')
+    if isinstance(body, (dict, list)):
+        body_text = json_utils.dumps(body) if body else ''
+    else:
+        body_text = body or ''
+
+    parsed = urlparse(record.get('url', ''))
+    timestamp = record.get('timestamp') or ''
+    started = timestamp.replace(' ', 'T') + 'Z' if timestamp else datetime.now(timezone.utc).isoformat()
+
+    har_request = {
+        'method': record.get('method', 'GET'),
+        'url': record.get('url', ''),
+        'httpVersion': 'HTTP/1.1',
+        'cookies': [],
+        'headers': [{'name': k, 'value': str(v)} for k, v in headers.items()],
+        'queryString': [{'name': k, 'value': v} for k, v in parse_qsl(parsed.query, keep_blank_values=True)],
+        'headersSize': -1,
+        'bodySize': len(body_text.encode('utf-8')) if body_text else 0,
+    }
+    if body_text:
+        content_type = next((v for k, v in headers.items() if k.lower() == 'content-type'), 'text/plain')
+        har_request['postData'] = {'mimeType': content_type, 'text': body_text}
+
+    elapsed = record.get('elapsed_ms') or 0
+    har_response = {
+        'status': record.get('status') or 0,
+        'statusText': record.get('reason') or '',
+        'httpVersion': '',
+        'cookies': [],
+        'headers': [],
+        'content': {'size': record.get('response_size') or 0, 'mimeType': ''},
+        'redirectURL': '',
+        'headersSize': -1,
+        'bodySize': record.get('response_size') if record.get('response_size') is not None else -1,
+    }
+    if record.get('error_kind'):
+        # 传输错误没有 HTTP 状态码, 按 HAR 惯例 status 为 0, 错误类型放在自定义字段中
+        har_response['_error'] = record['error_kind']
+
+    return {
+        'startedDateTime': started,
+        'time': elapsed,
+        'request': har_request,
+        'response': har_response,
+        'cache': {},
+        'timings': {'send': 0, 'wait': elapsed, 'receive': 0},
+    }
+
+
+def write_har(entries, fileobj):
+    """流式写出 HAR 1.2 文件, entries 为 HAR entry 的可迭代对象
+
+    Returns:
+        int: 写出的 entry 数量
+    """
+    header = {
+        'version': '1.2',
+        'creator': {'name': 'FreeHttp', 'version': VERSION},
+        'pages': [],
+    }
+    fileobj.write('{"log": ')
+    fileobj.write(json_utils.dumps(header, compact=True)[:-1])
+    fileobj.write(', "entries": [\n')
+    count = 0
+    for entry in entries:
+        if count:
+            fileobj.write(',\n')
+        fileobj.write(json_utils.dumps(entry, compact=True))
+        count += 1
+    fileobj.write('\n]}}\n')
+    return count
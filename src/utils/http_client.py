@@ -1,54 +1,292 @@
 import aiohttp
 import asyncio
-import chardet
+import time
+from loguru import logger
+from src.utils.instrumentation import instrumentation
+from src.utils.http_result import HttpResult, classify_error
+from src.utils.retry_policy import NO_RETRY, parse_retry_after, latency_tracker
+from src.utils.http_trace import new_trace_context
+from src.utils.cookie_jar import PersistentCookieJar
+from src.utils.network import NetworkSettings, CachingResolver, is_socks_proxy, is_unix_url
+from src.utils.rate_limiter import RateLimiter
+from src.utils.transports.base import TransportError
+from src.utils.transports.registry import get_transport_class, UNIX_TRANSPORT
+
+COOKIE_SAVE_DELAY = 5  # 请求修改 Cookie 后延迟写回数据库的秒数, 期间的修改合并为一次写入
 
 class HttpClient:
-    def __init__(self, timeout=30):
+    """长期存在的 HTTP 客户端, 所有请求共享连接池和 Cookie Jar
+
+    请求由可插拔的传输引擎发送(见 src.utils.transports), 引擎按请求参数或域名配置选择,
+    默认为 aiohttp; 重试、对冲、Cookie 持久化、按域名限速和跟踪记录对所有引擎相同。
+    """
+
+    def __init__(self, timeout=30, cookie_model=None, network=None):
         self.timeout = timeout
+        self.cookie_model = cookie_model
+        self.cookie_jar = None
+        self.network = network or NetworkSettings()
+        self.resolver = CachingResolver(self.network.dns_cache_ttl, self.network.host_overrides)
+        self.rate_limiter = RateLimiter(self.network.rate_limits)
+        self.transports = {}  # 引擎名称 -> 引擎实例, 第一次使用时创建
+        self._cookie_save_handle = None
+
+    def configure_network(self, network):
+        """更新网络设置; 已建立的连接可能指向旧的地址或代理, 由各引擎在下次请求时重建"""
+        self.network = network
+        self.resolver.configure(network.dns_cache_ttl, network.host_overrides)
+        self.rate_limiter.configure(network.rate_limits)
+        for transport in self.transports.values():
+            transport.configure_network(network)
+        logger.info("Network settings updated: {} proxied hosts, {} host overrides, {} hosts with custom transports, "
+                    "{} rate-limited hosts", len(network.proxies), len(network.host_overrides),
+                    len(network.transports), len(self.rate_limiter.limiters))
+
+    def get_transport(self, name=None):
+        """按名称获取引擎实例(为空时使用默认引擎), 第一次使用时创建
+
+        Raises:
+            TransportError: 引擎未注册或依赖未安装
+        """
+        transport_class = get_transport_class(name)
+        transport = self.transports.get(transport_class.name)
+        if transport is None:
+            transport = transport_class(self)
+            self.transports[transport_class.name] = transport
+            logger.debug(f"Created {transport_class.label} transport")
+        return transport
+
+    def select_transport(self, url, transport=None):
+        """选择请求使用的引擎: 请求参数优先, 其次是域名配置, 最后是默认引擎; unix:// 地址使用 unix 引擎"""
+        if is_unix_url(url):
+            engine = self.get_transport(transport or UNIX_TRANSPORT)
+            if not engine.capabilities.unix_sockets:
+                raise TransportError(f"Transport {engine.name} does not support unix sockets")
+            return engine
+        engine = self.get_transport(transport or self.network.transport_for(url))
+        proxy = self.network.proxy_for(url)
+        if proxy and is_socks_proxy(proxy) and not engine.capabilities.socks_proxies:
+            raise TransportError(f"Transport {engine.name} does not support SOCKS proxies")
+        return engine
+
+    async def open_stream_session(self, url):
+        """WebSocket/SSE 使用的会话; 域名选择的引擎不支持流式连接时使用默认引擎
+
+        Returns:
+            (session, request_url, proxy)
+        """
+        engine = self.select_transport(url)
+        if not engine.capabilities.streaming and not is_unix_url(url):
+            logger.info(f"Transport {engine.name} cannot stream, using {self.get_transport().name} for {url}")
+            engine = self.get_transport()
+        return await engine.open_stream_session(url)
+
+    def get_cookie_jar(self):
+        """所有引擎共享的 Cookie Jar, 第一次使用时创建"""
+        if self.cookie_jar is None:
+            self.cookie_jar = (PersistentCookieJar(self.cookie_model) if self.cookie_model
+                               else aiohttp.CookieJar(unsafe=True))
+        return self.cookie_jar
+
+    def save_cookies(self):
+        """将有变化的 Cookie 写回数据库"""
+        if self._cookie_save_handle is not None:
+            self._cookie_save_handle.cancel()
+            self._cookie_save_handle = None
+        if isinstance(self.cookie_jar, PersistentCookieJar):
+            self.cookie_jar.save()
+
+    def schedule_cookie_save(self):
+        """Cookie 有变化时在 COOKIE_SAVE_DELAY 秒后写回数据库; 写入会重写整张表, 不在每个请求后同步执行"""
+        if (self._cookie_save_handle is not None or not isinstance(self.cookie_jar, PersistentCookieJar)
+                or not self.cookie_jar.dirty):
+            return
+        self._cookie_save_handle = asyncio.get_running_loop().call_later(COOKIE_SAVE_DELAY, self.save_cookies)
+
+    def get_cookies(self):
+        """当前所有 Cookie; 会话尚未创建时直接读取数据库"""
+        if isinstance(self.cookie_jar, PersistentCookieJar):
+            return self.cookie_jar.to_records()
+        if self.cookie_model is not None:
+            return self.cookie_model.get_all_cookies()
+        return []
+
+    def delete_cookie(self, domain, path, name):
+        """删除单个 Cookie, 同时更新会话中的 Cookie Jar 和数据库"""
+        if isinstance(self.cookie_jar, PersistentCookieJar):
+            self.cookie_jar.delete_cookie(domain, path, name)
+        if self.cookie_model is not None:
+            self.cookie_model.delete_cookie(domain, path, name)
+        logger.info(f"Deleted cookie {name} for {domain}{path}")
+
+    def clear_cookies(self, domain=None):
+        """清除指定域名(为空时清除全部)的 Cookie"""
+        if isinstance(self.cookie_jar, PersistentCookieJar):
+            if domain:
+                self.cookie_jar.clear_domain(domain)
+            else:
+                self.cookie_jar.clear()
+        if self.cookie_model is not None:
+            self.cookie_model.clear_cookies(domain)
+        logger.info(f"Cleared cookies for {domain or 'all domains'}")
+
+    async def close(self):
+        """保存 Cookie 并关闭所有引擎的连接"""
+        self.save_cookies()
+        for transport in self.transports.values():
+            await transport.close()
+        await self.resolver.close()
 
-    async def send_request(self, method, url, headers=None, body=None):
+    async def send_request(self, method, url, headers=None, body=None, retry_policy=None, timeout=None,
+                           transport=None):
+        """发送请求, 按 retry_policy 重试或对冲
+
+        Args:
+            transport: 引擎名称, 为空时按域名配置选择
+
+        Returns:
+            HttpResult: 传输失败时 status 为 None, error_kind 描述失败类型;
+                        每次尝试记录在 attempts 中
+        """
+        policy = retry_policy or NO_RETRY
+        can_retry = policy.allows(method)
+        timeout = timeout or self.timeout
+        start = time.perf_counter()
+        attempts = []
+        engine = None
+        try:
+            engine = self.select_transport(url, transport)
+            send = engine.send
+            request = (method, url, headers, body, timeout)
+            retry_number = 0
+            while True:
+                hedge_delay = None
+                if policy.hedge and can_retry:
+                    hedge_delay = latency_tracker.hedge_delay(url, policy)
+                kind = 'retry' if retry_number else 'primary'
+                try:
+                    result = await self._hedged_attempt(send, request, start, attempts, kind, hedge_delay)
+                    error = None
+                except Exception as e:
+                    if not classify_error(e).retryable:
+                        raise
+                    result, error = None, e
+
+                if error is not None:
+                    should_retry = policy.retry_connection_errors
+                else:
+                    should_retry = result.status in policy.retry_statuses
+                if not (should_retry and can_retry and retry_number < policy.max_retries):
+                    if error is not None:
+                        raise error
+                    break
+
+                retry_number += 1
+                retry_after = None
+                if result is not None:
+                    attempts[result.attempt - 1]['outcome'] = 'retried'
+                    retry_after = parse_retry_after(result.headers.get('Retry-After'))
+                delay = policy.backoff_delay(retry_number, retry_after)
+                instrumentation.count('http.retry')
+                logger.info("Retrying {} {} in {:.0f} ms (retry {}/{}, reason: {})",
+                            method, url, delay * 1000, retry_number, policy.max_retries,
+                            type(error).__name__ if error else result.status)
+                await asyncio.sleep(delay)
+
+            attempts[result.attempt - 1]['outcome'] = 'used'
+            result.elapsed_ms = (time.perf_counter() - start) * 1000
+            result.attempts = attempts
+            result.transport = engine.name
+            self.schedule_cookie_save()
+            return result
+
+        except Exception as e:
+            result = HttpResult.from_error(e, (time.perf_counter() - start) * 1000, attempts, timeout)
+            result.transport = engine.name if engine else transport
+            logger.warning("Request failed ({}): {} {}: {}", result.error_kind.value, method, url, e)
+            return result
+
+    async def _hedged_attempt(self, send, request, start, attempts, kind, hedge_delay):
+        """发送一次请求; 设置了对冲延迟时, 超过延迟未返回则再发一个相同请求, 取先成功的结果"""
+        method, url = request[0], request[1]
+        primary = asyncio.ensure_future(self._attempt(send, request, start, attempts, kind))
+        if hedge_delay is None:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        instrumentation.count('http.hedge.fired')
+        logger.debug("Hedging {} {} after {:.0f} ms", method, url, hedge_delay * 1000)
+        hedge = asyncio.ensure_future(self._attempt(send, request, start, attempts, 'hedge'))
+        pending = {primary, hedge}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            instrumentation.count('http.hedge.won')
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # 取消较慢的请求
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _attempt(self, send, request, start, attempts, kind):
+        """执行单次请求, 并在 attempts 中记录开始时间、耗时、重定向链和结果
+
+        域名配置了限速时先排队获取名额, 排队时间记录在 queue_ms 中, elapsed_ms 只包含网络耗时。
+
+        Args:
+            send: 引擎的发送函数 send(request, trace_context) -> HttpResult
+            request: (method, url, headers, body, timeout)
+        """
+        url = request[1]
+        attempt_start = time.perf_counter()
+        trace_context = new_trace_context(start)
+        record = {
+            'number': len(attempts) + 1,
+            'kind': kind,
+            'start_ms': (attempt_start - start) * 1000,
+            'queue_ms': None,
+            'elapsed_ms': None,
+            'status': None,
+            'error': None,
+            'outcome': 'pending',
+            'hops': trace_context['hops']
+        }
+        attempts.append(record)
+        limiter = self.rate_limiter.limiter_for(url)
+        if limiter is not None:
+            try:
+                record['queue_ms'] = await limiter.acquire()
+            except asyncio.CancelledError:
+                record.update(queue_ms=(time.perf_counter() - attempt_start) * 1000, outcome='cancelled')
+                raise
+        send_start = time.perf_counter()
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    data=body if body else None,
-                    verify_ssl=False,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as response:
-                    status = response.status
-                    # 读取原始字节数据
-                    content = await response.read()
-                    
-                    # 检测编码
-                    encoding = response.get_encoding()
-                    if not encoding:
-                        detected = chardet.detect(content)
-                        encoding = detected['encoding'] or 'utf-8'
-                    
-                    # 使用检测到的编码解码内容
-                    text = content.decode(encoding, errors='replace')
-                    
-                    return {'status': status, 'text': text}
-                    
-        except aiohttp.ClientSSLError as e:
-            return {
-                'status': 495,  # SSL Certificate Error
-                'text': f"SSL 证书验证失败: {str(e)}"
-            }
-        except asyncio.TimeoutError:
-            return {
-                'status': 408,  # Request Timeout
-                'text': f"请求超时 (超过 {self.timeout} 秒)"
-            }
-        except aiohttp.ClientConnectorError:
-            return {
-                'status': 503,  # Service Unavailable
-                'text': "连接错误，请检查网络或URL是否正确"
-            }
+            result = await send(request, trace_context)
+        except asyncio.CancelledError:
+            record.update(elapsed_ms=(time.perf_counter() - send_start) * 1000, outcome='cancelled')
+            raise
         except Exception as e:
-            return {
-                'status': 500,  # Internal Server Error
-                'text': f"请求失败: {str(e)}"
-            }
\ No newline at end of file
+            record.update(elapsed_ms=(time.perf_counter() - send_start) * 1000,
+                          error=classify_error(e).value, outcome='failed')
+            raise
+        finally:
+            if limiter is not None:
+                limiter.release()
+
+        elapsed_ms = (time.perf_counter() - send_start) * 1000
+        record.update(elapsed_ms=elapsed_ms, status=result.status, outcome='completed')
+        if result.status < 500:
+            latency_tracker.observe(url, elapsed_ms)
+        result.attempt = record['number']
+        return result
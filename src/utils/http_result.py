@@ -0,0 +1,222 @@
+"""
+请求结果: 区分真实的 HTTP 状态码与客户端传输错误(DNS、连接、TLS、超时、连接重置)
+"""
+import ssl
+import errno
+import socket
+import asyncio
+from enum import Enum
+import aiohttp
+import chardet
+from multidict import CIMultiDict
+from src.utils.instrumentation import instrumentation
+from src.utils.response_body import ResponseBody, detect_body_kind
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# aiohttp 3.10 之前没有单独的 DNS 错误类型
+_DNS_ERROR = getattr(aiohttp, 'ClientConnectorDNSError', None)
+_RESET_ERRNOS = {errno.ECONNRESET, errno.EPIPE, errno.ECONNABORTED}
+
+
+class ErrorKind(str, Enum):
+    """客户端传输错误类型"""
+    DNS = 'dns'
+    CONNECT = 'connect'
+    TLS = 'tls'
+    TIMEOUT = 'timeout'
+    RESET = 'reset'
+    OTHER = 'other'
+
+    @property
+    def label(self):
+        return {
+            ErrorKind.DNS: "DNS Lookup Failed",
+            ErrorKind.CONNECT: "Connection Failed",
+            ErrorKind.TLS: "TLS Error",
+            ErrorKind.TIMEOUT: "Timeout",
+            ErrorKind.RESET: "Connection Reset",
+            ErrorKind.OTHER: "Client Error",
+        }[self]
+
+    @property
+    def retryable(self):
+        """连接类错误可以重试; TLS 错误和其他客户端错误重试也不会成功"""
+        return self in (ErrorKind.DNS, ErrorKind.CONNECT, ErrorKind.TIMEOUT, ErrorKind.RESET)
+
+
+def _classify_httpx_error(error):
+    """httpx 异常没有细分 DNS/TLS, 根据异常链中的底层 OSError 判断"""
+    if isinstance(error, httpx.TimeoutException):
+        return ErrorKind.TIMEOUT
+    cause = error
+    while cause is not None:
+        if isinstance(cause, ssl.SSLError):
+            return ErrorKind.TLS
+        if isinstance(cause, socket.gaierror):
+            return ErrorKind.DNS
+        cause = cause.__cause__ or cause.__context__
+    if isinstance(error, httpx.ConnectError):
+        return ErrorKind.CONNECT
+    if isinstance(error, (httpx.RemoteProtocolError, httpx.ReadError, httpx.WriteError)):
+        return ErrorKind.RESET
+    return ErrorKind.OTHER
+
+
+def classify_error(error):
+    """将请求异常归类为 ErrorKind"""
+    if httpx is not None and isinstance(error, httpx.TransportError):
+        return _classify_httpx_error(error)
+    if isinstance(error, (aiohttp.ClientSSLError, ssl.SSLError)):
+        return ErrorKind.TLS
+    if isinstance(error, asyncio.TimeoutError):
+        return ErrorKind.TIMEOUT
+    if _DNS_ERROR is not None and isinstance(error, _DNS_ERROR):
+        return ErrorKind.DNS
+    if isinstance(error, aiohttp.ClientConnectorError):
+        if isinstance(getattr(error, 'os_error', None), socket.gaierror):
+            return ErrorKind.DNS
+        return ErrorKind.CONNECT
+    if isinstance(error, (aiohttp.ServerDisconnectedError, aiohttp.ClientPayloadError, ConnectionResetError)):
+        return ErrorKind.RESET
+    if isinstance(error, aiohttp.ClientOSError) and error.errno in _RESET_ERRNOS:
+        return ErrorKind.RESET
+    return ErrorKind.OTHER
+
+
+class HttpResult:
+    """一次请求的结果
+
+    成功收到响应时 status 为服务器返回的状态码, error_kind 为 None;
+    传输失败时 status 为 None, error_kind/error_message 描述失败原因。
+    响应体以原始字节保存(大响应写入临时文件), text 在第一次访问时才解码;
+    二进制响应(is_binary)应通过 body 按需读取, 不要访问 text。
+    """
+
+    def __init__(self, status=None, reason='', headers=None, content=b'', encoding=None,
+                 elapsed_ms=None, attempts=None, error_kind=None, error_message='', attempt=None,
+                 url=None, hops=None, http_version=None, transport=None):
+        self.status = status
+        self.reason = reason or ''
+        self.headers = headers if headers is not None else CIMultiDict()  # 支持多值响应头
+        self.body = content if isinstance(content, ResponseBody) else ResponseBody(content or b'')
+        self.encoding = encoding
+        self.elapsed_ms = elapsed_ms
+        self.attempts = attempts or []
+        self.error_kind = error_kind
+        self.error_message = error_message
+        self.attempt = attempt  # 最终采用的尝试编号
+        self.url = url  # 重定向后的最终地址
+        self.hops = hops or []  # 重定向链中每一跳的耗时与连接信息
+        self.http_version = http_version  # 如 "HTTP/1.1", "HTTP/2"
+        self.transport = transport  # 发送请求的引擎名称
+        self._text = None
+        self._detected_encoding = None
+        self._body_kind = None
+
+    @classmethod
+    def from_error(cls, error, elapsed_ms=None, attempts=None, timeout=None):
+        """根据异常创建传输错误结果"""
+        kind = classify_error(error)
+        if kind == ErrorKind.TIMEOUT and timeout is not None:
+            message = f"请求超时 (超过 {timeout} 秒)"
+        elif kind == ErrorKind.TLS:
+            message = f"SSL 证书验证失败: {str(error)}"
+        elif kind in (ErrorKind.DNS, ErrorKind.CONNECT):
+            message = f"连接错误，请检查网络或URL是否正确: {str(error)}"
+        else:
+            message = f"请求失败: {str(error) or type(error).__name__}"
+        return cls(elapsed_ms=elapsed_ms, attempts=attempts, error_kind=kind, error_message=message)
+
+    @property
+    def is_error(self):
+        """是否为客户端传输错误(没有收到 HTTP 响应)"""
+        return self.error_kind is not None
+
+    @property
+    def ok(self):
+        return self.status is not None and 200 <= self.status < 400
+
+    @property
+    def content(self):
+        """完整的响应体 bytes"""
+        return self.body.getvalue()
+
+    @property
+    def size(self):
+        return self.body.size
+
+    @property
+    def content_type(self):
+        """去掉参数的小写 Content-Type"""
+        return self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+
+    @property
+    def body_kind(self):
+        """响应体的显示方式(text/image/msgpack/cbor/protobuf/grpc-web/binary)"""
+        if self._body_kind is None:
+            if self.is_error:
+                self._body_kind = 'text'
+            else:
+                self._body_kind = detect_body_kind(self.content_type, self.body.head())
+        return self._body_kind
+
+    @property
+    def is_binary(self):
+        return self.body_kind != 'text'
+
+    @property
+    def text_encoding(self):
+        """响应文本的编码: 响应头中声明的编码, 否则根据开头部分检测"""
+        if self.encoding:
+            return self.encoding
+        if self._detected_encoding is None:
+            # 只用开头部分检测编码, 大响应不必整体扫描
+            detected = chardet.detect(self.body.head(64 * 1024))
+            self._detected_encoding = detected['encoding'] or 'utf-8'
+        return self._detected_encoding
+
+    @property
+    def text(self):
+        """响应文本, 第一次访问时检测编码并解码; 传输错误时为错误信息
+
+        大响应应通过 body 按需读取(见分页文本视图), 不要访问 text。
+        """
+        if self.is_error:
+            return self.error_message
+        if self._text is None:
+            with instrumentation.span('decode'):
+                self._text = self.content.decode(self.text_encoding, errors='replace')
+        return self._text
+
+    def summary(self):
+        """用于保存历史记录和统计的字段"""
+        return {
+            'status': self.status,
+            'reason': self.reason or None,
+            'error_kind': self.error_kind.value if self.error_kind else None,
+            'elapsed_ms': self.elapsed_ms,
+            'response_size': None if self.is_error else self.size,
+        }
+
+    @property
+    def redirected(self):
+        return len(self.hops) > 1
+
+    def to_dict(self):
+        data = self.summary()
+        data['url'] = self.url
+        data['http_version'] = self.http_version
+        data['transport'] = self.transport
+        data['headers'] = list(self.headers.items())
+        data['hops'] = self.hops
+        data['attempts'] = self.attempts
+        return data
+
+    def __repr__(self):
+        if self.is_error:
+            return f"<HttpResult error={self.error_kind.value}>"
+        return f"<HttpResult status={self.status} size={self.size}>"
@@ -0,0 +1,152 @@
+"""
+请求跟踪: 记录重定向链中每一跳的耗时、DNS 解析、建连以及连接复用情况
+
+跟踪上下文由 HttpClient 为每次尝试创建; aiohttp 通过 TraceConfig 回调更新,
+HTTP/2 传输在 httpx 的事件钩子中调用同样的函数。
+"""
+import time
+import aiohttp
+from yarl import URL
+from src.utils.instrumentation import instrumentation
+
+
+def new_trace_context(start):
+    """创建一次尝试的跟踪上下文, start 为整个请求的开始时间(perf_counter)"""
+    return {'start': start, 'hops': []}
+
+
+def _now_ms(context):
+    return (time.perf_counter() - context['start']) * 1000
+
+
+def current_hop(context):
+    """当前(最后一跳)的记录, 没有时返回 None"""
+    if not context or not context['hops']:
+        return None
+    return context['hops'][-1]
+
+
+def start_hop(context, method, url):
+    context['hops'].append({
+        'method': method,
+        'url': str(url),
+        'start_ms': _now_ms(context),
+        'elapsed_ms': None,
+        'status': None,
+        'http_version': None,
+        'stream_id': None,  # HTTP/2 流编号
+        'connection': None,
+        'dns_ms': None,
+        'connect_ms': None,
+    })
+
+
+def finish_hop(context, status, http_version=None, stream_id=None):
+    hop = current_hop(context)
+    if hop is not None:
+        hop.update(status=status, http_version=http_version, stream_id=stream_id,
+                   elapsed_ms=_now_ms(context) - hop['start_ms'])
+
+
+def connection_started(context):
+    hop = current_hop(context)
+    if hop is not None:
+        hop['connect_start'] = _now_ms(context)
+
+
+def connection_created(context):
+    instrumentation.count('http.connection.new')
+    hop = current_hop(context)
+    if hop is not None:
+        hop['connection'] = 'new'
+        if 'connect_start' in hop:
+            hop['connect_ms'] = _now_ms(context) - hop.pop('connect_start')
+
+
+def connection_reused(context):
+    instrumentation.count('http.connection.reused')
+    hop = current_hop(context)
+    if hop is not None:
+        hop['connection'] = 'reused'
+        hop['connect_ms'] = 0.0
+
+
+def redirect_method(method, status):
+    """重定向后使用的请求方法"""
+    if (status == 303 and method != 'HEAD') or (status in (301, 302) and method == 'POST'):
+        return 'GET'
+    return method
+
+
+def _response_version(response):
+    version = response.version
+    return f"HTTP/{version.major}.{version.minor}" if version else None
+
+
+async def _on_request_start(session, trace_config_ctx, params):
+    context = trace_config_ctx.trace_request_ctx
+    if context:
+        start_hop(context, params.method, params.url)
+
+
+async def _on_request_redirect(session, trace_config_ctx, params):
+    # 重定向时 aiohttp 不会再触发 request_start, 在这里结束当前一跳并开始下一跳
+    context = trace_config_ctx.trace_request_ctx
+    response = params.response
+    finish_hop(context, response.status, _response_version(response))
+    hop = current_hop(context)
+    location = response.headers.get('Location') or response.headers.get('URI')
+    if hop is None or not location:
+        return
+    start_hop(context, redirect_method(hop['method'], response.status), response.url.join(URL(location)))
+
+
+async def _on_request_end(session, trace_config_ctx, params):
+    finish_hop(trace_config_ctx.trace_request_ctx, params.response.status, _response_version(params.response))
+
+
+async def _on_dns_start(session, trace_config_ctx, params):
+    context = trace_config_ctx.trace_request_ctx
+    hop = current_hop(context)
+    if hop is not None:
+        hop['dns_start'] = _now_ms(context)
+
+
+async def _on_dns_end(session, trace_config_ctx, params):
+    context = trace_config_ctx.trace_request_ctx
+    hop = current_hop(context)
+    if hop is not None and 'dns_start' in hop:
+        hop['dns_ms'] = _now_ms(context) - hop.pop('dns_start')
+
+
+async def _on_dns_cache_hit(session, trace_config_ctx, params):
+    hop = current_hop(trace_config_ctx.trace_request_ctx)
+    if hop is not None:
+        hop['dns_ms'] = 0.0
+
+
+async def _on_connection_create_start(session, trace_config_ctx, params):
+    connection_started(trace_config_ctx.trace_request_ctx)
+
+
+async def _on_connection_create_end(session, trace_config_ctx, params):
+    connection_created(trace_config_ctx.trace_request_ctx)
+
+
+async def _on_connection_reuse(session, trace_config_ctx, params):
+    connection_reused(trace_config_ctx.trace_request_ctx)
+
+
+def create_trace_config():
+    """创建请求跟踪配置, 通过 session.request(trace_request_ctx=...) 传入跟踪上下文"""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_request_redirect.append(_on_request_redirect)
+    trace_config.on_request_end.append(_on_request_end)
+    trace_config.on_dns_resolvehost_start.append(_on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(_on_dns_end)
+    trace_config.on_dns_cache_hit.append(_on_dns_cache_hit)
+    trace_config.on_connection_create_start.append(_on_connection_create_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(_on_connection_reuse)
+    return trace_config
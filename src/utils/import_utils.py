@@ -0,0 +1,344 @@
+"""
+cURL 命令与 OpenAPI 3 规范解析, 生成可批量保存的 API 数据
+"""
+import re
+import base64
+import shlex
+from urllib.parse import urlparse, urlencode
+from src.utils import json_utils
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+DEFAULT_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "User-Agent": "FreeHttp/1.0"
+}
+HTTP_METHODS = ('get', 'post', 'put', 'delete', 'patch', 'head', 'options')
+MAX_SCHEMA_DEPTH = 6  # 根据 schema 生成示例时的最大嵌套深度
+
+
+class ImportFormatError(ValueError):
+    """导入内容格式错误"""
+
+
+def _make_body(body_text, headers):
+    """请求体文本转换为 ApiModel 存储的格式: JSON 对象直接保存, 其他内容保存在 content 字段"""
+    if not body_text:
+        return {}
+    content_type = next((v for k, v in headers.items() if k.lower() == 'content-type'), '')
+    if 'json' in content_type.lower():
+        try:
+            body = json_utils.loads(body_text)
+            if isinstance(body, dict):
+                return body
+        except ValueError:
+            pass
+    return {'content': body_text}
+
+
+def _default_name(method, url):
+    parsed = urlparse(url)
+    return f"{method} {parsed.netloc}{parsed.path or '/'}"
+
+
+# ---------- cURL ----------
+
+def split_curl_commands(text):
+    """将粘贴的文本拆分为多条 curl 命令, 支持 \\ 和 ^ 续行"""
+    joined = re.sub(r'[\\^]\r?\n', ' ', text)
+    commands = []
+    current = []
+    for line in joined.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith('curl ') and current:
+            commands.append(' '.join(current))
+            current = []
+        current.append(stripped)
+    if current:
+        commands.append(' '.join(current))
+    return [command for command in commands if command.startswith('curl')]
+
+
+def parse_curl(command, name=None):
+    """解析单条 curl 命令
+
+    Returns:
+        dict: name, method, url, headers, body, timeout
+    """
+    try:
+        tokens = shlex.split(command)
+    except ValueError as e:
+        raise ImportFormatError(f"Invalid curl command: {e}")
+    if not tokens or tokens[0] != 'curl':
+        raise ImportFormatError("Command must start with curl")
+
+    method = None
+    url = None
+    headers = {}
+    data_parts = []
+    use_get = False
+    timeout = 30
+    # 带参数但与请求内容无关的选项
+    skip_value_options = {'-o', '--output', '-w', '--write-out', '--connect-timeout',
+                          '--retry', '-e', '--referer', '--cacert', '--cert', '--key',
+                          '-x', '--proxy', '--resolve', '-c', '--cookie-jar'}
+    data_options = ('-d', '--data', '--data-raw', '--data-binary', '--data-ascii', '--data-urlencode')
+    value_options = skip_value_options | set(data_options) | {
+        '-X', '--request', '-H', '--header', '--json', '-u', '--user', '-A', '--user-agent',
+        '-b', '--cookie', '-m', '--max-time', '--url'}
+
+    i = 1
+    while i < len(tokens):
+        token = tokens[i]
+        if not token.startswith('--') and len(token) > 2 and token[:2] in value_options:
+            # 短选项的值可以直接跟在后面, 如 -XPUT, -HAccept:json
+            token, value = token[:2], token[2:]
+            i += 1
+        elif token in value_options:
+            if i + 1 >= len(tokens):
+                raise ImportFormatError(f"Option {token} requires a value")
+            value = tokens[i + 1]
+            i += 2
+        else:
+            value = None
+            i += 1
+
+        if token in ('-X', '--request'):
+            method = value.upper()
+        elif token in ('-H', '--header'):
+            key, _, header_value = value.partition(':')
+            headers[key.strip()] = header_value.strip()
+        elif token in data_options:
+            data_parts.append(value)
+        elif token == '--json':
+            data_parts.append(value)
+            headers.setdefault('Content-Type', 'application/json')
+            headers.setdefault('Accept', 'application/json')
+        elif token in ('-u', '--user'):
+            headers['Authorization'] = 'Basic ' + base64.b64encode(value.encode('utf-8')).decode('ascii')
+        elif token in ('-A', '--user-agent'):
+            headers['User-Agent'] = value
+        elif token in ('-b', '--cookie'):
+            headers['Cookie'] = value
+        elif token in ('-m', '--max-time'):
+            try:
+                timeout = max(1, int(float(value)))
+            except ValueError:
+                pass
+        elif token == '--url':
+            url = value
+        elif token in ('-G', '--get'):
+            use_get = True
+        elif token in ('-I', '--head'):
+            method = 'HEAD'
+        elif token in skip_value_options or token.startswith('-'):
+            # 与请求内容无关的选项和开关(如 --compressed, -k, -L, -s)
+            pass
+        else:
+            url = token
+
+    if not url:
+        raise ImportFormatError("No URL found in curl command")
+    if '://' not in url:
+        url = 'http://' + url
+
+    body_text = '&'.join(data_parts)
+    if use_get and body_text:
+        url += ('&' if '?' in url else '?') + body_text
+        body_text = ''
+    if not method:
+        method = 'POST' if body_text else 'GET'
+    if body_text and not any(k.lower() == 'content-type' for k in headers):
+        headers['Content-Type'] = 'application/x-www-form-urlencoded'
+
+    return {
+        'name': name or _default_name(method, url),
+        'method': method,
+        'url': url,
+        'headers': headers,
+        'body': _make_body(body_text, headers),
+        'timeout': timeout,
+    }
+
+
+def parse_curl_commands(text):
+    """解析粘贴的一条或多条 curl 命令"""
+    commands = split_curl_commands(text)
+    if not commands:
+        raise ImportFormatError("No curl command found")
+    return [parse_curl(command) for command in commands]
+
+
+# ---------- OpenAPI 3 ----------
+
+def load_openapi_spec(path):
+    """加载 OpenAPI 规范文件, 支持 JSON 和 YAML(需要安装 PyYAML)"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        text = f.read()
+    if text.lstrip().startswith('{'):
+        return json_utils.loads(text)
+    if yaml is None:
+        raise ImportFormatError("YAML specs require PyYAML (pip install pyyaml)")
+    return yaml.safe_load(text)
+
+
+class _RefResolver:
+    """解析规范内部的 $ref 引用, 并缓存结果"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.cache = {}
+
+    def resolve(self, node):
+        seen = set()
+        while isinstance(node, dict) and '$ref' in node:
+            ref = node['$ref']
+            if ref in seen or not ref.startswith('#/'):
+                return {}
+            seen.add(ref)
+            if ref not in self.cache:
+                target = self.spec
+                for part in ref[2:].split('/'):
+                    part = part.replace('~1', '/').replace('~0', '~')
+                    target = target.get(part, {}) if isinstance(target, dict) else {}
+                self.cache[ref] = target
+            node = self.cache[ref]
+        return node if node is not None else {}
+
+
+def _schema_example(schema, resolver, depth=0):
+    """根据 schema 生成示例值"""
+    schema = resolver.resolve(schema)
+    if not isinstance(schema, dict) or depth > MAX_SCHEMA_DEPTH:
+        return None
+    if 'example' in schema:
+        return schema['example']
+    if 'default' in schema:
+        return schema['default']
+    if schema.get('enum'):
+        return schema['enum'][0]
+    for combiner in ('allOf', 'oneOf', 'anyOf'):
+        if schema.get(combiner):
+            if combiner == 'allOf':
+                merged = {}
+                for sub in schema['allOf']:
+                    value = _schema_example(sub, resolver, depth + 1)
+                    if isinstance(value, dict):
+                        merged.update(value)
+                return merged
+            return _schema_example(schema[combiner][0], resolver, depth + 1)
+
+    schema_type = schema.get('type')
+    if schema_type == 'object' or 'properties' in schema:
+        return {
+            key: _schema_example(value, resolver, depth + 1)
+            for key, value in (schema.get('properties') or {}).items()
+        }
+    if schema_type == 'array':
+        item = _schema_example(schema.get('items', {}), resolver, depth + 1)
+        return [item] if item is not None else []
+    return {
+        'string': '',
+        'integer': 0,
+        'number': 0,
+        'boolean': False,
+    }.get(schema_type)
+
+
+def _media_example(media, resolver):
+    """从 media type 对象中获取示例"""
+    media = resolver.resolve(media)
+    if 'example' in media:
+        return media['example']
+    examples = media.get('examples')
+    if isinstance(examples, dict) and examples:
+        first = resolver.resolve(next(iter(examples.values())))
+        if 'value' in first:
+            return first['value']
+    if 'schema' in media:
+        return _schema_example(media['schema'], resolver)
+    return None
+
+
+def _server_url(servers):
+    """取第一个 server 的地址, 并替换变量为默认值"""
+    if not servers:
+        return ''
+    server = servers[0]
+    url = server.get('url', '')
+    for key, variable in (server.get('variables') or {}).items():
+        url = url.replace('{' + key + '}', str(variable.get('default', '')))
+    return url.rstrip('/')
+
+
+def parse_openapi(spec):
+    """将 OpenAPI 3 规范中的每个操作转换为 API 数据
+
+    Returns:
+        list: 每个元素包含 name, method, url, headers, body, timeout
+    """
+    if not isinstance(spec, dict) or 'paths' not in spec:
+        raise ImportFormatError("Not an OpenAPI document: missing 'paths'")
+    if not str(spec.get('openapi', '')).startswith('3'):
+        raise ImportFormatError("Only OpenAPI 3.x documents are supported")
+
+    resolver = _RefResolver(spec)
+    base_url = _server_url(spec.get('servers'))
+    title = (spec.get('info') or {}).get('title', '')
+    apis = []
+
+    for path, path_item in (spec.get('paths') or {}).items():
+        path_item = resolver.resolve(path_item)
+        path_parameters = path_item.get('parameters') or []
+        path_base_url = _server_url(path_item.get('servers')) or base_url
+        for method in HTTP_METHODS:
+            operation = path_item.get(method)
+            if not isinstance(operation, dict):
+                continue
+            operation_url = _server_url(operation.get('servers')) or path_base_url
+
+            headers = dict(DEFAULT_HEADERS)
+            query = []
+            for parameter in path_parameters + (operation.get('parameters') or []):
+                parameter = resolver.resolve(parameter)
+                location = parameter.get('in')
+                value = parameter.get('example')
+                if value is None and 'schema' in parameter:
+                    value = _schema_example(parameter['schema'], resolver)
+                if location == 'header':
+                    headers[parameter.get('name', '')] = '' if value is None else str(value)
+                elif location == 'query' and parameter.get('required'):
+                    query.append((parameter.get('name', ''), '' if value is None else str(value)))
+
+            body_text = ''
+            request_body = resolver.resolve(operation.get('requestBody') or {})
+            content = request_body.get('content') or {}
+            if content:
+                media_type = 'application/json' if 'application/json' in content else next(iter(content))
+                headers['Content-Type'] = media_type
+                example = _media_example(content[media_type], resolver)
+                if example is not None:
+                    body_text = example if isinstance(example, str) else json_utils.dumps(example)
+
+            url = operation_url + path
+            if query:
+                url += '?' + urlencode(query)
+            name = operation.get('operationId') or f"{method.upper()} {path}"
+            if title:
+                name = f"{title}: {name}"
+
+            apis.append({
+                'name': name,
+                'method': method.upper(),
+                'url': url,
+                'headers': headers,
+                'body': _make_body(body_text, headers),
+                'timeout': 30,
+            })
+    return apis
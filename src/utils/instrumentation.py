@@ -0,0 +1,296 @@
+"""
+轻量级性能埋点: 计时 span、计数器、直方图、事件循环延迟监控与按需性能分析
+
+默认关闭, 关闭时 span() 返回共享的空上下文, 热路径上几乎没有开销。
+"""
+import os
+import time
+import asyncio
+import cProfile
+import functools
+from bisect import bisect_left
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime
+from loguru import logger
+
+try:
+    import yappi
+except ImportError:
+    yappi = None
+
+# 直方图桶上界(毫秒), 最后一个桶收集所有更大的值
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+                   1000, 2500, 5000, 10000, 30000)
+
+_NULL_SPAN = nullcontext()
+
+
+class Histogram:
+    """固定桶的直方图, 用于统计耗时分布(毫秒)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @classmethod
+    def from_counts(cls, counts, total, maximum, buckets=DEFAULT_BUCKETS):
+        """由已汇总的桶计数(如数据库中的样本)重建直方图"""
+        histogram = cls(buckets)
+        histogram.counts = list(counts) + [0] * (len(histogram.counts) - len(counts))
+        histogram.count = sum(histogram.counts)
+        histogram.total = total
+        histogram.max = maximum
+        return histogram
+
+    def merge(self, other):
+        """累加另一个桶边界相同的直方图"""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.max > self.max:
+            self.max = other.max
+        return self
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """按桶估算百分位数, 返回所在桶的上界"""
+        if not self.count:
+            return 0.0
+        target = p / 100.0 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target and bucket_count:
+                if index < len(self.buckets):
+                    return min(self.buckets[index], self.max)
+                return self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.max,
+            'buckets': list(self.buckets),
+            'counts': list(self.counts),
+        }
+
+
+class _Span:
+    """记录一次耗时, 结束时写入 Instrumentation"""
+    __slots__ = ('owner', 'name', 'start')
+
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.owner.record(self.name, (time.perf_counter() - self.start) * 1000, exc_type is not None)
+        return False
+
+
+class Instrumentation:
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(Instrumentation, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.enabled = False
+        self.recent_spans = deque(maxlen=500)
+        self.histograms = {}
+        self.counters = {}
+        self.loop_lag = Histogram()
+        self.last_loop_lag = 0.0
+        self._lag_task = None
+        self._profiler = None
+        self._profile_engine = None
+        self._profile_remaining = 0
+        self._profile_path = None
+        self.last_profile_path = None
+
+    def set_enabled(self, enabled):
+        """开启或关闭埋点"""
+        self.enabled = bool(enabled)
+        logger.info(f"Instrumentation {'enabled' if self.enabled else 'disabled'}")
+        if self.enabled:
+            self.start_loop_monitor()
+        else:
+            self.stop_loop_monitor()
+
+    def span(self, name):
+        """返回计时上下文, 关闭时返回空上下文"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, duration_ms, failed=False):
+        """记录一个 span 的耗时"""
+        self.recent_spans.append((time.time(), name, duration_ms, failed))
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(duration_ms)
+        if failed:
+            self.count(f"{name}.errors")
+
+    def count(self, name, value=1):
+        """累加计数器"""
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self):
+        """清空所有统计数据"""
+        self.recent_spans.clear()
+        self.histograms.clear()
+        self.counters.clear()
+        self.loop_lag = Histogram()
+        self.last_loop_lag = 0.0
+
+    def snapshot(self):
+        """返回当前统计数据的快照, 供诊断面板展示"""
+        return {
+            'spans': list(self.recent_spans),
+            'histograms': {name: h.snapshot() for name, h in self.histograms.items()},
+            'counters': dict(self.counters),
+            'loop_lag': self.loop_lag.snapshot(),
+            'last_loop_lag': self.last_loop_lag,
+            'profiling': self._profile_remaining,
+            'last_profile_path': self.last_profile_path,
+        }
+
+    # ---------- 事件循环延迟监控 ----------
+
+    def start_loop_monitor(self, interval=0.1):
+        """在当前事件循环(qasync)上启动延迟监控任务"""
+        if self._lag_task and not self._lag_task.done():
+            return
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            logger.warning("No event loop available for loop lag monitor")
+            return
+        self._lag_task = loop.create_task(self._monitor_loop_lag(interval))
+        logger.debug("Event loop lag monitor started")
+
+    def stop_loop_monitor(self):
+        if self._lag_task:
+            self._lag_task.cancel()
+            self._lag_task = None
+            logger.debug("Event loop lag monitor stopped")
+
+    async def _monitor_loop_lag(self, interval):
+        while True:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            lag_ms = max(0.0, (time.perf_counter() - expected) * 1000)
+            self.last_loop_lag = lag_ms
+            self.loop_lag.observe(lag_ms)
+
+    # ---------- 按需性能分析 ----------
+
+    @staticmethod
+    def available_profilers():
+        engines = ['cProfile']
+        if yappi is not None:
+            engines.append('yappi')
+        return engines
+
+    def profile_next_requests(self, count, output_dir, engine='cProfile'):
+        """对接下来 count 个请求进行性能分析, 结果写入 output_dir"""
+        if engine == 'yappi' and yappi is None:
+            raise RuntimeError("yappi is not installed")
+        os.makedirs(output_dir, exist_ok=True)
+        suffix = 'pstat' if engine == 'yappi' else 'prof'
+        filename = f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{suffix}"
+        self._profile_path = os.path.join(output_dir, filename)
+        self._profile_engine = engine
+        self._profile_remaining = int(count)
+        logger.info(f"Profiling next {count} requests with {engine} -> {self._profile_path}")
+
+    def request_started(self):
+        """请求开始时调用, 如已预约分析则启动分析器"""
+        if self._profile_remaining <= 0 or self._profiler is not None:
+            return
+        if self._profile_engine == 'yappi':
+            yappi.set_clock_type('wall')
+            yappi.start()
+            self._profiler = 'yappi'
+        else:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def request_finished(self):
+        """请求结束时调用, 分析完指定数量的请求后写出结果"""
+        if self._profiler is None:
+            return
+        self._profile_remaining -= 1
+        if self._profile_remaining > 0:
+            return
+        try:
+            if self._profiler == 'yappi':
+                yappi.stop()
+                yappi.get_func_stats().save(self._profile_path, type='pstat')
+                yappi.clear_stats()
+            else:
+                self._profiler.disable()
+                self._profiler.dump_stats(self._profile_path)
+            self.last_profile_path = self._profile_path
+            logger.info(f"Profile saved: {self._profile_path}")
+        except Exception as e:
+            logger.error(f"Failed to save profile: {str(e)}")
+        finally:
+            self._profiler = None
+            self._profile_remaining = 0
+
+
+instrumentation = Instrumentation()
+
+
+def timed(name):
+    """为同步或异步函数添加计时 span 的装饰器"""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with instrumentation.span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with instrumentation.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
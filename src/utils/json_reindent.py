@@ -0,0 +1,212 @@
+"""
+流式 JSON 格式化: 直接在字节上分词并重新缩进, 不构建 Python 对象树
+
+输入可以是 bytes 或 mmap(UTF-8), 输出分块写入回调, 内存占用与输入大小无关。
+字符串和数字按原样输出(只有含 \\u 转义的字符串会还原为字符, 与 ensure_ascii=False 一致);
+需要排序键等改变内容的格式化时才退回完整解析(json_utils)。
+"""
+import re
+import json
+from src.utils import json_utils
+
+WINDOW_SIZE = 64 * 1024  # 每次分词的输入字节数, 每个窗口的输出写入一次
+
+_STRING = rb'"[^"\\\x00-\x1f]*(?:\\.[^"\\\x00-\x1f]*)*"'
+# 记号: 字符串(可以带前面的逗号和后面的冒号)、结构字符、数字/字面量、空白;
+# 其他字符(包括未闭合字符串的引号)单独成为一个记号。",键:" 合并为一个记号, 记号数约减少三分之一
+_TOKEN = re.compile(
+    rb'(?:,[ \t\n\r]*)?' + _STRING + rb'(?:[ \t\n\r]*:)?'
+    rb'|[{}\[\],:]'
+    rb'|[^ \t\n\r{}\[\],:"]+'
+    rb'|[ \t\n\r]+'
+    rb'|.',
+    re.DOTALL
+)
+_SCALAR = re.compile(rb'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|true|false|null')
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+_QUOTE, _COMMA, _COLON_CHAR = ord('"'), ord(','), ord(':')
+_OPENERS = {ord('{'): b'{', ord('['): b'['}
+_CLOSERS = {ord('}'): b'{', ord(']'): b'['}
+_WHITESPACE = frozenset(b' \t\n\r')
+
+# 解析状态
+_VALUE, _KEY, _COLON, _AFTER, _DONE = range(5)
+
+
+class JsonFormatError(ValueError):
+    """输入不是合法的 JSON"""
+
+    def __init__(self, message, offset):
+        super().__init__(f"{message} near offset {offset}")
+        self.message = message
+        self.offset = offset
+
+
+def _unescape(token):
+    """把含 \\u 转义的字符串还原为 UTF-8 字符(保留 \\" 等必须的转义); 单独的代理项保持原样"""
+    try:
+        return json.dumps(json.loads(token), ensure_ascii=False).encode('utf-8')
+    except (ValueError, UnicodeEncodeError):
+        return token
+
+
+def _tokenize(buffer, start):
+    """按窗口分词, 每次产出一批完整的记号
+
+    窗口末尾可能截断字符串、数字或"键:": 截断的字符串会留下单独的引号记号, 从它开始(否则从倒数第二个
+    记号开始, 键和冒号之间可能隔着空白)留到下一个窗口重新分词。
+    """
+    size = len(buffer)
+    pos = start
+    window = WINDOW_SIZE
+    while pos < size:
+        end = min(size, pos + window)
+        tokens = _TOKEN.findall(buffer, pos, end)
+        if end < size:
+            try:
+                del tokens[tokens.index(b'"'):]
+            except ValueError:
+                del tokens[-2:]
+            if not tokens:
+                # 单个记号超过窗口(如很长的字符串), 扩大窗口重试
+                window *= 2
+                continue
+            window = WINDOW_SIZE
+        yield pos, tokens
+        pos += sum(map(len, tokens))
+
+
+def reindent(buffer, write, indent=2, worker=None):
+    """单遍扫描 JSON 字节并按缩进格式输出
+
+    Args:
+        buffer: UTF-8 编码的 bytes 或 mmap
+        write: 接收输出 bytes 片段的回调
+        indent: 缩进空格数
+        worker: 可选的 BackgroundWorker, 每个窗口检查一次取消
+
+    Returns:
+        bool: 完成返回 True, 已取消返回 False
+
+    Raises:
+        JsonFormatError: 输入不是合法的 JSON(已输出的部分应丢弃); offset 为出错记号的字节位置
+    """
+    breaks = [b'\n']  # breaks[d]: 换行加 d 层缩进
+    stack = []  # 当前所在的容器: b'{' 或 b'['
+    state = _VALUE
+    opened = False  # 刚输出 { 或 [, 如果紧接着就是结束符则输出 {} / []
+    start = len(_UTF8_BOM) if buffer[:3] == _UTF8_BOM else 0
+
+    for offset, tokens in _tokenize(buffer, start):
+        if worker is not None and worker.is_cancelled():
+            return False
+        out = []
+        append = out.append
+        remaining = iter(tokens)
+        try:
+            for token in remaining:
+                first = token[0]
+                if first == _QUOTE or (first == _COMMA and len(token) > 1):
+                    if first == _COMMA:
+                        # ,"键": 或数组中的 ,"字符串"
+                        if state != _AFTER:
+                            raise JsonFormatError("Unexpected ,", offset)
+                        state = _KEY if stack[-1] == b'{' else _VALUE
+                        append(b',' + breaks[len(stack)])
+                        token = token[1:].lstrip()
+                    elif len(token) == 1:
+                        raise JsonFormatError("Unterminated string", offset)
+                    elif opened:
+                        append(breaks[len(stack)])
+                        opened = False
+                    if token[-1] == _COLON_CHAR:
+                        if state != _KEY:
+                            raise JsonFormatError("Unexpected key", offset)
+                        token = token[:-1].rstrip()
+                        append((_unescape(token) if b'\\u' in token else token) + b': ')
+                        state = _VALUE
+                        continue
+                    if state == _KEY:
+                        state = _COLON
+                    elif state == _VALUE:
+                        state = _AFTER if stack else _DONE
+                    else:
+                        raise JsonFormatError("Unexpected string", offset)
+                    append(_unescape(token) if b'\\u' in token else token)
+                elif first == _COMMA:
+                    if state != _AFTER:
+                        raise JsonFormatError("Unexpected ,", offset)
+                    append(b',' + breaks[len(stack)])
+                    state = _KEY if stack[-1] == b'{' else _VALUE
+                elif first == _COLON_CHAR:
+                    if state != _COLON:
+                        raise JsonFormatError("Unexpected :", offset)
+                    append(b': ')
+                    state = _VALUE
+                elif first in _WHITESPACE:
+                    pass
+                elif first in _CLOSERS:
+                    if not stack or stack[-1] != _CLOSERS[first] or not (state == _AFTER or opened):
+                        raise JsonFormatError(f"Unexpected {token.decode()}", offset)
+                    stack.pop()
+                    if opened:
+                        append(token)
+                        opened = False
+                    else:
+                        append(breaks[len(stack)] + token)
+                    state = _AFTER if stack else _DONE
+                elif first in _OPENERS:
+                    if state != _VALUE:
+                        raise JsonFormatError(f"Unexpected {token.decode()}", offset)
+                    depth = len(stack)
+                    if opened:
+                        append(breaks[depth])
+                    stack.append(_OPENERS[first])
+                    if len(breaks) <= depth + 1:
+                        breaks.append(b'\n' + b' ' * (indent * (depth + 1)))
+                    append(token)
+                    opened = True
+                    state = _KEY if token == b'{' else _VALUE
+                else:
+                    if state != _VALUE or not _SCALAR.fullmatch(token):
+                        raise JsonFormatError("Unexpected value", offset)
+                    if opened:
+                        append(breaks[len(stack)])
+                        opened = False
+                    append(token)
+                    state = _AFTER if stack else _DONE
+        except JsonFormatError as e:
+            # 按已消耗的记号长度计算出错记号的位置, 不在每个记号上累加偏移
+            index = len(tokens) - sum(1 for _ in remaining) - 1
+            raise JsonFormatError(e.message, offset + sum(map(len, tokens[:index]))) from None
+        if out:
+            write(b''.join(out))
+
+    if state != _DONE:
+        raise JsonFormatError("Unexpected end of JSON", len(buffer))
+    return True
+
+
+def format_json(data, indent=2, sort_keys=False):
+    """格式化 JSON 文本
+
+    Args:
+        data: str、bytes 或 mmap
+        sort_keys: 需要排序键时使用完整解析
+
+    Returns:
+        str: 格式化后的文本
+
+    Raises:
+        ValueError: 不是合法的 JSON
+    """
+    if sort_keys:
+        if not isinstance(data, str):
+            data = bytes(data)
+        return json_utils.dumps(json_utils.loads(data), indent=indent, sort_keys=True)
+    if isinstance(data, str):
+        data = data.encode('utf-8', errors='surrogatepass')
+    parts = []
+    reindent(data, parts.append, indent)
+    return b''.join(parts).decode('utf-8', errors='replace')
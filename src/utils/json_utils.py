@@ -0,0 +1,79 @@
+"""
+JSON 编解码入口: 安装了 orjson 时使用 orjson, 否则使用标准库 json
+
+同一调用的输出与所用后端无关:
+  - dumps 默认输出非 ASCII 字符(ensure_ascii=False), 分隔符与 json.dumps 默认的 ", " 和 ": " 相同,
+    orjson 不支持这种分隔符, 因此由标准库完成;
+  - compact=True 输出没有空格的紧凑格式, indent=2 输出两个空格缩进, 这两种情况优先使用 orjson;
+  - orjson 不支持的值(超过 64 位的整数、非字符串键、单独的代理字符等)和其他缩进交给标准库。
+浮点数的指数形式可能不同(orjson 输出 1e300, 标准库输出 1e+300), 数值相同;
+NaN/Infinity 会被 orjson 输出为 null, 因此包含这些值时交给标准库, 与标准库一样输出 NaN/Infinity。
+loads 解析超过 64 位的整数时 orjson 返回 float。
+"""
+import json
+import math
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data):
+    """解析 str 或 bytes
+
+    Raises:
+        JSONDecodeError: 不是合法的 JSON(标准库的错误信息)
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity 等 orjson 不接受的输入交给标准库, 错误信息也与标准库一致
+            pass
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps(obj, indent=None, sort_keys=False, ensure_ascii=False, compact=False):
+    """序列化为 str
+
+    Args:
+        indent: 缩进空格数, None 为单行
+        sort_keys: 按键排序
+        ensure_ascii: 转义非 ASCII 字符(只有标准库支持)
+        compact: 单行输出时不加空格, 用于存储和网络传输
+    """
+    if orjson is not None and not ensure_ascii and (indent == 2 or (indent is None and compact)):
+        option = orjson.OPT_INDENT_2 if indent == 2 else 0
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            data = orjson.dumps(obj, option=option)
+        except TypeError:
+            # orjson.JSONEncodeError 是 TypeError 的子类: 不支持的值交给标准库(标准库仍不支持时抛出它的错误)
+            data = None
+        # 只有输出中出现 null 时才需要检查是否有非有限浮点数
+        if data is not None and (b'null' not in data or not _has_non_finite(obj)):
+            return data.decode('utf-8')
+    separators = (',', ':') if compact and indent is None else None
+    return json.dumps(obj, indent=indent, sort_keys=sort_keys, ensure_ascii=ensure_ascii, separators=separators)
+
+
+def _has_non_finite(obj):
+    """obj 中是否包含 NaN/Infinity"""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
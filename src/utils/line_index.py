@@ -0,0 +1,173 @@
+"""
+大文本响应的行索引与分页读取
+
+索引只记录每个固定大小数据块之前的换行符数量, 内存占用与行数无关(每 64 KB 一个整数);
+读取某一行时先二分定位数据块, 再在块内查找换行符。缓冲区可以是 bytes 或临时文件的 mmap。
+"""
+import codecs
+from array import array
+from bisect import bisect_left
+from loguru import logger
+from src.utils.json_reindent import JsonFormatError, reindent
+from src.utils.response_body import ResponseBody
+
+BLOCK_SIZE = 64 * 1024  # 每个索引块的字节数
+LINE_DISPLAY_LIMIT = 4096  # 单行最多读取的字节数, 超长行截断显示
+WRITE_CHUNK = 256 * 1024  # 格式化输出累积到此大小后写入
+
+
+def _count_newlines(buffer, start, end):
+    count = getattr(buffer, 'count', None)
+    if count is not None:
+        return count(b'\n', start, end)
+    return buffer[start:end].count(b'\n')
+
+
+class LineIndex:
+    """按数据块统计换行符的行索引
+
+    用法: LineIndex(buffer).build(worker), build 可以在后台线程中执行。
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.size = len(buffer)
+        self.block_lines = array('Q')  # 第 k 个数据块之前的换行符数量
+        self.newlines = 0
+        self._last = (0, 0)  # 上一次读取的 (行号, 起始偏移), 顺序读取时不必重新定位
+
+    def build(self, worker=None):
+        """统计换行符; 已取消时返回 None
+
+        Args:
+            worker: 可选的 BackgroundWorker, 用于报告进度和检查取消
+        """
+        newlines = 0
+        for start in range(0, self.size, BLOCK_SIZE):
+            self.block_lines.append(newlines)
+            newlines += _count_newlines(self.buffer, start, min(start + BLOCK_SIZE, self.size))
+            if worker is not None and start % (256 * BLOCK_SIZE) == 0:
+                if worker.is_cancelled():
+                    return None
+                worker.report_progress(start, self.size)
+        self.newlines = newlines
+        logger.debug(f"Line index built: {self.line_count} lines, {len(self.block_lines)} blocks")
+        return self
+
+    @property
+    def line_count(self):
+        """行数; 末尾的换行符不产生额外的空行"""
+        if not self.size:
+            return 0
+        return self.newlines + (0 if self.buffer[self.size - 1:self.size] == b'\n' else 1)
+
+    def _newline_offset(self, number):
+        """第 number 个(从 1 开始)换行符的偏移"""
+        block = bisect_left(self.block_lines, number) - 1
+        offset = block * BLOCK_SIZE - 1
+        for _ in range(number - self.block_lines[block]):
+            offset = self.buffer.find(b'\n', offset + 1)
+        return offset
+
+    def line_start(self, line):
+        """第 line 行(从 0 开始)的起始偏移"""
+        if line <= 0:
+            return 0
+        last_line, last_offset = self._last
+        if line == last_line + 1:
+            # 顺序读取(视图逐行绘制)只需查找一次
+            offset = self.buffer.find(b'\n', last_offset) + 1
+        elif line == last_line:
+            offset = last_offset
+        else:
+            offset = self._newline_offset(line) + 1
+        self._last = (line, offset)
+        return offset
+
+    def line(self, line, limit=LINE_DISPLAY_LIMIT):
+        """读取一行的字节(不含换行符)
+
+        Returns:
+            (bytes, truncated): truncated 表示超过 limit 被截断
+        """
+        start = self.line_start(line)
+        end = self.buffer.find(b'\n', start, start + limit + 1)
+        truncated = False
+        if end < 0:
+            end = min(self.size, start + limit)
+            truncated = end < self.size
+        data = bytes(self.buffer[start:end])
+        return data.rstrip(b'\r'), truncated
+
+
+def is_ascii_compatible(encoding):
+    """换行符按单字节 \\n 编码时才能直接在原始字节上建立行索引(UTF-16/32 不行)"""
+    try:
+        return '\n'.encode(codecs.lookup(encoding).name) == b'\n'
+    except LookupError:
+        return False
+
+
+class _BodyWriter:
+    """把字符串片段累积后编码写入 ResponseBody, 大结果自动写入临时文件"""
+
+    def __init__(self):
+        self.body = ResponseBody()
+        self._parts = []
+        self._pending = 0
+
+    def write(self, text):
+        self._parts.append(text)
+        self._pending += len(text)
+        if self._pending >= WRITE_CHUNK:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            self.body.write(''.join(self._parts).encode('utf-8'))
+            self._parts = []
+            self._pending = 0
+
+    def finish(self):
+        self.flush()
+        return self.body.finish()
+
+
+def transcode_to_utf8(buffer, encoding, worker=None):
+    """分块把 UTF-16 等编码的内容转为 UTF-8, 以便建立行索引; 已取消时返回 None"""
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    writer = _BodyWriter()
+    size = len(buffer)
+    for start in range(0, size, WRITE_CHUNK):
+        if worker is not None and worker.is_cancelled():
+            return None
+        writer.write(decoder.decode(bytes(buffer[start:start + WRITE_CHUNK]), final=start + WRITE_CHUNK >= size))
+    return writer.finish()
+
+
+def format_json_body(buffer, encoding='utf-8', worker=None):
+    """用流式格式化器把 JSON 缩进(2 个空格)后写入新的 ResponseBody, 不构建对象树
+
+    Returns:
+        ResponseBody; 内容不是 JSON 或已取消时返回 None
+    """
+    transcoded = None
+    if codecs.lookup(encoding).name not in ('utf-8', 'ascii'):
+        # 格式化器按 UTF-8 分词, GBK 等编码的多字节字符可能包含 \ 等字节, 先转码
+        transcoded = transcode_to_utf8(buffer, encoding, worker)
+        if transcoded is None:
+            return None
+        buffer = transcoded.buffer
+    body = ResponseBody()
+    try:
+        completed = reindent(buffer, body.write, worker=worker)
+    except JsonFormatError as e:
+        logger.debug(f"Body is not valid JSON: {e}")
+        completed = False
+    finally:
+        if transcoded is not None:
+            transcoded.close()
+    if not completed:
+        body.finish().close()
+        return None
+    return body.finish()
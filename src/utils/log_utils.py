@@ -0,0 +1,115 @@
+"""
+日志配置与请求/响应内容的低开销日志工具
+"""
+import sys
+import random
+from collections.abc import Mapping
+from pathlib import Path
+from loguru import logger
+
+LOG_FORMAT = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}.py:{line} - {message}"
+
+# 需要脱敏的请求/响应头(小写)
+SENSITIVE_HEADERS = {
+    'authorization', 'proxy-authorization', 'cookie', 'set-cookie',
+    'x-api-key', 'x-auth-token', 'x-access-token'
+}
+REDACTED = '***'
+
+# 默认日志配置, 可在配置文件中覆盖
+DEFAULT_LOG_LEVEL = "INFO"
+DEFAULT_PAYLOAD_MAX_CHARS = 2000
+DEFAULT_PAYLOAD_SAMPLE_RATE = 1.0
+DEFAULT_LOG_ROTATION = "10 MB"
+DEFAULT_LOG_RETENTION = 5
+
+_payload_max_chars = DEFAULT_PAYLOAD_MAX_CHARS
+_payload_sample_rate = DEFAULT_PAYLOAD_SAMPLE_RATE
+
+
+def setup_logger(config_model=None):
+    """配置loguru日志: 级别来自配置, 使用后台线程写入标准错误和滚动日志文件
+
+    Args:
+        config_model: ConfigModel 实例, 为空时使用默认配置
+    """
+    global _payload_max_chars, _payload_sample_rate
+
+    get = config_model.get if config_model else (lambda key, default=None: default)
+    level = str(get("log_level", DEFAULT_LOG_LEVEL)).upper()
+    _payload_max_chars = int(get("log_payload_max_chars", DEFAULT_PAYLOAD_MAX_CHARS))
+    _payload_sample_rate = float(get("log_payload_sample_rate", DEFAULT_PAYLOAD_SAMPLE_RATE))
+
+    # 移除默认的处理器
+    logger.remove()
+    # enqueue=True 时日志由后台线程写出, 不阻塞事件循环
+    if sys.stderr is not None:
+        logger.add(sys.stderr, format=LOG_FORMAT, level=level, enqueue=True)
+
+    app_data_path = config_model.get_app_data_path() if config_model else None
+    if app_data_path and get("log_to_file", True):
+        log_dir = Path(app_data_path) / 'logs'
+        try:
+            log_dir.mkdir(parents=True, exist_ok=True)
+            logger.add(
+                str(log_dir / 'free-http.log'),
+                format=LOG_FORMAT,
+                level=level,
+                enqueue=True,
+                rotation=get("log_rotation", DEFAULT_LOG_ROTATION),
+                retention=get("log_retention", DEFAULT_LOG_RETENTION),
+                encoding='utf-8'
+            )
+        except Exception as e:
+            logger.warning(f"Failed to add file log sink: {str(e)}")
+
+    # 替换模块名中的点号为斜杠
+    logger.configure(patcher=lambda record: record.update(name=record["name"].replace(".", "/")))
+    logger.info(f"Logger configured: level={level}")
+
+
+def redact_headers(headers):
+    """返回敏感字段已脱敏的请求头副本, 多值响应头返回 (名称, 值) 列表"""
+    if not isinstance(headers, Mapping):
+        return headers
+    if not isinstance(headers, dict):
+        return [
+            (key, REDACTED if str(key).lower() in SENSITIVE_HEADERS else value)
+            for key, value in headers.items()
+        ]
+    return {
+        key: (REDACTED if str(key).lower() in SENSITIVE_HEADERS else value)
+        for key, value in headers.items()
+    }
+
+
+def truncate_payload(payload, max_chars=None):
+    """截断过长的内容, 并注明被截断的字符数"""
+    if payload is None:
+        return ''
+    text = payload if isinstance(payload, str) else str(payload)
+    limit = _payload_max_chars if max_chars is None else max_chars
+    if limit <= 0 or len(text) <= limit:
+        return text
+    return f"{text[:limit]}... ({len(text) - limit} more chars truncated)"
+
+
+def payload_sampled():
+    """按采样率决定是否记录本次请求的内容"""
+    if _payload_sample_rate >= 1.0:
+        return True
+    return random.random() < _payload_sample_rate
+
+
+def log_payload(label, headers=None, body=None):
+    """以 DEBUG 级别延迟记录请求/响应头和内容
+
+    日志级别高于 DEBUG 时不会执行任何格式化; 请求头会脱敏, 内容会按配置截断和采样。
+    """
+    if not payload_sampled():
+        return
+    lazy_logger = logger.opt(lazy=True, depth=1)
+    if headers is not None:
+        lazy_logger.debug("{} headers: {}", lambda: label, lambda: redact_headers(headers))
+    if body is not None:
+        lazy_logger.debug("{} body: {}", lambda: label, lambda: truncate_payload(body))
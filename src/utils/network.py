@@ -0,0 +1,290 @@
+"""
+网络设置: 按域名配置的代理(HTTP/HTTPS/SOCKS5)和传输引擎、按环境的静态主机映射, 以及带 TTL 缓存的 DNS 解析器
+"""
+import os
+import stat
+import time
+import socket
+import asyncio
+import inspect
+import ipaddress
+from urllib.parse import urlparse, urlunparse, unquote
+import aiohttp
+from aiohttp.abc import AbstractResolver
+from loguru import logger
+from src.utils.instrumentation import instrumentation
+
+try:
+    from aiohttp_socks import ProxyConnector
+except ImportError:
+    ProxyConnector = None
+
+HTTP_PROXY_SCHEMES = ('http', 'https')
+SOCKS_PROXY_SCHEMES = ('socks4', 'socks5', 'socks5h')
+UNIX_SCHEMES = ('unix', 'http+unix')
+_SOCKS_MISSING = "SOCKS proxies require aiohttp_socks (pip install aiohttp_socks)"
+DEFAULT_DNS_CACHE_TTL = 60  # 秒
+DEFAULT_HAPPY_EYEBALLS_DELAY_MS = 250  # aiohttp 默认值, 0 表示关闭
+
+# aiohttp 3.10 之前的 TCPConnector 不支持 happy eyeballs 参数
+_SUPPORTS_HAPPY_EYEBALLS = 'happy_eyeballs_delay' in inspect.signature(aiohttp.TCPConnector.__init__).parameters
+
+
+class NetworkConfigError(ValueError):
+    """代理或主机映射配置无效"""
+
+
+def url_host(url):
+    """提取 URL 中的主机名(小写), 允许省略协议"""
+    if '://' not in url:
+        url = '//' + url
+    return (urlparse(url).hostname or '').lower()
+
+
+def is_unix_url(url):
+    """是否为 unix 域套接字地址(unix:///path/to.sock/... 或 http+unix://%2Fpath%2Fto.sock/...)"""
+    return urlparse(url).scheme.lower() in UNIX_SCHEMES
+
+
+def _split_socket_path(path):
+    """将 unix:// 地址的路径拆分为 (套接字路径, 请求路径)
+
+    路径中第一个以 .sock 结尾的部分为套接字; 没有时取第一个存在的套接字文件。
+    """
+    segments = path.split('/')
+    prefixes = ['/'.join(segments[:index]) for index in range(2, len(segments) + 1)]
+    for prefix in prefixes:
+        if prefix.endswith('.sock'):
+            return prefix, path[len(prefix):]
+    for prefix in prefixes:
+        try:
+            if stat.S_ISSOCK(os.stat(prefix).st_mode):
+                return prefix, path[len(prefix):]
+        except OSError:
+            continue
+    raise NetworkConfigError(f"No unix socket found in {path} (name it *.sock or make sure it exists)")
+
+
+def split_unix_url(url):
+    """拆分 unix 域套接字地址, 返回 (套接字路径, 发往该套接字的 http://localhost 地址)"""
+    parsed = urlparse(url)
+    if parsed.scheme.lower() == 'http+unix':
+        socket_path, request_path = unquote(parsed.netloc), parsed.path
+    elif parsed.scheme.lower() == 'unix':
+        if parsed.netloc:
+            raise NetworkConfigError(f"Unix socket paths must be absolute, e.g. unix:///run/app.sock: {url}")
+        socket_path, request_path = _split_socket_path(parsed.path)
+    else:
+        raise NetworkConfigError(f"Not a unix socket address: {url}")
+    if not socket_path:
+        raise NetworkConfigError(f"Missing unix socket path: {url}")
+    request_url = urlunparse(('http', 'localhost', request_path or '/', parsed.params, parsed.query, parsed.fragment))
+    return socket_path, request_url
+
+
+def unix_url(socket_path, request_url):
+    """split_unix_url 的逆操作, 用于在结果和跟踪记录中显示原始形式的地址"""
+    parsed = urlparse(request_url)
+    url = f"unix://{socket_path}{parsed.path if parsed.path != '/' else ''}"
+    if parsed.query:
+        url += f"?{parsed.query}"
+    return url
+
+
+def validate_proxy(proxy):
+    """校验代理地址, 返回去除空白后的地址(空字符串表示直连)"""
+    proxy = (proxy or '').strip()
+    if not proxy:
+        return ''
+    parsed = urlparse(proxy)
+    scheme = parsed.scheme.lower()
+    if scheme not in HTTP_PROXY_SCHEMES + SOCKS_PROXY_SCHEMES:
+        raise NetworkConfigError(
+            f"Unsupported proxy scheme '{parsed.scheme}', use http://, https:// or socks5://"
+        )
+    if not parsed.hostname:
+        raise NetworkConfigError(f"Proxy address has no host: {proxy}")
+    if scheme in SOCKS_PROXY_SCHEMES and ProxyConnector is None:
+        raise NetworkConfigError(_SOCKS_MISSING)
+    return proxy
+
+
+def is_socks_proxy(proxy):
+    return urlparse(proxy).scheme.lower() in SOCKS_PROXY_SCHEMES
+
+
+def parse_host_overrides(text):
+    """解析 hosts 文件格式的主机映射, 每行 "IP 主机名 [主机名...]", # 之后为注释
+
+    Returns:
+        dict: 主机名(小写) -> IP 地址
+    """
+    overrides = {}
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        parts = line.split()
+        if len(parts) < 2:
+            raise NetworkConfigError(f"Line {number}: expected 'IP hostname', got '{line}'")
+        try:
+            address = str(ipaddress.ip_address(parts[0]))
+        except ValueError:
+            raise NetworkConfigError(f"Line {number}: '{parts[0]}' is not an IP address")
+        for host in parts[1:]:
+            overrides[host.lower()] = address
+    return overrides
+
+
+def format_host_overrides(overrides):
+    """将主机映射格式化为 hosts 文件格式, 同一 IP 的主机名合并为一行"""
+    by_address = {}
+    for host, address in overrides.items():
+        by_address.setdefault(address, []).append(host)
+    return "\n".join(f"{address} {' '.join(hosts)}" for address, hosts in by_address.items())
+
+
+class NetworkSettings:
+    """一次会话使用的网络设置
+
+    代理、传输引擎和限速按请求 URL 的主机名匹配域名配置; 静态主机映射取自当前活动域名(环境),
+    切换活动域名即切换映射, 不需要修改系统 hosts 文件。
+    静态主机映射和 DNS 缓存只对使用 CachingResolver 的引擎生效(capabilities.host_overrides)。
+    """
+
+    def __init__(self, proxies=None, host_overrides=None, dns_cache_ttl=DEFAULT_DNS_CACHE_TTL,
+                 happy_eyeballs_delay_ms=DEFAULT_HAPPY_EYEBALLS_DELAY_MS, transports=None, rate_limits=None):
+        self.proxies = proxies or {}  # 主机名 -> 代理地址
+        self.host_overrides = host_overrides or {}  # 主机名 -> IP 地址
+        self.dns_cache_ttl = dns_cache_ttl
+        self.happy_eyeballs_delay_ms = happy_eyeballs_delay_ms
+        self.transports = transports or {}  # 主机名 -> 引擎名称, 未配置时使用默认引擎
+        self.rate_limits = rate_limits or {}  # 主机名 -> RateLimit.to_dict()
+
+    @classmethod
+    def load(cls, domain_model, config=None):
+        """从域名配置和应用配置加载网络设置"""
+        proxies = {}
+        transports = {}
+        rate_limits = {}
+        active = None
+        # 同一主机有多个配置时以活动域名为准
+        domains = sorted(domain_model.get_all_domains(), key=lambda domain: domain['is_active'])
+        for domain in domains:
+            host = url_host(domain['domain'])
+            if domain['is_active']:
+                active = domain
+            if not host:
+                continue
+            if domain['proxy']:
+                proxies[host] = domain['proxy']
+            if domain['transport']:
+                transports[host] = domain['transport']
+            if domain['rate_limit']:
+                rate_limits[host] = domain['rate_limit']
+
+        settings = cls(proxies=proxies, host_overrides=active['host_overrides'] if active else None,
+                       transports=transports, rate_limits=rate_limits)
+        if config is not None:
+            settings.dns_cache_ttl = config.get('dns_cache_ttl', DEFAULT_DNS_CACHE_TTL)
+            settings.happy_eyeballs_delay_ms = config.get(
+                'happy_eyeballs_delay_ms', DEFAULT_HAPPY_EYEBALLS_DELAY_MS
+            )
+        return settings
+
+    def proxy_for(self, url):
+        """请求 URL 对应的代理地址, 没有配置时返回 None"""
+        return self.proxies.get(url_host(url))
+
+    def transport_for(self, url):
+        """请求 URL 对应的引擎名称, 没有配置时返回 None(默认引擎)"""
+        return self.transports.get(url_host(url))
+
+    def connector_options(self):
+        """TCPConnector 的 happy eyeballs 参数"""
+        if not _SUPPORTS_HAPPY_EYEBALLS:
+            return {}
+        delay = self.happy_eyeballs_delay_ms
+        return {'happy_eyeballs_delay': delay / 1000 if delay else None}
+
+
+class CachingResolver(AbstractResolver):
+    """带 TTL 缓存和静态主机映射的 DNS 解析器
+
+    由 HttpClient 持有, 会话重建后缓存仍然有效; 重复请求的解析耗时降为零。
+    """
+
+    def __init__(self, ttl=DEFAULT_DNS_CACHE_TTL, overrides=None):
+        self.ttl = ttl
+        self.overrides = dict(overrides or {})
+        self._cache = {}  # (主机, 端口, 地址族) -> (过期时间, 解析结果)
+        self._resolver = None
+        self._resolver_loop = None
+
+    def configure(self, ttl, overrides):
+        """更新 TTL 和主机映射; 主机映射优先于缓存, 已缓存的结果不受影响"""
+        self.ttl = ttl
+        self.overrides = dict(overrides or {})
+        if not ttl:
+            self.clear()
+
+    def clear(self):
+        self._cache.clear()
+
+    def _get_resolver(self):
+        # 默认解析器与事件循环绑定, 安装了 aiodns 时为异步解析器
+        loop = asyncio.get_running_loop()
+        if self._resolver is None or self._resolver_loop is not loop:
+            self._resolver = aiohttp.DefaultResolver()
+            self._resolver_loop = loop
+        return self._resolver
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        address = self.overrides.get(host.lower())
+        if address is not None:
+            instrumentation.count('dns.override')
+            return [{
+                'hostname': host,
+                'host': address,
+                'port': port,
+                'family': socket.AF_INET6 if ':' in address else socket.AF_INET,
+                'proto': 0,
+                'flags': socket.AI_NUMERICHOST,
+            }]
+
+        key = (host, port, family)
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > now:
+            instrumentation.count('dns.cache.hit')
+            return cached[1]
+
+        instrumentation.count('dns.cache.miss')
+        results = await self._get_resolver().resolve(host, port, family)
+        if self.ttl:
+            self._cache[key] = (now + self.ttl, results)
+        logger.debug(f"Resolved {host}: {', '.join(result['host'] for result in results)}")
+        return results
+
+    async def close(self):
+        if self._resolver is not None:
+            await self._resolver.close()
+            self._resolver = None
+
+
+def create_connector(settings, resolver, proxy=None, limit=None):
+    """创建连接器; SOCKS 代理需要安装 aiohttp_socks; limit 为连接池上限, 为空时使用 aiohttp 默认值(100)"""
+    options = settings.connector_options()
+    if limit is not None:
+        options['limit'] = limit
+    if proxy and is_socks_proxy(proxy):
+        if ProxyConnector is None:
+            raise NetworkConfigError(_SOCKS_MISSING)
+        # socks5h:// 由代理服务器解析主机名, 此时不使用本地解析器和主机映射
+        if urlparse(proxy).scheme.lower() == 'socks5h':
+            proxy = 'socks5' + proxy[len('socks5h'):]
+            options['rdns'] = True
+        else:
+            options.update(resolver=resolver, use_dns_cache=False)
+        return ProxyConnector.from_url(proxy, **options)
+    return aiohttp.TCPConnector(resolver=resolver, use_dns_cache=False, **options)
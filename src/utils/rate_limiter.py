@@ -0,0 +1,148 @@
+"""
+按域名限速: 每个主机一个令牌桶(每秒请求数和突发量)加上最大并发请求数
+
+令牌桶按 GCRA(虚拟调度)实现: 每次获取时同步预约下一个可用时间再等待, 先到先得,
+不需要锁, 也不绑定事件循环。HttpClient 在每次尝试(包括重试和对冲)发送前获取名额,
+等待时间记录在尝试的 queue_ms 中, 与网络耗时分开显示。
+"""
+import time
+import asyncio
+from loguru import logger
+from src.utils.instrumentation import instrumentation
+from src.utils.network import url_host
+
+
+class RateLimit:
+    """一个域名的限速配置"""
+
+    DEFAULTS = {
+        'rps': 0,  # 每秒请求数, 0 表示不限速
+        'burst': 1,  # 空闲后允许连续发出的请求数
+        'max_concurrent': 0,  # 同时进行的请求数上限, 0 表示不限制
+    }
+
+    def __init__(self, **options):
+        for key, default in self.DEFAULTS.items():
+            setattr(self, key, options.get(key, default))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**(data or {}))
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.DEFAULTS}
+
+    @property
+    def enabled(self):
+        return bool(self.rps or self.max_concurrent)
+
+    def scaled(self, share):
+        """按比例分配的配置(如压测的每个工作进程分到 1/N), 突发量和并发数至少为 1"""
+        return RateLimit(
+            rps=self.rps * share,
+            burst=max(1, int(self.burst * share)),
+            max_concurrent=max(1, int(self.max_concurrent * share)) if self.max_concurrent else 0,
+        )
+
+    def describe(self):
+        parts = []
+        if self.rps:
+            parts.append(f"{self.rps:g} req/s (burst {self.burst})")
+        if self.max_concurrent:
+            parts.append(f"max {self.max_concurrent} concurrent")
+        return ", ".join(parts)
+
+
+class TokenBucket:
+    """令牌桶: 平均每秒 rate 个请求, 空闲后最多连续 burst 个"""
+
+    def __init__(self, rate, burst=1):
+        self.interval = 1.0 / rate
+        self.tolerance = (max(1, burst) - 1) * self.interval
+        self.theoretical_arrival = 0.0
+
+    def reserve(self):
+        """预约一个令牌, 返回需要等待的秒数"""
+        now = time.monotonic()
+        arrival = max(self.theoretical_arrival, now)
+        self.theoretical_arrival = arrival + self.interval
+        return max(0.0, arrival - self.tolerance - now)
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class HostLimiter:
+    """一个主机的令牌桶和并发名额"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.bucket = TokenBucket(limit.rps, limit.burst) if limit.rps else None
+        self._semaphore = None
+        self._loop = None
+
+    def _get_semaphore(self):
+        # asyncio.Semaphore 绑定第一次使用的事件循环, 循环变化时(如基准测试多次 asyncio.run)重新创建
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.limit.max_concurrent)
+            self._loop = loop
+        return self._semaphore
+
+    async def acquire(self):
+        """先获取并发名额再获取令牌, 令牌在真正发送前才消耗; 返回排队等待的毫秒数"""
+        start = time.perf_counter()
+        semaphore = self._get_semaphore() if self.limit.max_concurrent else None
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            if self.bucket is not None:
+                await self.bucket.acquire()
+        except BaseException:
+            if semaphore is not None:
+                semaphore.release()
+            raise
+        waited_ms = (time.perf_counter() - start) * 1000
+        if waited_ms >= 1:
+            instrumentation.count('http.rate_limit.queued')
+        return waited_ms
+
+    def release(self):
+        if self.limit.max_concurrent and self._semaphore is not None:
+            self._semaphore.release()
+
+
+class RateLimiter:
+    """按主机名查找限速器; 配置来自 NetworkSettings.rate_limits"""
+
+    def __init__(self, rate_limits=None, share=1.0):
+        self.share = share
+        self.limiters = {}  # 主机名 -> HostLimiter
+        self.configure(rate_limits or {})
+
+    def configure(self, rate_limits):
+        """更新配置; 配置未变的主机保留令牌桶状态, 避免切换域名时突发量被重置"""
+        limiters = {}
+        for host, data in rate_limits.items():
+            limit = RateLimit.from_dict(data)
+            if not limit.enabled:
+                continue
+            if self.share != 1.0:
+                limit = limit.scaled(self.share)
+            current = self.limiters.get(host)
+            if current is not None and current.limit.to_dict() == limit.to_dict():
+                limiters[host] = current
+            else:
+                limiters[host] = HostLimiter(limit)
+        self.limiters = limiters
+        if limiters:
+            logger.debug(f"Rate limits: {', '.join(f'{host} {l.limit.describe()}' for host, l in limiters.items())}")
+
+    def limiter_for(self, url):
+        """请求 URL 对应的限速器, 没有配置时返回 None"""
+        if not self.limiters:
+            return None
+        return self.limiters.get(url_host(url))
@@ -0,0 +1,295 @@
+"""
+请求指标: 按已保存的 API 和域名累计请求数、错误数(按类型)、请求/响应体字节数和耗时直方图
+
+计数在内存中累加, 定期把每个时间段的增量写入 SQLite(MetricsModel), 便于长时间运行后绘图;
+当前累计值可导出为 Prometheus 文本或 JSON, 也可以通过本地 HTTP 端点(/metrics, /metrics.json)抓取。
+"""
+import os
+import time
+import asyncio
+from urllib.parse import urlparse
+from aiohttp import web
+from loguru import logger
+from src.utils import json_utils
+from src.utils.instrumentation import Histogram
+from src.utils.network import NetworkConfigError, is_unix_url, split_unix_url
+
+DEFAULT_FLUSH_INTERVAL = 60  # 秒
+UNSAVED_API = '(unsaved)'  # 未保存为 API 的请求
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def error_class(result):
+    """请求的错误类型: 传输错误为 ErrorKind 的值(dns/timeout 等), HTTP 错误为 4xx/5xx, 成功为 None"""
+    if result.error_kind is not None:
+        return result.error_kind.value
+    if result.status is not None and result.status >= 500:
+        return '5xx'
+    if result.status is not None and result.status >= 400:
+        return '4xx'
+    return None
+
+
+def domain_of(url):
+    """指标中使用的域名: 主机和端口; unix 套接字地址使用套接字路径"""
+    if is_unix_url(url):
+        try:
+            return f"unix:{split_unix_url(url)[0]}"
+        except NetworkConfigError:
+            return 'unix'
+    return urlparse(url).netloc.lower() or url
+
+
+def body_size(body):
+    """请求体字节数"""
+    if not body:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode('utf-8', errors='replace'))
+    return len(body)
+
+
+class MetricSeries:
+    """一个 API 或域名的计数器与耗时直方图"""
+    __slots__ = ('requests', 'errors', 'request_bytes', 'response_bytes', 'latency')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = {}  # 错误类型 -> 次数
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.latency = Histogram()
+
+    def observe(self, elapsed_ms, error, request_bytes, response_bytes):
+        self.requests += 1
+        if error is not None:
+            self.errors[error] = self.errors.get(error, 0) + 1
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        if elapsed_ms is not None:
+            self.latency.observe(elapsed_ms)
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'errors': dict(self.errors),
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+            'latency': self.latency.snapshot(),
+        }
+
+
+def _label(value):
+    """Prometheus 标签值转义"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RequestMetrics:
+    """进程内的请求指标; 只应在事件循环线程中调用"""
+
+    def __init__(self):
+        self.totals = {}  # (scope, name) -> 启动以来的累计值
+        self.pending = {}  # (scope, name) -> 上次刷新以来的增量
+        self.period_start = time.time()
+        self.started_at = self.period_start
+        self.model = None
+        self.export_path = None
+        self._flush_task = None
+        self._runner = None
+        self.port = None
+
+    def configure(self, model=None, export_path=None):
+        """设置写入样本的 MetricsModel, 以及每次刷新时覆盖写出的导出文件(.prom/.txt 为 Prometheus 文本, 否则为 JSON)"""
+        self.model = model
+        self.export_path = export_path or None
+
+    def observe(self, result, url, api_name=None, request_bytes=0):
+        """记录一次请求(包含重试在内的最终结果)"""
+        error = error_class(result)
+        response_bytes = 0 if result.is_error else result.size
+        for key in (('api', api_name or UNSAVED_API), ('domain', domain_of(url))):
+            for store in (self.totals, self.pending):
+                series = store.get(key)
+                if series is None:
+                    series = store[key] = MetricSeries()
+                series.observe(result.elapsed_ms, error, request_bytes, response_bytes)
+
+    def rename_api(self, old_name, new_name):
+        """已保存的 API 重命名后, 内存中的计数和数据库中的样本都归到新名称下"""
+        for store in (self.totals, self.pending):
+            series = store.pop(('api', old_name), None)
+            if series is not None:
+                store[('api', new_name)] = series
+        if self.model is not None:
+            try:
+                self.model.rename_series('api', old_name, new_name)
+            except Exception as e:
+                logger.error(f"Failed to rename metric series {old_name}: {str(e)}")
+
+    def reset(self):
+        """清空内存中的累计值(不影响已写入数据库的样本)"""
+        self.totals.clear()
+        self.pending.clear()
+        self.period_start = self.started_at = time.time()
+
+    def snapshot(self):
+        """当前累计值, 按 scope 和名称排序"""
+        return [dict(scope=scope, name=name, **self.totals[(scope, name)].to_dict())
+                for scope, name in sorted(self.totals)]
+
+    # ---------- 刷新与导出 ----------
+
+    def flush(self):
+        """把上次刷新以来的增量写入数据库, 并更新导出文件
+
+        Returns:
+            int: 写入的样本数
+        """
+        now = time.time()
+        samples = [{
+            'scope': scope,
+            'name': name,
+            'period_start': self.period_start,
+            'period_end': now,
+            'requests': series.requests,
+            'errors': series.errors,
+            'request_bytes': series.request_bytes,
+            'response_bytes': series.response_bytes,
+            'latency_sum_ms': series.latency.total,
+            'latency_max_ms': series.latency.max,
+            'latency_buckets': series.latency.counts,
+        } for (scope, name), series in self.pending.items()]
+        self.pending = {}
+        self.period_start = now
+        written = 0
+        if samples and self.model is not None:
+            try:
+                written = self.model.add_samples(samples)
+            except Exception as e:
+                logger.error(f"Failed to flush request metrics: {str(e)}")
+        if self.export_path and (samples or not os.path.exists(self.export_path)):
+            try:
+                self.export(self.export_path)
+            except OSError as e:
+                logger.error(f"Failed to export request metrics to {self.export_path}: {str(e)}")
+        return written
+
+    def to_prometheus(self):
+        """Prometheus 文本格式的累计值; 耗时直方图的单位为秒"""
+        lines = []
+
+        def header(name, kind, text):
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        series = [(f'scope="{scope}",name="{_label(name)}"', self.totals[(scope, name)])
+                  for scope, name in sorted(self.totals)]
+        header('freehttp_requests_total', 'counter', 'Requests sent, by saved API and by domain')
+        for labels, item in series:
+            lines.append(f"freehttp_requests_total{{{labels}}} {item.requests}")
+        header('freehttp_request_errors_total', 'counter',
+               'Failed requests by class (transport error kind, 4xx, 5xx)')
+        for labels, item in series:
+            for error, count in sorted(item.errors.items()):
+                lines.append(f'freehttp_request_errors_total{{{labels},class="{error}"}} {count}')
+        header('freehttp_request_body_bytes_total', 'counter', 'Request body bytes sent')
+        for labels, item in series:
+            lines.append(f"freehttp_request_body_bytes_total{{{labels}}} {item.request_bytes}")
+        header('freehttp_response_body_bytes_total', 'counter', 'Response body bytes received')
+        for labels, item in series:
+            lines.append(f"freehttp_response_body_bytes_total{{{labels}}} {item.response_bytes}")
+        header('freehttp_request_duration_seconds', 'histogram', 'Request latency including retries')
+        for labels, item in series:
+            histogram = item.latency
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'freehttp_request_duration_seconds_bucket{{{labels},le="{bound / 1000:g}"}} {cumulative}')
+            lines.append(f'freehttp_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"freehttp_request_duration_seconds_sum{{{labels}}} {histogram.total / 1000:.6f}")
+            lines.append(f"freehttp_request_duration_seconds_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self, include_samples=False):
+        """JSON 格式的累计值; include_samples 时附带数据库中的全部时间序列样本"""
+        data = {
+            'started_at': self.started_at,
+            'generated_at': time.time(),
+            'series': self.snapshot(),
+        }
+        if include_samples and self.model is not None:
+            data['samples'] = self.model.get_samples()
+        return json_utils.dumps(data, indent=2)
+
+    def export(self, path, include_samples=False):
+        """写出到文件: .prom/.txt 为 Prometheus 文本, 其他扩展名为 JSON; 先写临时文件再替换"""
+        if path.lower().endswith(('.prom', '.txt')):
+            content = self.to_prometheus()
+        else:
+            content = self.to_json(include_samples)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    # ---------- 定期刷新与 HTTP 端点 ----------
+
+    def start(self, interval=DEFAULT_FLUSH_INTERVAL, port=None):
+        """在当前事件循环上启动定期刷新; port 不为空时在 127.0.0.1:port 提供指标端点"""
+        if self._flush_task and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            logger.warning("No event loop available for request metrics")
+            return
+        self._flush_task = loop.create_task(self._flush_loop(max(1, interval)))
+        if port:
+            loop.create_task(self.start_server(int(port)))
+        logger.debug(f"Request metrics flushing every {interval}s")
+
+    async def stop(self):
+        """停止定期刷新和指标端点, 并写入最后一段增量"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self.flush()
+        await self.stop_server()
+
+    async def _flush_loop(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            self.flush()
+
+    async def start_server(self, port):
+        """只监听本机地址, 不需要认证"""
+        app = web.Application()
+        app.router.add_get('/metrics', self._handle_prometheus)
+        app.router.add_get('/metrics.json', self._handle_json)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, '127.0.0.1', port).start()
+        except OSError as e:
+            await runner.cleanup()
+            logger.error(f"Failed to start metrics endpoint on port {port}: {str(e)}")
+            return
+        self._runner = runner
+        self.port = port
+        logger.info(f"Metrics endpoint listening on http://127.0.0.1:{port}/metrics")
+
+    async def stop_server(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            self.port = None
+
+    async def _handle_prometheus(self, request):
+        return web.Response(body=self.to_prometheus().encode('utf-8'),
+                            headers={'Content-Type': PROMETHEUS_CONTENT_TYPE})
+
+    async def _handle_json(self, request):
+        return web.Response(text=self.to_json(), content_type='application/json')
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,188 @@
+"""
+响应体存储与内容类型判断
+
+小响应保存在内存; 超过阈值的大响应边读边写入临时文件, 读完后通过 mmap 只读访问,
+查看器按需读取片段, 不把整个响应体复制为 bytes 或解码为 str。
+"""
+import mmap
+import tempfile
+from loguru import logger
+
+SPOOL_THRESHOLD = 8 * 1024 * 1024  # 超过 8 MB 的响应体写入临时文件
+HEAD_SIZE = 4096  # 判断内容类型时读取的字节数
+
+# 响应体类型: text 按文本显示, 其他类型使用二进制查看器
+BODY_KINDS = ('text', 'image', 'msgpack', 'cbor', 'protobuf', 'grpc-web', 'binary')
+
+_CONTENT_TYPE_KINDS = {
+    'application/msgpack': 'msgpack',
+    'application/x-msgpack': 'msgpack',
+    'application/vnd.msgpack': 'msgpack',
+    'application/cbor': 'cbor',
+    'application/protobuf': 'protobuf',
+    'application/x-protobuf': 'protobuf',
+    'application/x-google-protobuf': 'protobuf',
+    'application/vnd.google.protobuf': 'protobuf',
+    'application/grpc': 'grpc-web',
+    'application/grpc+proto': 'grpc-web',
+    'application/grpc-web': 'grpc-web',
+    'application/grpc-web+proto': 'grpc-web',
+}
+_TEXT_SUFFIXES = ('json', 'xml', 'javascript', 'ecmascript', 'x-www-form-urlencoded', 'yaml', 'csv',
+                  'graphql', 'event-stream', 'html', 'svg')
+_IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'PNG'),
+    (b'\xff\xd8\xff', 'JPEG'),
+    (b'GIF87a', 'GIF'),
+    (b'GIF89a', 'GIF'),
+    (b'BM', 'BMP'),
+    (b'\x00\x00\x01\x00', 'ICO'),
+)
+_CONTROL_BYTES = bytes(range(0, 9)) + bytes(range(14, 32))  # 文本中罕见的控制字符
+
+
+def image_format(head):
+    """根据文件头识别图片格式, 不是图片时返回 None"""
+    head = bytes(head[:16])
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'WEBP'
+    for signature, name in _IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return name
+    return None
+
+
+def looks_binary(head):
+    """文件头中有 NUL, 或不是 UTF-8 且控制字符较多时视为二进制(GBK 等编码的文本仍按文本处理)"""
+    head = bytes(head)
+    if b'\x00' in head:
+        return True
+    try:
+        head.decode('utf-8')
+        return False
+    except UnicodeDecodeError as e:
+        # 末尾被截断的多字节字符不算
+        if e.reason == 'unexpected end of data' and e.start >= len(head) - 3:
+            return False
+    controls = len(head) - len(head.translate(None, _CONTROL_BYTES))
+    return controls > len(head) * 0.05
+
+
+def detect_body_kind(content_type, head):
+    """根据 Content-Type 和响应体开头判断显示方式
+
+    Args:
+        content_type: 去掉参数的小写 Content-Type, 可以为空
+        head: 响应体开头的字节
+
+    Returns:
+        str: BODY_KINDS 中的一项
+    """
+    if not head:
+        return 'text'
+    if content_type in _CONTENT_TYPE_KINDS:
+        return _CONTENT_TYPE_KINDS[content_type]
+    if content_type.startswith('text/') or content_type.endswith(_TEXT_SUFFIXES):
+        return 'text'
+    if content_type.startswith('image/') or image_format(head):
+        return 'image'
+    # application/octet-stream 或未知类型: 按内容判断
+    return 'binary' if looks_binary(head) else 'text'
+
+
+class ResponseBody:
+    """响应体; 内存中的 bytes 或写入临时文件后的只读 mmap
+
+    用法: 一次性传入 data, 或者多次 write() 后调用 finish()。
+    buffer 支持 len()、切片和 find(), 查看器通过它按需读取片段。
+    """
+
+    def __init__(self, data=b'', spool_threshold=SPOOL_THRESHOLD):
+        self.spool_threshold = spool_threshold
+        self._chunks = []
+        self._size = len(data)
+        self._file = None
+        self._map = None
+        self._data = data
+
+    @property
+    def size(self):
+        return self._size
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def spooled(self):
+        """响应体是否已写入临时文件"""
+        return self._file is not None
+
+    def write(self, chunk):
+        """追加一块数据, 总大小超过阈值时转存到临时文件"""
+        if not chunk:
+            return
+        self._size += len(chunk)
+        if self._file is not None:
+            self._file.write(chunk)
+            return
+        self._chunks.append(chunk)
+        if self._size > self.spool_threshold:
+            self._file = tempfile.TemporaryFile(prefix='free-http-body-')
+            if self._data:
+                self._file.write(self._data)
+            self._file.writelines(self._chunks)
+            self._chunks = []
+            self._data = b''
+            logger.debug(f"Spooling response body to disk (> {self.spool_threshold} bytes)")
+
+    def finish(self):
+        """写入结束: 内存中的分块合并为 bytes, 临时文件映射为只读 mmap"""
+        if self._file is not None:
+            self._file.flush()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            logger.debug(f"Response body spooled: {self._size} bytes")
+        elif self._chunks:
+            self._data = self._data + b''.join(self._chunks)
+            self._chunks = []
+        return self
+
+    @property
+    def buffer(self):
+        """只读的 bytes 或 mmap, 不复制数据"""
+        return self._map if self._map is not None else self._data
+
+    def read(self, offset=0, length=None):
+        """读取一个片段"""
+        end = self._size if length is None else min(self._size, offset + length)
+        return bytes(self.buffer[offset:end])
+
+    def head(self, length=HEAD_SIZE):
+        return self.read(0, length)
+
+    def getvalue(self):
+        """完整的 bytes; 写入临时文件的大响应会整体读入内存, 查看器应使用 buffer/read"""
+        if self._map is not None:
+            return self._map[:]
+        return self._data
+
+    def close(self):
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # 后台线程(如搜索)仍在读取, 最后一个引用释放时自动关闭
+                pass
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._data = b''
+        self._size = 0
+
+
+async def read_body(chunks, spool_threshold=SPOOL_THRESHOLD):
+    """从异步分块迭代器读取响应体, 超过阈值时写入临时文件"""
+    body = ResponseBody(spool_threshold=spool_threshold)
+    async for chunk in chunks:
+        body.write(chunk)
+    return body.finish()
@@ -0,0 +1,121 @@
+"""
+请求重试与对冲(hedged request)策略
+
+重试: 指数退避 + 随机抖动, 可按状态码和连接错误重试, 遵循 Retry-After;
+对冲: 第一次尝试在 p95 延迟内未返回时发出第二个相同请求, 取先返回的结果。
+"""
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from src.utils.instrumentation import Histogram
+from src.utils.network import NetworkConfigError, is_unix_url, split_unix_url
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'})
+DEFAULT_RETRY_STATUSES = (429, 502, 503, 504)
+HEDGE_MIN_SAMPLES = 20  # 使用 p95 作为对冲延迟所需的最少样本数
+
+
+class RetryPolicy:
+    """单个API的重试与对冲配置"""
+
+    DEFAULTS = {
+        'max_retries': 0,
+        'backoff_base_ms': 200,
+        'backoff_max_ms': 10000,
+        'jitter': True,
+        'retry_statuses': list(DEFAULT_RETRY_STATUSES),
+        'retry_connection_errors': True,
+        'retry_non_idempotent': False,
+        'respect_retry_after': True,
+        'hedge': False,
+        'hedge_delay_ms': 0,  # 0 表示根据历史延迟的 p95 自动计算
+    }
+
+    def __init__(self, **options):
+        for key, default in self.DEFAULTS.items():
+            setattr(self, key, options.get(key, default))
+        self.retry_statuses = frozenset(self.retry_statuses or ())
+
+    @classmethod
+    def from_dict(cls, data):
+        """从 ApiModel 保存的配置创建, 为空时返回不重试的默认策略"""
+        return cls(**(data or {}))
+
+    def to_dict(self):
+        data = {key: getattr(self, key) for key in self.DEFAULTS}
+        data['retry_statuses'] = sorted(self.retry_statuses)
+        return data
+
+    @property
+    def enabled(self):
+        return self.max_retries > 0 or self.hedge
+
+    def allows(self, method):
+        """该请求方法是否允许重试或对冲(默认只允许幂等方法)"""
+        return self.retry_non_idempotent or method.upper() in IDEMPOTENT_METHODS
+
+    def backoff_delay(self, retry_number, retry_after=None):
+        """第 retry_number 次重试前的等待时间(秒)"""
+        delay = min(self.backoff_max_ms, self.backoff_base_ms * (2 ** (retry_number - 1))) / 1000
+        if self.jitter:
+            # full jitter: 在 [0, delay] 内随机, 避免多个客户端同时重试
+            delay = random.uniform(0, delay)
+        if retry_after is not None and self.respect_retry_after:
+            delay = max(delay, min(retry_after, self.backoff_max_ms / 1000))
+        return delay
+
+
+NO_RETRY = RetryPolicy()
+
+
+def parse_retry_after(value):
+    """解析 Retry-After 响应头(秒数或 HTTP 日期), 返回秒数或 None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class LatencyTracker:
+    """按主机统计成功请求的延迟, 用于计算对冲延迟"""
+
+    def __init__(self):
+        self.histograms = {}
+
+    @staticmethod
+    def _key(url):
+        # unix 套接字地址没有主机名, 按套接字路径统计
+        if is_unix_url(url):
+            try:
+                return split_unix_url(url)[0]
+            except NetworkConfigError:
+                return url
+        return urlparse(url).netloc
+
+    def observe(self, url, elapsed_ms):
+        key = self._key(url)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(elapsed_ms)
+
+    def hedge_delay(self, url, policy):
+        """返回对冲延迟(秒): 优先使用配置值, 否则使用该主机的 p95, 样本不足时返回 None"""
+        if policy.hedge_delay_ms:
+            return policy.hedge_delay_ms / 1000
+        histogram = self.histograms.get(self._key(url))
+        if histogram is None or histogram.count < HEDGE_MIN_SAMPLES:
+            return None
+        return histogram.percentile(95) / 1000
+
+
+latency_tracker = LatencyTracker()
@@ -0,0 +1,335 @@
+"""
+流式连接: WebSocket 和 Server-Sent Events
+
+消息写入固定容量的环形缓冲区(超出容量时丢弃最旧的消息), 界面定时批量刷新,
+不为每条消息创建控件。连接运行在 qasync 事件循环上, 复用 HttpClient 的会话、代理和 Cookie。
+"""
+import time
+import asyncio
+from collections import deque
+import aiohttp
+from loguru import logger
+from src.utils.instrumentation import instrumentation
+
+DEFAULT_BUFFER_SIZE = 10000
+DEFAULT_SSE_RETRY_MS = 3000
+STREAM_KINDS = ('websocket', 'sse')
+
+
+def guess_stream_kind(url):
+    """ws:// 和 wss:// 地址使用 WebSocket, 其他使用 SSE"""
+    return 'websocket' if url.lower().startswith(('ws://', 'wss://')) else 'sse'
+
+
+class StreamMessage:
+    """一条流消息; data 为 str(文本)或 bytes(二进制帧)"""
+    __slots__ = ('timestamp', 'direction', 'kind', 'data', 'size')
+
+    def __init__(self, direction, kind, data, size=None, timestamp=None):
+        self.timestamp = timestamp or time.time()
+        self.direction = direction  # 'in' 收到, 'out' 发送
+        self.kind = kind  # 'text'、'binary' 或 SSE 事件类型
+        self.data = data
+        if size is None:
+            size = len(data) if isinstance(data, bytes) else len(data.encode('utf-8'))
+        self.size = size
+
+    def preview(self, limit=300):
+        """单行预览, 二进制帧显示为十六进制"""
+        if isinstance(self.data, bytes):
+            text = self.data[:limit // 3].hex(' ')
+            return text + (" ..." if len(self.data) > limit // 3 else "")
+        text = self.data[:limit].replace('\r', ' ').replace('\n', ' ')
+        return text + ("..." if len(self.data) > limit else "")
+
+
+class RingBuffer:
+    """固定容量的环形缓冲区, 按下标 O(1) 访问; 满时覆盖最旧的元素"""
+
+    def __init__(self, capacity=DEFAULT_BUFFER_SIZE):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._start = 0
+        self._length = 0
+        self.total = 0  # 累计写入数
+        self.dropped = 0  # 因容量限制丢弃的数量
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("ring buffer index out of range")
+        return self._items[(self._start + index) % self.capacity]
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self._items[(self._start + index) % self.capacity]
+
+    def append(self, item):
+        if self._length < self.capacity:
+            self._items[(self._start + self._length) % self.capacity] = item
+            self._length += 1
+        else:
+            self._items[self._start] = item
+            self._start = (self._start + 1) % self.capacity
+            self.dropped += 1
+        self.total += 1
+
+    def clear(self):
+        self._items = [None] * self.capacity
+        self._start = 0
+        self._length = 0
+
+    def set_capacity(self, capacity):
+        """修改容量, 缩小时保留最新的元素"""
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        items = list(self)[-capacity:]
+        self.dropped += self._length - len(items)
+        self.capacity = capacity
+        self._items = items + [None] * (capacity - len(items))
+        self._start = 0
+        self._length = len(items)
+
+
+class RateMeter:
+    """最近 window 秒内的消息速率和字节速率, 按整秒分桶"""
+
+    def __init__(self, window=5):
+        self.window = window
+        self._buckets = deque()  # [秒, 消息数, 字节数]
+        self._started = None
+
+    def add(self, size, now=None):
+        now = time.monotonic() if now is None else now
+        if self._started is None:
+            self._started = now
+        second = int(now)
+        if self._buckets and self._buckets[-1][0] == second:
+            bucket = self._buckets[-1]
+            bucket[1] += 1
+            bucket[2] += size
+        else:
+            self._buckets.append([second, 1, size])
+            self._trim(now)
+
+    def _trim(self, now):
+        while self._buckets and self._buckets[0][0] <= now - self.window:
+            self._buckets.popleft()
+
+    def rates(self, now=None):
+        """返回 (消息/秒, 字节/秒)"""
+        now = time.monotonic() if now is None else now
+        self._trim(now)
+        if not self._buckets:
+            return 0.0, 0.0
+        span = min(self.window, max(now - self._started, 1.0))
+        messages = sum(bucket[1] for bucket in self._buckets)
+        size = sum(bucket[2] for bucket in self._buckets)
+        return messages / span, size / span
+
+    def reset(self):
+        self._buckets.clear()
+        self._started = None
+
+
+class SseEvent:
+    __slots__ = ('event', 'data', 'id')
+
+    def __init__(self, event, data, event_id):
+        self.event = event
+        self.data = data
+        self.id = event_id
+
+
+class SseParser:
+    """增量解析 text/event-stream, 按 WHATWG 规范处理 data/event/id/retry 字段和注释行"""
+
+    def __init__(self):
+        self._buffer = b""
+        self._data = []
+        self._event = ""
+        self.last_event_id = ""
+        self.retry_ms = None
+
+    def feed(self, chunk):
+        """输入任意切分的字节块, 返回其中完整的事件列表"""
+        self._buffer += chunk
+        lines = self._buffer.split(b"\n")
+        self._buffer = lines.pop()
+        events = []
+        for raw in lines:
+            line = raw.rstrip(b"\r").decode('utf-8', errors='replace')
+            if not line:
+                if self._data:
+                    events.append(SseEvent(self._event or 'message', "\n".join(self._data), self.last_event_id))
+                self._data = []
+                self._event = ""
+                continue
+            if line.startswith(':'):
+                continue
+            field, _, value = line.partition(':')
+            if value.startswith(' '):
+                value = value[1:]
+            if field == 'data':
+                self._data.append(value)
+            elif field == 'event':
+                self._event = value
+            elif field == 'id' and '\0' not in value:
+                self.last_event_id = value
+            elif field == 'retry' and value.isdigit():
+                self.retry_ms = int(value)
+        return events
+
+
+class StreamConnection:
+    """流式连接基类
+
+    run() 连接并读取消息直到关闭, 每条消息调用 on_message(StreamMessage);
+    状态变化(connecting/open/reconnecting/closed)调用 on_state(state, detail)。
+    """
+    kind = None
+    can_send = False
+
+    def __init__(self, http_client, url, headers=None, timeout=30):
+        self.http_client = http_client
+        self.url = url
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.closed = False
+
+    async def run(self, on_message, on_state=None):
+        raise NotImplementedError
+
+    async def send(self, text):
+        raise RuntimeError(f"{self.kind} streams are receive-only")
+
+    async def close(self):
+        self.closed = True
+
+    @staticmethod
+    def _notify(on_state, state, detail=""):
+        logger.debug(f"Stream {state}{f': {detail}' if detail else ''}")
+        if on_state is not None:
+            on_state(state, detail)
+
+
+class WebSocketStream(StreamConnection):
+    kind = 'websocket'
+    can_send = True
+
+    def __init__(self, http_client, url, headers=None, timeout=30):
+        super().__init__(http_client, url, headers, timeout)
+        self._ws = None
+
+    async def run(self, on_message, on_state=None):
+        session, request_url, proxy = await self.http_client.open_stream_session(self.url)
+        self._notify(on_state, 'connecting', self.url)
+        async with session.ws_connect(
+            request_url,
+            headers=self.headers,
+            proxy=proxy,
+            ssl=False,
+            heartbeat=30,
+            max_msg_size=0,
+        ) as ws:
+            self._ws = ws
+            self._notify(on_state, 'open', self.url)
+            try:
+                async for msg in ws:
+                    if msg.type == aiohttp.WSMsgType.TEXT:
+                        instrumentation.count('stream.message')
+                        on_message(StreamMessage('in', 'text', msg.data))
+                    elif msg.type == aiohttp.WSMsgType.BINARY:
+                        instrumentation.count('stream.message')
+                        on_message(StreamMessage('in', 'binary', msg.data))
+                    elif msg.type == aiohttp.WSMsgType.ERROR:
+                        raise ws.exception()
+            finally:
+                self._ws = None
+        self._notify(on_state, 'closed', f"code {ws.close_code}" if ws.close_code is not None else "")
+
+    async def send(self, text):
+        """发送文本帧, 返回对应的 StreamMessage"""
+        if self._ws is None or self._ws.closed:
+            raise RuntimeError("WebSocket is not connected")
+        await self._ws.send_str(text)
+        return StreamMessage('out', 'text', text)
+
+    async def close(self):
+        await super().close()
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+
+
+class EventStream(StreamConnection):
+    """SSE 连接; 服务器关闭连接后按 retry 间隔带 Last-Event-ID 自动重连"""
+    kind = 'sse'
+
+    def __init__(self, http_client, url, headers=None, timeout=30, reconnect=True):
+        super().__init__(http_client, url, headers, timeout)
+        self.reconnect = reconnect
+        self._response = None
+
+    async def run(self, on_message, on_state=None):
+        parser = SseParser()
+        opened = False
+        while not self.closed:
+            session, request_url, proxy = await self.http_client.open_stream_session(self.url)
+            headers = {'Accept': 'text/event-stream', 'Cache-Control': 'no-cache', **self.headers}
+            if parser.last_event_id:
+                headers['Last-Event-ID'] = parser.last_event_id
+            self._notify(on_state, 'connecting', self.url)
+            try:
+                async with session.get(
+                    request_url,
+                    headers=headers,
+                    proxy=proxy,
+                    ssl=False,
+                    # 流没有总超时, 只限制建连等待时间
+                    timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.timeout),
+                ) as response:
+                    if response.status != 200:
+                        raise RuntimeError(f"Unexpected status {response.status} {response.reason}")
+                    self._response = response
+                    opened = True
+                    self._notify(on_state, 'open', response.headers.get('Content-Type', ''))
+                    try:
+                        async for chunk in response.content.iter_any():
+                            for event in parser.feed(chunk):
+                                instrumentation.count('stream.message')
+                                on_message(StreamMessage('in', event.event, event.data))
+                    finally:
+                        self._response = None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # 第一次连接失败直接报错; 已建立的流断开后按规范重连
+                if not opened:
+                    raise
+                if not self.closed:
+                    logger.info(f"Event stream {self.url} interrupted: {e}")
+            if self.closed or not self.reconnect:
+                break
+            delay = (parser.retry_ms or DEFAULT_SSE_RETRY_MS) / 1000
+            self._notify(on_state, 'reconnecting', f"in {delay:.1f} s")
+            await asyncio.sleep(delay)
+        self._notify(on_state, 'closed')
+
+    async def close(self):
+        await super().close()
+        if self._response is not None:
+            self._response.close()
+
+
+def open_stream(http_client, url, kind=None, headers=None, timeout=30):
+    """创建流式连接; kind 为空时根据地址判断"""
+    kind = kind or guess_stream_kind(url)
+    if kind == 'websocket':
+        return WebSocketStream(http_client, url, headers, timeout)
+    if kind == 'sse':
+        return EventStream(http_client, url, headers, timeout)
+    raise ValueError(f"Unknown stream kind: {kind}")
@@ -0,0 +1,146 @@
+"""
+响应内容搜索: 在后台线程中直接搜索字节内容(bytes 或 mmap), 增量返回命中的行号和位置
+
+纯文本和正则在字节上匹配(忽略大小写只对 ASCII 字符生效), 不依赖界面控件的文本文档;
+JSONPath/jq 风格的查询解析 JSON 后返回匹配的节点。
+"""
+import re
+from src.utils import json_utils
+from src.utils.assertions import AssertionSpecError, compile_jsonpath, evaluate_jsonpath
+
+SEARCH_MODES = ('text', 'regex', 'jsonpath')
+MAX_MATCHES = 100000  # 超过此数量后停止搜索
+PARTIAL_BATCH = 1000  # 每找到多少个命中发送一次增量结果
+
+
+class SearchError(ValueError):
+    """查询语法错误"""
+    pass
+
+
+class SearchMatch:
+    """一个命中; start/end 为行内字节偏移"""
+    __slots__ = ('line', 'line_offset', 'start', 'end')
+
+    def __init__(self, line, line_offset, start, end):
+        self.line = line
+        self.line_offset = line_offset  # 所在行在内容中的起始偏移
+        self.start = start
+        self.end = end
+
+
+def jq_to_jsonpath(query):
+    """把 jq 风格的路径(.items[].name)转换为 JSONPath($.items[*].name)"""
+    query = query.strip()
+    if query.startswith('$'):
+        return query
+    if query in ('', '.'):
+        return '$'
+    return '$' + query.replace('[]', '[*]')
+
+
+def compile_pattern(mode, pattern, case_sensitive=False):
+    """把纯文本或正则编译为字节正则"""
+    if not pattern:
+        raise SearchError("Empty search pattern")
+    flags = re.MULTILINE if case_sensitive else re.MULTILINE | re.IGNORECASE
+    source = pattern.encode('utf-8')
+    if mode == 'text':
+        return re.compile(re.escape(source), flags)
+    try:
+        return re.compile(source, flags)
+    except re.error as e:
+        raise SearchError(f"Invalid regular expression: {e}") from e
+
+
+def _count_newlines(buffer, start, end):
+    count = getattr(buffer, 'count', None)
+    if count is not None:
+        return count(b'\n', start, end)
+    return buffer[start:end].count(b'\n')
+
+
+def search_buffer(buffer, regex, worker=None, max_matches=MAX_MATCHES):
+    """在字节内容中查找所有命中
+
+    Args:
+        buffer: bytes 或 mmap
+        regex: compile_pattern 返回的字节正则
+        worker: 可选的 BackgroundWorker, 通过 emit_partial 发送 SearchMatch 列表, 并检查取消
+        max_matches: 最多返回的命中数
+
+    Returns:
+        dict: matches(未通过 emit_partial 发送的剩余命中)、total 和 truncated
+    """
+    batch = []
+    total = 0
+    line = 0
+    counted_to = 0  # 已统计换行符的位置
+    line_offset = 0
+    size = len(buffer)
+    for match in regex.finditer(buffer):
+        start, end = match.span()
+        if start == end:
+            continue  # 忽略空匹配(如 ^ 或 \b)
+        if start > counted_to:
+            newlines = _count_newlines(buffer, counted_to, start)
+            if newlines:
+                line += newlines
+                line_offset = buffer.rfind(b'\n', counted_to, start) + 1
+            counted_to = start
+        # 跨行的命中只记录到行尾
+        line_end = buffer.find(b'\n', start, end)
+        batch.append(SearchMatch(line, line_offset, start - line_offset,
+                                 (end if line_end < 0 else line_end) - line_offset))
+        total += 1
+        if total >= max_matches:
+            break
+        if worker is not None and len(batch) >= PARTIAL_BATCH:
+            if worker.is_cancelled():
+                return None
+            worker.emit_partial(batch)
+            worker.report_progress(start, size)
+            batch = []
+    return {'matches': batch, 'total': total, 'truncated': total >= max_matches}
+
+
+def compile_query(mode, pattern, case_sensitive=False):
+    """在界面线程中编译查询, 语法错误立即报告
+
+    Returns:
+        文本/正则模式为字节正则, JSONPath 模式为编译后的路径步骤
+    """
+    if mode == 'jsonpath':
+        try:
+            return compile_jsonpath(jq_to_jsonpath(pattern))
+        except AssertionSpecError as e:
+            raise SearchError(str(e)) from e
+    return compile_pattern(mode, pattern, case_sensitive)
+
+
+def query_json(buffer, steps):
+    """解析 JSON 并执行编译后的 JSONPath, 返回匹配的值列表"""
+    try:
+        document = json_utils.loads(bytes(buffer))
+    except ValueError as e:
+        raise SearchError(f"Response is not valid JSON: {e}") from e
+    return evaluate_jsonpath(steps, document)
+
+
+def run_search(buffer, mode, query, worker=None):
+    """后台任务入口
+
+    Args:
+        query: compile_query 的结果
+
+    Returns:
+        dict: 文本/正则模式见 search_buffer; JSONPath 模式为 {'nodes': [...], 'total': n};
+        内容不是 JSON 时为 {'error': 信息}; 已取消时为 None
+    """
+    try:
+        if mode == 'jsonpath':
+            nodes = query_json(buffer, query)
+            return {'nodes': nodes, 'total': len(nodes), 'truncated': False}
+        return search_buffer(buffer, query, worker)
+    except SearchError as e:
+        return {'error': str(e)}
@@ -0,0 +1,121 @@
+"""
+基于 aiohttp 的默认传输: HTTP/1.1 连接池, 支持 HTTP/SOCKS 代理、静态主机映射和完整的跟踪钩子
+"""
+import asyncio
+import aiohttp
+from loguru import logger
+from multidict import CIMultiDict
+from src.utils.http_result import HttpResult
+from src.utils.http_trace import create_trace_config
+from src.utils.response_body import SPOOL_THRESHOLD, read_body
+from src.utils.network import create_connector, is_socks_proxy
+from src.utils.transports.base import Transport, TransportCapabilities
+
+
+class AiohttpTransport(Transport):
+    """aiohttp 会话的封装
+
+    使用 SOCKS 代理的请求需要单独的连接器, 每个 SOCKS 代理各有一个会话, 共享 HttpClient 的 Cookie Jar。
+    """
+    name = 'aiohttp'
+    label = "aiohttp (HTTP/1.1)"
+    capabilities = TransportCapabilities(streaming=True, trace_hooks=True, proxies=True,
+                                         socks_proxies=True, host_overrides=True)
+
+    def __init__(self, client):
+        super().__init__(client)
+        self.sessions = {}  # 会话 key(SOCKS 代理地址, 直连或 HTTP 代理为 None) -> 会话
+        self._session_loop = None
+        self._stale_sessions = []
+        self.trace_config = create_trace_config()
+
+    def configure_network(self, network):
+        """已建立的连接可能指向旧的地址或代理, 下次请求时重建会话"""
+        self._stale_sessions.extend(self.sessions.values())
+        self.sessions = {}
+
+    async def _close_stale_sessions(self):
+        stale, self._stale_sessions = self._stale_sessions, []
+        for session in stale:
+            if not session.closed:
+                await session.close()
+
+    async def get_session(self, proxy=None):
+        """获取共享会话, 第一次使用或事件循环变化时创建
+
+        Args:
+            proxy: 请求使用的代理; 只有 SOCKS 代理需要单独的会话
+        """
+        key = proxy if proxy and is_socks_proxy(proxy) else None
+        return await self._session(key, lambda: create_connector(self.client.network, self.client.resolver, key))
+
+    async def _session(self, key, connector_factory):
+        """按 key 获取会话, 没有或已关闭时用 connector_factory() 创建的连接器新建"""
+        loop = asyncio.get_running_loop()
+        if self._session_loop is not loop:
+            self._stale_sessions.extend(self.sessions.values())
+            self.sessions = {}
+            self._session_loop = loop
+        if self._stale_sessions:
+            await self._close_stale_sessions()
+
+        session = self.sessions.get(key)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=connector_factory(),
+                cookie_jar=self.client.get_cookie_jar(),
+                trace_configs=[self.trace_config]
+            )
+            self.sessions[key] = session
+            logger.debug(f"Created shared HTTP session{f' ({key})' if key else ''}")
+        return session
+
+    async def send(self, request, trace_context):
+        proxy = self.client.network.proxy_for(request[1])
+        session = await self.get_session(proxy)
+        # HTTP(S) 代理按请求设置, SOCKS 代理由会话的连接器处理
+        http_proxy = proxy if proxy and not is_socks_proxy(proxy) else None
+        return await self._send(session, request, trace_context, http_proxy)
+
+    async def open_stream_session(self, url):
+        proxy = self.client.network.proxy_for(url)
+        session = await self.get_session(proxy)
+        return session, url, proxy if proxy and not is_socks_proxy(proxy) else None
+
+    async def _send(self, session, request, trace_context, proxy=None):
+        """通过指定会话发送请求并读取完整响应体"""
+        method, url, headers, body, timeout = request
+        async with session.request(
+            method=method,
+            url=url,
+            headers=headers,
+            data=body if body else None,
+            verify_ssl=False,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            proxy=proxy,
+            trace_request_ctx=trace_context
+        ) as response:
+            # 读取原始字节数据, 解码延迟到第一次访问 text 时; 大响应边读边写入临时文件
+            if response.content_length is not None and response.content_length <= SPOOL_THRESHOLD:
+                content = await response.read()
+            else:
+                content = await read_body(response.content.iter_any())
+            try:
+                encoding = response.get_encoding()
+            except (RuntimeError, LookupError):
+                encoding = None
+            return HttpResult(
+                status=response.status,
+                reason=response.reason,
+                headers=CIMultiDict(response.headers),
+                content=content,
+                encoding=encoding,
+                url=str(response.url),
+                hops=trace_context['hops'],
+                http_version=f"HTTP/{response.version.major}.{response.version.minor}"
+            )
+
+    async def close(self):
+        self._stale_sessions.extend(self.sessions.values())
+        self.sessions = {}
+        await self._close_stale_sessions()
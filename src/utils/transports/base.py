@@ -0,0 +1,82 @@
+"""
+传输引擎接口: HttpClient 负责重试、对冲、Cookie 持久化和跟踪记录, 引擎只负责把一次请求发出去
+"""
+
+
+class TransportError(RuntimeError):
+    """传输引擎不可用或不支持请求"""
+
+
+class TransportCapabilities:
+    """传输引擎的能力描述, 用于选择引擎和在界面中提示限制"""
+    FIELDS = (
+        'streaming',       # 可以建立 WebSocket/SSE 流式连接
+        'http2',           # 支持 HTTP/2 多路复用
+        'trace_hooks',     # 提供 DNS/建连/连接复用的跟踪信息
+        'unix_sockets',    # 可以连接 unix 域套接字
+        'proxies',         # 支持 HTTP(S) 代理
+        'socks_proxies',   # 支持 SOCKS 代理
+        'host_overrides',  # 使用 CachingResolver(静态主机映射和 DNS 缓存)
+    )
+
+    def __init__(self, **flags):
+        unknown = set(flags) - set(self.FIELDS)
+        if unknown:
+            raise TypeError(f"Unknown transport capabilities: {', '.join(sorted(unknown))}")
+        for field in self.FIELDS:
+            setattr(self, field, bool(flags.get(field, False)))
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def describe(self):
+        """以逗号分隔列出支持的能力"""
+        return ", ".join(field for field in self.FIELDS if getattr(self, field))
+
+    def __repr__(self):
+        return f"<TransportCapabilities {self.describe()}>"
+
+
+class Transport:
+    """传输引擎基类
+
+    子类设置 name/label/capabilities 并实现 send 和 close; 可选依赖未安装时 available() 返回 False。
+    引擎由 HttpClient 按需创建, 通过 self.client 共享 Cookie Jar、网络设置和 DNS 解析器。
+    """
+    name = None
+    label = None
+    capabilities = TransportCapabilities()
+    missing_message = None  # 不可用时的提示
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def available(cls):
+        return True
+
+    def configure_network(self, network):
+        """网络设置变化时调用; 持有连接池的引擎应丢弃已有连接"""
+
+    async def send(self, request, trace_context):
+        """发送一次请求(自动跟随重定向)并读取完整响应体
+
+        Args:
+            request: (method, url, headers, body, timeout)
+            trace_context: http_trace.new_trace_context 创建的跟踪上下文, 每一跳记录在其中
+
+        Returns:
+            HttpResult: 只需填写响应相关字段, attempt/elapsed_ms/attempts 由 HttpClient 填写
+        """
+        raise NotImplementedError
+
+    async def open_stream_session(self, url):
+        """流式连接(WebSocket/SSE)使用的 aiohttp 会话
+
+        Returns:
+            (session, request_url, proxy): 会话、实际请求地址和按请求设置的 HTTP 代理
+        """
+        raise TransportError(f"Transport {self.name} does not support streaming")
+
+    async def close(self):
+        """关闭连接池"""
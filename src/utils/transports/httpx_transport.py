@@ -0,0 +1,147 @@
+"""
+基于 httpx/h2 的 HTTP/2 传输: 同一主机的并发请求复用一个连接上的多个流
+
+aiohttp 只支持 HTTP/1.1, 并发请求会建立多个 TCP 连接。域名选择 httpx 引擎时,
+HttpClient 通过此传输发送请求; 重试、对冲、Cookie 和跟踪记录与 aiohttp 共用。
+"""
+import importlib.util
+from http.cookies import SimpleCookie
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from loguru import logger
+from multidict import CIMultiDict
+from yarl import URL
+from src.utils.http_result import HttpResult
+from src.utils.response_body import read_body
+from src.utils.http_trace import (start_hop, finish_hop, current_hop, connection_started,
+                                  connection_created, connection_reused)
+from src.utils.transports.base import Transport, TransportCapabilities, TransportError
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+HTTP2_AVAILABLE = httpx is not None and importlib.util.find_spec('h2') is not None
+HTTP2_MISSING = "HTTP/2 requires httpx with h2 (pip install 'httpx[http2]')"
+
+_EXTENSION = 'free_http_trace'
+
+
+def _trace_callback(context):
+    """httpcore 的 trace 扩展: 根据连接事件判断新建还是复用连接
+
+    建连耗时包括 TLS 握手; 发送请求头前没有建连事件说明复用了已有连接(HTTP/2 下为同一连接的新流)。
+    """
+    async def trace(event, info):
+        if event == 'connection.connect_tcp.started':
+            connection_started(context)
+        elif event == 'connection.connect_tcp.complete':
+            hop = current_hop(context)
+            if hop is not None and not hop['url'].startswith('https:'):
+                connection_created(context)
+        elif event == 'connection.start_tls.complete':
+            connection_created(context)
+        elif event.endswith('.send_request_headers.started'):
+            hop = current_hop(context)
+            if hop is not None and hop['connection'] is None:
+                connection_reused(context)
+    return trace
+
+
+class HttpxTransport(Transport):
+    """httpx 客户端的封装, 与 HttpClient 共享 Cookie Jar
+
+    http:// 地址使用 h2c(先验知识, 不经过协商); https:// 地址通过 ALPN 协商, 服务器不支持时回退到 HTTP/1.1。
+    httpx 不经过 CachingResolver, 静态主机映射和 DNS 缓存对此引擎无效。
+    """
+    name = 'httpx'
+    label = "httpx (HTTP/2)"
+    capabilities = TransportCapabilities(http2=True, trace_hooks=True, proxies=True)
+    missing_message = HTTP2_MISSING
+
+    def __init__(self, client):
+        if not HTTP2_AVAILABLE:
+            raise TransportError(HTTP2_MISSING)
+        super().__init__(client)
+        self.clients = {}  # (是否 h2c, 代理) -> httpx.AsyncClient
+
+    def _get_client(self, url, proxy):
+        prior_knowledge = URL(url).scheme == 'http'
+        key = (prior_knowledge, proxy)
+        client = self.clients.get(key)
+        if client is None:
+            client = httpx.AsyncClient(
+                http1=not prior_knowledge,
+                http2=True,
+                verify=False,
+                proxy=proxy,
+                follow_redirects=True,
+                # Cookie 由共享的 Cookie Jar 管理, 禁用 httpx 自己的 Cookie 存储
+                cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+                event_hooks={'request': [self._on_request], 'response': [self._on_response]},
+            )
+            self.clients[key] = client
+            logger.debug(f"Created HTTP/2 client ({'h2c' if prior_knowledge else 'ALPN'})"
+                         f"{f' via {proxy}' if proxy else ''}")
+        return client
+
+    async def _on_request(self, request):
+        """每一跳(包括重定向)发送前: 记录跳并附加 Cookie"""
+        context, cookie_jar = request.extensions[_EXTENSION]
+        start_hop(context, request.method, request.url)
+        cookies = cookie_jar.filter_cookies(URL(str(request.url)))
+        if cookies:
+            jar_cookies = "; ".join(f"{name}={morsel.coded_value}" for name, morsel in cookies.items())
+            existing = request.headers.get('Cookie')
+            request.headers['Cookie'] = f"{existing}; {jar_cookies}" if existing else jar_cookies
+
+    async def _on_response(self, response):
+        """每一跳收到响应头后: 保存 Set-Cookie 并结束该跳"""
+        context, cookie_jar = response.request.extensions[_EXTENSION]
+        set_cookies = response.headers.get_list('set-cookie')
+        if set_cookies:
+            response_url = URL(str(response.url))
+            if hasattr(cookie_jar, 'update_cookies_from_headers'):
+                cookie_jar.update_cookies_from_headers(set_cookies, response_url)
+            else:
+                for header in set_cookies:
+                    cookie_jar.update_cookies(SimpleCookie(header), response_url)
+        finish_hop(context, response.status_code, response.http_version,
+                   response.extensions.get('stream_id'))
+
+    @classmethod
+    def available(cls):
+        return HTTP2_AVAILABLE
+
+    async def send(self, request, trace_context):
+        method, url, headers, body, timeout = request
+        cookie_jar = self.client.get_cookie_jar()
+        client = self._get_client(url, self.client.network.proxy_for(url))
+        response = await client.send(client.build_request(
+            method,
+            url,
+            headers=headers,
+            content=body if body else None,
+            timeout=timeout,
+            extensions={_EXTENSION: (trace_context, cookie_jar), 'trace': _trace_callback(trace_context)},
+        ), stream=True)
+        try:
+            # 大响应边读边写入临时文件
+            content = await read_body(response.aiter_bytes())
+        finally:
+            await response.aclose()
+        return HttpResult(
+            status=response.status_code,
+            reason=response.reason_phrase,
+            headers=CIMultiDict(response.headers.multi_items()),
+            content=content,
+            encoding=response.charset_encoding,
+            url=str(response.url),
+            hops=trace_context['hops'],
+            http_version=response.http_version,
+        )
+
+    async def close(self):
+        clients, self.clients = self.clients, {}
+        for client in clients.values():
+            await client.aclose()
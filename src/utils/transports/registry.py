@@ -0,0 +1,31 @@
+"""
+已注册的传输引擎; 域名配置和请求参数通过名称选择引擎
+"""
+from src.utils.transports.base import TransportError
+from src.utils.transports.aiohttp_transport import AiohttpTransport
+from src.utils.transports.httpx_transport import HttpxTransport
+from src.utils.transports.unix_transport import UnixTransport
+
+DEFAULT_TRANSPORT = AiohttpTransport.name
+UNIX_TRANSPORT = UnixTransport.name  # unix:// 地址使用的引擎
+
+TRANSPORTS = {
+    AiohttpTransport.name: AiohttpTransport,
+    HttpxTransport.name: HttpxTransport,
+    UnixTransport.name: UnixTransport,
+}
+
+
+def get_transport_class(name):
+    """按名称获取引擎类; 名称为空时返回默认引擎, 未知或不可用时抛出 TransportError"""
+    transport_class = TRANSPORTS.get(name or DEFAULT_TRANSPORT)
+    if transport_class is None:
+        raise TransportError(f"Unknown transport: {name} (available: {', '.join(TRANSPORTS)})")
+    if not transport_class.available():
+        raise TransportError(transport_class.missing_message or f"Transport {name} is not available")
+    return transport_class
+
+
+def available_transports():
+    """当前环境可用的引擎类列表, 默认引擎在前"""
+    return [transport_class for transport_class in TRANSPORTS.values() if transport_class.available()]
@@ -0,0 +1,42 @@
+"""
+unix 域套接字传输: 直接连接本机 sidecar/管理端口的套接字文件, 省去 TCP 握手和回环网络栈
+
+地址形式为 unix:///run/app.sock/health 或 http+unix://%2Frun%2Fapp.sock/health,
+HttpClient 遇到这类地址时自动选择此引擎。每个套接字一个会话, 连接在请求之间复用。
+"""
+import sys
+import aiohttp
+from src.utils.network import split_unix_url, unix_url
+from src.utils.transports.base import TransportCapabilities
+from src.utils.transports.aiohttp_transport import AiohttpTransport
+
+UNIX_SOCKETS_AVAILABLE = sys.platform != 'win32'
+
+
+class UnixTransport(AiohttpTransport):
+    """基于 aiohttp UnixConnector 的传输, 请求以 Host: localhost 发送到套接字"""
+    name = 'unix'
+    label = "Unix socket (aiohttp)"
+    capabilities = TransportCapabilities(streaming=True, trace_hooks=True, unix_sockets=True)
+    missing_message = "Unix domain sockets are not supported on Windows"
+
+    @classmethod
+    def available(cls):
+        return UNIX_SOCKETS_AVAILABLE
+
+    async def open_stream_session(self, url):
+        socket_path, request_url = split_unix_url(url)
+        session = await self._session(socket_path, lambda: aiohttp.UnixConnector(path=socket_path))
+        return session, request_url, None
+
+    async def send(self, request, trace_context):
+        method, url, headers, body, timeout = request
+        socket_path, request_url = split_unix_url(url)
+        session = await self._session(socket_path, lambda: aiohttp.UnixConnector(path=socket_path))
+        result = await self._send(session, (method, request_url, headers, body, timeout), trace_context)
+        # 结果和跟踪记录中显示原始的 unix:// 地址
+        result.url = unix_url(socket_path, result.url)
+        for hop in trace_context['hops']:
+            if hop['url'].startswith('http://localhost'):
+                hop['url'] = unix_url(socket_path, hop['url'])
+        return result
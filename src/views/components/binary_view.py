@@ -0,0 +1,319 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListView, QLabel, QComboBox,
+                            QLineEdit, QPushButton, QStackedWidget, QScrollArea, QFileDialog,
+                            QAbstractItemView)
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt6.QtGui import QFont, QPixmap
+import os
+from loguru import logger
+from src.models.config_model import ConfigModel
+from src.utils.background_worker import BackgroundWorker
+from src.utils.binary_decoders import (DECODABLE_KINDS, DecodeError, ProtobufSchema, decode_body,
+                                       decoder_missing)
+from src.utils.response_body import image_format
+from src.views.components.lazy_tree_view import LazyTreeView
+
+BYTES_PER_ROW = 16
+IMAGE_PREVIEW_LIMIT = 64 * 1024 * 1024  # 超过此大小的图片不预览
+MODE_LABELS = {'hex': "Hex", 'image': "Image", 'decoded': "Decoded"}
+DECODER_LABELS = {'msgpack': "MessagePack", 'cbor': "CBOR", 'protobuf': "Protobuf", 'grpc-web': "gRPC-Web"}
+
+
+def hex_line(offset, chunk, width=BYTES_PER_ROW):
+    """一行十六进制和 ASCII 对照"""
+    ascii_text = "".join(chr(byte) if 32 <= byte < 127 else "." for byte in chunk)
+    return f"{offset:08x}  {chunk.hex(' '):<{width * 3}} {ascii_text}"
+
+
+def hex_dump(data, width=BYTES_PER_ROW):
+    """十六进制和 ASCII 对照显示"""
+    return "\n".join(hex_line(offset, data[offset:offset + width], width) for offset in range(0, len(data), width))
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class HexDumpModel(QAbstractListModel):
+    """按行读取 bytes/mmap 的十六进制模型; 只格式化视图中可见的行"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.buffer = b''
+        self.size = 0
+
+    def set_buffer(self, buffer, size):
+        self.beginResetModel()
+        self.buffer = buffer
+        self.size = size
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else (self.size + BYTES_PER_ROW - 1) // BYTES_PER_ROW
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        offset = index.row() * BYTES_PER_ROW
+        return hex_line(offset, bytes(self.buffer[offset:offset + BYTES_PER_ROW]))
+
+
+class BinaryView(QWidget):
+    """二进制响应体查看器: 分页的十六进制视图、图片预览和 MessagePack/CBOR/Protobuf/gRPC-Web 解码树
+
+    响应体通过 ResponseBody.buffer 按需读取(大响应为 mmap), 不解码为完整的字符串。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.config_model = ConfigModel()
+        self.body = None
+        self.kind = None
+        self.schema = None
+        self.decoded_key = None  # 已解码内容对应的 (响应体, 解码器, 消息类型)
+        self.worker = None
+        self.generation = 0
+        self.init_ui()
+        descriptor = self.config_model.get('protobuf_descriptor')
+        if descriptor and os.path.exists(descriptor):
+            self.load_descriptor(descriptor)
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+        toolbar = QHBoxLayout()
+        self.info_label = QLabel()
+        self.info_label.setStyleSheet("color: #6c757d; padding: 2px;")
+        toolbar.addWidget(self.info_label)
+        toolbar.addStretch()
+
+        self.mode_combo = QComboBox()
+        self.mode_combo.currentIndexChanged.connect(self.on_mode_changed)
+        toolbar.addWidget(self.mode_combo)
+
+        self.decoder_combo = QComboBox()
+        for kind in DECODABLE_KINDS:
+            self.decoder_combo.addItem(DECODER_LABELS[kind], kind)
+        self.decoder_combo.currentIndexChanged.connect(self.on_decoder_changed)
+        toolbar.addWidget(self.decoder_combo)
+
+        self.descriptor_button = QPushButton("Descriptor...")
+        self.descriptor_button.setToolTip("Load a FileDescriptorSet (protoc --include_imports --descriptor_set_out)")
+        self.descriptor_button.clicked.connect(self.choose_descriptor)
+        toolbar.addWidget(self.descriptor_button)
+
+        self.message_combo = QComboBox()
+        self.message_combo.setMinimumWidth(180)
+        self.message_combo.currentIndexChanged.connect(lambda _: self.show_decoded())
+        toolbar.addWidget(self.message_combo)
+
+        self.offset_input = QLineEdit()
+        self.offset_input.setPlaceholderText("Go to offset (0x...)")
+        self.offset_input.setMaximumWidth(160)
+        self.offset_input.returnPressed.connect(self.go_to_offset)
+        toolbar.addWidget(self.offset_input)
+        layout.addLayout(toolbar)
+
+        self.stack = QStackedWidget()
+        self.hex_model = HexDumpModel(self)
+        self.hex_view = QListView()
+        self.hex_view.setModel(self.hex_model)
+        self.hex_view.setUniformItemSizes(True)
+        self.hex_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.hex_view.setFont(QFont("Consolas, Courier New, monospace"))
+        self.stack.addWidget(self.hex_view)
+
+        self.image_label = QLabel()
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.image_area = QScrollArea()
+        self.image_area.setWidgetResizable(True)
+        self.image_area.setWidget(self.image_label)
+        self.stack.addWidget(self.image_area)
+
+        self.tree_view = LazyTreeView()
+        self.stack.addWidget(self.tree_view)
+
+        self.message_label = QLabel()
+        self.message_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.message_label.setWordWrap(True)
+        self.message_label.setStyleSheet("color: #6c757d; padding: 20px;")
+        self.stack.addWidget(self.message_label)
+        layout.addWidget(self.stack)
+
+    def set_body(self, body, kind, content_type=''):
+        """显示响应体
+
+        Args:
+            body: ResponseBody
+            kind: detect_body_kind 的结果
+            content_type: 响应的 Content-Type, 用于显示
+        """
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+        self.generation += 1
+        self.body = body
+        self.kind = kind
+        self.decoded_key = None
+        self.tree_view.clear()
+        self.image_label.clear()
+        self.hex_model.set_buffer(body.buffer, body.size)
+        details = [content_type or "unknown type", format_size(body.size)]
+        if body.spooled:
+            details.append("memory-mapped")
+        self.info_label.setText(" · ".join(details))
+
+        modes = ['hex']
+        if kind == 'image':
+            modes.insert(0, 'image')
+        else:
+            modes.append('decoded')
+            if kind in DECODABLE_KINDS:
+                modes.insert(0, modes.pop())
+        self.decoder_combo.blockSignals(True)
+        # 未知的二进制内容默认按 Protobuf 线格式尝试, 不需要描述文件
+        decoder = kind if kind in DECODABLE_KINDS else 'protobuf'
+        self.decoder_combo.setCurrentIndex(self.decoder_combo.findData(decoder))
+        self.decoder_combo.blockSignals(False)
+        self.mode_combo.blockSignals(True)
+        self.mode_combo.clear()
+        for mode in modes:
+            self.mode_combo.addItem(MODE_LABELS[mode], mode)
+        self.mode_combo.blockSignals(False)
+        self.on_mode_changed()
+
+    def clear(self):
+        self.generation += 1
+        self.body = None
+        self.decoded_key = None
+        self.hex_model.set_buffer(b'', 0)
+        self.tree_view.clear()
+        self.image_label.clear()
+
+    def update_toolbar(self):
+        mode = self.mode_combo.currentData()
+        decoder = self.decoder_combo.currentData()
+        self.decoder_combo.setVisible(mode == 'decoded')
+        uses_schema = mode == 'decoded' and decoder in ('protobuf', 'grpc-web')
+        self.descriptor_button.setVisible(uses_schema)
+        self.message_combo.setVisible(uses_schema and self.schema is not None)
+        self.offset_input.setVisible(mode == 'hex')
+
+    def on_mode_changed(self, *args):
+        mode = self.mode_combo.currentData()
+        self.update_toolbar()
+        if self.body is None or mode is None:
+            return
+        if mode == 'image':
+            self.show_image()
+        elif mode == 'decoded':
+            self.show_decoded()
+        else:
+            self.stack.setCurrentWidget(self.hex_view)
+
+    def on_decoder_changed(self, *args):
+        self.update_toolbar()
+        self.show_decoded()
+
+    def show_message(self, text):
+        self.message_label.setText(text)
+        self.stack.setCurrentWidget(self.message_label)
+
+    def show_image(self):
+        if self.body.size > IMAGE_PREVIEW_LIMIT:
+            self.show_message(f"Image is too large to preview ({format_size(self.body.size)})")
+            return
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(self.body.read()):
+            self.show_message("Unsupported or corrupt image")
+            return
+        self.image_label.setPixmap(pixmap)
+        name = image_format(self.body.head(16)) or "Image"
+        self.info_label.setText(f"{name} {pixmap.width()}×{pixmap.height()} · {format_size(self.body.size)}")
+        self.stack.setCurrentWidget(self.image_area)
+
+    def show_decoded(self):
+        """在后台线程解码, 结果显示在懒加载树中"""
+        if self.body is None or self.mode_combo.currentData() != 'decoded':
+            return
+        decoder = self.decoder_combo.currentData()
+        missing = decoder_missing(decoder)
+        if missing:
+            self.show_message(missing)
+            return
+        message_name = self.message_combo.currentData() if self.schema is not None else None
+        key = (id(self.body), decoder, message_name)
+        if key == self.decoded_key:
+            self.stack.setCurrentWidget(self.tree_view)
+            return
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+        self.generation += 1
+        generation = self.generation
+        buffer, schema = self.body.buffer, self.schema
+        self.show_message(f"Decoding {DECODER_LABELS[decoder]}...")
+        logger.info(f"Decoding {decoder} body ({self.body.size} bytes)")
+
+        worker = BackgroundWorker(lambda w: decode_body(decoder, buffer, schema, message_name),
+                                  name="decode", parent=self)
+        worker.result.connect(lambda data: self.on_decoded(generation, key, data))
+        worker.error.connect(lambda message: self.on_decode_failed(generation, message))
+        self.worker = worker
+        worker.start()
+
+    def on_decoded(self, generation, key, data):
+        if generation != self.generation:
+            return
+        self.decoded_key = key
+        self.tree_view.set_data(data)
+        self.stack.setCurrentWidget(self.tree_view)
+
+    def on_decode_failed(self, generation, message):
+        if generation != self.generation:
+            return
+        logger.warning(f"Failed to decode body: {message}")
+        self.show_message(f"Cannot decode as {self.decoder_combo.currentText()}: {message}")
+
+    def choose_descriptor(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Load Protobuf Descriptor", self.config_model.get('protobuf_descriptor', ''),
+            "Descriptor sets (*.desc *.pb *.protoset *.bin);;All files (*)"
+        )
+        if path:
+            self.load_descriptor(path)
+
+    def load_descriptor(self, path):
+        try:
+            schema = ProtobufSchema(path)
+        except (OSError, DecodeError) as e:
+            logger.warning(f"Failed to load descriptor {path}: {e}")
+            self.show_message(f"Cannot load descriptor: {e}")
+            return
+        self.schema = schema
+        self.config_model.set('protobuf_descriptor', path)
+        self.message_combo.blockSignals(True)
+        self.message_combo.clear()
+        self.message_combo.addItem("(raw wire format)", None)
+        for name in schema.message_names:
+            self.message_combo.addItem(name, name)
+        self.message_combo.setCurrentIndex(1 if schema.message_names else 0)
+        self.message_combo.blockSignals(False)
+        self.update_toolbar()
+        self.show_decoded()
+
+    def go_to_offset(self):
+        text = self.offset_input.text().strip().lower()
+        try:
+            offset = int(text, 16) if text.startswith('0x') else int(text)
+        except ValueError:
+            return
+        if self.hex_model.size == 0:
+            return
+        row = min(max(offset, 0), self.hex_model.size - 1) // BYTES_PER_ROW
+        index = self.hex_model.index(row)
+        self.hex_view.setCurrentIndex(index)
+        self.hex_view.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
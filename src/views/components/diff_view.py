@@ -0,0 +1,294 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+                            QPushButton, QTableView, QHeaderView, QAbstractItemView)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QFont, QColor
+from bisect import bisect_right
+from loguru import logger
+
+from src.utils import json_utils
+from src.utils.background_worker import BackgroundWorker
+from src.utils.diff_utils import (line_diff, json_diff, DiffCancelled,
+                                  DEFAULT_IGNORE_PATHS, DEFAULT_ARRAY_KEYS)
+
+TAG_COLORS = {
+    'delete': QColor('#fff5f5'),
+    'insert': QColor('#f0fff4'),
+    'replace': QColor('#fffff0'),
+    'removed': QColor('#fff5f5'),
+    'added': QColor('#f0fff4'),
+    'changed': QColor('#fffff0'),
+}
+MAX_CELL_CHARS = 500  # 单元格最多显示的字符数
+
+
+class LineDiffModel(QAbstractTableModel):
+    """并排显示的行级差异, 按需从操作码计算每一行的内容"""
+    HEADERS = ["#", "Baseline", "#", "Current"]
+
+    def __init__(self, a_lines, b_lines, opcodes, parent=None):
+        super().__init__(parent)
+        self.a_lines = a_lines
+        self.b_lines = b_lines
+        self.opcodes = opcodes
+        # 每个操作码块在表格中的起始行
+        self.block_starts = []
+        rows = 0
+        for tag, i1, i2, j1, j2 in opcodes:
+            self.block_starts.append(rows)
+            rows += max(i2 - i1, j2 - j1)
+        self.total_rows = rows
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.total_rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 4
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def _locate(self, row):
+        """返回行所在的块, 以及左右两侧对应的行号(不存在时为 None)"""
+        block = bisect_right(self.block_starts, row) - 1
+        tag, i1, i2, j1, j2 = self.opcodes[block]
+        offset = row - self.block_starts[block]
+        left = i1 + offset if i1 + offset < i2 else None
+        right = j1 + offset if j1 + offset < j2 else None
+        return tag, left, right
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        tag, left, right = self._locate(index.row())
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return str(left + 1) if left is not None else ''
+            if column == 1:
+                return self.a_lines[left][:MAX_CELL_CHARS] if left is not None else ''
+            if column == 2:
+                return str(right + 1) if right is not None else ''
+            return self.b_lines[right][:MAX_CELL_CHARS] if right is not None else ''
+        if role == Qt.ItemDataRole.BackgroundRole and tag != 'equal':
+            return TAG_COLORS.get(tag)
+        return None
+
+    def next_change_row(self, row):
+        """返回 row 之后第一个差异块的起始行"""
+        for start, opcode in zip(self.block_starts, self.opcodes):
+            if start > row and opcode[0] != 'equal':
+                return start
+        return None
+
+
+class JsonDiffModel(QAbstractTableModel):
+    """JSON 结构化差异列表"""
+    HEADERS = ["Path", "Change", "Baseline", "Current"]
+
+    def __init__(self, changes, parent=None):
+        super().__init__(parent)
+        self.changes = changes
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.changes)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 4
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    @staticmethod
+    def _format(value):
+        return json_utils.dumps(value)[:MAX_CELL_CHARS]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        change = self.changes[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            column = index.column()
+            if column == 0:
+                return change['path']
+            if column == 1:
+                return change['kind']
+            if column == 2:
+                return self._format(change['old']) if change['kind'] != 'added' else ''
+            return self._format(change['new']) if change['kind'] != 'removed' else ''
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return TAG_COLORS.get(change['kind'])
+        return None
+
+    def next_change_row(self, row):
+        return row + 1 if row + 1 < len(self.changes) else None
+
+
+def compute_diff(baseline, current, ignore_paths, array_keys, worker=None):
+    """在后台线程中计算差异: 两侧都是 JSON 时做结构化比较, 否则做行级比较"""
+    cancelled = worker.is_cancelled if worker else None
+    try:
+        try:
+            old = json_utils.loads(baseline)
+            new = json_utils.loads(current)
+        except (ValueError, TypeError):
+            old = new = None
+        else:
+            if isinstance(old, (dict, list)) and isinstance(new, (dict, list)):
+                return {'mode': 'json', 'changes': json_diff(old, new, ignore_paths, array_keys, cancelled)}
+
+        a_lines = baseline.splitlines()
+        b_lines = current.splitlines()
+        return {
+            'mode': 'lines',
+            'a_lines': a_lines,
+            'b_lines': b_lines,
+            'opcodes': line_diff(a_lines, b_lines, cancelled=cancelled),
+        }
+    except DiffCancelled:
+        return None
+
+
+class DiffView(QWidget):
+    """并排显示两个响应的差异, 计算在后台线程中进行, 表格按需渲染可见行"""
+    closed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.baseline = ''
+        self.current = ''
+        self.worker = None
+        self.generation = 0
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+        options_layout = QHBoxLayout()
+        options_layout.addWidget(QLabel("Ignore paths:"))
+        self.ignore_input = QLineEdit(", ".join(DEFAULT_IGNORE_PATHS))
+        self.ignore_input.setToolTip("Comma separated wildcard paths, e.g. *.timestamp, $.meta.*")
+        self.ignore_input.returnPressed.connect(self.recompute)
+        options_layout.addWidget(self.ignore_input, stretch=2)
+
+        options_layout.addWidget(QLabel("Array keys:"))
+        self.keys_input = QLineEdit(", ".join(DEFAULT_ARRAY_KEYS))
+        self.keys_input.setToolTip("Object keys used to match array items between responses")
+        self.keys_input.returnPressed.connect(self.recompute)
+        options_layout.addWidget(self.keys_input, stretch=1)
+
+        recompute_button = QPushButton("Recompute")
+        recompute_button.clicked.connect(self.recompute)
+        options_layout.addWidget(recompute_button)
+
+        next_button = QPushButton("Next Change")
+        next_button.clicked.connect(self.goto_next_change)
+        options_layout.addWidget(next_button)
+
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.closed.emit)
+        options_layout.addWidget(close_button)
+        layout.addLayout(options_layout)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableView()
+        self.table.setFont(QFont("Consolas, Courier New, monospace"))
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setWordWrap(False)
+        # 固定行高, 避免对所有行计算尺寸
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(20)
+        self.table.verticalHeader().hide()
+        layout.addWidget(self.table)
+
+    @staticmethod
+    def _split(text):
+        return tuple(part.strip() for part in text.split(',') if part.strip())
+
+    def set_sources(self, baseline, current):
+        """设置要比较的两个响应内容并开始计算"""
+        self.baseline = baseline or ''
+        self.current = current or ''
+        self.recompute()
+
+    def recompute(self):
+        """在后台线程中重新计算差异, 取消尚未完成的计算"""
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+        self.generation += 1
+        generation = self.generation
+        baseline, current = self.baseline, self.current
+        ignore_paths = self._split(self.ignore_input.text())
+        array_keys = self._split(self.keys_input.text())
+
+        self.summary_label.setText("Computing diff...")
+        self.table.setModel(None)
+        logger.info(f"Computing diff: {len(baseline)} vs {len(current)} chars")
+
+        worker = BackgroundWorker(
+            lambda w: compute_diff(baseline, current, ignore_paths, array_keys, w),
+            name="diff", parent=self
+        )
+        worker.result.connect(lambda result: self.on_diff_ready(generation, result))
+        worker.error.connect(lambda message: self.on_diff_failed(generation, message))
+        self.worker = worker
+        worker.start()
+
+    def on_diff_ready(self, generation, result):
+        if generation != self.generation or result is None:
+            return
+        if result['mode'] == 'json':
+            model = JsonDiffModel(result['changes'], self)
+            counts = {}
+            for change in result['changes']:
+                counts[change['kind']] = counts.get(change['kind'], 0) + 1
+            detail = ", ".join(f"{count} {kind}" for kind, count in sorted(counts.items())) or "no differences"
+            self.summary_label.setText(f"JSON structural diff: {detail}")
+        else:
+            model = LineDiffModel(result['a_lines'], result['b_lines'], result['opcodes'], self)
+            changed = sum(1 for opcode in result['opcodes'] if opcode[0] != 'equal')
+            self.summary_label.setText(
+                f"Line diff: {changed} changed blocks "
+                f"({len(result['a_lines'])} vs {len(result['b_lines'])} lines)"
+            )
+        self.table.setModel(model)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        if result['mode'] == 'lines':
+            self.table.setColumnWidth(0, 60)
+            self.table.setColumnWidth(2, 60)
+            header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+            header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        else:
+            header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        logger.info(f"Diff ready: {self.summary_label.text()}")
+
+    def on_diff_failed(self, generation, message):
+        if generation != self.generation:
+            return
+        self.summary_label.setText(f"Diff failed: {message}")
+
+    def goto_next_change(self):
+        """跳转到下一个差异"""
+        model = self.table.model()
+        if model is None:
+            return
+        current = self.table.currentIndex().row() if self.table.currentIndex().isValid() else -1
+        row = model.next_change_row(current)
+        if row is not None:
+            self.table.selectRow(row)
+            self.table.scrollTo(model.index(row, 0), QAbstractItemView.ScrollHint.PositionAtCenter)
+
+    def shutdown(self):
+        """取消正在进行的计算"""
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
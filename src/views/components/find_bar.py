@@ -0,0 +1,165 @@
+from PyQt6.QtWidgets import (QWidget, QHBoxLayout, QLineEdit, QComboBox, QCheckBox, QPushButton, QLabel,
+                            QApplication)
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QAbstractListModel, QModelIndex
+
+MODE_LABELS = [("Text", 'text'), ("Regex", 'regex'), ("JSONPath", 'jsonpath')]
+LINE_PREVIEW_LIMIT = 2000  # 过滤视图中每行最多显示的字节数
+
+
+class MatchLinesModel(QAbstractListModel):
+    """过滤模式的列表模型: 每个命中的行一行, 行内容在显示时才从字节内容中读取"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.source = b''
+        self.lines = []  # (行号, 行起始偏移)
+
+    def reset_lines(self, source):
+        self.beginResetModel()
+        self.source = source if source is not None else b''
+        self.lines = []
+        self.endResetModel()
+
+    def add_matches(self, matches):
+        """追加一批命中(按位置排序), 同一行只显示一次"""
+        new_lines = []
+        last = self.lines[-1][0] if self.lines else -1
+        for match in matches:
+            if match.line != last:
+                new_lines.append((match.line, match.line_offset))
+                last = match.line
+        if not new_lines:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.lines), len(self.lines) + len(new_lines) - 1)
+        self.lines.extend(new_lines)
+        self.endInsertRows()
+
+    def line_at(self, row):
+        return self.lines[row][0]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.lines)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        line, offset = self.lines[index.row()]
+        end = self.source.find(b'\n', offset, offset + LINE_PREVIEW_LIMIT)
+        if end < 0:
+            end = min(offset + LINE_PREVIEW_LIMIT, len(self.source))
+        text = bytes(self.source[offset:end]).decode('utf-8', errors='replace').rstrip('\r')
+        return f"{line + 1:>7}  {text}"
+
+
+class FindBar(QWidget):
+    """响应内容的查找栏; 输入停顿后发出 search_requested, 由响应面板在后台执行搜索"""
+    search_requested = pyqtSignal(str, str, bool)  # 模式, 查询, 区分大小写
+    next_requested = pyqtSignal()
+    previous_requested = pyqtSignal()
+    filter_toggled = pyqtSignal(bool)
+    closed = pyqtSignal()
+
+    SEARCH_DELAY = 250  # 毫秒, 输入停顿后才开始搜索
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.emit_search)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+        self.mode_combo = QComboBox()
+        for label, mode in MODE_LABELS:
+            self.mode_combo.addItem(label, mode)
+        self.mode_combo.currentIndexChanged.connect(self.on_mode_changed)
+        layout.addWidget(self.mode_combo)
+
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("Find in response")
+        self.query_input.textChanged.connect(lambda _: self.search_timer.start(self.SEARCH_DELAY))
+        self.query_input.returnPressed.connect(self.on_return_pressed)
+        layout.addWidget(self.query_input)
+
+        self.case_checkbox = QCheckBox("Aa")
+        self.case_checkbox.setToolTip("Match case")
+        self.case_checkbox.toggled.connect(lambda _: self.emit_search())
+        layout.addWidget(self.case_checkbox)
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #6c757d; padding: 0 5px;")
+        layout.addWidget(self.status_label)
+
+        self.previous_button = QPushButton("↑")
+        self.previous_button.setToolTip("Previous match (Shift+Enter)")
+        self.previous_button.setFixedWidth(30)
+        self.previous_button.clicked.connect(self.previous_requested)
+        layout.addWidget(self.previous_button)
+
+        self.next_button = QPushButton("↓")
+        self.next_button.setToolTip("Next match (Enter)")
+        self.next_button.setFixedWidth(30)
+        self.next_button.clicked.connect(self.next_requested)
+        layout.addWidget(self.next_button)
+
+        self.filter_button = QPushButton("Filter")
+        self.filter_button.setCheckable(True)
+        self.filter_button.setToolTip("Show only matching lines")
+        self.filter_button.toggled.connect(self.filter_toggled)
+        layout.addWidget(self.filter_button)
+
+        close_button = QPushButton("✕")
+        close_button.setFixedWidth(30)
+        close_button.clicked.connect(self.close_bar)
+        layout.addWidget(close_button)
+        self.on_mode_changed()
+
+    @property
+    def mode(self):
+        return self.mode_combo.currentData()
+
+    def on_mode_changed(self, *args):
+        jsonpath = self.mode == 'jsonpath'
+        # JSONPath 结果总是以节点列表显示
+        self.query_input.setPlaceholderText("$.items[*].name or .items[].name" if jsonpath else "Find in response")
+        self.case_checkbox.setEnabled(not jsonpath)
+        self.filter_button.setEnabled(not jsonpath)
+        self.previous_button.setEnabled(not jsonpath)
+        self.next_button.setEnabled(not jsonpath)
+        self.emit_search()
+
+    def on_return_pressed(self):
+        if self.search_timer.isActive():
+            self.emit_search()
+        elif QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier:
+            self.previous_requested.emit()
+        else:
+            self.next_requested.emit()
+
+    def emit_search(self):
+        self.search_timer.stop()
+        self.search_requested.emit(self.mode, self.query_input.text(), self.case_checkbox.isChecked())
+
+    def set_status(self, text, error=False):
+        self.status_label.setText(text)
+        self.status_label.setStyleSheet(f"color: {'#dc3545' if error else '#6c757d'}; padding: 0 5px;")
+
+    def open_bar(self):
+        self.show()
+        self.query_input.setFocus()
+        self.query_input.selectAll()
+
+    def close_bar(self):
+        self.filter_button.setChecked(False)
+        self.hide()
+        self.closed.emit()
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key.Key_Escape:
+            self.close_bar()
+        else:
+            super().keyPressEvent(event)
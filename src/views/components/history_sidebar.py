@@ -6,7 +6,8 @@ import json
 from loguru import logger
 
 class HistoryItem(QWidget):
-    def __init__(self, method, url, timestamp, parent=None):
+    def __init__(self, method, url, timestamp, status=None, error_kind=None, elapsed_ms=None, source=None,
+                 parent=None):
         super().__init__(parent)
         layout = QVBoxLayout(self)
         layout.setSpacing(2)
@@ -37,8 +38,33 @@ class HistoryItem(QWidget):
             }
         """)
         top_layout.addWidget(time_label)
+        
+        # 定时探测的记录
+        if source == 'probe':
+            source_label = QLabel("probe")
+            source_label.setStyleSheet("""
+                QLabel {
+                    color: #6f42c1;
+                    font-size: 11px;
+                }
+            """)
+            top_layout.addWidget(source_label)
         top_layout.addStretch()
         
+        # 请求结果标签: 状态码或传输错误类型
+        if status is not None or error_kind:
+            result_text = str(status) if status is not None else error_kind
+            if elapsed_ms is not None:
+                result_text += f" · {elapsed_ms:.0f} ms"
+            result_label = QLabel(result_text)
+            result_label.setStyleSheet(f"""
+                QLabel {{
+                    color: {self.get_result_color(status, error_kind)};
+                    font-size: 11px;
+                }}
+            """)
+            top_layout.addWidget(result_label)
+        
         # URL标签
         url_label = QLabel(url)
         url_label.setStyleSheet("""
@@ -65,6 +91,16 @@ class HistoryItem(QWidget):
         }
         return colors.get(method, '#333333')
         
+    def get_result_color(self, status, error_kind):
+        """获取请求结果的文字颜色, 传输错误与服务器错误使用不同颜色"""
+        if error_kind:
+            return '#6f42c1'
+        if status >= 500:
+            return '#dc3545'
+        if status >= 400:
+            return '#b8860b'
+        return '#28a745'
+        
     def get_method_bg_color(self, method):
         """获取请求方法的背景颜色"""
         colors = {
@@ -145,7 +181,11 @@ class HistorySideBar(QWidget):
             history_widget = HistoryItem(
                 method=item['method'],
                 url=item['url'],
-                timestamp=item['timestamp']
+                timestamp=item['timestamp'],
+                status=item.get('status'),
+                error_kind=item.get('error_kind'),
+                elapsed_ms=item.get('elapsed_ms'),
+                source=item.get('source')
             )
             list_item.setSizeHint(history_widget.sizeHint())
             list_item.setData(Qt.ItemDataRole.UserRole, item)
@@ -0,0 +1,193 @@
+from PyQt6.QtWidgets import QTreeView, QAbstractItemView, QHeaderView
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex
+from PyQt6.QtGui import QFont, QColor
+
+SUMMARY_LIMIT = 200  # 值列最多显示的字符数
+FETCH_BATCH = 500  # 展开或滚动到末尾时每次加载的子节点数
+AUTO_EXPAND_LIMIT = 100  # 顶层元素不超过此数量时自动展开
+TYPE_COLORS = {
+    'str': QColor('#27ae60'),
+    'bytes': QColor('#8e44ad'),
+    'int': QColor('#2980b9'),
+    'float': QColor('#2980b9'),
+    'bool': QColor('#d35400'),
+    'NoneType': QColor('#7f8c8d'),
+}
+
+
+def _is_mapping(value):
+    return hasattr(value, 'items') and not isinstance(value, (str, bytes))
+
+
+def _is_sequence(value):
+    return isinstance(value, (list, tuple))
+
+
+def summarize(value):
+    """值列的单行显示, 容器只显示元素个数"""
+    if _is_mapping(value):
+        return f"{{{len(value)} keys}}" if isinstance(value, dict) else f"{{{len(value)} fields}}"
+    if _is_sequence(value):
+        return f"[{len(value)} items]"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value[:SUMMARY_LIMIT // 3])
+        return f"{data.hex(' ')}{' ...' if len(value) > len(data) else ''} ({len(value)} bytes)"
+    text = repr(value) if isinstance(value, str) else str(value)
+    if len(text) > SUMMARY_LIMIT:
+        text = text[:SUMMARY_LIMIT] + "..."
+    return text.replace('\n', ' ')
+
+
+class _Node:
+    """树节点; 子节点在第一次访问时才按行创建"""
+    __slots__ = ('key', 'value', 'parent', 'row', 'loaded', '_entries', '_children')
+
+    def __init__(self, key, value, parent=None, row=0):
+        self.key = key
+        self.value = value
+        self.parent = parent
+        self.row = row
+        self.loaded = 0  # 已通知视图的子节点数, 大型容器分批加载
+        self._entries = None
+        self._children = {}
+
+    def entries(self):
+        """(键, 值) 序列; 列表直接按下标访问, 不复制"""
+        if self._entries is None:
+            if _is_mapping(self.value):
+                self._entries = list(self.value.items())
+            elif _is_sequence(self.value):
+                self._entries = self.value
+            else:
+                self._entries = ()
+        return self._entries
+
+    def child_count(self):
+        return len(self.entries())
+
+    def child(self, row):
+        node = self._children.get(row)
+        if node is None:
+            entries = self.entries()
+            if _is_mapping(self.value):
+                key, value = entries[row]
+            else:
+                key, value = row, entries[row]
+            node = _Node(key, value, self, row)
+            self._children[row] = node
+        return node
+
+
+class LazyTreeModel(QAbstractItemModel):
+    """Python 对象(dict/list/标量)的树模型
+
+    只为展开过的节点创建子节点, 大型数组和对象通过 fetchMore 每次加载 FETCH_BATCH 行。
+    """
+    COLUMNS = ("Key", "Value", "Type")
+
+    def __init__(self, data=None, parent=None):
+        super().__init__(parent)
+        self.root = _Node(None, data)
+
+    def set_data(self, data):
+        self.beginResetModel()
+        self.root = _Node(None, data)
+        self.root.loaded = min(FETCH_BATCH, self.root.child_count())
+        self.endResetModel()
+
+    def _node(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self._node(parent)
+        if not 0 <= row < node.loaded or not 0 <= column < len(self.COLUMNS):
+            return QModelIndex()
+        return self.createIndex(row, column, node.child(row))
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self.root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        return self._node(parent).loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        node = self._node(parent)
+        return node.loaded < node.child_count()
+
+    def fetchMore(self, parent=QModelIndex()):
+        node = self._node(parent)
+        count = min(FETCH_BATCH, node.child_count() - node.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(parent, node.loaded, node.loaded + count - 1)
+        node.loaded += count
+        self.endInsertRows()
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.COLUMNS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        value = self._node(parent).value
+        return (_is_mapping(value) or _is_sequence(value)) and len(value) > 0
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return str(node.key) if _is_mapping(node.parent.value) else f"[{node.key}]"
+            if column == 1:
+                return summarize(node.value)
+            return type(node.value).__name__
+        if role == Qt.ItemDataRole.ForegroundRole and column == 1:
+            return TYPE_COLORS.get(type(node.value).__name__)
+        if role == Qt.ItemDataRole.ToolTipRole and column == 1 and isinstance(node.value, str):
+            return node.value[:2000]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+
+class LazyTreeView(QTreeView):
+    """显示解码后数据的树视图, 大型数组和对象只在展开时创建对应行"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tree_model = LazyTreeModel(None, self)
+        self.setModel(self.tree_model)
+        self.setUniformRowHeights(True)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setFont(QFont("Consolas, Courier New, monospace"))
+        header = self.header()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        header.setStretchLastSection(False)
+        self.setColumnWidth(0, 220)
+
+    def clear(self):
+        self.tree_model.set_data(None)
+
+    def set_data(self, data):
+        if not (_is_mapping(data) or _is_sequence(data)):
+            data = [data]  # 顶层为标量时也显示为一行
+        self.tree_model.set_data(data)
+        # 只自动展开第一层中较小的容器
+        model = self.tree_model
+        if model.rowCount() <= AUTO_EXPAND_LIMIT:
+            for row in range(model.rowCount()):
+                node = model.root.child(row)
+                if 0 < node.child_count() <= AUTO_EXPAND_LIMIT:
+                    self.expand(model.index(row, 0))
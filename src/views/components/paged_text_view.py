@@ -0,0 +1,224 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView, QLabel,
+                            QLineEdit, QAbstractItemView, QApplication)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QFont, QColor, QKeySequence, QShortcut, QFontMetrics
+from loguru import logger
+from src.utils.background_worker import BackgroundWorker
+from src.utils.line_index import LineIndex, is_ascii_compatible, transcode_to_utf8
+from src.views.components.binary_view import format_size
+
+PAGED_THRESHOLD = 4 * 1024 * 1024  # 超过此大小的文本响应分页显示
+MARKED_LINE_COLOR = QColor("#fff3a3")
+
+
+class LineTableModel(QAbstractTableModel):
+    """行号和行内容两列; 行内容在绘制时才从缓冲区读取和解码"""
+    COLUMNS = ("Line", "Text")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.index_ = None
+        self.encoding = 'utf-8'
+        self.marked_lines = {}  # 需要高亮的行(搜索命中), 只需支持 in
+
+    def set_index(self, line_index, encoding='utf-8'):
+        self.beginResetModel()
+        self.index_ = line_index
+        self.encoding = encoding
+        self.marked_lines = {}
+        self.endResetModel()
+
+    def line_count(self):
+        return self.index_.line_count if self.index_ is not None else 0
+
+    def line_text(self, line):
+        data, truncated = self.index_.line(line)
+        text = data.decode(self.encoding, errors='replace')
+        return text + " …" if truncated else text
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.line_count()
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            if index.column() == 0:
+                return str(index.row() + 1)
+            return self.line_text(index.row())
+        if role == Qt.ItemDataRole.ForegroundRole and index.column() == 0:
+            return QColor("#adb5bd")
+        if role == Qt.ItemDataRole.TextAlignmentRole and index.column() == 0:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        if role == Qt.ItemDataRole.BackgroundRole and index.column() == 1 and index.row() in self.marked_lines:
+            return MARKED_LINE_COLOR
+        return None
+
+
+class PagedTextView(QWidget):
+    """大文本响应查看器: 在后台为缓冲区(bytes 或 mmap)建立行索引, 滚动时只读取可见的行
+
+    内存占用与响应大小无关; 跳转到任意行只需一次二分查找和块内扫描。
+    """
+    ready = pyqtSignal()  # 行索引建立完成
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.body = None  # 转码后的 ResponseBody, 由本视图负责关闭
+        self.worker = None
+        self.generation = 0
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+        toolbar = QHBoxLayout()
+        self.info_label = QLabel()
+        self.info_label.setStyleSheet("color: #6c757d; padding: 2px;")
+        toolbar.addWidget(self.info_label)
+        toolbar.addStretch()
+        self.line_input = QLineEdit()
+        self.line_input.setPlaceholderText("Go to line")
+        self.line_input.setMaximumWidth(160)
+        self.line_input.returnPressed.connect(self.go_to_line)
+        toolbar.addWidget(self.line_input)
+        layout.addLayout(toolbar)
+
+        # QTableView 的固定行高下滚动和定位不随行数增长(QListView 会逐行布局)
+        self.model = LineTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setFont(QFont("Consolas, Courier New, monospace"))
+        self.table.setShowGrid(False)
+        self.table.setWordWrap(False)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.table.horizontalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        vertical = self.table.verticalHeader()
+        vertical.hide()
+        vertical.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical.setDefaultSectionSize(QFontMetrics(self.table.font()).height() + 4)
+        layout.addWidget(self.table)
+
+        copy_shortcut = QShortcut(QKeySequence(QKeySequence.StandardKey.Copy), self.table)
+        copy_shortcut.setContext(Qt.ShortcutContext.WidgetShortcut)
+        copy_shortcut.activated.connect(self.copy_selection)
+
+    @property
+    def buffer(self):
+        index = self.model.index_
+        return index.buffer if index is not None else None
+
+    def clear(self):
+        self.generation += 1
+        if self.worker and self.worker.isRunning():
+            # 索引线程每处理一段就检查取消, 等它退出后再关闭它正在读取的缓冲区
+            self.worker.cancel()
+            self.worker.wait()
+        self.model.set_index(None)
+        self.info_label.clear()
+        self.release_body()
+
+    def release_body(self):
+        if self.body is not None:
+            self.body.close()
+            self.body = None
+
+    def set_source(self, buffer, encoding='utf-8', description="", owned_body=None):
+        """在后台建立行索引后显示
+
+        Args:
+            buffer: bytes 或 mmap
+            encoding: 内容编码; UTF-16 等编码先转为 UTF-8
+            description: 信息栏中的说明(如 "formatted JSON")
+            owned_body: 需要在显示其他内容时关闭的 ResponseBody(如格式化结果)
+        """
+        self.clear()
+        self.body = owned_body
+        self.generation += 1
+        generation = self.generation
+        self.info_label.setText(f"Indexing {format_size(len(buffer))}...")
+
+        def build(worker):
+            source, source_encoding, transcoded = buffer, encoding, None
+            if not is_ascii_compatible(encoding):
+                transcoded = transcode_to_utf8(buffer, encoding, worker)
+                if transcoded is None:
+                    return None
+                source, source_encoding = transcoded.buffer, 'utf-8'
+            line_index = LineIndex(source).build(worker)
+            if line_index is None:
+                if transcoded is not None:
+                    transcoded.close()
+                return None
+            return line_index, source_encoding, transcoded
+
+        worker = BackgroundWorker(build, name="line-index", parent=self)
+        worker.progress.connect(lambda done, total: self.on_index_progress(generation, done, total))
+        worker.result.connect(lambda result: self.on_index_ready(generation, description, result))
+        worker.error.connect(lambda message: self.on_index_failed(generation, message))
+        self.worker = worker
+        worker.start()
+
+    def on_index_progress(self, generation, done, total):
+        if generation == self.generation and total:
+            self.info_label.setText(f"Indexing {format_size(total)}... {done * 100 // total}%")
+
+    def on_index_ready(self, generation, description, result):
+        if result is None:
+            return
+        line_index, encoding, transcoded = result
+        if generation != self.generation:
+            if transcoded is not None:
+                transcoded.close()
+            return
+        if transcoded is not None:
+            self.release_body()
+            self.body = transcoded
+        self.model.set_index(line_index, encoding)
+        digits = len(str(max(line_index.line_count, 1)))
+        self.table.setColumnWidth(0, QFontMetrics(self.table.font()).horizontalAdvance("9" * (digits + 2)))
+        parts = [f"{line_index.line_count:,} lines", format_size(line_index.size)]
+        if description:
+            parts.append(description)
+        self.info_label.setText(" · ".join(parts))
+        logger.info(f"Paged text view ready: {line_index.line_count} lines, {line_index.size} bytes")
+        self.ready.emit()
+
+    def on_index_failed(self, generation, message):
+        if generation == self.generation:
+            self.info_label.setText(f"Indexing failed: {message}")
+
+    def set_marked_lines(self, lines):
+        """高亮搜索命中的行; lines 支持 in 即可(如 行号 -> 命中 的字典)"""
+        self.model.marked_lines = lines if lines is not None else {}
+        self.table.viewport().update()
+
+    def select_line(self, line):
+        count = self.model.line_count()
+        if not count:
+            return
+        index = self.model.index(min(max(line, 0), count - 1), 1)
+        self.table.setCurrentIndex(index)
+        self.table.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
+
+    def go_to_line(self):
+        try:
+            line = int(self.line_input.text().strip().replace(',', ''))
+        except ValueError:
+            return
+        self.select_line(line - 1)
+        self.table.setFocus()
+
+    def copy_selection(self):
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedIndexes()})
+        if rows:
+            QApplication.clipboard().setText("\n".join(self.model.line_text(row) for row in rows))
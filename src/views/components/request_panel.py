@@ -3,9 +3,10 @@ from PyQt6.QtWidgets import (QPlainTextEdit, QWidget, QVBoxLayout, QHBoxLayout,
                             QInputDialog, QMenu, QSpinBox)
 from PyQt6.QtCore import pyqtSignal, QTimer
 from PyQt6.QtGui import QFont
-import json
 from urllib.parse import urlparse, urljoin
 from loguru import logger
+from src.utils import json_utils
+from src.utils.network import NetworkConfigError, is_unix_url, split_unix_url
 
 class RequestPanel(QWidget):
     send_request = pyqtSignal(str, str, dict, str, int)
@@ -13,6 +14,7 @@ class RequestPanel(QWidget):
     api_deleted = pyqtSignal(str)  # name
     api_renamed = pyqtSignal(str, str)  # old_name, new_name
     status_message = pyqtSignal(str, int)  # message, timeout
+    domain_changed = pyqtSignal()  # 活动域名变化
     
     # 常用 Content-Type
     CONTENT_TYPES = {
@@ -150,7 +152,13 @@ class RequestPanel(QWidget):
                     self.url_input.setText(f"{domain_part}/{path_part}" if path_part else domain_part)
                 else:
                     # 如果是完整URL，替换协议、主机和端口部分
-                    if not parsed_url.scheme:
+                    if is_unix_url(current_url):
+                        # unix 地址的请求路径从套接字路径之后开始
+                        try:
+                            parsed_url = urlparse(split_unix_url(current_url)[1])
+                        except NetworkConfigError as e:
+                            logger.warning(f"Cannot parse unix socket URL {current_url}: {e}")
+                    elif not parsed_url.scheme:
                         current_url = 'http://' + current_url
                         parsed_url = urlparse(current_url)
                     
@@ -197,6 +205,7 @@ class RequestPanel(QWidget):
             
             logger.info("Clearing URL input")
             self.status_message.emit("已清除域名", 2000)
+        self.domain_changed.emit()
         
     def setup_auto_save(self):
         """设置自动保存触发器"""
@@ -242,11 +251,11 @@ class RequestPanel(QWidget):
         body_cursor = self.body_input.textCursor()
 
         try:
-            headers = json.loads(self.headers_input.toPlainText() or '{}')
+            headers = json_utils.loads(self.headers_input.toPlainText() or '{}')
             if not isinstance(headers, dict):
                 self.status_message.emit("Headers must be a JSON object", 3000)
                 return
-        except json.JSONDecodeError as e:
+        except json_utils.JSONDecodeError as e:
             self.status_message.emit(f"Invalid JSON in headers: {str(e)}", 3000)
             return
 
@@ -258,7 +267,7 @@ class RequestPanel(QWidget):
                 if not is_valid:
                     self.status_message.emit(f"Invalid JSON in body: {error}", 3000)
                     return
-                body = json.loads(body_text) if body_text else {}
+                body = json_utils.loads(body_text) if body_text else {}
             else:
                 body = {"content": body_text} if body_text else {}
 
@@ -303,14 +312,14 @@ class RequestPanel(QWidget):
             
         if data1['headers'] != data2['headers']:
             print("[Data Compare] Headers changed:")
-            print(f"Old headers: {json.dumps(data1['headers'], indent=2)}")
-            print(f"New headers: {json.dumps(data2['headers'], indent=2)}")
+            print(f"Old headers: {json_utils.dumps(data1['headers'], indent=2)}")
+            print(f"New headers: {json_utils.dumps(data2['headers'], indent=2)}")
             return False
             
         if data1['body'] != data2['body']:
             print("[Data Compare] Body changed:")
-            print(f"Old body: {json.dumps(data1['body'], indent=2)}")
-            print(f"New body: {json.dumps(data2['body'], indent=2)}")
+            print(f"Old body: {json_utils.dumps(data1['body'], indent=2)}")
+            print(f"New body: {json_utils.dumps(data2['body'], indent=2)}")
             return False
             
         if data1['timeout'] != data2['timeout']:
@@ -647,10 +656,10 @@ Plain text content''')
     def on_content_type_changed(self, content_type):
         """当选择 Content-Type 时更新 headers"""
         try:
-            current_headers = json.loads(self.headers_input.toPlainText() or '{}')
+            current_headers = json_utils.loads(self.headers_input.toPlainText() or '{}')
             current_headers['Content-Type'] = content_type
-            self.headers_input.setPlainText(json.dumps(current_headers, indent=4))
-        except json.JSONDecodeError:
+            self.headers_input.setPlainText(json_utils.dumps(current_headers, indent=4))
+        except json_utils.JSONDecodeError:
             # 如果当前 headers 不是有效的 JSON，直接设置新的
             self.headers_input.setPlainText(self.CONTENT_TYPES[content_type])
     
@@ -665,9 +674,9 @@ Plain text content''')
         if not text:
             return True, None
         try:
-            json.loads(text)
+            json_utils.loads(text)
             return True, None
-        except json.JSONDecodeError as e:
+        except json_utils.JSONDecodeError as e:
             return False, str(e)
         
     def on_send_clicked(self):
@@ -681,11 +690,11 @@ Plain text content''')
             
         # 验证并解析 headers
         try:
-            headers = json.loads(self.headers_input.toPlainText() or '{}')
+            headers = json_utils.loads(self.headers_input.toPlainText() or '{}')
             if not isinstance(headers, dict):
                 self.show_error("错误", "Headers 必须是一个 JSON 对象")
                 return
-        except json.JSONDecodeError as e:
+        except json_utils.JSONDecodeError as e:
             self.show_error("Headers 格式错误", f"Headers 不是有效的 JSON 格式: {str(e)}")
             return
             
@@ -725,7 +734,7 @@ Plain text content''')
         self.method_combo.setCurrentText(api_data['method'])
         logger.info(f"Loading API URL: {api_data['url']}")
         self.url_input.setText(api_data['url'])
-        self.headers_input.setPlainText(json.dumps(api_data['headers'], indent=4))
+        self.headers_input.setPlainText(json_utils.dumps(api_data['headers'], indent=4))
         
         # 设置超时时间
         timeout = api_data.get('timeout', 30)  # 如果没有timeout字段，使用默认值30
@@ -739,7 +748,7 @@ Plain text content''')
                 self.body_input.setPlainText(body['content'])
             else:
                 # JSON内容，格式化显示
-                self.body_input.setPlainText(json.dumps(body, indent=4))
+                self.body_input.setPlainText(json_utils.dumps(body, indent=4))
         
         # 重新启用自动保存
         QTimer.singleShot(100, self.enable_auto_save)
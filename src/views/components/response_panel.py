@@ -1,10 +1,40 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTextEdit, QLabel, QHBoxLayout
-from PyQt6.QtGui import QFont
-import json
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTextEdit, QLabel, QHBoxLayout,
+                            QPushButton, QStackedWidget, QTabWidget, QTableWidget,
+                            QTableWidgetItem, QHeaderView, QAbstractItemView, QListView)
+from PyQt6.QtGui import QFont, QColor, QKeySequence, QShortcut, QTextCursor
+from PyQt6.QtCore import Qt, QPoint
+from loguru import logger
+from src.utils.background_worker import BackgroundWorker
+from src.utils.instrumentation import instrumentation
+from src.utils.json_reindent import format_json
+from src.utils.line_index import format_json_body
+from src.utils.text_search import SearchError, compile_query, run_search
+from src.views.components.binary_view import BinaryView
+from src.views.components.diff_view import DiffView
+from src.views.components.find_bar import FindBar, MatchLinesModel
+from src.views.components.lazy_tree_view import LazyTreeView
+from src.views.components.paged_text_view import PAGED_THRESHOLD, PagedTextView
+from src.views.components.timing_view import TimingView
+
+MATCH_COLOR = QColor("#fff3a3")
+CURRENT_MATCH_COLOR = QColor("#ffa94d")
 
 class ResponsePanel(QWidget):
     def __init__(self):
         super().__init__()
+        self.current_text = None  # 最近一次响应内容
+        self.previous_text = None  # 上一次响应内容
+        self.baseline_text = None  # 手动固定的比较基准
+        self.display_text = None  # 正文中显示的文本(格式化后)
+        self._search_source = None  # display_text 的 UTF-8 字节, 第一次搜索时生成
+        self.paged = False  # 大响应使用分页文本视图显示
+        self.format_worker = None
+        self.format_generation = 0
+        self.search_worker = None
+        self.search_generation = 0
+        self.matches = []  # 按位置排序的 SearchMatch
+        self.matches_by_line = {}  # 行号 -> 命中下标列表, 用于只高亮可见行
+        self.current_match = -1
         self.init_ui()
         
     def init_ui(self):
@@ -22,25 +52,175 @@ class ResponsePanel(QWidget):
             }
         """)
         status_layout.addWidget(self.status_label)
+        
+        # 协议版本(HTTP/2 时显示流编号)
+        self.protocol_label = QLabel()
+        self.protocol_label.setStyleSheet("""
+            QLabel {
+                color: #6c757d;
+                padding: 5px;
+            }
+        """)
+        self.protocol_label.hide()
+        status_layout.addWidget(self.protocol_label)
+        
+        # 断言结果
+        self.assertions_label = QLabel()
+        self.assertions_label.hide()
+        status_layout.addWidget(self.assertions_label)
         status_layout.addStretch()
+        
+        # 差异比较按钮
+        self.baseline_button = QPushButton("Set Baseline")
+        self.baseline_button.setToolTip("Pin the current response as the baseline for comparison")
+        self.baseline_button.clicked.connect(self.set_baseline)
+        status_layout.addWidget(self.baseline_button)
+        
+        self.diff_button = QPushButton("Diff")
+        self.diff_button.setCheckable(True)
+        self.diff_button.setToolTip("Compare the current response with the baseline or previous response")
+        self.diff_button.toggled.connect(self.toggle_diff)
+        status_layout.addWidget(self.diff_button)
+        
+        self.find_button = QPushButton("Find")
+        self.find_button.setToolTip("Find in response (Ctrl+F)")
+        self.find_button.clicked.connect(self.open_find_bar)
+        status_layout.addWidget(self.find_button)
         layout.addLayout(status_layout)
         
-        # 响应内容
+        # 响应内容与差异视图
+        self.content_stack = QStackedWidget()
         self.response_text = QTextEdit()
         self.response_text.setReadOnly(True)
         self.response_text.setFont(QFont("Consolas, Courier New, monospace"))
-        layout.addWidget(self.response_text)
+        # 滚动时只为可见行重新计算高亮
+        self.response_text.verticalScrollBar().valueChanged.connect(self.highlight_visible_matches)
+        self.content_stack.addWidget(self.response_text)
+        
+        self.diff_view = DiffView()
+        self.diff_view.closed.connect(lambda: self.diff_button.setChecked(False))
+        self.content_stack.addWidget(self.diff_view)
         
+        # 二进制响应(图片、MessagePack、Protobuf 等)不解码为文本
+        self.binary_view = BinaryView()
+        self.content_stack.addWidget(self.binary_view)
+        
+        # 大文本响应: 按行索引分页读取
+        self.paged_view = PagedTextView()
+        self.paged_view.ready.connect(self.on_paged_ready)
+        self.content_stack.addWidget(self.paged_view)
+        
+        # 过滤模式: 只显示命中的行
+        self.match_lines_model = MatchLinesModel(self)
+        self.filter_view = QListView()
+        self.filter_view.setModel(self.match_lines_model)
+        self.filter_view.setUniformItemSizes(True)
+        self.filter_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.filter_view.setFont(QFont("Consolas, Courier New, monospace"))
+        self.filter_view.activated.connect(self.jump_to_filtered_line)
+        self.content_stack.addWidget(self.filter_view)
+        
+        # JSONPath 查询结果
+        self.node_view = LazyTreeView()
+        self.content_stack.addWidget(self.node_view)
+        
+        # 查找栏
+        self.find_bar = FindBar()
+        self.find_bar.hide()
+        self.find_bar.search_requested.connect(self.start_search)
+        self.find_bar.next_requested.connect(lambda: self.step_match(1))
+        self.find_bar.previous_requested.connect(lambda: self.step_match(-1))
+        self.find_bar.filter_toggled.connect(self.set_filter_mode)
+        self.find_bar.closed.connect(self.close_search)
+        find_shortcut = QShortcut(QKeySequence(QKeySequence.StandardKey.Find), self)
+        find_shortcut.setContext(Qt.ShortcutContext.WidgetWithChildrenShortcut)
+        find_shortcut.activated.connect(self.open_find_bar)
+        
+        body_widget = QWidget()
+        body_layout = QVBoxLayout()
+        body_layout.setContentsMargins(0, 0, 0, 0)
+        body_widget.setLayout(body_layout)
+        body_layout.addWidget(self.find_bar)
+        body_layout.addWidget(self.content_stack)
+        
+        # 响应内容与耗时分页显示
+        self.tabs = QTabWidget()
+        self.tabs.addTab(body_widget, "Body")
+        # 响应头按原始顺序逐条显示, 同名的多个值(如 Set-Cookie)各占一行
+        self.headers_table = QTableWidget(0, 2)
+        self.headers_table.setHorizontalHeaderLabels(["Name", "Value"])
+        self.headers_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.headers_table.verticalHeader().hide()
+        self.headers_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        self.headers_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.tabs.addTab(self.headers_table, "Headers")
+        self.timing_view = TimingView()
+        self.tabs.addTab(self.timing_view, "Timing")
+        layout.addWidget(self.tabs)
+        self.update_diff_buttons()
+        
+    def set_status_style(self, text, color, bg_color):
+        """设置状态标签的文本和颜色"""
+        self.status_label.setText(text)
+        self.status_label.setStyleSheet(f"""
+            QLabel {{
+                color: {color};
+                padding: 5px 10px;
+                border: 1px solid {color};
+                border-radius: 3px;
+                background-color: {bg_color};
+            }}
+        """)
+
+    def show_pending(self):
+        """显示请求发送中状态"""
+        self.status_label.setText("Status: Sending Request...")
+        self.status_label.setStyleSheet("""
+            QLabel {
+                padding: 5px;
+                border-radius: 3px;
+                background-color: #f8f9fa;
+            }
+        """)
+        self.response_text.clear()
+        self.binary_view.clear()
+        self.reset_paged_view()
+        self.timing_view.clear()
+        self.set_headers(None)
+        self.protocol_label.hide()
+
+    def clear_response(self):
+        """清空响应内容"""
+        self.show_pending()
+        self.status_label.setText("Status: Ready")
+
     def update_response(self, response):
-        if response:
-            status = response['status']
+        """显示请求结果
+
+        Args:
+            response: HttpResult, 传输错误(DNS、连接、超时等)与服务器返回的状态码分开显示
+        """
+        self.reset_paged_view()
+        if self.content_stack.currentWidget() in (self.binary_view, self.filter_view, self.node_view):
+            self.content_stack.setCurrentWidget(self.response_text)
+        self.set_display_text(None)
+        if response is None:
+            self.set_status_style("Status: Error", "#dc3545", "#fff5f5")
+            self.response_text.setText("请求失败，请检查网络连接或URL是否正确")
+            return
+
+        if response.is_error:
+            # 客户端传输错误, 没有收到服务器响应, 不按服务器错误着色
+            self.set_status_style(
+                f"Error: {response.error_kind.label}", "#6f42c1", "#f5f0ff"
+            )
+            self.response_text.setText(response.text)
+        else:
+            status = response.status
             # 根据状态码设置不同的样式
             if 200 <= status < 300:
                 status_color = "#28a745"  # 绿色
                 bg_color = "#f0fff4"  # 浅绿色背景
-            elif status == 408:  # 超时
-                status_color = "#dc3545"  # 红色
-                bg_color = "#fff5f5"  # 浅红色背景
             elif 400 <= status < 500:
                 status_color = "#ffc107"  # 黄色
                 bg_color = "#fffff0"  # 浅黄色背景
@@ -50,49 +230,377 @@ class ResponsePanel(QWidget):
             else:
                 status_color = "#6c757d"  # 灰色
                 bg_color = "#f8f9fa"  # 浅灰色背景
-                
-            # 获取状态描述
-            status_text = {
-                408: "Request Timeout",
-                495: "SSL Certificate Error",
-                503: "Service Unavailable",
-                500: "Internal Server Error"
-            }.get(status, "")
-            
-            if status_text:
-                status_display = f"Status: {status} ({status_text})"
+
+            if response.reason:
+                status_display = f"Status: {status} ({response.reason})"
             else:
                 status_display = f"Status: {status}"
-            
-            # 设置状态标签
-            self.status_label.setText(status_display)
-            self.status_label.setStyleSheet(f"""
-                QLabel {{
-                    color: {status_color};
-                    padding: 5px 10px;
-                    border: 1px solid {status_color};
-                    border-radius: 3px;
-                    background-color: {bg_color};
-                }}
-            """)
-            
-            try:
-                # 尝试格式化 JSON 响应
-                json_response = json.loads(response['text'])
-                formatted_response = json.dumps(json_response, indent=2, ensure_ascii=False)
-                self.response_text.setText(formatted_response)
-            except:
-                # 如果不是 JSON 格式，直接显示原文
-                self.response_text.setText(response['text'])
+            self.set_status_style(status_display, status_color, bg_color)
+
+            if response.is_binary:
+                self.show_binary(response)
+            else:
+                self.show_text(response)
+
+        self.set_headers(response)
+        self.set_protocol(response)
+        self.timing_view.set_timing(response)
+        self.update_diff_buttons()
+        # 查找栏打开时对新响应重新搜索
+        if self.find_bar.isVisible() and self.find_bar.query_input.text():
+            self.find_bar.emit_search()
+
+    def show_binary(self, response):
+        """二进制响应使用查看器显示, 不参与文本差异比较"""
+        logger.debug(f"Showing {response.body_kind} body ({response.size} bytes)")
+        with instrumentation.span('render'):
+            self.binary_view.set_body(response.body, response.body_kind, response.content_type)
+        self.response_text.clear()
+        self.previous_text = self.current_text
+        self.current_text = None
+        self.diff_button.setChecked(False)
+        self.content_stack.setCurrentWidget(self.binary_view)
+
+    def show_text(self, response):
+        """显示文本响应, JSON 自动格式化"""
+        if response.size > PAGED_THRESHOLD:
+            self.show_paged(response)
+            return
+        text = response.text
+        try:
+            # 尝试格式化 JSON 响应(流式重新缩进, 不构建对象树)
+            with instrumentation.span('format'):
+                formatted_response = format_json(text)
+        except ValueError:
+            # 如果不是 JSON 格式，直接显示原文
+            formatted_response = text
+        with instrumentation.span('render'):
+            # 按纯文本显示, 文本块与行一一对应(搜索结果按行号定位)
+            self.response_text.setPlainText(formatted_response)
+        self.set_display_text(formatted_response)
+
+        # 记录响应内容用于差异比较
+        self.previous_text = self.current_text
+        self.current_text = text
+        if self.diff_button.isChecked():
+            self.show_diff()
+
+    def show_paged(self, response):
+        """大文本响应分页显示, 不解码为完整的字符串; JSON 在后台格式化后写入临时文件再显示"""
+        logger.info(f"Showing large text body in paged view ({response.size} bytes)")
+        self.response_text.clear()
+        self.paged = True
+        self.content_stack.setCurrentWidget(self.paged_view)
+        # 大响应不保存完整文本, 不参与差异比较
+        self.previous_text = self.current_text
+        self.current_text = None
+        self.diff_button.setChecked(False)
+
+        body = response.body
+        encoding = response.text_encoding
+        head = body.head().lstrip()
+        if not (response.content_type.endswith('json') or head[:1] in (b'{', b'[')):
+            self.paged_view.set_source(body.buffer, encoding)
+            return
+
+        self.format_generation += 1
+        generation = self.format_generation
+        self.paged_view.info_label.setText("Formatting JSON...")
+        worker = BackgroundWorker(lambda w: format_json_body(body.buffer, encoding, w),
+                                  name="format-json", parent=self)
+        worker.result.connect(lambda formatted: self.on_json_formatted(generation, body, encoding, formatted))
+        worker.error.connect(lambda message: self.on_json_formatted(generation, body, encoding, None))
+        self.format_worker = worker
+        worker.start()
+
+    def on_json_formatted(self, generation, body, encoding, formatted):
+        if generation != self.format_generation:
+            if formatted is not None:
+                formatted.close()
+            return
+        if formatted is None:
+            # 不是合法的 JSON, 显示原文
+            self.paged_view.set_source(body.buffer, encoding)
         else:
-            self.status_label.setText("Status: Error")
-            self.status_label.setStyleSheet("""
-                QLabel {
-                    color: #dc3545;
-                    padding: 5px 10px;
-                    border: 1px solid #dc3545;
-                    border-radius: 3px;
-                    background-color: #fff5f5;
-                }
-            """)
-            self.response_text.setText("请求失败，请检查网络连接或URL是否正确")
\ No newline at end of file
+            self.paged_view.set_source(formatted.buffer, 'utf-8', "formatted JSON", owned_body=formatted)
+
+    def on_paged_ready(self):
+        # 查找栏打开时, 索引建立后重新搜索
+        if self.paged and self.find_bar.isVisible() and self.find_bar.query_input.text():
+            self.find_bar.emit_search()
+
+    def reset_paged_view(self):
+        """离开分页视图; 取消未完成的格式化并释放格式化结果"""
+        self.format_generation += 1
+        if self.format_worker and self.format_worker.isRunning():
+            self.format_worker.cancel()
+        if self.paged:
+            self.paged = False
+            self.reset_search_results()
+            self.paged_view.clear()
+            if self.content_stack.currentWidget() is self.paged_view:
+                self.content_stack.setCurrentWidget(self.response_text)
+
+    def text_view(self):
+        """当前显示正文的控件"""
+        return self.paged_view if self.paged else self.response_text
+
+    def set_protocol(self, response):
+        """显示响应使用的协议版本; HTTP/2 时附带最后一跳的流编号"""
+        if response.is_error or not response.http_version:
+            self.protocol_label.hide()
+            return
+        text = response.http_version
+        stream_id = response.hops[-1]['stream_id'] if response.hops else None
+        if stream_id is not None:
+            text += f" · stream {stream_id}"
+        self.protocol_label.setText(text)
+        self.protocol_label.show()
+
+    def set_headers(self, response):
+        """显示完整的响应头, 包括重复的头"""
+        headers = list(response.headers.items()) if response is not None else []
+        self.headers_table.setRowCount(len(headers))
+        for row, (name, value) in enumerate(headers):
+            self.headers_table.setItem(row, 0, QTableWidgetItem(name))
+            value_item = QTableWidgetItem(value)
+            value_item.setToolTip(value)
+            self.headers_table.setItem(row, 1, value_item)
+        self.tabs.setTabText(self.tabs.indexOf(self.headers_table),
+                             f"Headers ({len(headers)})" if headers else "Headers")
+
+    def show_assertion_results(self, results):
+        """显示断言结果, 详细信息放在提示中"""
+        if not results:
+            self.assertions_label.hide()
+            return
+        passed = sum(1 for result in results if result['passed'])
+        color = "#28a745" if passed == len(results) else "#dc3545"
+        self.assertions_label.setText(f"Assertions: {passed}/{len(results)} passed")
+        self.assertions_label.setToolTip("\n".join(
+            f"{'✔' if result['passed'] else '✘'} {result['name']}: {result['message']}"
+            for result in results
+        ))
+        self.assertions_label.setStyleSheet(f"""
+            QLabel {{
+                color: {color};
+                padding: 5px 10px;
+                border: 1px solid {color};
+                border-radius: 3px;
+            }}
+        """)
+        self.assertions_label.show()
+
+    def update_diff_buttons(self):
+        """根据是否有可比较的响应更新按钮状态"""
+        self.baseline_button.setEnabled(self.current_text is not None)
+        has_baseline = self.baseline_text is not None or self.previous_text is not None
+        self.diff_button.setEnabled(self.current_text is not None and has_baseline)
+
+    def set_baseline(self):
+        """将当前响应固定为比较基准"""
+        self.baseline_text = self.current_text
+        logger.info(f"Diff baseline set ({len(self.baseline_text or '')} chars)")
+        self.baseline_button.setText("Baseline Set")
+        self.update_diff_buttons()
+
+    def toggle_diff(self, checked):
+        if checked:
+            self.show_diff()
+        else:
+            self.diff_view.shutdown()
+            self.content_stack.setCurrentWidget(self.text_view())
+
+    def show_diff(self):
+        """显示基准(或上一次响应)与当前响应的差异"""
+        baseline = self.baseline_text if self.baseline_text is not None else self.previous_text
+        if baseline is None or self.current_text is None:
+            self.diff_button.setChecked(False)
+            return
+        self.content_stack.setCurrentWidget(self.diff_view)
+        self.diff_view.set_sources(baseline, self.current_text)
+
+    # ---------- 查找 ----------
+
+    def set_display_text(self, text):
+        """记录正文显示的文本; 之前的搜索结果失效"""
+        self.display_text = text
+        self._search_source = None
+        self.reset_search_results()
+
+    def search_source(self):
+        """搜索使用的字节内容: 显示文本的 UTF-8 编码, 第一次搜索时才生成; 分页显示时为索引的缓冲区"""
+        if self.paged:
+            self._search_source = self.paged_view.buffer
+        elif self._search_source is None and self.display_text is not None:
+            self._search_source = self.display_text.encode('utf-8')
+        return self._search_source
+
+    def open_find_bar(self):
+        self.tabs.setCurrentIndex(0)
+        self.find_bar.open_bar()
+
+    def close_search(self):
+        self.reset_search_results()
+        if self.content_stack.currentWidget() in (self.filter_view, self.node_view):
+            self.content_stack.setCurrentWidget(self.text_view())
+
+    def reset_search_results(self):
+        self.search_generation += 1
+        if self.search_worker and self.search_worker.isRunning():
+            self.search_worker.cancel()
+        self.matches = []
+        self.matches_by_line = {}
+        self.current_match = -1
+        self.match_lines_model.reset_lines(self._search_source)
+        self.response_text.setExtraSelections([])
+        self.paged_view.set_marked_lines(None)
+
+    def start_search(self, mode, pattern, case_sensitive):
+        """在后台线程中搜索正文, 命中分批返回"""
+        self.reset_search_results()
+        if self.content_stack.currentWidget() is self.node_view:
+            self.content_stack.setCurrentWidget(self.text_view())
+        if not pattern:
+            self.find_bar.set_status("")
+            return
+        source = self.search_source()
+        if source is None:
+            if self.paged:
+                # 行索引建立后(on_paged_ready)重新搜索
+                self.find_bar.set_status("Waiting for the line index...")
+            else:
+                self.find_bar.set_status("Nothing to search", error=True)
+            return
+        try:
+            query = compile_query(mode, pattern, case_sensitive)
+        except SearchError as e:
+            self.find_bar.set_status(str(e), error=True)
+            return
+        self.match_lines_model.reset_lines(source)
+        generation = self.search_generation
+        self.find_bar.set_status("Searching...")
+        logger.info(f"Searching response ({mode}, {len(source)} bytes)")
+
+        worker = BackgroundWorker(lambda w: run_search(source, mode, query, w), name="search", parent=self)
+        worker.partial.connect(lambda matches: self.on_search_partial(generation, matches))
+        worker.progress.connect(lambda done, total: self.on_search_progress(generation, done, total))
+        worker.result.connect(lambda result: self.on_search_finished(generation, mode, result))
+        worker.error.connect(lambda message: self.on_search_failed(generation, message))
+        self.search_worker = worker
+        worker.start()
+
+    def add_matches(self, matches):
+        start = len(self.matches)
+        self.matches.extend(matches)
+        for index, match in enumerate(matches, start):
+            self.matches_by_line.setdefault(match.line, []).append(index)
+        self.match_lines_model.add_matches(matches)
+        if self.current_match < 0 and self.matches:
+            self.step_match(1)
+        else:
+            self.highlight_visible_matches()
+
+    def on_search_partial(self, generation, matches):
+        if generation == self.search_generation:
+            self.add_matches(matches)
+
+    def on_search_progress(self, generation, done, total):
+        if generation == self.search_generation and total:
+            self.find_bar.set_status(f"{len(self.matches):,} matches ({done * 100 // total}%)...")
+
+    def on_search_finished(self, generation, mode, result):
+        if generation != self.search_generation or result is None:
+            return
+        if 'error' in result:
+            self.find_bar.set_status(result['error'], error=True)
+            return
+        if mode == 'jsonpath':
+            self.node_view.set_data(result['nodes'])
+            self.content_stack.setCurrentWidget(self.node_view)
+            self.find_bar.set_status(f"{result['total']:,} nodes")
+            logger.info(f"JSONPath query matched {result['total']} nodes")
+            return
+        self.add_matches(result['matches'])
+        suffix = "+" if result['truncated'] else ""
+        if not self.matches:
+            self.find_bar.set_status("No matches")
+        else:
+            self.update_match_status(suffix)
+        logger.info(f"Search finished: {result['total']}{suffix} matches")
+
+    def on_search_failed(self, generation, message):
+        if generation == self.search_generation:
+            self.find_bar.set_status(f"Search failed: {message}", error=True)
+
+    def update_match_status(self, suffix=""):
+        self.find_bar.set_status(f"{self.current_match + 1:,}/{len(self.matches):,}{suffix}")
+
+    def match_cursor(self, match):
+        """命中在文本控件中的选区; 行内字节偏移换算为 UTF-16 位置"""
+        block = self.response_text.document().findBlockByNumber(match.line)
+        if not block.isValid():
+            return None
+        line = self._search_source[match.line_offset:match.line_offset + match.end]
+        start = len(line[:match.start].decode('utf-8', errors='replace').encode('utf-16-le')) // 2
+        end = len(line.decode('utf-8', errors='replace').encode('utf-16-le')) // 2
+        cursor = QTextCursor(block)
+        cursor.setPosition(block.position() + start)
+        cursor.setPosition(block.position() + end, QTextCursor.MoveMode.KeepAnchor)
+        return cursor
+
+    def highlight_visible_matches(self, *args):
+        """只为视口中可见的行设置高亮, 命中再多也不影响滚动"""
+        if not self.matches_by_line:
+            return
+        if self.paged:
+            self.paged_view.set_marked_lines(self.matches_by_line)
+            return
+        text = self.response_text
+        first = text.cursorForPosition(QPoint(0, 0)).blockNumber()
+        last = text.cursorForPosition(QPoint(0, text.viewport().height() - 1)).blockNumber()
+        selections = []
+        for line in range(first, last + 1):
+            for index in self.matches_by_line.get(line, ()):
+                cursor = self.match_cursor(self.matches[index])
+                if cursor is None:
+                    continue
+                selection = QTextEdit.ExtraSelection()
+                selection.cursor = cursor
+                selection.format.setBackground(CURRENT_MATCH_COLOR if index == self.current_match else MATCH_COLOR)
+                selections.append(selection)
+        text.setExtraSelections(selections)
+
+    def step_match(self, delta):
+        """跳到下一个/上一个命中"""
+        if not self.matches:
+            return
+        self.current_match = (self.current_match + delta) % len(self.matches)
+        match = self.matches[self.current_match]
+        if self.content_stack.currentWidget() is self.filter_view:
+            row = next((row for row, (line, _) in enumerate(self.match_lines_model.lines) if line == match.line), 0)
+            self.filter_view.setCurrentIndex(self.match_lines_model.index(row))
+        elif self.paged:
+            self.paged_view.select_line(match.line)
+        else:
+            cursor = self.match_cursor(match)
+            if cursor is not None:
+                self.response_text.setTextCursor(cursor)
+                self.response_text.ensureCursorVisible()
+        self.highlight_visible_matches()
+        self.update_match_status()
+
+    def set_filter_mode(self, enabled):
+        """过滤模式下只显示命中的行, 激活某一行后回到完整内容并定位"""
+        if enabled:
+            if self.content_stack.currentWidget() is self.text_view():
+                self.content_stack.setCurrentWidget(self.filter_view)
+        elif self.content_stack.currentWidget() is self.filter_view:
+            self.content_stack.setCurrentWidget(self.text_view())
+            self.highlight_visible_matches()
+
+    def jump_to_filtered_line(self, index):
+        line = self.match_lines_model.line_at(index.row())
+        self.find_bar.filter_button.setChecked(False)
+        self.current_match = min(self.matches_by_line.get(line, [0]))
+        self.step_match(0)
@@ -6,11 +6,17 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import pyqtSignal, Qt, QTimer
 from PyQt6.QtGui import QCursor, QKeyEvent, QFont
 from src.models.api_model import ApiModel
+from src.models.metrics_model import MetricsModel
+from src.views.dialogs.assertions_dialog import AssertionsDialog
+from src.views.dialogs.retry_policy_dialog import RetryPolicyDialog
+from src.views.dialogs.latency_trend_dialog import LatencyTrendDialog
+from src.views.dialogs.probe_dialog import ProbeDialog
 
 class SideBar(QWidget):
     api_selected = pyqtSignal(dict)  # 发送选中的API数据
     api_deleted = pyqtSignal(str)    # 发送被删除的API名称
     api_renamed = pyqtSignal(str, str)  # 发送API的旧名称和新名称
+    probes_changed = pyqtSignal()  # 定时探测设置变化
 
     def __init__(self):
         super().__init__()
@@ -123,6 +129,10 @@ class SideBar(QWidget):
 
         menu = QMenu()
         rename_action = menu.addAction("Rename")
+        assertions_action = menu.addAction("Assertions...")
+        retry_action = menu.addAction("Retry Policy...")
+        probe_action = menu.addAction("Probe...")
+        trend_action = menu.addAction("Latency Trend...")
         delete_action = menu.addAction("Delete")
         action = menu.exec(QCursor.pos())
         
@@ -130,6 +140,36 @@ class SideBar(QWidget):
             self.delete_api(item)
         elif action == rename_action:
             self.rename_api(item)
+        elif action == assertions_action:
+            self.edit_assertions(item)
+        elif action == retry_action:
+            self.edit_retry_policy(item)
+        elif action == probe_action:
+            self.edit_probe(item)
+        elif action == trend_action:
+            self.show_latency_trend(item)
+
+    def edit_assertions(self, item):
+        """编辑选中API的断言规则"""
+        api_data = self.api_model.get_api_by_id(item.data(Qt.ItemDataRole.UserRole))
+        if api_data:
+            AssertionsDialog(api_data, self.api_model, self).exec()
+
+    def edit_retry_policy(self, item):
+        """编辑选中API的重试与对冲策略"""
+        api_data = self.api_model.get_api_by_id(item.data(Qt.ItemDataRole.UserRole))
+        if api_data:
+            RetryPolicyDialog(api_data, self.api_model, self).exec()
+
+    def edit_probe(self, item):
+        """编辑选中API的定时探测设置"""
+        api_data = self.api_model.get_api_by_id(item.data(Qt.ItemDataRole.UserRole))
+        if api_data and ProbeDialog(api_data, self.api_model, self).exec():
+            self.probes_changed.emit()
+
+    def show_latency_trend(self, item):
+        """显示选中API的耗时趋势"""
+        LatencyTrendDialog(item.text(), MetricsModel(), self).exec()
 
     def rename_api(self, item):
         """重命名选中的API"""
@@ -192,6 +232,30 @@ class SideBar(QWidget):
                 self.list_widget.setCurrentItem(item)
                 self.api_selected.emit(api)
 
+    def add_api_items(self, apis):
+        """增量添加或更新列表项, 用于批量导入时避免整体重建列表"""
+        if not apis:
+            return
+        existing = {}
+        for i in range(self.list_widget.count()):
+            item = self.list_widget.item(i)
+            existing[item.data(Qt.ItemDataRole.UserRole)] = item
+
+        self.list_widget.setUpdatesEnabled(False)
+        try:
+            for api in apis:
+                item = existing.get(api['id'])
+                if item is not None:
+                    item.setText(api['name'])
+                    continue
+                # 新建的API排在最前面, 与 load_api_list 的排序一致
+                item = QListWidgetItem(api['name'])
+                item.setData(Qt.ItemDataRole.UserRole, api['id'])
+                self.list_widget.insertItem(0, item)
+                existing[api['id']] = item
+        finally:
+            self.list_widget.setUpdatesEnabled(True)
+
     def on_list_item_clicked(self, item):
         """当列表项被点击时"""
         api_id = item.data(Qt.ItemDataRole.UserRole)
@@ -261,11 +325,7 @@ class SideBar(QWidget):
 
     def get_api_data(self, api_name):
         """根据API名称获取API数据"""
-        apis = self.api_model.get_all_apis()
-        for api in apis:
-            if api['name'] == api_name:
-                return api
-        return None
+        return self.api_model.get_api_by_name(api_name)
 
     def handle_key_press(self, event: QKeyEvent):
         """处理键盘事件"""
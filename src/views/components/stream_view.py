@@ -0,0 +1,172 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListView, QLabel, QCheckBox,
+                            QPlainTextEdit, QSplitter, QAbstractItemView)
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer
+from PyQt6.QtGui import QFont, QColor
+import time
+from src.utils.streaming import RingBuffer, RateMeter, DEFAULT_BUFFER_SIZE
+from src.views.components.binary_view import format_size, hex_dump
+
+DIRECTION_COLORS = {
+    'in': QColor('#2c3e50'),
+    'out': QColor('#2980b9'),
+}
+DETAIL_LIMIT = 256 * 1024  # 详情中最多显示的字节数
+
+
+def format_message(message):
+    """列表中的单行显示: 时间、方向、类型、大小和预览"""
+    clock = time.strftime('%H:%M:%S', time.localtime(message.timestamp))
+    millis = int(message.timestamp * 1000) % 1000
+    arrow = "↓" if message.direction == 'in' else "↑"
+    return f"{clock}.{millis:03d} {arrow} {message.kind:<8} {format_size(message.size):>9}  {message.preview()}"
+
+
+class StreamMessageModel(QAbstractListModel):
+    """环形缓冲区上的列表模型; 行内容在绘制时才生成, 不为每条消息创建控件或条目"""
+
+    def __init__(self, buffer, parent=None):
+        super().__init__(parent)
+        self.buffer = buffer
+        self._rows = 0  # 已通知视图的行数
+        self._seen_total = 0  # 已通知视图时缓冲区的累计写入数
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._rows:
+            return None
+        message = self.buffer[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return format_message(message)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return DIRECTION_COLORS.get(message.direction)
+        if role == Qt.ItemDataRole.UserRole:
+            return message
+        return None
+
+    def sync(self):
+        """把上次同步后缓冲区的变化通知视图: 先移除被覆盖的最旧行, 再在末尾插入新行
+
+        Returns:
+            int: 新增的行数
+        """
+        appended = self.buffer.total - self._seen_total
+        self._seen_total = self.buffer.total
+        if not appended:
+            return 0
+        # 缓冲区 = 旧行去掉被覆盖的前 removed 行 + 新消息
+        removed = min(self._rows + appended - len(self.buffer), self._rows)
+        if removed > 0:
+            self.beginRemoveRows(QModelIndex(), 0, removed - 1)
+            self._rows -= removed
+            self.endRemoveRows()
+        inserted = len(self.buffer) - self._rows
+        if inserted > 0:
+            self.beginInsertRows(QModelIndex(), self._rows, len(self.buffer) - 1)
+            self._rows = len(self.buffer)
+            self.endInsertRows()
+        return inserted
+
+    def reset(self):
+        """缓冲区被清空或改变容量后整体刷新"""
+        self.beginResetModel()
+        self._rows = len(self.buffer)
+        self._seen_total = self.buffer.total
+        self.endResetModel()
+
+
+class StreamView(QWidget):
+    """流消息列表: 消息写入环形缓冲区, 定时批量刷新到视图, 并统计消息速率和字节速率"""
+
+    FLUSH_INTERVAL = 100  # 毫秒
+
+    def __init__(self, capacity=DEFAULT_BUFFER_SIZE, parent=None):
+        super().__init__(parent)
+        self.buffer = RingBuffer(capacity)
+        self.meter = RateMeter()
+        self.total_bytes = 0
+        self.init_ui()
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start(self.FLUSH_INTERVAL)
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+        self.model = StreamMessageModel(self.buffer, self)
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.list_view.setFont(QFont("Consolas, Courier New, monospace"))
+        self.list_view.selectionModel().currentChanged.connect(self.show_detail)
+
+        self.detail_text = QPlainTextEdit()
+        self.detail_text.setReadOnly(True)
+        self.detail_text.setFont(QFont("Consolas, Courier New, monospace"))
+        self.detail_text.setPlaceholderText("Select a message to see its full content")
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(self.list_view)
+        splitter.addWidget(self.detail_text)
+        splitter.setSizes([400, 120])
+        layout.addWidget(splitter)
+
+        stats_layout = QHBoxLayout()
+        self.follow_checkbox = QCheckBox("Follow")
+        self.follow_checkbox.setChecked(True)
+        self.follow_checkbox.setToolTip("Keep the newest message in view")
+        stats_layout.addWidget(self.follow_checkbox)
+        self.stats_label = QLabel()
+        self.stats_label.setStyleSheet("color: #6c757d; padding: 2px;")
+        stats_layout.addWidget(self.stats_label)
+        stats_layout.addStretch()
+        layout.addLayout(stats_layout)
+        self.update_stats()
+
+    def append(self, message):
+        """添加一条消息; 只写入缓冲区, 视图在下一次定时刷新时更新"""
+        self.buffer.append(message)
+        self.meter.add(message.size)
+        self.total_bytes += message.size
+
+    def flush(self):
+        if self.model.sync() and self.follow_checkbox.isChecked():
+            self.list_view.scrollToBottom()
+        self.update_stats()
+
+    def update_stats(self):
+        messages_per_s, bytes_per_s = self.meter.rates()
+        self.stats_label.setText(
+            f"{messages_per_s:,.0f} msg/s · {format_size(bytes_per_s)}/s · "
+            f"{self.buffer.total:,} messages ({format_size(self.total_bytes)}) · "
+            f"{len(self.buffer):,}/{self.buffer.capacity:,} buffered · {self.buffer.dropped:,} dropped"
+        )
+
+    def set_capacity(self, capacity):
+        self.buffer.set_capacity(capacity)
+        self.model.reset()
+        self.update_stats()
+
+    def clear(self):
+        self.buffer.clear()
+        self.model.reset()
+        self.detail_text.clear()
+        self.update_stats()
+
+    def show_detail(self, current, previous=None):
+        message = self.model.data(current, Qt.ItemDataRole.UserRole) if current.isValid() else None
+        if message is None:
+            self.detail_text.clear()
+            return
+        if isinstance(message.data, bytes):
+            text = hex_dump(message.data[:DETAIL_LIMIT])
+        else:
+            text = message.data[:DETAIL_LIMIT]
+        if message.size > DETAIL_LIMIT:
+            text += f"\n... ({format_size(message.size)} total)"
+        self.detail_text.setPlainText(text)
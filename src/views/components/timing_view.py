@@ -0,0 +1,134 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+                            QHeaderView, QAbstractItemView)
+from PyQt6.QtGui import QColor
+
+OUTCOME_COLORS = {
+    'used': QColor('#f0fff4'),
+    'retried': QColor('#fffff0'),
+    'failed': QColor('#fff5f5'),
+    'cancelled': QColor('#f8f9fa'),
+}
+
+
+class TimingView(QWidget):
+    """显示一次请求的耗时与每次尝试(重试、对冲)的详细情况"""
+    HEADERS = ["#", "Kind", "Start (ms)", "Queued (ms)", "Duration (ms)", "Result", "Outcome"]
+    HOP_HEADERS = ["Method", "URL", "Status", "Protocol", "Start (ms)", "Duration (ms)", "Connection",
+                   "DNS (ms)", "Connect (ms)"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+        self.summary_label = QLabel("No timing data")
+        self.summary_label.setStyleSheet("padding: 5px;")
+        layout.addWidget(self.summary_label)
+
+        self.attempts_table = QTableWidget(0, len(self.HEADERS))
+        self.attempts_table.setHorizontalHeaderLabels(self.HEADERS)
+        self.attempts_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.attempts_table.verticalHeader().hide()
+        self.attempts_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.attempts_table)
+
+        # 最终采用的尝试中每一跳(重定向)的耗时与连接复用情况
+        self.hops_label = QLabel("Redirect chain")
+        self.hops_label.setStyleSheet("padding: 5px;")
+        layout.addWidget(self.hops_label)
+
+        self.hops_table = QTableWidget(0, len(self.HOP_HEADERS))
+        self.hops_table.setHorizontalHeaderLabels(self.HOP_HEADERS)
+        self.hops_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.hops_table.verticalHeader().hide()
+        self.hops_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.hops_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.hops_table)
+
+    def clear(self):
+        self.summary_label.setText("No timing data")
+        self.attempts_table.setRowCount(0)
+        self.hops_label.setText("Redirect chain")
+        self.hops_table.setRowCount(0)
+
+    def set_timing(self, response):
+        """根据 HttpResult 中的 elapsed_ms 与 attempts 更新显示"""
+        elapsed = response.elapsed_ms
+        attempts = response.attempts
+        if elapsed is None:
+            self.clear()
+            return
+        retries = sum(1 for attempt in attempts if attempt['kind'] == 'retry')
+        hedges = sum(1 for attempt in attempts if attempt['kind'] == 'hedge')
+        transport = f" via {response.transport}" if response.transport else ""
+        # 限速排队时间与网络耗时分开显示(旧历史记录没有 queue_ms)
+        queued = sum(attempt.get('queue_ms') or 0 for attempt in attempts)
+        breakdown = ""
+        if queued:
+            network = sum(attempt['elapsed_ms'] or 0 for attempt in attempts)
+            breakdown = f" (queued {queued:.1f} ms, network {network:.1f} ms)"
+        self.summary_label.setText(
+            f"Total: {elapsed:.1f} ms{breakdown}, {len(attempts)} attempts "
+            f"({retries} retries, {hedges} hedged){transport}"
+        )
+
+        self.attempts_table.setRowCount(len(attempts))
+        for row, attempt in enumerate(attempts):
+            duration = attempt['elapsed_ms']
+            values = [
+                str(attempt['number']),
+                attempt['kind'],
+                f"{attempt['start_ms']:.1f}",
+                _format_ms(attempt.get('queue_ms')),
+                f"{duration:.1f}" if duration is not None else "",
+                attempt['error'] or (str(attempt['status']) if attempt['status'] is not None else ""),
+                attempt['outcome'],
+            ]
+            color = OUTCOME_COLORS.get(attempt['outcome'])
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if color is not None:
+                    item.setBackground(color)
+                self.attempts_table.setItem(row, column, item)
+
+        self.set_hops(response.hops)
+
+    def set_hops(self, hops):
+        """显示重定向链中每一跳的耗时"""
+        reused = sum(1 for hop in hops if hop['connection'] == 'reused')
+        self.hops_label.setText(
+            f"Redirect chain: {len(hops)} hops, {reused} on reused connections" if hops else "Redirect chain"
+        )
+        self.hops_table.setRowCount(len(hops))
+        for row, hop in enumerate(hops):
+            values = [
+                hop['method'],
+                hop['url'],
+                str(hop['status']) if hop['status'] is not None else "",
+                _format_protocol(hop),
+                f"{hop['start_ms']:.1f}",
+                _format_ms(hop['elapsed_ms']),
+                hop['connection'] or "",
+                _format_ms(hop['dns_ms']),
+                _format_ms(hop['connect_ms']),
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column == 1:
+                    item.setToolTip(value)
+                self.hops_table.setItem(row, column, item)
+
+
+def _format_protocol(hop):
+    protocol = hop['http_version'] or ""
+    if hop['stream_id'] is not None:
+        protocol += f" (stream {hop['stream_id']})"
+    return protocol
+
+
+def _format_ms(value):
+    return f"{value:.1f}" if value is not None else ""
@@ -0,0 +1,220 @@
+from datetime import datetime
+from PyQt6.QtWidgets import QWidget, QToolTip
+from PyQt6.QtCore import Qt, QRectF, QPointF
+from PyQt6.QtGui import QPainter, QPen, QColor, QFont, QFontMetrics, QPainterPath
+
+# 耗时曲线: (字段, 图例, 颜色)
+LATENCY_LINES = (
+    ('p50', "p50", QColor("#339af0")),
+    ('p95', "p95", QColor("#f59f00")),
+    ('p99', "p99", QColor("#e03131")),
+)
+# 状态分布柱: (字段, 图例, 颜色)
+STATUS_SEGMENTS = (
+    ('ok', "2xx/3xx", QColor("#51cf66")),
+    ('4xx', "4xx", QColor("#fcc419")),
+    ('5xx', "5xx", QColor("#ff6b6b")),
+    ('transport', "Transport error", QColor("#868e96")),
+)
+GRID_COLOR = QColor("#e9ecef")
+AXIS_TEXT_COLOR = QColor("#6c757d")
+
+
+def nice_ceiling(value):
+    """坐标轴上限取 1/2/2.5/5 x 10^n"""
+    if value <= 0:
+        return 1.0
+    magnitude = 10 ** len(str(int(value))) / 10
+    for step in (1, 2, 2.5, 5, 10):
+        if value <= step * magnitude:
+            return step * magnitude
+    return 10 * magnitude
+
+
+class LatencyTrendChart(QWidget):
+    """按时间段绘制耗时百分位曲线(上方)和状态分布堆叠柱(下方); 鼠标悬停显示该时间段的数值
+
+    points 为按时间排序的字典: bucket_start(秒), requests, p50, p95, p99, mean, max 和 statuses(字段见 STATUS_SEGMENTS)
+    """
+    MARGIN_LEFT = 64
+    MARGIN_RIGHT = 16
+    MARGIN_TOP = 28
+    MARGIN_BOTTOM = 28
+    STATUS_RATIO = 0.28  # 状态分布区域占绘图区高度的比例
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.points = []
+        self.bucket_seconds = 3600
+        self.range_start = 0
+        self.range_end = 0
+        self.setMouseTracking(True)
+        self.setMinimumSize(480, 320)
+        self.setStyleSheet("background: white;")
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+
+    def set_data(self, points, bucket_seconds, range_start, range_end):
+        self.points = points
+        self.bucket_seconds = bucket_seconds
+        self.range_start = range_start
+        # 范围终点取到时间段边界, 最后一个(未结束的)时间段完整显示
+        buckets = max(1, -(-(range_end - range_start) // bucket_seconds))
+        self.range_end = range_start + buckets * bucket_seconds
+        self.update()
+
+    # ---------- 坐标换算 ----------
+
+    def plot_rect(self):
+        return QRectF(self.MARGIN_LEFT, self.MARGIN_TOP,
+                      max(1, self.width() - self.MARGIN_LEFT - self.MARGIN_RIGHT),
+                      max(1, self.height() - self.MARGIN_TOP - self.MARGIN_BOTTOM))
+
+    def areas(self):
+        """(耗时区域, 状态分布区域)"""
+        plot = self.plot_rect()
+        status_height = plot.height() * self.STATUS_RATIO
+        latency = QRectF(plot.left(), plot.top(), plot.width(), plot.height() - status_height - 12)
+        status = QRectF(plot.left(), plot.bottom() - status_height, plot.width(), status_height)
+        return latency, status
+
+    def x_for(self, timestamp):
+        plot = self.plot_rect()
+        span = self.range_end - self.range_start
+        return plot.left() + (timestamp - self.range_start) / span * plot.width()
+
+    def bucket_width(self):
+        return self.plot_rect().width() * self.bucket_seconds / (self.range_end - self.range_start)
+
+    # ---------- 绘制 ----------
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(QFont("Segoe UI", 8))
+        if not self.points:
+            painter.setPen(AXIS_TEXT_COLOR)
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "No samples in this range")
+            return
+        latency_area, status_area = self.areas()
+        self.draw_legend(painter)
+        self.draw_latency(painter, latency_area)
+        self.draw_statuses(painter, status_area)
+        self.draw_time_axis(painter, status_area)
+
+    def draw_legend(self, painter):
+        metrics = QFontMetrics(painter.font())
+        x = float(self.MARGIN_LEFT)
+        y = 8
+        for _, label, color in LATENCY_LINES:
+            painter.setPen(QPen(color, 2))
+            painter.drawLine(QPointF(x, y + 6), QPointF(x + 14, y + 6))
+            painter.setPen(AXIS_TEXT_COLOR)
+            painter.drawText(QPointF(x + 18, y + 10), label)
+            x += 26 + metrics.horizontalAdvance(label)
+        x += 12
+        for _, label, color in STATUS_SEGMENTS:
+            painter.fillRect(QRectF(x, y + 1, 10, 10), color)
+            painter.setPen(AXIS_TEXT_COLOR)
+            painter.drawText(QPointF(x + 14, y + 10), label)
+            x += 24 + metrics.horizontalAdvance(label)
+
+    def draw_latency(self, painter, area):
+        top = nice_ceiling(max(point['p99'] for point in self.points))
+        metrics = QFontMetrics(painter.font())
+        for step in range(5):
+            value = top * step / 4
+            y = area.bottom() - area.height() * step / 4
+            painter.setPen(GRID_COLOR)
+            painter.drawLine(QPointF(area.left(), y), QPointF(area.right(), y))
+            painter.setPen(AXIS_TEXT_COLOR)
+            text = f"{value:g} ms"
+            painter.drawText(QPointF(area.left() - 6 - metrics.horizontalAdvance(text), y + 4), text)
+
+        half = self.bucket_width() / 2
+        for field, _, color in LATENCY_LINES:
+            path = QPainterPath()
+            previous = None
+            for point in self.points:
+                position = QPointF(self.x_for(point['bucket_start']) + half,
+                                   area.bottom() - point[field] / top * area.height())
+                # 没有样本的时间段断开曲线
+                if previous is not None and point['bucket_start'] - previous == self.bucket_seconds:
+                    path.lineTo(position)
+                else:
+                    path.moveTo(position)
+                previous = point['bucket_start']
+            painter.setPen(QPen(color, 2))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawPath(path)
+            painter.setBrush(color)
+            painter.setPen(Qt.PenStyle.NoPen)
+            for point in self.points:
+                center = QPointF(self.x_for(point['bucket_start']) + half,
+                                 area.bottom() - point[field] / top * area.height())
+                painter.drawEllipse(center, 2.5, 2.5)
+
+    def draw_statuses(self, painter, area):
+        top = max(point['requests'] for point in self.points) or 1
+        painter.setPen(AXIS_TEXT_COLOR)
+        metrics = QFontMetrics(painter.font())
+        text = f"{top} req"
+        painter.drawText(QPointF(area.left() - 6 - metrics.horizontalAdvance(text), area.top() + 8), text)
+        painter.setPen(GRID_COLOR)
+        painter.drawLine(QPointF(area.left(), area.bottom()), QPointF(area.right(), area.bottom()))
+
+        width = max(1.0, self.bucket_width() * 0.7)
+        offset = (self.bucket_width() - width) / 2
+        for point in self.points:
+            x = self.x_for(point['bucket_start']) + offset
+            y = area.bottom()
+            for field, _, color in STATUS_SEGMENTS:
+                count = point['statuses'].get(field, 0)
+                if not count:
+                    continue
+                height = count / top * area.height()
+                y -= height
+                painter.fillRect(QRectF(x, y, width, height), color)
+
+    def draw_time_axis(self, painter, area):
+        painter.setPen(AXIS_TEXT_COLOR)
+        metrics = QFontMetrics(painter.font())
+        time_format = '%m-%d' if self.bucket_seconds >= 86400 else '%m-%d %H:%M'
+        label_width = metrics.horizontalAdvance("00-00 00:00") + 16
+        # 刻度落在时间段边界上, 间隔为整数个时间段
+        buckets = round((self.range_end - self.range_start) / self.bucket_seconds)
+        step = max(1, -(-buckets // max(1, int(area.width() // label_width))))
+        for index in range(0, buckets + 1, step):
+            timestamp = self.range_start + index * self.bucket_seconds
+            text = datetime.fromtimestamp(timestamp).strftime(time_format)
+            x = self.x_for(timestamp) - metrics.horizontalAdvance(text) / 2
+            x = min(max(x, area.left() - 20), self.width() - metrics.horizontalAdvance(text) - 2)
+            painter.drawText(QPointF(x, area.bottom() + 16), text)
+
+    # ---------- 悬停提示 ----------
+
+    def point_at(self, x):
+        if not self.points:
+            return None
+        timestamp = self.range_start + (x - self.plot_rect().left()) / self.plot_rect().width() * (
+            self.range_end - self.range_start)
+        for point in self.points:
+            if point['bucket_start'] <= timestamp < point['bucket_start'] + self.bucket_seconds:
+                return point
+        return None
+
+    def mouseMoveEvent(self, event):
+        point = self.point_at(event.position().x())
+        if point is None:
+            QToolTip.hideText()
+            return
+        start = datetime.fromtimestamp(point['bucket_start'])
+        statuses = ", ".join(f"{label} {point['statuses'][field]}" for field, label, _ in STATUS_SEGMENTS
+                             if point['statuses'].get(field))
+        QToolTip.showText(
+            event.globalPosition().toPoint(),
+            f"{start:%Y-%m-%d %H:%M}\n"
+            f"{point['requests']} requests ({statuses})\n"
+            f"mean {point['mean']:.1f} ms, p50 {point['p50']:g} ms, p95 {point['p95']:g} ms, "
+            f"p99 {point['p99']:g} ms, max {point['max']:.1f} ms",
+            self
+        )
@@ -0,0 +1,83 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
+                            QLabel, QPlainTextEdit, QMessageBox)
+from PyQt6.QtGui import QFont
+from loguru import logger
+from src.utils import json_utils
+from src.utils.assertions import compile_assertions
+
+ASSERTION_TEMPLATE = [
+    {"type": "status", "in": [200]},
+    {"type": "header", "name": "Content-Type", "matches": "json"},
+    {"type": "jsonpath", "path": "$.id", "exists": True},
+    {"type": "latency", "max_ms": 1000},
+    {"type": "body_size", "max_bytes": 1048576},
+]
+
+
+class AssertionsDialog(QDialog):
+    """编辑已保存API的断言规则"""
+
+    def __init__(self, api, api_model, parent=None):
+        super().__init__(parent)
+        self.api = api
+        self.api_model = api_model
+        self.setWindowTitle(f"Assertions - {api['name']}")
+        self.resize(640, 480)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        hint = QLabel("JSON array of assertions. Types: status, header, jsonpath, latency, body_size")
+        hint.setStyleSheet("color: #6c757d;")
+        layout.addWidget(hint)
+
+        self.editor = QPlainTextEdit()
+        self.editor.setFont(QFont("Consolas, Courier New, monospace"))
+        assertions = self.api.get('assertions') or []
+        self.editor.setPlainText(json_utils.dumps(assertions, indent=2) if assertions else '[]')
+        layout.addWidget(self.editor)
+
+        button_layout = QHBoxLayout()
+        template_button = QPushButton("Insert Template")
+        template_button.clicked.connect(
+            lambda: self.editor.setPlainText(json_utils.dumps(ASSERTION_TEMPLATE, indent=2))
+        )
+        button_layout.addWidget(template_button)
+        button_layout.addStretch()
+
+        save_button = QPushButton("Save")
+        save_button.setStyleSheet("""
+            QPushButton {
+                background-color: #2ecc71;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                padding: 6px 12px;
+                min-width: 80px;
+            }
+            QPushButton:hover {
+                background-color: #27ae60;
+            }
+        """)
+        save_button.clicked.connect(self.save)
+        button_layout.addWidget(save_button)
+
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+
+    def save(self):
+        """校验并保存断言规则"""
+        try:
+            assertions = json_utils.loads(self.editor.toPlainText() or '[]')
+            compile_assertions(assertions)
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Assertions", str(e))
+            return
+        self.api_model.update_assertions(self.api['id'], assertions)
+        self.api['assertions'] = assertions
+        logger.info(f"Saved {len(assertions)} assertions for API: {self.api['name']}")
+        self.accept()
@@ -0,0 +1,96 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                            QSpinBox, QTableWidget, QTableWidgetItem, QHeaderView,
+                            QAbstractItemView)
+from PyQt6.QtGui import QColor
+import qasync
+from loguru import logger
+from src.controllers.collection_runner import CollectionRunner
+from src.utils.assertions import summarize_results
+
+
+class CollectionRunnerDialog(QDialog):
+    """运行所有已保存的API并显示断言结果"""
+    HEADERS = ["API", "Status", "Time (ms)", "Assertions"]
+
+    def __init__(self, api_model, request_controller, parent=None):
+        super().__init__(parent)
+        self.api_model = api_model
+        self.runner = CollectionRunner(request_controller)
+        self.running = False
+        self.setWindowTitle("Collection Runner")
+        self.resize(800, 500)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        control_layout = QHBoxLayout()
+        control_layout.addWidget(QLabel("Concurrency:"))
+        self.concurrency_input = QSpinBox()
+        self.concurrency_input.setRange(1, 64)
+        self.concurrency_input.setValue(1)
+        control_layout.addWidget(self.concurrency_input)
+        control_layout.addStretch()
+        self.summary_label = QLabel()
+        control_layout.addWidget(self.summary_label)
+        self.run_button = QPushButton("Run All")
+        self.run_button.clicked.connect(self.run_collection)
+        control_layout.addWidget(self.run_button)
+        layout.addLayout(control_layout)
+
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+    @qasync.asyncSlot()
+    async def run_collection(self):
+        """运行所有已保存的API"""
+        if self.running:
+            return
+        apis = self.api_model.get_all_apis()
+        self.table.setRowCount(len(apis))
+        for row, api in enumerate(apis):
+            self.table.setItem(row, 0, QTableWidgetItem(api['name']))
+            for column in range(1, len(self.HEADERS)):
+                self.table.setItem(row, column, QTableWidgetItem(""))
+
+        self.running = True
+        self.run_button.setEnabled(False)
+        self.summary_label.setText(f"Running {len(apis)} APIs...")
+        logger.info(f"Running collection of {len(apis)} APIs")
+        try:
+            summary = await self.runner.run(
+                apis, concurrency=self.concurrency_input.value(), on_result=self.on_result
+            )
+            self.summary_label.setText(
+                f"{summary['total']} APIs, {summary['failed']} failed, {summary['elapsed']:.2f}s"
+            )
+        except Exception as e:
+            logger.error(f"Collection run failed: {str(e)}")
+            self.summary_label.setText(f"Run failed: {str(e)}")
+        finally:
+            self.running = False
+            self.run_button.setEnabled(True)
+
+    def on_result(self, row, result):
+        """更新单个API的运行结果"""
+        response = result['response']
+        elapsed = response.elapsed_ms
+        passed, total = summarize_results(result['assertions'])
+        self.table.item(row, 1).setText(
+            str(response.status) if not response.is_error else response.error_kind.label
+        )
+        self.table.item(row, 2).setText(f"{elapsed:.0f}" if elapsed is not None else "")
+        assertions_item = self.table.item(row, 3)
+        assertions_item.setText(f"{passed}/{total} passed" if total else "-")
+        assertions_item.setToolTip("\n".join(
+            f"{'✔' if item['passed'] else '✘'} {item['name']}: {item['message']}"
+            for item in result['assertions']
+        ))
+        color = QColor('#f0fff4') if result['passed'] else QColor('#fff5f5')
+        for column in range(len(self.HEADERS)):
+            self.table.item(row, column).setBackground(color)
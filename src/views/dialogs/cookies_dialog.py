@@ -0,0 +1,111 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                            QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
+                            QMessageBox)
+from datetime import datetime
+from loguru import logger
+
+
+class CookiesDialog(QDialog):
+    """查看和清除共享会话中持久化的 Cookie"""
+    HEADERS = ["Domain", "Path", "Name", "Value", "Expires", "Flags"]
+
+    def __init__(self, http_client, parent=None):
+        super().__init__(parent)
+        self.http_client = http_client
+        self.cookies = []
+        self.setWindowTitle("Cookies")
+        self.resize(860, 480)
+        self.init_ui()
+        self.refresh()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        delete_button = QPushButton("Delete")
+        delete_button.clicked.connect(self.delete_selected)
+        button_layout.addWidget(delete_button)
+        clear_domain_button = QPushButton("Clear Domain")
+        clear_domain_button.clicked.connect(self.clear_selected_domain)
+        button_layout.addWidget(clear_domain_button)
+        clear_all_button = QPushButton("Clear All")
+        clear_all_button.clicked.connect(self.clear_all)
+        button_layout.addWidget(clear_all_button)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+    def refresh(self):
+        """重新加载 Cookie 列表"""
+        self.cookies = sorted(self.http_client.get_cookies(),
+                              key=lambda cookie: (cookie['domain'], cookie['path'], cookie['name']))
+        self.table.setRowCount(len(self.cookies))
+        for row, cookie in enumerate(self.cookies):
+            expires = cookie['expires']
+            flags = [flag for flag, enabled in (
+                ("Secure", cookie['secure']), ("HttpOnly", cookie['http_only']),
+                ("HostOnly", cookie['host_only'])
+            ) if enabled]
+            values = [
+                cookie['domain'],
+                cookie['path'],
+                cookie['name'],
+                cookie['value'],
+                datetime.fromtimestamp(expires).strftime('%Y-%m-%d %H:%M:%S') if expires else "Session",
+                ", ".join(flags),
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column == 3:
+                    item.setToolTip(value)
+                self.table.setItem(row, column, item)
+        domains = {cookie['domain'] for cookie in self.cookies}
+        self.summary_label.setText(f"{len(self.cookies)} cookies for {len(domains)} domains")
+
+    def selected_cookie(self):
+        row = self.table.currentRow()
+        if row < 0 or row >= len(self.cookies):
+            return None
+        return self.cookies[row]
+
+    def delete_selected(self):
+        cookie = self.selected_cookie()
+        if cookie is None:
+            return
+        self.http_client.delete_cookie(cookie['domain'], cookie['path'], cookie['name'])
+        self.refresh()
+
+    def clear_selected_domain(self):
+        cookie = self.selected_cookie()
+        if cookie is None:
+            return
+        self.http_client.clear_cookies(cookie['domain'])
+        self.refresh()
+
+    def clear_all(self):
+        if not self.cookies:
+            return
+        reply = QMessageBox.question(
+            self, "Clear Cookies", f"Delete all {len(self.cookies)} cookies?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            logger.info("Clearing all cookies")
+            self.http_client.clear_cookies()
+            self.refresh()
@@ -0,0 +1,191 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
+                            QLabel, QCheckBox, QTableWidget, QTableWidgetItem,
+                            QPlainTextEdit, QSpinBox, QComboBox, QSplitter,
+                            QHeaderView, QAbstractItemView)
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QFont
+from datetime import datetime
+from pathlib import Path
+from loguru import logger
+
+from src.models.config_model import ConfigModel
+from src.utils.instrumentation import instrumentation
+
+
+class DiagnosticsDialog(QDialog):
+    """诊断面板: 展示最近的 span、耗时直方图、事件循环延迟, 并可对后续请求做性能分析"""
+
+    REFRESH_INTERVAL = 1000  # 毫秒
+    MAX_SPAN_ROWS = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.config_model = ConfigModel()
+        self.setWindowTitle("Diagnostics")
+        self.resize(900, 640)
+        self.init_ui()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(self.REFRESH_INTERVAL)
+        self.refresh()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        button_font = QFont("Segoe UI", 10)
+
+        # 开关与操作按钮
+        top_layout = QHBoxLayout()
+        self.enable_checkbox = QCheckBox("Enable instrumentation")
+        self.enable_checkbox.setFont(button_font)
+        self.enable_checkbox.setChecked(instrumentation.enabled)
+        self.enable_checkbox.toggled.connect(self.on_enable_toggled)
+        top_layout.addWidget(self.enable_checkbox)
+
+        self.loop_lag_label = QLabel()
+        self.loop_lag_label.setFont(button_font)
+        top_layout.addWidget(self.loop_lag_label)
+        top_layout.addStretch()
+
+        reset_button = QPushButton("Reset")
+        reset_button.setFont(button_font)
+        reset_button.clicked.connect(self.on_reset_clicked)
+        top_layout.addWidget(reset_button)
+        layout.addLayout(top_layout)
+
+        # 性能分析
+        profile_layout = QHBoxLayout()
+        profile_label = QLabel("Profile next")
+        profile_label.setFont(button_font)
+        self.profile_count = QSpinBox()
+        self.profile_count.setRange(1, 1000)
+        self.profile_count.setValue(5)
+        self.profile_count.setSuffix(" requests")
+        self.profile_engine = QComboBox()
+        self.profile_engine.addItems(instrumentation.available_profilers())
+        self.profile_button = QPushButton("Start Profiling")
+        self.profile_button.setFont(button_font)
+        self.profile_button.clicked.connect(self.on_profile_clicked)
+        self.profile_status = QLabel()
+        self.profile_status.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        profile_layout.addWidget(profile_label)
+        profile_layout.addWidget(self.profile_count)
+        profile_layout.addWidget(self.profile_engine)
+        profile_layout.addWidget(self.profile_button)
+        profile_layout.addWidget(self.profile_status, stretch=1)
+        layout.addLayout(profile_layout)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+
+        # 直方图统计表
+        self.histogram_table = QTableWidget(0, 6)
+        self.histogram_table.setHorizontalHeaderLabels(["Span", "Count", "Mean (ms)", "P50 (ms)", "P95 (ms)", "Max (ms)"])
+        self.histogram_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.histogram_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.histogram_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.histogram_table.itemSelectionChanged.connect(self.update_histogram_detail)
+        splitter.addWidget(self.histogram_table)
+
+        # 选中 span 的桶分布
+        self.histogram_detail = QPlainTextEdit()
+        self.histogram_detail.setReadOnly(True)
+        self.histogram_detail.setFont(QFont("Consolas, Courier New, monospace"))
+        splitter.addWidget(self.histogram_detail)
+
+        # 最近的 span
+        self.span_table = QTableWidget(0, 3)
+        self.span_table.setHorizontalHeaderLabels(["Time", "Span", "Duration (ms)"])
+        self.span_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.span_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        splitter.addWidget(self.span_table)
+
+        layout.addWidget(splitter)
+
+    def on_enable_toggled(self, checked):
+        """开启或关闭埋点并保存到配置"""
+        instrumentation.set_enabled(checked)
+        self.config_model.set("instrumentation_enabled", checked)
+        self.refresh()
+
+    def on_reset_clicked(self):
+        instrumentation.reset()
+        self.refresh()
+
+    def on_profile_clicked(self):
+        """预约对接下来的 N 个请求进行性能分析"""
+        output_dir = Path(self.config_model.get_app_data_path()) / 'profiles'
+        try:
+            instrumentation.profile_next_requests(
+                self.profile_count.value(), str(output_dir), self.profile_engine.currentText()
+            )
+            self.profile_status.setText(f"Waiting for {self.profile_count.value()} requests...")
+        except Exception as e:
+            logger.error(f"Failed to start profiling: {str(e)}")
+            self.profile_status.setText(f"Error: {str(e)}")
+
+    def refresh(self):
+        """刷新面板数据"""
+        snapshot = instrumentation.snapshot()
+
+        lag = snapshot['loop_lag']
+        self.loop_lag_label.setText(
+            f"Loop lag: {snapshot['last_loop_lag']:.1f} ms (p95 {lag['p95']:.1f} ms, max {lag['max']:.1f} ms)"
+        )
+        if snapshot['profiling'] > 0:
+            self.profile_status.setText(f"Profiling, {snapshot['profiling']} requests remaining...")
+        elif snapshot['last_profile_path']:
+            self.profile_status.setText(f"Saved: {snapshot['last_profile_path']}")
+
+        # 保留当前选中的 span 名称
+        selected_name = self.selected_histogram_name()
+        histograms = snapshot['histograms']
+        self.histogram_table.blockSignals(True)
+        self.histogram_table.setRowCount(len(histograms))
+        for row, name in enumerate(sorted(histograms)):
+            stats = histograms[name]
+            values = [name, str(stats['count']), f"{stats['mean']:.2f}", f"{stats['p50']:.2f}",
+                      f"{stats['p95']:.2f}", f"{stats['max']:.2f}"]
+            for column, value in enumerate(values):
+                self.histogram_table.setItem(row, column, QTableWidgetItem(value))
+            if name == selected_name:
+                self.histogram_table.selectRow(row)
+        self.histogram_table.blockSignals(False)
+        self.update_histogram_detail()
+
+        spans = snapshot['spans'][-self.MAX_SPAN_ROWS:]
+        spans.reverse()
+        self.span_table.setRowCount(len(spans))
+        for row, (timestamp, name, duration, failed) in enumerate(spans):
+            time_text = datetime.fromtimestamp(timestamp).strftime('%H:%M:%S.%f')[:-3]
+            name_text = f"{name} (error)" if failed else name
+            self.span_table.setItem(row, 0, QTableWidgetItem(time_text))
+            self.span_table.setItem(row, 1, QTableWidgetItem(name_text))
+            self.span_table.setItem(row, 2, QTableWidgetItem(f"{duration:.2f}"))
+
+    def selected_histogram_name(self):
+        items = self.histogram_table.selectedItems()
+        if not items:
+            return None
+        return self.histogram_table.item(items[0].row(), 0).text()
+
+    def update_histogram_detail(self):
+        """以文本柱状图展示选中 span 的桶分布"""
+        name = self.selected_histogram_name()
+        histogram = instrumentation.histograms.get(name) if name else None
+        if histogram is None:
+            self.histogram_detail.setPlainText("Select a span to view its histogram")
+            return
+
+        peak = max(histogram.counts) or 1
+        lines = []
+        bounds = [f"<= {b:g} ms" for b in histogram.buckets] + [f"> {histogram.buckets[-1]:g} ms"]
+        for bound, count in zip(bounds, histogram.counts):
+            if count:
+                bar = '#' * max(1, int(40 * count / peak))
+                lines.append(f"{bound:>14} | {bar} {count}")
+        self.histogram_detail.setPlainText("\n".join(lines))
+
+    def closeEvent(self, event):
+        self.refresh_timer.stop()
+        super().closeEvent(event)
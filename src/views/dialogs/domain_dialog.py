@@ -1,8 +1,14 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
                             QLabel, QLineEdit, QMessageBox, QListWidget,
-                            QListWidgetItem, QWidget, QMenu)
+                            QListWidgetItem, QWidget, QMenu, QPlainTextEdit, QComboBox,
+                            QSpinBox, QDoubleSpinBox)
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
+from loguru import logger
+from src.utils.network import (NetworkConfigError, validate_proxy, is_socks_proxy, is_unix_url, split_unix_url,
+                               parse_host_overrides, format_host_overrides)
+from src.utils.rate_limiter import RateLimit
+from src.utils.transports.registry import TRANSPORTS, DEFAULT_TRANSPORT, UNIX_TRANSPORT
 
 class DomainDialog(QDialog):
     domain_changed = pyqtSignal()  # 当域名变化时发出信号
@@ -41,7 +47,7 @@ class DomainDialog(QDialog):
         """)
         
         self.domain_input = QLineEdit()
-        self.domain_input.setPlaceholderText("Domain (e.g. https://api.example.com)")
+        self.domain_input.setPlaceholderText("Domain (e.g. https://api.example.com, unix:///run/app.sock)")
         self.domain_input.setFont(button_font)
         self.domain_input.setMinimumHeight(32)
         self.domain_input.setStyleSheet("""
@@ -118,6 +124,12 @@ class DomainDialog(QDialog):
         if not name or not domain:
             QMessageBox.warning(self, "Warning", "Please enter both name and domain")
             return
+        if is_unix_url(domain):
+            try:
+                split_unix_url(domain)
+            except NetworkConfigError as e:
+                QMessageBox.warning(self, "Invalid Domain", str(e))
+                return
             
         self.domain_model.add_domain(name, domain)
         self.name_input.clear()
@@ -147,6 +159,25 @@ class DomainDialog(QDialog):
             info_layout.addWidget(name_label)
             info_layout.addWidget(domain_label)
             
+            # 网络设置摘要
+            network_info = []
+            if is_unix_url(domain['domain']):
+                network_info.append(TRANSPORTS[UNIX_TRANSPORT].label)
+            elif domain['transport'] in TRANSPORTS:
+                network_info.append(TRANSPORTS[domain['transport']].label)
+            if domain['proxy']:
+                network_info.append(f"Proxy: {domain['proxy']}")
+            if domain['host_overrides']:
+                network_info.append(f"{len(domain['host_overrides'])} host overrides")
+            rate_limit = RateLimit.from_dict(domain['rate_limit'])
+            if rate_limit.enabled:
+                network_info.append(f"Limit: {rate_limit.describe()}")
+            if network_info:
+                network_label = QLabel(" · ".join(network_info))
+                network_label.setFont(QFont("Segoe UI", 9))
+                network_label.setStyleSheet("color: #7f8c8d;")
+                info_layout.addWidget(network_label)
+            
             # 活动状态标签
             if domain['is_active']:
                 active_label = QLabel("Active")
@@ -213,6 +244,12 @@ class DomainDialog(QDialog):
             name = dialog.name_input.text().strip()
             domain = dialog.domain_input.text().strip()
             self.domain_model.update_domain(domain_data['id'], name, domain)
+            self.domain_model.update_network_settings(
+                domain_data['id'], dialog.proxy, dialog.host_overrides, dialog.transport, dialog.rate_limit
+            )
+            logger.info(f"Updated domain {name}: proxy={dialog.proxy or 'direct'}, "
+                        f"transport={dialog.transport or DEFAULT_TRANSPORT}, {len(dialog.host_overrides)} host overrides, "
+                        f"rate limit={RateLimit.from_dict(dialog.rate_limit).describe() or 'off'}")
             self.refresh_domains()
             self.domain_changed.emit()
             
@@ -234,6 +271,11 @@ class EditDomainDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Edit Domain")
         self.domain_data = domain_data
+        self.proxy = domain_data.get('proxy', '')
+        self.host_overrides = domain_data.get('host_overrides', {})
+        self.transport = domain_data.get('transport', '')
+        self.rate_limit = domain_data.get('rate_limit', {})
+        self.setMinimumWidth(460)
         self.init_ui()
         
     def init_ui(self):
@@ -249,6 +291,61 @@ class EditDomainDialog(QDialog):
         layout.addWidget(QLabel("Domain:"))
         layout.addWidget(self.domain_input)
         
+        # 网络设置: 传输引擎、代理和静态主机映射; 默认引擎保存为空, 以后更换默认引擎时随之变化
+        self.transport_combo = QComboBox()
+        for name, transport_class in TRANSPORTS.items():
+            if name == UNIX_TRANSPORT:
+                continue  # unix:// 地址自动使用
+            label = transport_class.label
+            if name == DEFAULT_TRANSPORT:
+                label += " - default"
+            elif not transport_class.available():
+                label += " - not installed"
+            self.transport_combo.addItem(label, "" if name == DEFAULT_TRANSPORT else name)
+            self.transport_combo.setItemData(self.transport_combo.count() - 1,
+                                             transport_class.capabilities.describe(), Qt.ItemDataRole.ToolTipRole)
+        self.transport_combo.setCurrentIndex(max(0, self.transport_combo.findData(self.transport)))
+        self.transport_combo.setToolTip("Engine used to send requests to this domain; "
+                                        "httpx multiplexes concurrent requests over one HTTP/2 connection")
+        layout.addWidget(QLabel("Transport:"))
+        layout.addWidget(self.transport_combo)
+        
+        self.proxy_input = QLineEdit(self.proxy)
+        self.proxy_input.setPlaceholderText("Direct (e.g. http://127.0.0.1:8080, socks5://127.0.0.1:1080)")
+        layout.addWidget(QLabel("Proxy:"))
+        layout.addWidget(self.proxy_input)
+        
+        self.overrides_input = QPlainTextEdit(format_host_overrides(self.host_overrides))
+        self.overrides_input.setPlaceholderText("10.0.0.12 api.example.com\n# One 'IP hostname...' per line, like /etc/hosts")
+        self.overrides_input.setFixedHeight(100)
+        layout.addWidget(QLabel("Host overrides (applied while this domain is active):"))
+        layout.addWidget(self.overrides_input)
+        
+        # 限速: 每秒请求数(令牌桶)和最大并发请求数, 对该主机的所有请求生效(包括批量运行、探测和压测)
+        rate_limit = RateLimit.from_dict(self.rate_limit)
+        rate_layout = QHBoxLayout()
+        self.rps_input = QDoubleSpinBox()
+        self.rps_input.setRange(0, 100000)
+        self.rps_input.setDecimals(1)
+        self.rps_input.setSuffix(" req/s")
+        self.rps_input.setSpecialValueText("Off")
+        self.rps_input.setValue(rate_limit.rps)
+        rate_layout.addWidget(self.rps_input)
+        rate_layout.addWidget(QLabel("Burst:"))
+        self.burst_input = QSpinBox()
+        self.burst_input.setRange(1, 100000)
+        self.burst_input.setValue(rate_limit.burst)
+        self.burst_input.setToolTip("Requests that may be sent back to back after an idle period")
+        rate_layout.addWidget(self.burst_input)
+        rate_layout.addWidget(QLabel("Max concurrent:"))
+        self.max_concurrent_input = QSpinBox()
+        self.max_concurrent_input.setRange(0, 100000)
+        self.max_concurrent_input.setSpecialValueText("Unlimited")
+        self.max_concurrent_input.setValue(rate_limit.max_concurrent)
+        rate_layout.addWidget(self.max_concurrent_input)
+        layout.addWidget(QLabel("Rate limit (requests wait in a queue, shown separately in Timing):"))
+        layout.addLayout(rate_layout)
+        
         # 按钮
         button_layout = QHBoxLayout()
         save_button = QPushButton("Save")
@@ -261,3 +358,29 @@ class EditDomainDialog(QDialog):
         button_layout.addWidget(cancel_button)
         
         layout.addLayout(button_layout)
+
+    def accept(self):
+        """校验代理地址、主机映射和限速"""
+        try:
+            self.proxy = validate_proxy(self.proxy_input.text())
+            self.host_overrides = parse_host_overrides(self.overrides_input.toPlainText())
+            self.transport = self.transport_combo.currentData()
+            rate_limit = RateLimit(rps=self.rps_input.value(), burst=self.burst_input.value(),
+                                   max_concurrent=self.max_concurrent_input.value())
+            self.rate_limit = rate_limit.to_dict() if rate_limit.enabled else {}
+            if is_unix_url(self.domain_input.text().strip()):
+                split_unix_url(self.domain_input.text().strip())
+                if self.proxy:
+                    raise NetworkConfigError("Unix socket domains cannot use a proxy")
+                if self.rate_limit:
+                    raise NetworkConfigError("Unix socket domains cannot be rate limited")
+                self.transport = ''
+            transport_class = TRANSPORTS[self.transport or DEFAULT_TRANSPORT]
+            if not transport_class.available():
+                raise NetworkConfigError(transport_class.missing_message)
+            if self.proxy and is_socks_proxy(self.proxy) and not transport_class.capabilities.socks_proxies:
+                raise NetworkConfigError(f"{transport_class.label} does not support SOCKS proxies")
+        except NetworkConfigError as e:
+            QMessageBox.warning(self, "Invalid Network Settings", str(e))
+            return
+        super().accept()
@@ -0,0 +1,112 @@
+import time
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton)
+from PyQt6.QtGui import QFont
+from loguru import logger
+from src.utils.instrumentation import Histogram
+from src.utils.request_metrics import request_metrics
+from src.views.components.trend_chart import LatencyTrendChart
+
+# 名称: 秒数
+GROUPINGS = {"Hour": 3600, "Day": 86400}
+RANGES = {"Last 24 hours": 86400, "Last 7 days": 7 * 86400, "Last 30 days": 30 * 86400}
+
+
+def rollup_to_point(row):
+    """把 MetricsModel.get_rollup 的一行转换为图表的数据点; 百分位数按直方图桶估算"""
+    histogram = Histogram.from_counts(row['latency_buckets'], row['latency_sum_ms'], row['latency_max_ms'])
+    errors = row['errors']
+    transport = sum(count for error, count in errors.items() if error not in ('4xx', '5xx'))
+    return {
+        'bucket_start': row['bucket_start'],
+        'requests': row['requests'],
+        'mean': histogram.mean,
+        'p50': histogram.percentile(50),
+        'p95': histogram.percentile(95),
+        'p99': histogram.percentile(99),
+        'max': histogram.max,
+        'histogram': histogram,
+        'statuses': {
+            'ok': row['requests'] - sum(errors.values()),
+            '4xx': errors.get('4xx', 0),
+            '5xx': errors.get('5xx', 0),
+            'transport': transport,
+        },
+    }
+
+
+class LatencyTrendDialog(QDialog):
+    """已保存API的耗时趋势: 按小时或按天汇总请求指标样本, 显示百分位曲线和状态分布"""
+
+    def __init__(self, api_name, metrics_model, parent=None):
+        super().__init__(parent)
+        self.api_name = api_name
+        self.metrics_model = metrics_model
+        self.setWindowTitle(f"Latency Trend - {api_name}")
+        self.resize(900, 520)
+        self.init_ui()
+        self.refresh()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        button_font = QFont("Segoe UI", 10)
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("Group by:"))
+        self.grouping_combo = QComboBox()
+        self.grouping_combo.addItems(list(GROUPINGS))
+        self.grouping_combo.currentIndexChanged.connect(self.refresh)
+        top_layout.addWidget(self.grouping_combo)
+        top_layout.addWidget(QLabel("Range:"))
+        self.range_combo = QComboBox()
+        self.range_combo.addItems(list(RANGES))
+        self.range_combo.setCurrentIndex(1)
+        self.range_combo.currentIndexChanged.connect(self.refresh)
+        top_layout.addWidget(self.range_combo)
+        top_layout.addStretch()
+        refresh_button = QPushButton("Refresh")
+        refresh_button.setFont(button_font)
+        refresh_button.clicked.connect(self.refresh)
+        top_layout.addWidget(refresh_button)
+        layout.addLayout(top_layout)
+
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("color: #495057; padding: 2px;")
+        layout.addWidget(self.summary_label)
+
+        self.chart = LatencyTrendChart()
+        layout.addWidget(self.chart, stretch=1)
+
+    def refresh(self):
+        """写入尚未刷新的指标后重新汇总"""
+        request_metrics.flush()
+        bucket_seconds = GROUPINGS[self.grouping_combo.currentText()]
+        now = time.time()
+        utc_offset = time.localtime(now).tm_gmtoff
+        # 范围起点对齐到时间段边界, 第一个时间段完整显示
+        since = (now - RANGES[self.range_combo.currentText()] + utc_offset) // bucket_seconds * bucket_seconds - utc_offset
+        try:
+            rows = self.metrics_model.get_rollup('api', self.api_name, bucket_seconds, since, utc_offset)
+        except Exception as e:
+            logger.error(f"Failed to load latency trend for {self.api_name}: {str(e)}")
+            self.summary_label.setText(f"Error: {str(e)}")
+            rows = []
+        points = [rollup_to_point(row) for row in rows]
+        self.chart.set_data(points, bucket_seconds, since, now)
+        self.update_summary(points)
+
+    def update_summary(self, points):
+        if not points:
+            self.summary_label.setText("No requests recorded for this API in the selected range")
+            return
+        total = Histogram()
+        requests = failed = 0
+        for point in points:
+            total.merge(point['histogram'])
+            requests += point['requests']
+            failed += point['requests'] - point['statuses']['ok']
+        self.summary_label.setText(
+            f"{requests} requests, {failed} failed ({failed * 100 / requests:.1f}%) · "
+            f"mean {total.mean:.1f} ms, p50 {total.percentile(50):g} ms, p95 {total.percentile(95):g} ms, "
+            f"p99 {total.percentile(99):g} ms, max {total.max:.1f} ms"
+        )
@@ -0,0 +1,185 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QGridLayout, QPushButton,
+                            QLabel, QSpinBox, QCheckBox, QMessageBox)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+import os
+import asyncio
+from loguru import logger
+from src.models.config_model import ConfigModel
+from src.controllers.load_generator import LoadGenerator, LoadTestSettings, uvloop_available
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class LoadTestDialog(QDialog):
+    """对当前请求进行多进程压测(非模态), 实时显示请求速率、错误数和耗时百分位"""
+
+    def __init__(self, request, network, parent=None):
+        """
+        Args:
+            request: (method, url, headers, body, timeout)
+            network: 当前的 NetworkSettings
+        """
+        super().__init__(parent)
+        self.request = request
+        self.network = network
+        self.config_model = ConfigModel()
+        self.settings = LoadTestSettings.from_dict(self.config_model.get('load_test'))
+        self.generator = None
+        self.closing = False
+        self.setWindowTitle("Load Test")
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.setMinimumWidth(520)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        button_font = QFont("Segoe UI", 10)
+
+        method, url = self.request[:2]
+        target_label = QLabel(f"{method} {url}")
+        target_label.setStyleSheet("font-weight: bold; padding: 2px;")
+        target_label.setWordWrap(True)
+        layout.addWidget(target_label)
+
+        form = QFormLayout()
+        self.workers_input = QSpinBox()
+        self.workers_input.setRange(1, 256)
+        self.workers_input.setValue(self.settings.workers)
+        self.workers_input.setToolTip(f"Worker processes, one event loop each ({os.cpu_count()} CPUs)")
+        form.addRow("Worker processes:", self.workers_input)
+
+        self.concurrency_input = QSpinBox()
+        self.concurrency_input.setRange(1, 10000)
+        self.concurrency_input.setValue(self.settings.concurrency)
+        form.addRow("Concurrency per worker:", self.concurrency_input)
+
+        self.duration_input = QSpinBox()
+        self.duration_input.setRange(1, 86400)
+        self.duration_input.setSuffix(" s")
+        self.duration_input.setValue(self.settings.duration_s)
+        form.addRow("Duration:", self.duration_input)
+
+        self.max_requests_input = QSpinBox()
+        self.max_requests_input.setRange(0, 2_000_000_000)
+        self.max_requests_input.setSpecialValueText("Unlimited")
+        self.max_requests_input.setValue(self.settings.max_requests)
+        form.addRow("Max requests:", self.max_requests_input)
+
+        self.uvloop_input = QCheckBox("Use uvloop in workers")
+        self.uvloop_input.setChecked(self.settings.uvloop and uvloop_available())
+        if not uvloop_available():
+            self.uvloop_input.setEnabled(False)
+            self.uvloop_input.setToolTip("uvloop is not installed (pip install uvloop, not available on Windows)")
+        form.addRow("", self.uvloop_input)
+        layout.addLayout(form)
+
+        # 实时结果
+        stats_layout = QGridLayout()
+        self.stat_labels = {}
+        for row, (key, title) in enumerate([
+            ('requests', "Requests"), ('rps', "Requests/s"), ('errors', "Errors"),
+            ('latency', "Latency"), ('received', "Received"),
+        ]):
+            stats_layout.addWidget(QLabel(f"{title}:"), row, 0)
+            label = QLabel("-")
+            label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+            stats_layout.addWidget(label, row, 1)
+            self.stat_labels[key] = label
+        stats_layout.setColumnStretch(1, 1)
+        layout.addLayout(stats_layout)
+
+        self.state_label = QLabel("Idle")
+        self.state_label.setStyleSheet("color: #7f8c8d; padding: 2px;")
+        layout.addWidget(self.state_label)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.start_button = QPushButton("Start")
+        self.start_button.setFont(button_font)
+        self.start_button.clicked.connect(self.toggle_run)
+        button_layout.addWidget(self.start_button)
+        close_button = QPushButton("Close")
+        close_button.setFont(button_font)
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+    def read_settings(self):
+        return LoadTestSettings(
+            workers=self.workers_input.value(),
+            concurrency=self.concurrency_input.value(),
+            duration_s=self.duration_input.value(),
+            max_requests=self.max_requests_input.value(),
+            timeout=self.request[4],
+            uvloop=self.uvloop_input.isChecked(),
+        )
+
+    def toggle_run(self):
+        if self.generator is not None:
+            self.generator.stop()
+            self.state_label.setText("Stopping...")
+            return
+        settings = self.read_settings()
+        self.config_model.set('load_test', settings.to_dict())
+        self.generator = LoadGenerator(self.request, settings, self.network)
+        self.set_inputs_enabled(False)
+        self.start_button.setText("Stop")
+        self.state_label.setText(f"Starting {settings.workers} worker processes...")
+        asyncio.ensure_future(self.run(self.generator))
+
+    async def run(self, generator):
+        try:
+            stats = await generator.run(self.on_progress)
+            if not self.closing:
+                state = f"Finished in {stats.elapsed:.1f}s"
+                if stats.worker_errors:
+                    state += f" ({len(stats.worker_errors)} workers failed: {stats.worker_errors[0]})"
+                self.state_label.setText(state)
+        except Exception as e:
+            logger.error(f"Load test failed: {str(e)}")
+            if not self.closing:
+                self.state_label.setText(f"Error: {str(e)}")
+                QMessageBox.critical(self, "Load Test Failed", str(e))
+        finally:
+            self.generator = None
+            if not self.closing:
+                self.set_inputs_enabled(True)
+                self.start_button.setText("Start")
+
+    def on_progress(self, stats):
+        if self.closing:
+            return
+        if stats.started is not None and stats.finished is None:
+            self.state_label.setText(f"Running {stats.elapsed:.1f}s")
+        labels = self.stat_labels
+        labels['requests'].setText(f"{stats.requests:,}")
+        labels['rps'].setText(f"{stats.current_rps():,.0f} current, {stats.average_rps:,.0f} average")
+        if stats.errors:
+            breakdown = ", ".join(f"{error} {count:,}" for error, count in sorted(stats.errors.items()))
+            labels['errors'].setText(f"{stats.failed:,} ({stats.failed * 100 / stats.requests:.1f}%): {breakdown}")
+        else:
+            labels['errors'].setText("0")
+        latency = stats.latency
+        labels['latency'].setText(
+            f"mean {latency.mean:.1f} ms, p50 {latency.percentile(50):g} ms, p95 {latency.percentile(95):g} ms, "
+            f"p99 {latency.percentile(99):g} ms, max {latency.max:.1f} ms"
+        )
+        labels['received'].setText(format_bytes(stats.response_bytes))
+
+    def set_inputs_enabled(self, enabled):
+        for widget in (self.workers_input, self.concurrency_input, self.duration_input, self.max_requests_input):
+            widget.setEnabled(enabled)
+        self.uvloop_input.setEnabled(enabled and uvloop_available())
+
+    def closeEvent(self, event):
+        self.closing = True
+        if self.generator is not None:
+            self.generator.stop()
+        super().closeEvent(event)
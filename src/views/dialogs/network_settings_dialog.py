@@ -0,0 +1,72 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QPushButton,
+                            QLabel, QSpinBox)
+from loguru import logger
+from src.utils.network import DEFAULT_DNS_CACHE_TTL, DEFAULT_HAPPY_EYEBALLS_DELAY_MS
+
+
+class NetworkSettingsDialog(QDialog):
+    """编辑全局网络设置: DNS 缓存 TTL 和 happy eyeballs 延迟
+
+    代理与静态主机映射按域名配置, 在域名管理中编辑。
+    """
+
+    def __init__(self, config_model, request_controller, parent=None):
+        super().__init__(parent)
+        self.config_model = config_model
+        self.controller = request_controller
+        self.setWindowTitle("Network Settings")
+        self.setMinimumWidth(420)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        form = QFormLayout()
+
+        self.dns_ttl_input = QSpinBox()
+        self.dns_ttl_input.setRange(0, 86400)
+        self.dns_ttl_input.setSuffix(" s")
+        self.dns_ttl_input.setSpecialValueText("Disabled")
+        self.dns_ttl_input.setValue(self.config_model.get('dns_cache_ttl', DEFAULT_DNS_CACHE_TTL))
+        form.addRow("DNS cache TTL:", self.dns_ttl_input)
+
+        self.happy_eyeballs_input = QSpinBox()
+        self.happy_eyeballs_input.setRange(0, 10000)
+        self.happy_eyeballs_input.setSuffix(" ms")
+        self.happy_eyeballs_input.setSpecialValueText("Disabled")
+        self.happy_eyeballs_input.setValue(
+            self.config_model.get('happy_eyeballs_delay_ms', DEFAULT_HAPPY_EYEBALLS_DELAY_MS)
+        )
+        self.happy_eyeballs_input.setToolTip("Delay before trying the next address when a host has several (RFC 8305)")
+        form.addRow("Happy eyeballs delay:", self.happy_eyeballs_input)
+        layout.addLayout(form)
+
+        hint = QLabel("Proxies and host overrides are configured per domain in Manage Domains.")
+        hint.setStyleSheet("color: #7f8c8d;")
+        hint.setWordWrap(True)
+        layout.addWidget(hint)
+
+        button_layout = QHBoxLayout()
+        clear_button = QPushButton("Clear DNS Cache")
+        clear_button.clicked.connect(self.clear_dns_cache)
+        button_layout.addWidget(clear_button)
+        button_layout.addStretch()
+        save_button = QPushButton("Save")
+        save_button.clicked.connect(self.save)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(save_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+
+    def clear_dns_cache(self):
+        self.controller.http_client.resolver.clear()
+        logger.info("DNS cache cleared")
+
+    def save(self):
+        self.config_model.set('dns_cache_ttl', self.dns_ttl_input.value())
+        self.config_model.set('happy_eyeballs_delay_ms', self.happy_eyeballs_input.value())
+        logger.info(f"Network settings saved: dns_cache_ttl={self.dns_ttl_input.value()}s, "
+                    f"happy_eyeballs_delay={self.happy_eyeballs_input.value()}ms")
+        self.controller.reload_network_settings()
+        self.accept()
@@ -0,0 +1,76 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QPushButton,
+                            QLabel, QSpinBox, QCheckBox)
+from loguru import logger
+from src.controllers.probe_scheduler import ProbeSettings
+
+
+class ProbeDialog(QDialog):
+    """编辑已保存API的定时探测设置"""
+
+    def __init__(self, api, api_model, parent=None):
+        super().__init__(parent)
+        self.api = api
+        self.api_model = api_model
+        self.settings = ProbeSettings.from_dict(api.get('probe'))
+        self.setWindowTitle(f"Probe - {api['name']}")
+        self.setMinimumWidth(420)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        form = QFormLayout()
+
+        self.enabled_input = QCheckBox("Run this API periodically in the background")
+        self.enabled_input.setChecked(self.settings.enabled)
+        form.addRow("", self.enabled_input)
+
+        self.interval_input = QSpinBox()
+        self.interval_input.setRange(5, 86400)
+        self.interval_input.setSuffix(" s")
+        self.interval_input.setValue(int(self.settings.interval_s))
+        form.addRow("Interval:", self.interval_input)
+
+        self.jitter_input = QSpinBox()
+        self.jitter_input.setRange(0, 50)
+        self.jitter_input.setSuffix(" %")
+        self.jitter_input.setValue(round(self.settings.jitter * 100))
+        form.addRow("Jitter:", self.jitter_input)
+
+        self.threshold_input = QSpinBox()
+        self.threshold_input.setRange(0, 600000)
+        self.threshold_input.setSuffix(" ms")
+        self.threshold_input.setSpecialValueText("Off")
+        self.threshold_input.setValue(int(self.settings.latency_threshold_ms))
+        form.addRow("Latency alert above:", self.threshold_input)
+        layout.addLayout(form)
+
+        hint = QLabel("Results are saved to history. A notification is shown when the API starts failing "
+                      "(transport error, failed assertion or slow response) and when it recovers.")
+        hint.setStyleSheet("color: #6c757d;")
+        hint.setWordWrap(True)
+        layout.addWidget(hint)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        save_button = QPushButton("Save")
+        save_button.clicked.connect(self.save)
+        button_layout.addWidget(save_button)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+
+    def save(self):
+        """保存设置; 未启用时清除"""
+        settings = ProbeSettings(
+            enabled=self.enabled_input.isChecked(),
+            interval_s=self.interval_input.value(),
+            jitter=self.jitter_input.value() / 100,
+            latency_threshold_ms=self.threshold_input.value(),
+        )
+        data = settings.to_dict() if settings.enabled else {}
+        self.api_model.update_probe(self.api['id'], data)
+        self.api['probe'] = data
+        logger.info(f"Saved probe settings for API {self.api['name']}: {data}")
+        self.accept()
@@ -0,0 +1,111 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QPushButton,
+                            QLabel, QSpinBox, QCheckBox, QLineEdit, QMessageBox)
+from loguru import logger
+from src.utils.retry_policy import RetryPolicy
+
+
+class RetryPolicyDialog(QDialog):
+    """编辑已保存API的重试与对冲策略"""
+
+    def __init__(self, api, api_model, parent=None):
+        super().__init__(parent)
+        self.api = api
+        self.api_model = api_model
+        self.policy = RetryPolicy.from_dict(api.get('retry_policy'))
+        self.setWindowTitle(f"Retry Policy - {api['name']}")
+        self.setMinimumWidth(420)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        form = QFormLayout()
+
+        self.max_retries_input = QSpinBox()
+        self.max_retries_input.setRange(0, 10)
+        self.max_retries_input.setValue(self.policy.max_retries)
+        form.addRow("Max retries:", self.max_retries_input)
+
+        self.backoff_base_input = QSpinBox()
+        self.backoff_base_input.setRange(0, 60000)
+        self.backoff_base_input.setSuffix(" ms")
+        self.backoff_base_input.setValue(self.policy.backoff_base_ms)
+        form.addRow("Backoff base:", self.backoff_base_input)
+
+        self.backoff_max_input = QSpinBox()
+        self.backoff_max_input.setRange(0, 600000)
+        self.backoff_max_input.setSuffix(" ms")
+        self.backoff_max_input.setValue(self.policy.backoff_max_ms)
+        form.addRow("Backoff max:", self.backoff_max_input)
+
+        self.jitter_input = QCheckBox("Randomize backoff (full jitter)")
+        self.jitter_input.setChecked(self.policy.jitter)
+        form.addRow("", self.jitter_input)
+
+        self.statuses_input = QLineEdit(", ".join(str(status) for status in sorted(self.policy.retry_statuses)))
+        self.statuses_input.setPlaceholderText("e.g. 429, 502, 503, 504")
+        form.addRow("Retry on statuses:", self.statuses_input)
+
+        self.connection_errors_input = QCheckBox("Retry on connection errors and timeouts")
+        self.connection_errors_input.setChecked(self.policy.retry_connection_errors)
+        form.addRow("", self.connection_errors_input)
+
+        self.retry_after_input = QCheckBox("Honour Retry-After header")
+        self.retry_after_input.setChecked(self.policy.respect_retry_after)
+        form.addRow("", self.retry_after_input)
+
+        self.non_idempotent_input = QCheckBox("Also retry non-idempotent methods (POST, PATCH)")
+        self.non_idempotent_input.setChecked(self.policy.retry_non_idempotent)
+        form.addRow("", self.non_idempotent_input)
+
+        self.hedge_input = QCheckBox("Send a hedged request when the first one is slow")
+        self.hedge_input.setChecked(self.policy.hedge)
+        form.addRow("Hedging:", self.hedge_input)
+
+        self.hedge_delay_input = QSpinBox()
+        self.hedge_delay_input.setRange(0, 60000)
+        self.hedge_delay_input.setSuffix(" ms")
+        self.hedge_delay_input.setSpecialValueText("Auto (p95)")
+        self.hedge_delay_input.setValue(self.policy.hedge_delay_ms)
+        form.addRow("Hedge delay:", self.hedge_delay_input)
+        layout.addLayout(form)
+
+        hint = QLabel("Auto hedge delay uses the p95 latency of recent requests to the same host.")
+        hint.setStyleSheet("color: #6c757d;")
+        hint.setWordWrap(True)
+        layout.addWidget(hint)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        save_button = QPushButton("Save")
+        save_button.clicked.connect(self.save)
+        button_layout.addWidget(save_button)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+
+    def save(self):
+        """校验并保存策略"""
+        try:
+            statuses = [int(part) for part in self.statuses_input.text().replace(',', ' ').split()]
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Statuses", "Statuses must be a comma separated list of numbers")
+            return
+        policy = RetryPolicy(
+            max_retries=self.max_retries_input.value(),
+            backoff_base_ms=self.backoff_base_input.value(),
+            backoff_max_ms=self.backoff_max_input.value(),
+            jitter=self.jitter_input.isChecked(),
+            retry_statuses=statuses,
+            retry_connection_errors=self.connection_errors_input.isChecked(),
+            retry_non_idempotent=self.non_idempotent_input.isChecked(),
+            respect_retry_after=self.retry_after_input.isChecked(),
+            hedge=self.hedge_input.isChecked(),
+            hedge_delay_ms=self.hedge_delay_input.value(),
+        )
+        data = policy.to_dict() if policy.enabled else {}
+        self.api_model.update_retry_policy(self.api['id'], data)
+        self.api['retry_policy'] = data
+        logger.info(f"Saved retry policy for API {self.api['name']}: {data}")
+        self.accept()
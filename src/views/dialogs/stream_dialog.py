@@ -0,0 +1,196 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit,
+                            QComboBox, QSpinBox, QMessageBox)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+import asyncio
+from loguru import logger
+from src.models.config_model import ConfigModel
+from src.utils.streaming import open_stream, guess_stream_kind, DEFAULT_BUFFER_SIZE
+from src.views.components.stream_view import StreamView
+
+STREAM_KIND_LABELS = [("WebSocket", 'websocket'), ("Server-Sent Events", 'sse')]
+STATE_COLORS = {
+    'connecting': "#f39c12",
+    'open': "#27ae60",
+    'reconnecting': "#f39c12",
+    'closed': "#7f8c8d",
+    'error': "#dc3545",
+}
+
+
+class StreamDialog(QDialog):
+    """WebSocket/SSE 流式客户端(非模态), 在 qasync 事件循环上接收消息"""
+
+    def __init__(self, http_client, url='', headers=None, parent=None):
+        super().__init__(parent)
+        self.http_client = http_client
+        self.headers = headers or {}
+        self.config_model = ConfigModel()
+        self.connection = None
+        self.task = None
+        self.running = False
+        self.closing = False  # 窗口关闭后不再更新界面
+        self.setWindowTitle("Streaming Client")
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.resize(900, 620)
+        self.init_ui(url)
+
+    def init_ui(self, url):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        button_font = QFont("Segoe UI", 10)
+
+        # 连接设置
+        connect_layout = QHBoxLayout()
+        self.kind_combo = QComboBox()
+        for label, kind in STREAM_KIND_LABELS:
+            self.kind_combo.addItem(label, kind)
+        self.kind_combo.setCurrentIndex(self.kind_combo.findData(guess_stream_kind(url)))
+        connect_layout.addWidget(self.kind_combo)
+
+        self.url_input = QLineEdit(url)
+        self.url_input.setPlaceholderText("wss://example.com/socket or https://example.com/events")
+        self.url_input.textEdited.connect(
+            lambda text: self.kind_combo.setCurrentIndex(self.kind_combo.findData(guess_stream_kind(text)))
+        )
+        connect_layout.addWidget(self.url_input)
+
+        self.connect_button = QPushButton("Connect")
+        self.connect_button.setFont(button_font)
+        self.connect_button.clicked.connect(self.toggle_connection)
+        connect_layout.addWidget(self.connect_button)
+        layout.addLayout(connect_layout)
+
+        self.state_label = QLabel("Disconnected")
+        self.state_label.setStyleSheet("color: #7f8c8d; padding: 2px;")
+        layout.addWidget(self.state_label)
+
+        # 消息列表
+        capacity = self.config_model.get('stream_buffer_size', DEFAULT_BUFFER_SIZE)
+        self.stream_view = StreamView(capacity)
+        layout.addWidget(self.stream_view)
+
+        # 发送帧
+        send_layout = QHBoxLayout()
+        self.send_input = QLineEdit()
+        self.send_input.setPlaceholderText("Text frame to send")
+        self.send_input.returnPressed.connect(self.send_frame)
+        send_layout.addWidget(self.send_input)
+        self.send_button = QPushButton("Send")
+        self.send_button.setFont(button_font)
+        self.send_button.clicked.connect(self.send_frame)
+        send_layout.addWidget(self.send_button)
+        layout.addLayout(send_layout)
+
+        # 缓冲区设置
+        buffer_layout = QHBoxLayout()
+        buffer_layout.addWidget(QLabel("Keep last"))
+        self.capacity_input = QSpinBox()
+        self.capacity_input.setRange(100, 1000000)
+        self.capacity_input.setSingleStep(1000)
+        self.capacity_input.setSuffix(" messages")
+        self.capacity_input.setValue(capacity)
+        self.capacity_input.editingFinished.connect(self.on_capacity_changed)
+        buffer_layout.addWidget(self.capacity_input)
+        buffer_layout.addStretch()
+        clear_button = QPushButton("Clear")
+        clear_button.clicked.connect(self.stream_view.clear)
+        buffer_layout.addWidget(clear_button)
+        layout.addLayout(buffer_layout)
+        self.update_controls()
+
+    def update_controls(self):
+        connected = self.running
+        self.connect_button.setText("Disconnect" if connected else "Connect")
+        self.url_input.setEnabled(not connected)
+        self.kind_combo.setEnabled(not connected)
+        can_send = connected and self.connection is not None and self.connection.can_send
+        self.send_input.setEnabled(can_send)
+        self.send_button.setEnabled(can_send)
+
+    def set_state(self, state, detail=""):
+        color = STATE_COLORS.get(state, "#7f8c8d")
+        self.state_label.setText(f"{state.capitalize()}{f': {detail}' if detail else ''}")
+        self.state_label.setStyleSheet(f"color: {color}; padding: 2px;")
+
+    def toggle_connection(self):
+        if self.running:
+            asyncio.ensure_future(self.disconnect())
+            return
+        url = self.url_input.text().strip()
+        if not url:
+            QMessageBox.warning(self, "Warning", "Please enter a URL")
+            return
+        kind = self.kind_combo.currentData()
+        self.connection = open_stream(self.http_client, url, kind, self.headers)
+        logger.info(f"Opening {kind} stream: {url}")
+        self.running = True
+        self.task = asyncio.ensure_future(self.run_stream(self.connection))
+        self.update_controls()
+
+    async def run_stream(self, connection):
+        try:
+            await connection.run(self.stream_view.append, self.on_state)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not connection.closed:
+                logger.warning(f"Stream {connection.url} failed: {e}")
+                if not self.closing:
+                    self.set_state('error', str(e) or type(e).__name__)
+        finally:
+            self.running = False
+            logger.info(f"Stream {connection.url} finished")
+            if not self.closing:
+                self.stream_view.flush()
+                self.update_controls()
+
+    def on_state(self, state, detail):
+        if not self.closing:
+            self.set_state(state, detail)
+            self.update_controls()
+
+    async def disconnect(self):
+        connection, task = self.connection, self.task
+        if connection is None:
+            return
+        await connection.close()
+        if task is not None and not task.done():
+            try:
+                await asyncio.wait_for(task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+        if not self.closing:
+            self.set_state('closed')
+            self.update_controls()
+
+    def send_frame(self):
+        text = self.send_input.text()
+        if not text or not self.running or not self.connection.can_send:
+            return
+        asyncio.ensure_future(self._send(text))
+
+    async def _send(self, text):
+        try:
+            message = await self.connection.send(text)
+        except Exception as e:
+            logger.warning(f"Failed to send frame: {e}")
+            if not self.closing:
+                self.set_state('error', f"Send failed: {e}")
+            return
+        self.stream_view.append(message)
+        self.send_input.clear()
+
+    def on_capacity_changed(self):
+        capacity = self.capacity_input.value()
+        if capacity != self.stream_view.buffer.capacity:
+            self.stream_view.set_capacity(capacity)
+            self.config_model.set('stream_buffer_size', capacity)
+            logger.info(f"Stream buffer size set to {capacity}")
+
+    def closeEvent(self, event):
+        self.closing = True
+        self.stream_view.flush_timer.stop()
+        if self.running:
+            asyncio.ensure_future(self.disconnect())
+        super().closeEvent(event)
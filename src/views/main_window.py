@@ -1,19 +1,21 @@
 from PyQt6.QtWidgets import (
     QMainWindow, QVBoxLayout, QWidget, 
     QHBoxLayout, QStackedWidget, QSplitter, 
-    QMenuBar, QMenu, QMessageBox, QFileDialog
+    QMenuBar, QMenu, QMessageBox, QFileDialog,
+    QInputDialog, QProgressDialog, QSystemTrayIcon
 )
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QAction
+from PyQt6.QtGui import QAction, QIcon
 import qasync
 import os
-import json
 from loguru import logger
 
 from src.models.api_model import ApiModel
 from src.models.domain_model import DomainModel
 from src.models.config_model import ConfigModel
 from src.models.history_model import HistoryModel
+from src.models.metrics_model import MetricsModel
+from src.utils import json_utils
 from src.views.components.request_panel import RequestPanel
 from src.views.components.response_panel import ResponsePanel
 from src.views.components.sidebar import SideBar
@@ -21,11 +23,27 @@ from src.views.components.history_sidebar import HistorySideBar
 from src.views.components.icon_sidebar import IconSideBar
 from src.views.components.loading_spinner import LoadingSpinner
 from src.views.dialogs.domain_dialog import DomainDialog
+from src.views.dialogs.diagnostics_dialog import DiagnosticsDialog
+from src.views.dialogs.collection_runner_dialog import CollectionRunnerDialog
+from src.views.dialogs.cookies_dialog import CookiesDialog
+from src.views.dialogs.network_settings_dialog import NetworkSettingsDialog
+from src.views.dialogs.stream_dialog import StreamDialog
+from src.views.dialogs.load_test_dialog import LoadTestDialog
 from src.controllers.request_controller import RequestController
+from src.controllers.import_controller import ImportController
+from src.controllers.probe_scheduler import ProbeScheduler, DEFAULT_CONCURRENCY
+from src.utils.background_worker import BackgroundWorker
+from src.utils.instrumentation import instrumentation
+from src.utils.request_metrics import request_metrics, DEFAULT_FLUSH_INTERVAL
+from src.utils.log_utils import log_payload
+from src.utils.assertions import get_pipeline, summarize_results
+from src.utils.http_result import HttpResult
 import asyncio
 from src.version import VERSION
 from PyQt6.QtWidgets import QApplication
 
+ICON_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'icon.png')
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -50,6 +68,16 @@ class MainWindow(QMainWindow):
         self.config_model = ConfigModel()
         self.history_model = HistoryModel()
         
+        # 根据配置开启性能埋点
+        self.diagnostics_dialog = None
+        if self.config_model.get("instrumentation_enabled", False):
+            instrumentation.set_enabled(True)
+
+        # 请求指标定期写入数据库, 可选导出文件和本地指标端点
+        request_metrics.configure(MetricsModel(), self.config_model.get("metrics_export_path"))
+        request_metrics.start(self.config_model.get("metrics_flush_interval", DEFAULT_FLUSH_INTERVAL),
+                              self.config_model.get("metrics_port"))
+        
         self.update_window_title()
         
         # 创建主窗口部件
@@ -98,6 +126,19 @@ class MainWindow(QMainWindow):
         
         # 创建控制器
         self.controller = RequestController()
+        self.import_controller = ImportController(self.api_model, self.history_model)
+        self.import_worker = None
+
+        # 定时探测共用一个调度任务, 结果写入历史记录
+        active_domain = self.domain_model.get_active_domain()
+        self.probe_scheduler = ProbeScheduler(
+            self.controller, self.api_model, self.history_model,
+            self.config_model.get("probe_concurrency", DEFAULT_CONCURRENCY),
+            active_domain['domain'] if active_domain else None
+        )
+        self.probe_scheduler.on_alert = self.on_probe_alert
+        self.probe_scheduler.on_result = self.on_probe_result
+        self.tray_icon = None
         
         # 创建请求和响应面板
         self.request_panel = RequestPanel()
@@ -110,11 +151,18 @@ class MainWindow(QMainWindow):
         self.request_panel.send_request.connect(self.handle_request)
         self.request_panel.add_api.connect(self.api_sidebar.add_api)
         self.request_panel.status_message.connect(self.show_status_message)
+        self.request_panel.domain_changed.connect(self.on_domain_changed)
         
         # 连接 API 侧边栏的信号
         self.api_sidebar.api_selected.connect(self.request_panel.load_api)
         self.api_sidebar.api_deleted.connect(self.request_panel.on_api_deleted)
         self.api_sidebar.api_renamed.connect(self.request_panel.on_api_renamed)
+        self.api_sidebar.api_renamed.connect(request_metrics.rename_api)
+        # API 删除、重命名或探测设置变化后重新读取探测列表
+        self.api_sidebar.api_deleted.connect(self.reload_probes)
+        self.api_sidebar.api_renamed.connect(self.reload_probes)
+        self.api_sidebar.probes_changed.connect(self.reload_probes)
+        self.probe_scheduler.start()
         
         # 添加面板到右侧布局
         right_layout.addWidget(self.request_panel, stretch=3)
@@ -141,45 +189,46 @@ class MainWindow(QMainWindow):
     @qasync.asyncSlot(str, str, dict, str, int)
     async def handle_request(self, method, url, headers, body, timeout):
         """处理API请求"""
-        logger.info(f"Sending request: {method} {url}")
-        logger.debug(f"Request headers: {headers}")
-        logger.debug(f"Request body: {body}")
+        logger.info("Sending request: {} {}", method, url)
+        log_payload("Request", headers, body)
         
         # 显示加载动画
         self.loading_spinner.start()
         
         # 重置响应面板状态
-        self.response_panel.update_response({
-            'status': 0,
-            'status_text': 'Sending Request...',
-            'headers': {},
-            'text': ''
-        })
+        self.response_panel.show_assertion_results([])
+        self.response_panel.show_pending()
         
         try:
-            # 发送请求
-            response = await self.controller.send_request(method, url, headers, body, timeout)
+            # 发送请求(使用已保存API的重试策略)
+            api_data = self.get_current_api_data()
+            retry_policy = api_data.get('retry_policy') if api_data else None
+            response = await self.controller.send_request(method, url, headers, body, timeout, retry_policy,
+                                                          api_name=api_data['name'] if api_data else None)
             
             if response:
                 # 更新响应面板
-                self.response_panel.update_response({
-                    'status': response.get('status', 'Unknown'),
-                    'status_text': response.get('status_text', ''),
-                    'headers': response.get('headers', {}),
-                    'text': response.get('text', '')
-                })
+                self.response_panel.update_response(response)
                 
-                logger.info(f"Request completed: {response.get('status', 'Unknown')} {response.get('status_text', '')}")
-                logger.debug(f"Response headers: {response.get('headers', {})}")
+                if response.is_error:
+                    logger.info("Request failed ({}): {}", response.error_kind.value, response.error_message)
+                else:
+                    logger.info("Request completed: {} {}", response.status, response.reason)
+                    # 二进制响应只记录类型和大小, 不解码为文本
+                    if response.is_binary:
+                        log_payload("Response", response.headers, f"<{response.body_kind} body, {response.size} bytes>")
+                    else:
+                        log_payload("Response", response.headers, response.text)
+                self.evaluate_assertions(api_data, response)
                 
                 # 添加到历史记录
                 try:
-                    headers_dict = json.loads(headers)
+                    headers_dict = json_utils.loads(headers)
                 except:
                     headers_dict = headers
                     
                 try:
-                    body_dict = json.loads(body)
+                    body_dict = json_utils.loads(body)
                 except:
                     body_dict = body
                     
@@ -188,21 +237,48 @@ class MainWindow(QMainWindow):
                     url=url,
                     headers=headers_dict,
                     body=body_dict,
-                    timeout=timeout
+                    timeout=timeout,
+                    **response.summary()
                 )
-                logger.info(f"Added to history: {method} {url}")
+                logger.info("Added to history: {} {}", method, url)
         except Exception as e:
             logger.error(f"Request failed: {str(e)}")
-            self.response_panel.update_response({
-                'status': 'Error',
-                'status_text': str(e),
-                'headers': {},
-                'text': str(e)
-            })
+            self.response_panel.update_response(HttpResult.from_error(e))
         finally:
             # 停止加载动画
             self.loading_spinner.stop()
             
+    def get_current_api_data(self):
+        """获取请求面板当前API的已保存数据"""
+        api_name = self.request_panel.current_api_name
+        return self.api_model.get_api_by_name(api_name) if api_name else None
+
+    def evaluate_assertions(self, api_data, response):
+        """对当前API执行已保存的断言"""
+        if not api_data or not api_data.get('assertions'):
+            return
+        api_name = api_data['name']
+        try:
+            results = get_pipeline(api_data).evaluate(response)
+        except ValueError as e:
+            logger.error(f"Invalid assertions for {api_name}: {str(e)}")
+            results = [{'name': 'assertions', 'passed': False, 'message': str(e)}]
+        passed, total = summarize_results(results)
+        logger.info("Assertions for {}: {}/{} passed", api_name, passed, total)
+        self.response_panel.show_assertion_results(results)
+            
+    def closeEvent(self, event):
+        """退出前保存 Cookie 和请求指标, 并关闭共享会话"""
+        self.controller.http_client.save_cookies()
+        request_metrics.flush()
+        try:
+            asyncio.ensure_future(self.probe_scheduler.stop())
+            asyncio.ensure_future(self.controller.close())
+            asyncio.ensure_future(request_metrics.stop())
+        except RuntimeError as e:
+            logger.debug(f"Skipped closing HTTP session: {e}")
+        super().closeEvent(event)
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self.center_loading_spinner()
@@ -232,8 +308,10 @@ class MainWindow(QMainWindow):
         dialog.exec()
         
     def on_domain_changed(self):
-        """当域名改变时更新状态栏"""
+        """当域名改变时更新状态栏, 并重新加载代理和主机映射"""
+        self.controller.reload_network_settings()
         active_domain = self.domain_model.get_active_domain()
+        self.probe_scheduler.set_base_url(active_domain['domain'] if active_domain else None)
         if active_domain:
             logger.info(f"Active domain changed: {active_domain['name']} ({active_domain['domain']})")
             self.statusBar().showMessage(f"Active Domain: {active_domain['name']} ({active_domain['domain']})")
@@ -247,6 +325,25 @@ class MainWindow(QMainWindow):
         file_menu = menubar.addMenu("File")
         edit_menu = menubar.addMenu("Edit")
         settings_menu = menubar.addMenu("Settings")
+        tools_menu = menubar.addMenu("Tools")
+        
+        # 添加导入导出菜单项
+        import_har_action = QAction("Import HAR...", self)
+        import_har_action.triggered.connect(self.import_har)
+        file_menu.addAction(import_har_action)
+        
+        import_curl_action = QAction("Import cURL...", self)
+        import_curl_action.triggered.connect(self.import_curl)
+        file_menu.addAction(import_curl_action)
+        
+        import_openapi_action = QAction("Import OpenAPI...", self)
+        import_openapi_action.triggered.connect(self.import_openapi)
+        file_menu.addAction(import_openapi_action)
+        
+        export_har_action = QAction("Export History as HAR...", self)
+        export_har_action.triggered.connect(self.export_har)
+        file_menu.addAction(export_har_action)
+        file_menu.addSeparator()
         
         # 添加退出菜单项到File菜单
         exit_action = QAction("Exit", self)
@@ -268,6 +365,243 @@ class MainWindow(QMainWindow):
         app_data_action = QAction("Set App Data Path", self)
         app_data_action.triggered.connect(self.show_app_data_path_dialog)
         settings_menu.addAction(app_data_action)
+        
+        # 添加网络设置菜单项
+        network_action = QAction("Network Settings...", self)
+        network_action.triggered.connect(self.show_network_settings_dialog)
+        settings_menu.addAction(network_action)
+        
+        # 添加诊断面板菜单项
+        diagnostics_action = QAction("Diagnostics", self)
+        diagnostics_action.triggered.connect(self.show_diagnostics_dialog)
+        tools_menu.addAction(diagnostics_action)
+        
+        # 添加请求指标导出菜单项
+        metrics_action = QAction("Export Metrics...", self)
+        metrics_action.triggered.connect(self.export_metrics)
+        tools_menu.addAction(metrics_action)
+        
+        # 添加暂停定时探测菜单项
+        self.pause_probes_action = QAction("Pause Probes", self)
+        self.pause_probes_action.setCheckable(True)
+        self.pause_probes_action.toggled.connect(self.set_probes_paused)
+        tools_menu.addAction(self.pause_probes_action)
+        
+        # 添加集合运行菜单项
+        runner_action = QAction("Run Collection...", self)
+        runner_action.triggered.connect(self.show_collection_runner)
+        tools_menu.addAction(runner_action)
+        
+        # 添加 Cookie 管理菜单项
+        cookies_action = QAction("Cookies...", self)
+        cookies_action.triggered.connect(self.show_cookies_dialog)
+        tools_menu.addAction(cookies_action)
+        
+        # 添加 WebSocket/SSE 流式客户端菜单项
+        stream_action = QAction("Streaming Client...", self)
+        stream_action.triggered.connect(self.show_stream_dialog)
+        tools_menu.addAction(stream_action)
+        
+        # 添加压测菜单项
+        load_test_action = QAction("Load Test...", self)
+        load_test_action.triggered.connect(self.show_load_test_dialog)
+        tools_menu.addAction(load_test_action)
+
+    def import_har(self):
+        """从 HAR 文件导入历史记录或已保存的API"""
+        if self.import_worker and self.import_worker.isRunning():
+            self.show_status_message("An import is already running")
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "Import HAR", "", "HAR files (*.har *.json);;All files (*)")
+        if not path:
+            return
+        targets = {"History": ImportController.TARGET_HISTORY, "Saved APIs": ImportController.TARGET_APIS}
+        target_name, ok = QInputDialog.getItem(self, "Import HAR", "Import entries as:", list(targets), 0, False)
+        if not ok:
+            return
+        self.run_import(
+            lambda worker: self.import_controller.import_har(path, targets[target_name], worker),
+            f"Importing {os.path.basename(path)}..."
+        )
+
+    def run_import(self, task, label):
+        """在后台线程中执行导入任务, 并显示进度条"""
+        progress = QProgressDialog(label, "Cancel", 0, 1000, self)
+        progress.setWindowTitle("Import")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.setValue(0)
+
+        worker = BackgroundWorker(task, name="import", parent=self)
+        worker.progress.connect(
+            lambda done, total: progress.setValue(int(done * 1000 / total) if total else 0)
+        )
+        worker.partial.connect(self.api_sidebar.add_api_items)
+        worker.result.connect(self.on_import_finished)
+        worker.error.connect(lambda message: QMessageBox.critical(self, "Import Failed", message))
+        worker.finished.connect(progress.close)
+        progress.canceled.connect(worker.cancel)
+        self.import_worker = worker
+        worker.start()
+
+    def on_import_finished(self, summary):
+        """导入完成后刷新列表"""
+        logger.info(f"Import finished: {summary}")
+        # 已保存的API通过增量信号更新, 这里只需刷新历史记录
+        if summary['target'] == ImportController.TARGET_HISTORY:
+            self.history_sidebar.refresh_history()
+        message = f"Imported {summary['imported']} entries"
+        if summary.get('skipped'):
+            message += f", skipped {summary['skipped']}"
+        if summary.get('cancelled'):
+            message += " (cancelled)"
+        self.show_status_message(message, 5000)
+        if summary.get('dropped'):
+            limit = self.history_model.limit
+            QMessageBox.warning(
+                self, "Import",
+                f"History keeps only the newest {limit} requests, so {summary['dropped']} older entries "
+                f"were dropped after the import. Raise the 'history_limit' config option to keep more, "
+                f"or import the file as Saved APIs."
+            )
+
+    def import_curl(self):
+        """从粘贴的 curl 命令导入API"""
+        text, ok = QInputDialog.getMultiLineText(self, "Import cURL", "Paste one or more curl commands:")
+        if not ok or not text.strip():
+            return
+        try:
+            saved = self.import_controller.import_curl(text)
+        except Exception as e:
+            logger.error(f"Failed to import curl: {str(e)}")
+            QMessageBox.critical(self, "Import Failed", str(e))
+            return
+        self.api_sidebar.add_api_items(saved)
+        self.show_status_message(f"Imported {len(saved)} APIs from curl", 5000)
+
+    def import_openapi(self):
+        """从 OpenAPI 3 规范文件导入API"""
+        if self.import_worker and self.import_worker.isRunning():
+            self.show_status_message("An import is already running")
+            return
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import OpenAPI", "", "OpenAPI specs (*.json *.yaml *.yml);;All files (*)"
+        )
+        if not path:
+            return
+        self.run_import(
+            lambda worker: self.import_controller.import_openapi(path, worker),
+            f"Importing {os.path.basename(path)}..."
+        )
+
+    def export_har(self):
+        """导出历史记录为 HAR 文件"""
+        path, _ = QFileDialog.getSaveFileName(self, "Export HAR", "history.har", "HAR files (*.har)")
+        if not path:
+            return
+        try:
+            count = self.import_controller.export_har(path)
+            self.show_status_message(f"Exported {count} history entries to {path}", 5000)
+        except Exception as e:
+            logger.error(f"Failed to export HAR: {str(e)}")
+            QMessageBox.critical(self, "Export Failed", str(e))
+
+    def export_metrics(self):
+        """导出请求指标: JSON 包含累计值和数据库中的时间序列, Prometheus 文本只包含累计值"""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Metrics", "metrics.json", "JSON (*.json);;Prometheus text (*.prom)"
+        )
+        if not path:
+            return
+        try:
+            request_metrics.flush()
+            request_metrics.export(path, include_samples=True)
+            self.show_status_message(f"Exported request metrics to {path}", 5000)
+        except Exception as e:
+            logger.error(f"Failed to export metrics: {str(e)}")
+            QMessageBox.critical(self, "Export Failed", str(e))
+
+    def reload_probes(self, *args):
+        """API 或探测设置变化后刷新调度器"""
+        try:
+            self.probe_scheduler.reload()
+        except Exception as e:
+            logger.error(f"Failed to reload probes: {str(e)}")
+
+    def set_probes_paused(self, paused):
+        self.probe_scheduler.paused = paused
+        self.show_status_message("Probes paused" if paused else "Probes resumed")
+
+    def on_probe_result(self, api, result):
+        """探测完成后刷新历史列表(可见时)"""
+        if self.history_sidebar.isVisible():
+            self.history_sidebar.refresh_history()
+
+    def on_probe_alert(self, api, failing, message):
+        """探测开始失败或恢复时显示桌面通知; 系统不支持托盘时显示在状态栏"""
+        title = f"Probe {'failing' if failing else 'recovered'}: {api['name']}"
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            if self.tray_icon is None:
+                self.tray_icon = QSystemTrayIcon(QIcon(ICON_PATH), self)
+                self.tray_icon.setToolTip(self.windowTitle())
+                self.tray_icon.show()
+            icon = QSystemTrayIcon.MessageIcon.Warning if failing else QSystemTrayIcon.MessageIcon.Information
+            self.tray_icon.showMessage(title, message, icon, 10000)
+        self.show_status_message(f"{title} - {message}", 10000)
+
+    def show_diagnostics_dialog(self):
+        """显示诊断面板(非模态)"""
+        logger.info("Opening diagnostics dialog")
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(self)
+        self.diagnostics_dialog.refresh_timer.start(DiagnosticsDialog.REFRESH_INTERVAL)
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+
+    def show_collection_runner(self):
+        """显示集合运行对话框"""
+        logger.info("Opening collection runner")
+        CollectionRunnerDialog(self.api_model, self.controller, self).exec()
+
+    def show_cookies_dialog(self):
+        """显示 Cookie 管理对话框"""
+        logger.info("Opening cookies dialog")
+        CookiesDialog(self.controller.http_client, self).exec()
+
+    def show_stream_dialog(self):
+        """显示 WebSocket/SSE 流式客户端(非模态), 带入当前请求的地址和请求头"""
+        logger.info("Opening streaming client")
+        try:
+            headers = json_utils.loads(self.request_panel.headers_input.toPlainText() or "{}")
+        except json_utils.JSONDecodeError:
+            headers = {}
+        if not isinstance(headers, dict):
+            headers = {}
+        url = self.request_panel.url_input.text().strip()
+        StreamDialog(self.controller.http_client, url, headers, self).show()
+
+    def show_load_test_dialog(self):
+        """对当前请求进行压测(非模态)"""
+        url = self.request_panel.url_input.text().strip()
+        if not url:
+            QMessageBox.warning(self, "Warning", "Please enter a URL")
+            return
+        try:
+            headers = json_utils.loads(self.request_panel.headers_input.toPlainText() or "{}")
+        except json_utils.JSONDecodeError as e:
+            QMessageBox.warning(self, "Warning", f"Invalid JSON in headers: {str(e)}")
+            return
+        if not isinstance(headers, dict):
+            headers = {}
+        request = (self.request_panel.method_combo.currentText(), url, headers,
+                   self.request_panel.body_input.toPlainText(), self.request_panel.timeout_input.value())
+        logger.info("Opening load test for {} {}", request[0], url)
+        LoadTestDialog(request, self.controller.http_client.network, self).show()
+
+    def show_network_settings_dialog(self):
+        """显示网络设置对话框"""
+        logger.info("Opening network settings dialog")
+        NetworkSettingsDialog(self.config_model, self.controller, self).exec()
 
     def show_config_path_dialog(self):
         """显示配置文件路径设置对话框"""
@@ -332,7 +666,7 @@ class MainWindow(QMainWindow):
                 self.request_panel.load_api(api_data)
                 # 重新启用自动保存
                 self.request_panel.allow_auto_save = True
-                logger.debug(f"API data reloaded: {api_data}")
+                log_payload("Reloaded API", api_data.get('headers'), api_data.get('body'))
 
     def show_history(self):
         """显示历史记录"""
@@ -345,15 +679,10 @@ class MainWindow(QMainWindow):
     def on_history_selected(self, history_data):
         """处理历史记录选择事件"""
         logger.info(f"Loading history: {history_data['method']} {history_data['url']}")
-        logger.debug(f"History data: {history_data}")
+        log_payload("History", history_data.get('headers'), history_data.get('body'))
         
         # 重置响应结果
-        self.response_panel.update_response({
-            'status': 0,
-            'status_text': '',
-            'headers': {},
-            'text': ''
-        })
+        self.response_panel.clear_response()
         
         # 暂时禁用自动保存
         self.request_panel.allow_auto_save = False
@@ -361,8 +690,8 @@ class MainWindow(QMainWindow):
         # 加载历史记录数据
         self.request_panel.method_combo.setCurrentText(history_data["method"])
         self.request_panel.url_input.setText(history_data["url"])
-        self.request_panel.headers_input.setPlainText(json.dumps(history_data["headers"], indent=2))
-        self.request_panel.body_input.setPlainText(json.dumps(history_data["body"], indent=2))
+        self.request_panel.headers_input.setPlainText(json_utils.dumps(history_data["headers"], indent=2))
+        self.request_panel.body_input.setPlainText(json_utils.dumps(history_data["body"], indent=2))
         self.request_panel.timeout_input.setValue(history_data["timeout"])
         
         # 重新启用自动保存